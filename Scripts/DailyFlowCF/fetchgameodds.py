@@ -3,6 +3,9 @@ import json
 import sys
 from datetime import datetime
 import urllib3
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 # Disable SSL verification warnings globally
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -85,6 +88,14 @@ except Exception as e:
     print(f"Exception occurred when getting odds data: {str(e)}")
     odds_data = []
 
+# Keep this pull in the odds history; GameOdds only holds the latest price.
+# Imported here so a missing pandas/pyarrow can't stop the odds refresh
+try:
+    from oddshistory import append_snapshot, snapshot_rows
+    append_snapshot(snapshot_rows(odds_data))
+except Exception as e:
+    print(f"Exception occurred when storing the odds snapshot: {str(e)}")
+
 # Function to find odds for a particular team from a bookmaker
 def get_odds_for_team(bookmaker, team_name):
     if not bookmaker or 'markets' not in bookmaker or not bookmaker['markets']:
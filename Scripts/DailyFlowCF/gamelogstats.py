@@ -0,0 +1,143 @@
+import numpy as np
+
+from records import GameLogRow
+
+# Stats summed as integers over a window
+COUNTING = ('pa', 'ab', 'r', 'h', 'doubles', 'triples', 'hr', 'rbi', 'bb', 'so', 'sb', 'cs',
+            'hbp', 'sh', 'sf', 'ibb', 'gdp', 'roe')
+# Advanced stats summed over the games that report them
+SUMMED = ('wpa', 'cwpa', 're24', 'dfs_dk', 'dfs_fd')
+# Leverage stats averaged over the games that report them
+AVERAGED = ('ali', 'acli')
+
+
+def calculate_batting_stats(h, ab, bb=0, hbp=0, sf=0, doubles=0, triples=0, hr=0):
+    """
+    Calculate batting average, OBP, SLG, and OPS. Works on plain numbers
+    or on NumPy arrays of window totals.
+
+    Args:
+        h: Hits
+        ab: At bats
+        bb: Walks
+        hbp: Hit by pitch
+        sf: Sacrifice flies
+        doubles: Doubles
+        triples: Triples
+        hr: Home runs
+
+    Returns:
+        Tuple of (BA, OBP, SLG, OPS), 0.0 where a denominator is zero
+    """
+    h, ab, bb, hbp, sf = (np.asarray(v, dtype=float) for v in (h, ab, bb, hbp, sf))
+    # Total bases: singles + 2*doubles + 3*triples + 4*hr
+    tb = h + np.asarray(doubles, dtype=float) + 2 * np.asarray(triples, dtype=float) + 3 * np.asarray(hr, dtype=float)
+    obp_denominator = ab + bb + hbp + sf
+
+    ba = np.divide(h, ab, out=np.zeros_like(ab), where=ab > 0)
+    slg = np.divide(tb, ab, out=np.zeros_like(ab), where=ab > 0)
+    obp = np.divide(h + bb + hbp, obp_denominator, out=np.zeros_like(obp_denominator), where=obp_denominator > 0)
+    ops = obp + slg
+
+    if ba.ndim == 0:
+        return float(ba), float(obp), float(slg), float(ops)
+    return ba, obp, slg, ops
+
+
+class GameLog:
+    """
+    A player's batting game log held as columns, oldest game first. Built
+    once from the parsed rows; every window (last N games, a date range,
+    the whole season) is a slice of the same arrays.
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        n = len(self.rows)
+        self.counting = np.array([[getattr(r, s) for s in COUNTING] for r in self.rows], dtype=np.int64).reshape(n, len(COUNTING))
+        # Blank advanced cells become NaN so windows can skip them
+        self.advanced = np.array(
+            [[np.nan if getattr(r, s) is None else getattr(r, s) for s in SUMMED + AVERAGED] for r in self.rows],
+            dtype=np.float64,
+        ).reshape(n, len(SUMMED) + len(AVERAGED))
+        self.bop = np.array([r.bop for r in self.rows], dtype=np.int64)
+        self.is_away = np.array([r.is_away for r in self.rows], dtype=bool)
+        self.opp = np.array([r.opp or "UNKNOWN" for r in self.rows], dtype=object)
+        # ISO yyyy-mm-dd; doubleheader suffixes such as " (1)" dropped
+        self.dates = np.array([(r.date or "")[:10] for r in self.rows], dtype=object)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def window(self, last=None, start=None, end=None):
+        """
+        Index array for a window: the last N games, and/or games dated
+        between start and end (inclusive, yyyy-mm-dd). No arguments means
+        the whole log.
+        """
+        index = np.arange(len(self.rows))
+        if start is not None:
+            index = index[self.dates[index] >= start]
+        if end is not None:
+            index = index[self.dates[index] <= end]
+        if last is not None:
+            index = index[-last:] if last > 0 else index[:0]
+        return index
+
+    def totals(self, last=None, start=None, end=None):
+        """
+        Aggregate a window into a GameLogRow: counting and advanced stats
+        summed, rate stats recomputed, most common batting order spot, and
+        aLI/acLI averaged over the games that report them.
+        """
+        index = self.window(last, start, end)
+        counts = self.counting[index].sum(axis=0)
+        advanced = self.advanced[index]
+        sums = np.nansum(advanced[:, :len(SUMMED)], axis=0)
+
+        aggregate = GameLogRow(g=len(index))
+        for stat, value in zip(COUNTING, counts):
+            setattr(aggregate, stat, int(value))
+        for stat, value in zip(SUMMED, sums):
+            setattr(aggregate, stat, float(value))
+
+        ba, obp, slg, ops = calculate_batting_stats(
+            aggregate.h, aggregate.ab, aggregate.bb, aggregate.hbp, aggregate.sf,
+            aggregate.doubles, aggregate.triples, aggregate.hr
+        )
+        aggregate.ba, aggregate.obp, aggregate.slg, aggregate.ops = round(ba, 3), round(obp, 3), round(slg, 3), round(ops, 3)
+
+        aggregate.bop = self._bop_mode(self.bop[index])
+
+        reported = ~np.isnan(advanced[:, len(SUMMED):])
+        games = reported.sum(axis=0)
+        means = np.divide(np.nansum(advanced[:, len(SUMMED):], axis=0), games, out=np.zeros(len(AVERAGED)), where=games > 0)
+        for stat, value in zip(AVERAGED, means):
+            setattr(aggregate, stat, round(float(value), 3))
+
+        return aggregate
+
+    def home_games(self, last=None, start=None, end=None):
+        index = self.window(last, start, end)
+        return int((~self.is_away[index]).sum())
+
+    def away_opponents(self, last=None, start=None, end=None):
+        """
+        Opponent of each away game in the window, oldest first.
+        """
+        index = self.window(last, start, end)
+        return self.opp[index][self.is_away[index]].tolist()
+
+    @staticmethod
+    def _bop_mode(bop):
+        """
+        Most common lineup spot; ties go to the spot seen first, as
+        statistics.mode does. 0 when no game has one.
+        """
+        bop = bop[bop > 0]
+        if not len(bop):
+            return 0
+        counts = np.bincount(bop)
+        tied = np.flatnonzero(counts == counts.max())
+        first_seen = [np.argmax(bop == spot) for spot in tied]
+        return int(tied[int(np.argmin(first_seen))])
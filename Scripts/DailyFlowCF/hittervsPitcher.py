@@ -1,12 +1,13 @@
+import os
+import sys
 import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
-import time
 from datetime import datetime
 import urllib3
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from browserpool import BrowserPool
+
 # Suppress only the insecure request warning for localhost
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -14,29 +15,16 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # chrome_driver_path = "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
 chrome_driver_path = "C:/Users/travi/source/repos/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
 
-
-# Set Chrome options to run headless
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--no-sandbox")
-
-# Initialize the Selenium WebDriver (Chrome in this case)
-service = Service(chrome_driver_path)
-driver = webdriver.Chrome(service=service, options=chrome_options)
-
-# Load the webpage
+# Load the webpage in a headless browser and wait for the matchup rows
+# rather than a fixed delay
 url = "https://stathead.com/baseball/versus-finder.cgi?request=1&match=versus_today"
-driver.get(url)
-
-# Wait for the page to fully load
-time.sleep(6)
-
-# Parse the page source with BeautifulSoup
-soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-# Close the WebDriver after the page is loaded
-driver.quit()
+with BrowserPool(size=1, driver_path=chrome_driver_path) as pool, pool.tab() as tab:
+    try:
+        tab.get(url, ready="table#stats tr[data-row]")
+    except Exception as e:
+        print(f"Timed out waiting for the matchup table: {e}")
+    # Parse the page source with BeautifulSoup
+    soup = BeautifulSoup(tab.source(), 'html.parser')
 
 # Try finding the table by id
 table = soup.find('table', {'id': 'stats'})
@@ -5,8 +5,10 @@ from bs4 import BeautifulSoup, Comment
 import time
 import json
 from datetime import datetime
+import os
 import sys
 import random
+import logging
 
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -15,6 +17,12 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from logconfig import configure_logging
+from profiling import run
+
+logger = logging.getLogger(__name__)
+
 # Sample user agents
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
@@ -53,15 +61,15 @@ def create_scraper_session():
 
 # Mimic human browsing behavior
 def simulate_human_browsing(scraper):
-    print("Simulating human browsing pattern...")
+    logger.debug("Simulating human browsing pattern...")
     
     # First visit the homepage
     homepage_url = "https://www.baseball-reference.com"
-    print(f"Visiting homepage: {homepage_url}")
+    logger.debug("Visiting homepage: %s", homepage_url)
     homepage_response = scraper.get(homepage_url)
     
     if homepage_response.status_code != 200:
-        print(f"Failed to access homepage: {homepage_response.status_code}")
+        logger.warning("Failed to access homepage: %s", homepage_response.status_code)
         return False
     
     # Parse the homepage to find random links to visit
@@ -82,21 +90,21 @@ def simulate_human_browsing(scraper):
         internal_links.remove(random_link)
         
         full_url = f"https://www.baseball-reference.com{random_link}"
-        print(f"Visiting random page: {full_url}")
+        logger.debug("Visiting random page: %s", full_url)
         
         try:
             random_page_response = scraper.get(full_url)
-            print(f"Status code: {random_page_response.status_code}")
+            logger.debug("Status code: %s", random_page_response.status_code)
             
             # Add random delay between page visits (2-5 seconds)
             delay = random.uniform(2, 5)
-            print(f"Waiting for {delay:.2f} seconds...")
+            logger.debug("Waiting for %.2f seconds...", delay)
             time.sleep(delay)
             
         except Exception as e:
-            print(f"Error visiting random page: {e}")
+            logger.error("Error visiting random page: %s", e)
     
-    print("Human browsing simulation completed")
+    logger.debug("Human browsing simulation completed")
     return True
 
 # Create API session for non-BR requests
@@ -112,55 +120,55 @@ def get_url_letter(pitcher_id):
 # Function to check if the pitcher exists in the database
 def pitcher_1st_inning_exists(api_session, bbrefID, year):
     url = f"https://localhost:44346/api/Pitcher1stInning/{bbrefID}/{year}"
-    print(f"Checking if pitcher exists in the database: {bbrefID}/{year}")
+    logger.debug("Checking if pitcher exists in the database: %s/%s", bbrefID, year)
     
     response = api_session.get(url, headers={'Content-Type': 'application/json'})
     
     if response.status_code == 200:
-        print(f"Pitcher {bbrefID} exists in the database.")
+        logger.debug("Pitcher %s exists in the database.", bbrefID)
     elif response.status_code == 404:
-        print(f"Pitcher {bbrefID} does not exist in the database.")
+        logger.debug("Pitcher %s does not exist in the database.", bbrefID)
     else:
-        print(f"Error checking pitcher existence. Status code: {response.status_code}")
+        logger.error("Error checking pitcher existence. Status code: %s", response.status_code)
     
     return response.status_code == 200
 
 # Function to check if a home/away split exists in the database
 def pitcher_home_away_split_exists(api_session, bbrefID, year, split):
     url = f"https://localhost:44346/api/PitcherHomeAwaySplits/{bbrefID}/{year}/{split}"
-    print(f"Checking if pitcher home/away split exists in the database: {bbrefID}, {year}, {split}")
+    logger.debug("Checking if pitcher home/away split exists in the database: %s, %s, %s", bbrefID, year, split)
     
     response = api_session.get(url, headers={'Content-Type': 'application/json'})
     
     if response.status_code == 200:
-        print(f"Pitcher {bbrefID} {split} split for {year} exists in the database.")
+        logger.debug("Pitcher %s %s split for %s exists in the database.", bbrefID, split, year)
     elif response.status_code == 404:
-        print(f"Pitcher {bbrefID} {split} split for {year} does not exist in the database.")
+        logger.debug("Pitcher %s %s split for %s does not exist in the database.", bbrefID, split, year)
     else:
-        print(f"Error checking pitcher home/away split existence. Status code: {response.status_code}")
+        logger.error("Error checking pitcher home/away split existence. Status code: %s", response.status_code)
     
     return response.status_code == 200
 
 # Function to check if a platoon and track record exists in the database
 def pitcher_platoon_and_track_record_exists(api_session, bbrefID, year, split):
     url = f"https://localhost:44346/api/PitcherPlatoonAndTrackRecord/{bbrefID}/{year}/{split}"
-    print(f"Checking if pitcher split exists in the database: {bbrefID}, {year}, {split}")
+    logger.debug("Checking if pitcher split exists in the database: %s, %s, %s", bbrefID, year, split)
     
     response = api_session.get(url, headers={'Content-Type': 'application/json'})
     
     if response.status_code == 200:
-        print(f"Pitcher {bbrefID} {split} split for {year} exists in the database.")
+        logger.debug("Pitcher %s %s split for %s exists in the database.", bbrefID, split, year)
     elif response.status_code == 404:
-        print(f"Pitcher {bbrefID} {split} split for {year} does not exist in the database.")
+        logger.debug("Pitcher %s %s split for %s does not exist in the database.", bbrefID, split, year)
     else:
-        print(f"Error checking pitcher split existence. Status code: {response.status_code}")
+        logger.error("Error checking pitcher split existence. Status code: %s", response.status_code)
     
     return response.status_code == 200
 
 # Updated post_to_api function to handle all scenarios
 def post_to_api(api_session, endpoint, data, is_update=False):
     if data is None:
-        print(f"No data to post to {endpoint}.")
+        logger.warning("No data to post to %s.", endpoint)
         return
 
     # Add DateModified field with current timestamp
@@ -176,33 +184,34 @@ def post_to_api(api_session, endpoint, data, is_update=False):
     
     json_data = json.dumps(data)  # Convert the data to a JSON string
     
-    # Print the CURL equivalent command for debugging
-    curl_command = f"curl -X {'PUT' if is_update else 'POST'} \\\n  '{url}' \\\n  -H 'Content-Type: application/json' \\\n  -d '{json_data}'"
-    print(f"Equivalent CURL command:\n{curl_command}\n")
+    # Log the CURL equivalent command for debugging (only built when DEBUG is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        curl_command = f"curl -X {'PUT' if is_update else 'POST'} \\\n  '{url}' \\\n  -H 'Content-Type: application/json' \\\n  -d '{json_data}'"
+        logger.debug("Equivalent CURL command:\n%s", curl_command)
     
     response = api_session.put(url, data=json_data, headers={'Content-Type': 'application/json'}) if is_update else api_session.post(url, data=json_data, headers={'Content-Type': 'application/json'})
     
     if response.status_code in [200, 201, 204]:
-        print(f"Successfully {'updated' if is_update else 'posted'} data to {endpoint} for {data['bbrefID']}.")
+        logger.debug("Successfully %s data to %s for %s.", 'updated' if is_update else 'posted', endpoint, data['bbrefID'])
     elif response.status_code == 429:
-        print(f"Rate limit exceeded while trying to {'update' if is_update else 'post'} data to {endpoint} for {data['bbrefID']}.")
+        logger.warning("Rate limit exceeded while trying to %s data to %s for %s.", 'update' if is_update else 'post', endpoint, data['bbrefID'])
     else:
-        print(f"Failed to {'update' if is_update else 'post'} data to {endpoint} for {data['bbrefID']}. Status code: {response.status_code}")
-        print(f"Response content: {response.content}")
+        logger.warning("Failed to %s data to %s for %s. Status code: %s", 'update' if is_update else 'post', endpoint, data['bbrefID'], response.status_code)
+        logger.warning("Response content: %s", response.content)
 
 # Function to check if a pitcher's totals exist
 def pitcher_totals_exists(api_session, bbrefID, year):
     url = f"https://localhost:44346/api/PitcherPlatoonAndTrackRecord/{bbrefID}/{year}/Totals"
-    print(f"Checking if pitcher totals exist for {year}: {bbrefID}")
+    logger.debug("Checking if pitcher totals exist for %s: %s", year, bbrefID)
     
     response = api_session.get(url, headers={'Content-Type': 'application/json'})
     
     if response.status_code == 200:
-        print(f"Pitcher {bbrefID} totals for {year} exist.")
+        logger.debug("Pitcher %s totals for %s exist.", bbrefID, year)
     elif response.status_code == 404:
-        print(f"Pitcher {bbrefID} totals for {year} do not exist.")
+        logger.debug("Pitcher %s totals for %s do not exist.", bbrefID, year)
     else:
-        print(f"Error checking pitcher totals existence for {year}. Status code: {response.status_code}")
+        logger.error("Error checking pitcher totals existence for %s. Status code: %s", year, response.status_code)
     
     return response.status_code == 200
 
@@ -219,21 +228,21 @@ def get_pitchers_from_game_previews(api_session, date):
                 pitchers.append(game['homePitcher'])
             if game.get('awayPitcher') and game['awayPitcher'] != "Unannounced":
                 pitchers.append(game['awayPitcher'])
-        print(f"Found {len(pitchers)} announced pitchers for {date}")
+        logger.info("Found %s announced pitchers for %s", len(pitchers), date)
         return pitchers
     else:
-        print(f"Failed to retrieve game previews for {date}. Status code: {response.status_code}")
+        logger.warning("Failed to retrieve game previews for %s. Status code: %s", date, response.status_code)
         return []
 
 # Function to scrape totals for a specific year
 def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
     # Add random delay before fetching historical data
     delay = random.uniform(5, 8)
-    print(f"Waiting for {delay:.2f} seconds before fetching {year} data for {pitcher_id}...")
+    logger.debug("Waiting for %.2f seconds before fetching %s data for %s...", delay, year, pitcher_id)
     time.sleep(delay)
     
     url = f"https://www.baseball-reference.com/players/split.fcgi?id={pitcher_id}&year={year}&t=p"
-    print(f"Scraping data from URL: {url}")
+    logger.debug("Scraping data from URL: %s", url)
 
     try:
         # Update referer to look more realistic
@@ -241,12 +250,12 @@ def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
         response = scraper.get(url)
         
         if response.status_code != 200:
-            print(f"Failed to retrieve page for pitcher {pitcher_id} in {year}. Status code: {response.status_code}")
+            logger.warning("Failed to retrieve page for pitcher %s in %s. Status code: %s", pitcher_id, year, response.status_code)
             return None
             
         # Check if we might be getting a captcha or empty response
         if len(response.content) < 5000:  # Suspiciously small response
-            print(f"Warning: Very small response received ({len(response.content)} bytes). Possible captcha or block.")
+            logger.warning("Very small response received (%s bytes). Possible captcha or block.", len(response.content))
             return None
 
         # Add small delay to mimic human reading time
@@ -267,10 +276,10 @@ def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
                     comment_soup = BeautifulSoup(comment, 'html.parser')
                     div_totals = comment_soup.find('div', id='div_total')
                     if div_totals:
-                        print(f"Found 'div_total' div within comment for pitcher {pitcher_id}")
+                        logger.debug("Found 'div_total' div within comment for pitcher %s", pitcher_id)
                         totals_table = div_totals.find('table', id='total')
                         if totals_table:
-                            print(f"Found 'total' table for pitcher {pitcher_id}")
+                            logger.debug("Found 'total' table for pitcher %s", pitcher_id)
                             tbody = totals_table.find('tbody')
                             if tbody:
                                 rows = tbody.find_all('tr')
@@ -338,10 +347,10 @@ def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
                     comment_soup = BeautifulSoup(comment, 'html.parser')
                     div_totals = comment_soup.find('div', id='div_total')
                     if div_totals:
-                        print(f"Found 'div_total' div within comment for pitcher {pitcher_id}")
+                        logger.debug("Found 'div_total' div within comment for pitcher %s", pitcher_id)
                         totals_table = div_totals.find('table', id='total')
                         if totals_table:
-                            print(f"Found 'total' table for pitcher {pitcher_id}")
+                            logger.debug("Found 'total' table for pitcher %s", pitcher_id)
                             tbody = totals_table.find('tbody')
                             if tbody:
                                 rows = tbody.find_all('tr')
@@ -403,10 +412,10 @@ def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
                     comment_soup = BeautifulSoup(comment, 'html.parser')
                     div_platoon = comment_soup.find('div', id='div_plato')
                     if div_platoon:
-                        print(f"Found 'div_plato' div within comment for pitcher {pitcher_id}")
+                        logger.debug("Found 'div_plato' div within comment for pitcher %s", pitcher_id)
                         platoon_table = div_platoon.find('table', id='plato')
                         if platoon_table:
-                            print(f"Found 'plato' table for pitcher {pitcher_id}")
+                            logger.debug("Found 'plato' table for pitcher %s", pitcher_id)
                             tbody = platoon_table.find('tbody')
                             if tbody:
                                 rows = tbody.find_all('tr')
@@ -455,7 +464,7 @@ def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
                                         else:
                                             post_to_api(api_session, 'PitcherPlatoonAndTrackRecord', platoon_data)
     except Exception as e:
-        print(f"Error scraping data for pitcher {pitcher_id}: {e}")
+        logger.error("Error scraping data for pitcher %s: %s", pitcher_id, e)
         return None
 
 
@@ -463,11 +472,11 @@ def scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, year):
 def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
     # Wait to avoid hitting rate limits - use random delay
     delay = random.uniform(6, 10)
-    print(f"Waiting for {delay:.2f} seconds before fetching data for {pitcher_id}...")
+    logger.debug("Waiting for %.2f seconds before fetching data for %s...", delay, pitcher_id)
     time.sleep(delay)
     
     url = f"https://www.baseball-reference.com/players/split.fcgi?id={pitcher_id}&year={year}&t=p"
-    print(f"Scraping data from URL: {url}")
+    logger.debug("Scraping data from URL: %s", url)
     
     try:
         # Add referer for more realistic request
@@ -475,7 +484,7 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
         response = scraper.get(url)
         
         if response.status_code != 200:
-            print(f"Failed to retrieve page for pitcher {pitcher_id}. Status code: {response.status_code}")
+            logger.warning("Failed to retrieve page for pitcher %s. Status code: %s", pitcher_id, response.status_code)
             return None
             
         # Add small delay to mimic human reading time
@@ -483,7 +492,7 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
         
         # Check if we might be getting a captcha or empty response
         if len(response.content) < 5000:  # Suspiciously small response
-            print(f"Warning: Very small response received ({len(response.content)} bytes). Possible captcha or block.")
+            logger.warning("Very small response received (%s bytes). Possible captcha or block.", len(response.content))
             return None
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -491,23 +500,23 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
         # Scrape First Inning Data
         inning_div = soup.find('div', id='all_innng')
         if inning_div:
-            print(f"Found 'all_innng' div for pitcher {pitcher_id}")
+            logger.debug("Found 'all_innng' div for pitcher %s", pitcher_id)
             comments = inning_div.find_all(string=lambda text: isinstance(text, Comment))
             for comment in comments:
                 comment_soup = BeautifulSoup(comment, 'html.parser')
                 div_inning = comment_soup.find('div', id='div_innng')
                 if div_inning:
-                    print(f"Found 'div_innng' div within comment for pitcher {pitcher_id}")
+                    logger.debug("Found 'div_innng' div within comment for pitcher %s", pitcher_id)
                     inning_table = div_inning.find('table', id='innng')
                     if inning_table:
-                        print(f"Found 'innng' table for pitcher {pitcher_id}")
+                        logger.debug("Found 'innng' table for pitcher %s", pitcher_id)
                         tbody = inning_table.find('tbody')
                         if tbody:
                             rows = tbody.find_all('tr')
                             for row in rows:
                                 first_column = row.find('th', {'data-stat': 'split_name'})
                                 if first_column and first_column.text.strip() == '1st inning':
-                                    print(f"Found 1st inning data for pitcher {pitcher_id}")
+                                    logger.debug("Found 1st inning data for pitcher %s", pitcher_id)
                                     try:
                                         doubles = int(row.find(attrs={'data-stat': '2B'}).text or 0)
                                         triples = int(row.find(attrs={'data-stat': '3B'}).text or 0)
@@ -550,7 +559,7 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
                                         else:
                                             post_to_api(api_session, 'Pitcher1stInning', pitcher_1st_inning_data)
                                     except AttributeError as e:
-                                        print(f"Error parsing first inning data for pitcher: {pitcher_id}. Error: {e}")
+                                        logger.error("Error parsing first inning data for pitcher: %s. Error: %s", pitcher_id, e)
 
         # Scrape Home/Away Splits Data
         content_div = soup.find('div', id='content')
@@ -563,10 +572,10 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
                     comment_soup = BeautifulSoup(comment, 'html.parser')
                     div_hmvis = comment_soup.find('div', id='div_hmvis')
                     if div_hmvis:
-                        print(f"Found 'div_hmvis' div within comment for pitcher {pitcher_id}")
+                        logger.debug("Found 'div_hmvis' div within comment for pitcher %s", pitcher_id)
                         home_away_table = div_hmvis.find('table', id='hmvis')
                         if home_away_table:
-                            print(f"Found 'hmvis' table for pitcher {pitcher_id}")
+                            logger.debug("Found 'hmvis' table for pitcher %s", pitcher_id)
                             tbody = home_away_table.find('tbody')
                             if tbody:
                                 rows = tbody.find_all('tr')
@@ -630,10 +639,10 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
                     comment_soup = BeautifulSoup(comment, 'html.parser')
                     div_totals = comment_soup.find('div', id='div_total')
                     if div_totals:
-                        print(f"Found 'div_total' div within comment for pitcher {pitcher_id}")
+                        logger.debug("Found 'div_total' div within comment for pitcher %s", pitcher_id)
                         totals_table = div_totals.find('table', id='total')
                         if totals_table:
-                            print(f"Found 'total' table for pitcher {pitcher_id}")
+                            logger.debug("Found 'total' table for pitcher %s", pitcher_id)
                             tbody = totals_table.find('tbody')
                             if tbody:
                                 rows = tbody.find_all('tr')
@@ -695,10 +704,10 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
                     comment_soup = BeautifulSoup(comment, 'html.parser')
                     div_platoon = comment_soup.find('div', id='div_plato')
                     if div_platoon:
-                        print(f"Found 'div_plato' div within comment for pitcher {pitcher_id}")
+                        logger.debug("Found 'div_plato' div within comment for pitcher %s", pitcher_id)
                         platoon_table = div_platoon.find('table', id='plato')
                         if platoon_table:
-                            print(f"Found 'plato' table for pitcher {pitcher_id}")
+                            logger.debug("Found 'plato' table for pitcher %s", pitcher_id)
                             tbody = platoon_table.find('tbody')
                             if tbody:
                                 rows = tbody.find_all('tr')
@@ -747,28 +756,30 @@ def scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, year):
                                         else:
                                             post_to_api(api_session, 'PitcherPlatoonAndTrackRecord', platoon_data)
     except Exception as e:
-        print(f"Error scraping data for pitcher {pitcher_id}: {e}")
+        logger.error("Error scraping data for pitcher %s: %s", pitcher_id, e)
         return None
 
 # Main scraping logic for pitchers, now with checks for 2024 totals
 def scrape_and_post_pitcher_data_helper(scraper, api_session, pitcher_id, year):
     # Check if 2024 totals exist before proceeding with 2025
     if not pitcher_totals_exists(api_session, pitcher_id, 2024):
-        print(f"Scraping and posting 2024 totals for pitcher: {pitcher_id}")
+        logger.debug("Scraping and posting 2024 totals for pitcher: %s", pitcher_id)
         # Scrape 2024 totals only
         scrape_pitcher_totals_for_year(scraper, api_session, pitcher_id, 2024)
         # Add a longer delay after scraping 2024 data
         delay = random.uniform(8, 12)
-        print(f"Waiting {delay:.2f} seconds after processing 2024 data...")
+        logger.debug("Waiting %.2f seconds after processing 2024 data...", delay)
         time.sleep(delay)
 
     # Continue with scraping and posting 2025 data
-    print(f"Scraping and posting 2025 data for pitcher: {pitcher_id}")
+    logger.debug("Scraping and posting 2025 data for pitcher: %s", pitcher_id)
     scrape_and_post_pitcher_data(scraper, api_session, pitcher_id, 2025)
 
 # Main execution function
 def main():
-    print("Starting Baseball Reference data scraper with enhanced anti-detection measures")
+    # Per-pitcher detail is DEBUG; set LOG_LEVEL=DEBUG to see it
+    configure_logging("pitcherbulksplits_cf")
+    logger.info("Starting Baseball Reference data scraper with enhanced anti-detection measures")
     
     # Check if a date argument is provided via command line
     if len(sys.argv) > 1:
@@ -784,7 +795,7 @@ def main():
     
     # Simulate human browsing to avoid detection
     if not simulate_human_browsing(scraper):
-        print("Failed to establish browsing pattern. Exiting...")
+        logger.warning("Failed to establish browsing pattern. Exiting...")
         return
     
     # Create a regular session for API calls
@@ -794,10 +805,10 @@ def main():
     pitchers = get_pitchers_from_game_previews(api_session, date)
     
     if not pitchers:
-        print(f"No pitchers found for date {date}. Exiting...")
+        logger.warning("No pitchers found for date %s. Exiting...", date)
         return
     
-    print(f"Found {len(pitchers)} pitchers to process for {date}")
+    logger.info("Found %s pitchers to process for %s", len(pitchers), date)
     
     # Add a delay before starting to scrape pitchers
     time.sleep(random.uniform(3, 5))
@@ -808,10 +819,10 @@ def main():
     # Loop through each pitcher and scrape & post data
     for idx, pitcher_id in enumerate(pitchers):
         if pitcher_id.lower() == "unannounced":
-            print(f"Skipping pitcher: {pitcher_id}")
+            logger.debug("Skipping pitcher: %s", pitcher_id)
             continue
         
-        print(f"Processing pitcher {idx+1}/{len(pitchers)}: {pitcher_id}")
+        logger.debug("Processing pitcher %s/%s: %s", idx + 1, len(pitchers), pitcher_id)
         
         # Scrape and post data from Baseball Reference
         scrape_and_post_pitcher_data_helper(scraper, api_session, pitcher_id, year)
@@ -819,10 +830,10 @@ def main():
         # Add a longer delay between pitchers to avoid detection
         if idx < len(pitchers) - 1:  # Don't delay after the last pitcher
             delay = random.uniform(5, 11)
-            print(f"Waiting {delay:.2f} seconds before processing the next pitcher...")
+            logger.debug("Waiting %.2f seconds before processing the next pitcher...", delay)
             time.sleep(delay)
     
-    print("All pitchers processed successfully!")
+    logger.info("All pitchers processed successfully!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run(main)
@@ -0,0 +1,210 @@
+import json
+from datetime import date
+
+
+def _int(text):
+    try:
+        return int((text or "0").replace(",", ""))
+    except ValueError:
+        return 0
+
+
+def _float(text):
+    try:
+        return float((text or "").replace(",", "").replace("%", ""))
+    except ValueError:
+        return None
+
+
+class Record:
+    """
+    Base for slotted records. Subclasses list (attribute, default) pairs
+    in FIELDS, set __slots__ to the attribute names and map attributes to
+    API names in JSON_NAMES where they differ.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    JSON_NAMES = {}
+
+    def __init__(self, **values):
+        for name, default in self.FIELDS:
+            setattr(self, name, values.get(name, default))
+
+    def to_dict(self):
+        return {self.JSON_NAMES.get(name, name): getattr(self, name) for name, _ in self.FIELDS}
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name, _ in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+
+def slots(fields):
+    return tuple(name for name, _ in fields)
+
+
+def to_json(value, **kwargs):
+    """
+    Serialize records (alone, in lists or inside dicts) to a JSON string.
+    """
+    return json.dumps(value, default=_encode, **kwargs)
+
+
+def to_payload(value):
+    """
+    Records -> plain JSON-ready structures, for requests' json= argument.
+    """
+    return json.loads(to_json(value))
+
+
+def _encode(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# attribute -> (Baseball Reference data-stat, converter) for batting game logs
+GAMELOG_STATS = {
+    "pa": ("b_pa", _int), "ab": ("b_ab", _int), "r": ("b_r", _int), "h": ("b_h", _int),
+    "doubles": ("b_doubles", _int), "triples": ("b_triples", _int), "hr": ("b_hr", _int),
+    "rbi": ("b_rbi", _int), "bb": ("b_bb", _int), "so": ("b_so", _int), "sb": ("b_sb", _int),
+    "cs": ("b_cs", _int), "hbp": ("b_hbp", _int), "sh": ("b_sh", _int), "sf": ("b_sf", _int),
+    "ibb": ("b_ibb", _int), "gdp": ("b_gidp", _int), "roe": ("b_roe", _int),
+    "ba": ("b_batting_avg_cume", _float), "obp": ("b_onbase_perc_cume", _float),
+    "slg": ("b_slugging_perc_cume", _float), "ops": ("b_onbase_plus_slugging_cume", _float),
+    "ali": ("b_leverage_index_avg", _float), "wpa": ("b_wpa", _float), "acli": ("b_cli_avg", _float),
+    "cwpa": ("b_cwpa", _float), "re24": ("b_baseout_runs", _float),
+    "dfs_dk": ("b_draftkings_points", _float), "dfs_fd": ("b_fanduel_points", _float),
+    "bop": ("b_lineup_position", _int), "date": ("date", str), "team": ("team_name_abbr", str),
+    "opp": ("opp_name_abbr", str), "is_away": ("game_location", lambda text: text == "@"),
+}
+_GAMELOG_BY_DATA_STAT = {data_stat: (name, convert) for name, (data_stat, convert) in GAMELOG_STATS.items()}
+
+
+class GameLogRow(Record):
+    """
+    One batting game-log row (or a season/window total). Rate and leverage
+    stats stay None when the page leaves them blank; cwpa is in percent.
+    """
+    FIELDS = (
+        ("g", 1), ("pa", 0), ("ab", 0), ("r", 0), ("h", 0), ("doubles", 0), ("triples", 0), ("hr", 0),
+        ("rbi", 0), ("bb", 0), ("so", 0), ("sb", 0), ("cs", 0), ("hbp", 0), ("sh", 0), ("sf", 0),
+        ("ibb", 0), ("gdp", 0), ("roe", 0), ("ba", None), ("obp", None), ("slg", None), ("ops", None),
+        ("ali", None), ("wpa", None), ("acli", None), ("cwpa", None), ("re24", None),
+        ("dfs_dk", None), ("dfs_fd", None), ("bop", 0), ("date", ""), ("team", ""), ("opp", ""),
+        ("is_away", False),
+    )
+    __slots__ = slots(FIELDS)
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Read a <tr> once, converting each known data-stat cell.
+        """
+        record = cls()
+        for cell in row.find_all(['td', 'th']):
+            field = _GAMELOG_BY_DATA_STAT.get(cell.get('data-stat'))
+            if field:
+                name, convert = field
+                setattr(record, name, convert(cell.get_text(strip=True)))
+        return record
+
+
+class TrailingSplitPayload(Record):
+    """
+    Body for POST /api/TrailingGameLogSplits.
+    """
+    FIELDS = (
+        ("bbref_id", ""), ("team", ""), ("split", ""), ("split_park_factor", None), ("g", 0),
+        ("pa", 0), ("ab", 0), ("r", 0), ("h", 0), ("doubles", 0), ("triples", 0), ("hr", 0), ("rbi", 0),
+        ("bb", 0), ("ibb", 0), ("so", 0), ("hbp", 0), ("sh", 0), ("sf", 0), ("roe", 0), ("gdp", 0),
+        ("sb", 0), ("cs", 0), ("ba", 0.0), ("obp", 0.0), ("slg", 0.0), ("ops", 0.0), ("bop", 0),
+        ("ali", 0.0), ("wpa", 0.0), ("acli", 0.0), ("cwpa", "0.0%"), ("re24", 0.0), ("dfs_dk", 0.0),
+        ("dfs_fd", 0.0), ("home_games", 0), ("away_games", 0), ("home_park_factor", None),
+        ("away_park_factor_avg", None), ("date_updated", ""),
+    )
+    __slots__ = slots(FIELDS)
+    JSON_NAMES = {
+        "bbref_id": "bbrefId", "split_park_factor": "splitParkFactor", "acli": "acLI", "re24": "rE24",
+        "dfs_dk": "dfsDk", "dfs_fd": "dfsFd", "home_games": "homeGames", "away_games": "awayGames",
+        "home_park_factor": "homeParkFactor", "away_park_factor_avg": "awayParkFactorAvg",
+        "date_updated": "dateUpdated",
+    }
+
+    @classmethod
+    def from_row(cls, bbrefid, team, split, row, park_factor_response, split_park_factor,
+                 home_games, away_games, date_updated):
+        """
+        Build the payload from a GameLogRow (single game, season total or
+        window aggregate).
+        """
+        def number(value, places):
+            return round(value, places) if value is not None else 0.0
+
+        return cls(
+            bbref_id=bbrefid, team=team, split=split, split_park_factor=split_park_factor,
+            g=row.g, pa=row.pa, ab=row.ab, r=row.r, h=row.h, doubles=row.doubles, triples=row.triples,
+            hr=row.hr, rbi=row.rbi, bb=row.bb, ibb=row.ibb, so=row.so, hbp=row.hbp, sh=row.sh, sf=row.sf,
+            roe=row.roe, gdp=row.gdp, sb=row.sb, cs=row.cs,
+            ba=number(row.ba, 3), obp=number(row.obp, 3), slg=number(row.slg, 3), ops=number(row.ops, 3),
+            bop=row.bop, ali=number(row.ali, 3), wpa=number(row.wpa, 3), acli=number(row.acli, 3),
+            cwpa=f"{number(row.cwpa, 2)}%", re24=number(row.re24, 2),
+            dfs_dk=number(row.dfs_dk, 1), dfs_fd=number(row.dfs_fd, 1),
+            home_games=home_games, away_games=away_games,
+            home_park_factor=park_factor_response["homeParkFactor"],
+            away_park_factor_avg=park_factor_response["avgAwayParkFactor"],
+            date_updated=date_updated,
+        )
+
+
+class BoxBattingLine(Record):
+    """
+    One hitter's line from a box score batting table. cwpa is a fraction.
+    """
+    FIELDS = (
+        ("ab", 0), ("r", 0), ("h", 0), ("rbi", 0), ("bb", 0), ("so", 0), ("pa", 0), ("pit", 0),
+        ("str", 0), ("wpa", 0), ("ali", 0), ("wpa_pos", 0), ("wpa_neg", 0), ("cwpa", 0), ("acli", 0),
+        ("re24", 0), ("po", 0), ("a", 0), ("doubles", 0), ("triples", 0), ("hr", 0), ("sb", 0),
+        ("cs", 0), ("sf", 0), ("hbp", 0), ("e", 0),
+    )
+    __slots__ = slots(FIELDS)
+    JSON_NAMES = {
+        "ab": "AB", "r": "R", "h": "H", "rbi": "RBI", "bb": "BB", "so": "SO", "pa": "PA", "pit": "Pit",
+        "str": "Str", "wpa": "WPA", "ali": "ALI", "wpa_pos": "WPA+", "wpa_neg": "WPA-A", "cwpa": "cWPA",
+        "acli": "acLI", "re24": "RE24", "po": "PO", "a": "A", "doubles": "2B", "triples": "3B",
+        "hr": "HR", "sb": "SB", "cs": "CS", "sf": "SF", "hbp": "HBP", "e": "E",
+    }
+
+
+class BattingToDate(Record):
+    """
+    Season-to-date batting line printed next to a box score row; HR, RBI
+    and SB come from the table footer when listed there.
+    """
+    FIELDS = (("ba", 0.0), ("obp", 0.0), ("slg", 0.0), ("ops", 0.0), ("hr", None), ("rbi", None), ("sb", None))
+    __slots__ = slots(FIELDS)
+    JSON_NAMES = {"ba": "BA", "obp": "OBP", "slg": "SLG", "ops": "OPS", "hr": "HR", "rbi": "RBI", "sb": "SB"}
+
+    def to_dict(self):
+        # Footer stats only appear for players who were listed there
+        return {k: v for k, v in super().to_dict().items() if v is not None}
+
+
+class BoxPitchingLine(Record):
+    """
+    One pitcher's line from a box score pitching table.
+    """
+    FIELDS = (
+        ("ip", 0), ("h", 0), ("r", 0), ("er", 0), ("bb", 0), ("so", 0), ("hr", 0), ("bf", 0),
+        ("pit", 0), ("str", 0), ("ctct", 0), ("sts", 0), ("stl", 0), ("gb", 0), ("fb", 0), ("ld", 0),
+        ("unk", 0), ("gsc", 0), ("ir", 0), ("is_", 0), ("wpa", 0), ("ali", 0), ("cwpa", 0), ("acli", 0),
+        ("re24", 0),
+    )
+    __slots__ = slots(FIELDS)
+    JSON_NAMES = {
+        "ip": "IP", "h": "H", "r": "R", "er": "ER", "bb": "BB", "so": "SO", "hr": "HR", "bf": "BF",
+        "pit": "Pit", "str": "Str", "ctct": "Ctct", "sts": "StS", "stl": "StL", "gb": "GB", "fb": "FB",
+        "ld": "LD", "unk": "Unk", "gsc": "GSc", "ir": "IR", "is_": "IS", "wpa": "WPA", "ali": "aLI",
+        "cwpa": "cWPA", "acli": "acLI", "re24": "RE24",
+    }
@@ -7,6 +7,7 @@ import time
 import urllib3
 import logging
 import os
+import sys
 import ssl
 import random
 import requests
@@ -15,34 +16,30 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from urllib3.exceptions import InsecureRequestWarning
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from browserpool import BrowserPool, CHROME_ARGUMENTS, text_absent
+
+# Seconds to wait for a Cloudflare challenge to clear, before and after a refresh
+CLOUDFLARE_TIMEOUT = 25
+CLOUDFLARE_REFRESH_TIMEOUT = 10
+
 # Configure Selenium with direct path to chromedriver
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.webdriver.common.by import By
-    
-    # =====================================================================
-    # IMPORTANT: Set the direct path to your local chromedriver
-    # Examples:
-    # Windows: "C:/Users/username/path/to/chromedriver.exe"
-    # Mac: "/Users/username/path/to/chromedriver"
-    # Linux: "/home/username/path/to/chromedriver"
-    # =====================================================================
-    # Check if chromedriver path exists
-    # CHROMEDRIVER_PATH = "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
-    CHROMEDRIVER_PATH = "C:/Users/travi/source/repos/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
-
-    print(f"Checking chromedriver path: {CHROMEDRIVER_PATH}")
-    if os.path.exists(CHROMEDRIVER_PATH):
-        print(f"Chromedriver exists at: {CHROMEDRIVER_PATH}")
-    else:
-        print(f"ERROR: Chromedriver NOT FOUND at: {CHROMEDRIVER_PATH}")
-except ImportError:
-    selenium_available = False
-    logging.warning("Selenium not available. Some scraping methods will be disabled.")
+# =====================================================================
+# IMPORTANT: Set the direct path to your local chromedriver
+# Examples:
+# Windows: "C:/Users/username/path/to/chromedriver.exe"
+# Mac: "/Users/username/path/to/chromedriver"
+# Linux: "/home/username/path/to/chromedriver"
+# =====================================================================
+# Check if chromedriver path exists
+# CHROMEDRIVER_PATH = "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
+CHROMEDRIVER_PATH = "C:/Users/travi/source/repos/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
+
+print(f"Checking chromedriver path: {CHROMEDRIVER_PATH}")
+if os.path.exists(CHROMEDRIVER_PATH):
+    print(f"Chromedriver exists at: {CHROMEDRIVER_PATH}")
+else:
+    print(f"ERROR: Chromedriver NOT FOUND at: {CHROMEDRIVER_PATH}")
 
 # Remove the webdriver_manager import since we're using direct path
 webdriver_manager_available = False  # We're not using webdriver_manager anymore
@@ -308,103 +305,91 @@ def save_html_for_debugging(html_content, filename="debug_response.html"):
     except Exception as e:
         logger.error(f"Failed to save HTML for debugging: {e}")
 
+_browser_pool = None
+
+def get_browser_pool(driver_path=None):
+    """
+    One headless browser for the whole run, so cookies from a solved
+    Cloudflare challenge (e.g. on the warm-up page) carry over to the
+    pages scraped after it
+    """
+    global _browser_pool
+    if _browser_pool is not None:
+        return _browser_pool
+    
+    # Use an explicitly provided path, else the path defined at the top of the
+    # script, else a chromedriver in the current directory (Windows, Linux/Mac)
+    if not driver_path:
+        candidates = [CHROMEDRIVER_PATH, "./chromedriver.exe", "./chromedriver"]
+        driver_path = next((path for path in candidates if os.path.exists(path)), None)
+    if not driver_path:
+        logger.error("No chromedriver found. Please specify the correct path at the top of the script.")
+        return None
+    
+    _browser_pool = BrowserPool(
+        size=1,
+        driver_path=driver_path,
+        arguments=CHROME_ARGUMENTS + ("--disable-blink-features=AutomationControlled",),  # Try to prevent detection
+        user_agent=get_random_user_agent(),
+    )
+    _browser_pool.start()
+    return _browser_pool
+
+def close_browser_pool():
+    global _browser_pool
+    if _browser_pool is not None:
+        _browser_pool.close()
+        _browser_pool = None
+
 def scrape_with_selenium(url, driver_path=None):
     """Use Selenium to scrape a page, with improved handling of Cloudflare challenges"""
     try:
         logger.info("Attempting to scrape with Selenium...")
         
-        # Selenium imports should already be available from the top of the script
-        
-        options = Options()
-        options.add_argument("--headless")  # Run in headless mode
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument(f"user-agent={get_random_user_agent()}")
-        options.add_argument("--disable-blink-features=AutomationControlled")  # Try to prevent detection
-        
-        # Always use the direct path specified at the top of the script
-        if driver_path:
-            # Use explicitly provided path (from function parameter)
-            service = Service(executable_path=driver_path)
-        elif os.path.exists(CHROMEDRIVER_PATH):
-            # Use the path defined at the top of the script
-            service = Service(executable_path=CHROMEDRIVER_PATH)
-        elif os.path.exists("./chromedriver.exe"):
-            # Fallback to current directory (Windows)
-            service = Service(executable_path="./chromedriver.exe")
-        elif os.path.exists("./chromedriver"):
-            # Fallback to current directory (Linux/Mac)
-            service = Service(executable_path="./chromedriver")
-        else:
-            logger.error("No chromedriver found. Please specify the correct path at the top of the script.")
+        pool = get_browser_pool(driver_path)
+        if pool is None:
             return None
-            
-        driver = webdriver.Chrome(service=service, options=options)
-        
-        # Set timeout and get the page
-        driver.set_page_load_timeout(60)  # Increased timeout for Cloudflare
-        logger.info(f"Navigating to {url} with Selenium...")
-        driver.get(url)
-        
-        # Add extra wait for Cloudflare challenge to resolve
-        logger.info("Waiting for Cloudflare to resolve...")
         
-        # Wait for the page to load
-        try:
-            # First, check if we're on a Cloudflare challenge page
-            if "cloudflare" in driver.page_source.lower() or "challenge" in driver.page_source.lower():
-                logger.info("Detected Cloudflare challenge, waiting for it to resolve...")
-                # Wait longer for Cloudflare - try multiple times
-                wait_time = 5
-                max_attempts = 6  # Total wait time up to 30 seconds
-                
-                for attempt in range(max_attempts):
-                    time.sleep(wait_time)
-                    
-                    # Check if we're still on the challenge page
-                    if "cloudflare" not in driver.page_source.lower() and "challenge" not in driver.page_source.lower():
-                        logger.info("Cloudflare challenge appears to be resolved!")
-                        break
-                    
-                    logger.info(f"Still on Cloudflare page after {(attempt+1)*wait_time} seconds, continuing to wait...")
-                    
-                    # On the last attempt, try refreshing the page
-                    if attempt == max_attempts - 2:
-                        logger.info("Trying to refresh the page...")
-                        driver.refresh()
+        with pool.tab() as tab:
+            logger.info(f"Navigating to {url} with Selenium...")
+            tab.get(url)
             
-            # Now wait for the actual content to load - look for tables
+            # Wait for any Cloudflare challenge to resolve
+            logger.info("Waiting for Cloudflare to resolve...")
+            challenge_cleared = text_absent("cloudflare", "challenge")
             try:
-                wait = WebDriverWait(driver, 15)
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                logger.info("Table element found on page, content appears to be loaded")
+                try:
+                    tab.wait(challenge_cleared, timeout=CLOUDFLARE_TIMEOUT)
+                except Exception:
+                    # Still on the challenge page; try refreshing the page once
+                    logger.info(f"Still on Cloudflare page after {CLOUDFLARE_TIMEOUT} seconds, trying to refresh the page...")
+                    with tab.focus() as driver:
+                        driver.refresh()
+                    tab.wait(challenge_cleared, timeout=CLOUDFLARE_REFRESH_TIMEOUT)
+                
+                # Now wait for the actual content to load - look for tables
+                try:
+                    tab.wait("table", timeout=15)
+                    logger.info("Table element found on page, content appears to be loaded")
+                except Exception as e:
+                    logger.info(f"Timed out waiting for table element, but continuing anyway: {e}")
+                    # Continue anyway as the page might still be usable
+            
             except Exception as e:
-                logger.info(f"Timed out waiting for table element, but continuing anyway: {e}")
-                # Continue anyway as the page might still be usable
-        
-        except Exception as e:
-            logger.warning(f"Exception during page load wait: {e}")
-            # Continue anyway - we might still have useful content
-        
-        # Get the final page source
-        html_content = driver.page_source
+                logger.warning(f"Exception during page load wait: {e}")
+                # Continue anyway - we might still have useful content
+            
+            # Get the final page source
+            html_content = tab.source()
         
         # Save for debugging
         save_html_for_debugging(html_content, "selenium_result.html")
         
-        # Close the driver
-        driver.quit()
-        
         logger.info("Selenium scraping completed successfully")
         return html_content
         
     except Exception as e:
         logger.error(f"Error using Selenium: {e}")
-        if 'driver' in locals():
-            try:
-                driver.quit()
-            except:
-                pass
         return None
 
 def scrape_page_with_multiple_methods(url, max_retries=1):
@@ -869,6 +854,9 @@ def main():
         
     except Exception as e:
         logger.error(f"Error in main execution: {e}")
+    
+    finally:
+        close_browser_pool()
 
 
 if __name__ == "__main__":
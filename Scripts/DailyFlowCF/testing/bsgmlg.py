@@ -1,23 +1,20 @@
 import csv
-import time
 import os
+import sys
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import urllib3
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from browserpool import BrowserPool
+
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Configuration
 OUTPUT_DIR = "output"
 SEASON = "2025"  # The season you want to scrape data for
-SLEEP_TIME = 2  # Time to wait between requests to avoid rate limiting
+BROWSERS = 2  # Headless browsers scraping in parallel; also caps the request rate
 CHROME_DRIVER_PATH = "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"  # Path to your ChromeDriver
 WAIT_TIMEOUT = 10  # Maximum seconds to wait for elements to load
 
@@ -109,23 +106,153 @@ def build_baseball_savant_url(first_name, last_name, bs_id, season):
     player_slug = f"{first_name.lower()}-{last_name.lower()}-{bs_id}"
     return f"https://baseballsavant.mlb.com/savant-player/{player_slug}?stats=gamelogs-r-pitching-statcast&season={season}"
 
-def initialize_webdriver():
-    """Initialize and return a Chrome WebDriver instance."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--ignore-certificate-errors")  # Ignore SSL errors
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    service = Service(CHROME_DRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+def scrape_player(tab, entry):
+    """
+    Scrape one player's metrics row on a pooled browser tab
+
+    Args:
+        tab (browserpool.Tab): Tab to load the player page in
+        entry (tuple): (bbrefId, player info) from PLAYER_MAPPING
+
+    Returns:
+        dict: CSV row, or None if the table could not be read
+    """
+    bbref_id, player = entry
+    first_name = player['firstName']
+    last_name = player['lastName']
+    bs_id = player['bsId']
+    url = build_baseball_savant_url(first_name, last_name, bs_id, SEASON)
+
+    print(f"Scraping {url}")
+
+    try:
+        # Load the page and wait for JavaScript to populate at least one
+        # row of the metrics table
+        try:
+            tab.get(url, ready="#gamelogs_metrics tbody tr", timeout=WAIT_TIMEOUT)
+            print("Table has loaded!")
+        except Exception as wait_error:
+            print(f"Error waiting for table to load: {wait_error}")
+            print("Attempting to continue anyway...")
+
+        # Get the HTML after JavaScript has rendered the content
+        soup = BeautifulSoup(tab.source(), 'html.parser')
+
+        # Find the metrics table div
+        metrics_div = soup.find('div', id='gamelogs_metrics')
+
+        if metrics_div:
+            print("Found metrics div in the HTML")
+
+            # Find the table within the div
+            table = metrics_div.find('table')
+
+            if table:
+                print("Found the table element")
+
+                # Find all rows in the table
+                all_rows = table.find_all('tr')
+                print(f"Found {len(all_rows)} rows in the table")
+
+                if len(all_rows) >= 3:  # We need the header rows and at least one data row
+                    # The component row has the column headers
+                    header_row = table.find('tr', class_='tr-component-row')
+
+                    if not header_row:
+                        print("Could not find header row with class 'tr-component-row', using second row instead")
+                        header_row = all_rows[1]  # Use the second row as header if class not found
+
+                    # Extract headers from th elements
+                    headers = []
+                    for th in header_row.find_all('th'):
+                        header_text = th.get_text(strip=True)
+                        if header_text:
+                            headers.append(header_text)
+
+                    print(f"Extracted {len(headers)} headers:")
+                    for i, header in enumerate(headers):
+                        print(f"  {i}: {header}")
+
+                    # Find the data row (first row in tbody)
+                    data_row = table.find('tbody').find('tr')
+
+                    if data_row:
+                        # Extract data from td elements
+                        data = []
+                        for td in data_row.find_all('td'):
+                            # Try to find span inside td
+                            span = td.find('span')
+                            if span:
+                                value = span.get_text(strip=True)
+                            else:
+                                value = td.get_text(strip=True)
+                            data.append(value)
+
+                        print(f"Extracted {len(data)} data values:")
+                        for i, value in enumerate(data):
+                            print(f"  {i}: {value}")
+
+                        # Map data to a dictionary using column positions
+                        column_positions = {
+                            "PA": 0,
+                            "AB": 1,  # Use the first AB column
+                            "H": 3,
+                            "1B": 4,
+                            "2B": 5,
+                            "3B": 6,
+                            "HR": 7,
+                            "SO": 8,
+                            "BB": 9,
+                            "BA": 10,
+                            "xBA": 11,
+                            "HR%": 12,
+                            "K%": 13,
+                            "BB%": 14,
+                            "Brls": 15,
+                            "HardHit%": 16,
+                            "EV (MPH)": 17,  # Average EV
+                            "LA (°)": 18,
+                            "Dist (ft)": 19  # Average Distance
+                        }
+
+                        # Prepare the row for CSV
+                        row = {
+                            "BBRefID": bbref_id,
+                            "BSID": bs_id,
+                            "Name": f"{first_name} {last_name}",
+                            "Team": player['team']
+                        }
+
+                        # Extract values using the position mapping
+                        for field, pos in column_positions.items():
+                            if pos < len(data):
+                                row[field] = data[pos]
+
+                        print(f"Successfully scraped data for {first_name} {last_name}\n")
+                        return row
+                    else:
+                        print("Could not find data row in the table\n")
+                else:
+                    print("Not enough rows found in the table\n")
+            else:
+                print("Could not find table element inside the metrics div\n")
+                # Print the raw HTML for debugging
+                print("Raw HTML of metrics div:")
+                print(metrics_div.prettify()[:500])
+        else:
+            print("Could not find metrics div in the HTML\n")
+
+    except Exception as e:
+        print(f"Error scraping data for {first_name} {last_name}: {e}\n")
+        import traceback
+        traceback.print_exc()
+
+    return None
 
 def scrape_baseball_savant_stats():
     """
-    Scrape the statistics table from Baseball Savant using Selenium
+    Scrape the statistics table from Baseball Savant, BROWSERS players at
+    a time on a pool of headless browsers
     """
     # Create output directory if it doesn't exist
     if not os.path.exists(OUTPUT_DIR):
@@ -143,176 +270,19 @@ def scrape_baseball_savant_stats():
         "EV (MPH)", "LA (°)", "Dist (ft)"
     ]
     
+    # Browsers start once and every player page reuses them
+    with BrowserPool(size=BROWSERS, driver_path=CHROME_DRIVER_PATH) as pool:
+        rows = pool.map(scrape_player, list(PLAYER_MAPPING.items()))
+
     with open(output_file, 'w', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
-        
-        # Initialize the WebDriver
-        driver = initialize_webdriver()
-        
-        try:
-            # Process each player in our mapping
-            for bbref_id, player in PLAYER_MAPPING.items():
-                # Build URL
-                first_name = player['firstName']
-                last_name = player['lastName']
-                bs_id = player['bsId']
-                url = build_baseball_savant_url(first_name, last_name, bs_id, SEASON)
-                
-                print(f"Scraping {url}")
-                
-                try:
-                    # Load the page with Selenium
-                    driver.get(url)
-                    
-                    # Wait for the metrics table to load
-                    # This is crucial - we need to wait for JavaScript to populate the div
-                    print("Waiting for the metrics table to load...")
-                    
-                    try:
-                        # First wait for the main div to be present
-                        WebDriverWait(driver, WAIT_TIMEOUT).until(
-                            EC.presence_of_element_located((By.ID, "gamelogs_metrics"))
-                        )
-                        
-                        # Additional wait for the content to load within the div
-                        # Wait for table inside the div to be present
-                        WebDriverWait(driver, WAIT_TIMEOUT).until(
-                            lambda d: len(d.find_element(By.ID, "gamelogs_metrics").find_elements(By.TAG_NAME, "table")) > 0
-                        )
-                        
-                        # Final wait to ensure the tbody contains at least one row
-                        WebDriverWait(driver, WAIT_TIMEOUT).until(
-                            lambda d: len(d.find_elements(By.CSS_SELECTOR, "#gamelogs_metrics tbody tr")) > 0
-                        )
-                        
-                        print("Table has loaded!")
-                    except Exception as wait_error:
-                        print(f"Error waiting for table to load: {wait_error}")
-                        print("Attempting to continue anyway...")
-                    
-                    # Get the HTML after JavaScript has rendered the content
-                    page_source = driver.page_source
-                    soup = BeautifulSoup(page_source, 'html.parser')
-                    
-                    # Find the metrics table div
-                    metrics_div = soup.find('div', id='gamelogs_metrics')
-                    
-                    if metrics_div:
-                        print("Found metrics div in the HTML")
-                        
-                        # Find the table within the div
-                        table = metrics_div.find('table')
-                        
-                        if table:
-                            print("Found the table element")
-                            
-                            # Find all rows in the table
-                            all_rows = table.find_all('tr')
-                            print(f"Found {len(all_rows)} rows in the table")
-                            
-                            if len(all_rows) >= 3:  # We need the header rows and at least one data row
-                                # The component row has the column headers
-                                header_row = table.find('tr', class_='tr-component-row')
-                                
-                                if not header_row:
-                                    print("Could not find header row with class 'tr-component-row', using second row instead")
-                                    header_row = all_rows[1]  # Use the second row as header if class not found
-                                
-                                # Extract headers from th elements
-                                headers = []
-                                for th in header_row.find_all('th'):
-                                    header_text = th.get_text(strip=True)
-                                    if header_text:
-                                        headers.append(header_text)
-                                        
-                                print(f"Extracted {len(headers)} headers:")
-                                for i, header in enumerate(headers):
-                                    print(f"  {i}: {header}")
-                                
-                                # Find the data row (first row in tbody)
-                                data_row = table.find('tbody').find('tr')
-                                
-                                if data_row:
-                                    # Extract data from td elements
-                                    data = []
-                                    for td in data_row.find_all('td'):
-                                        # Try to find span inside td
-                                        span = td.find('span')
-                                        if span:
-                                            value = span.get_text(strip=True)
-                                        else:
-                                            value = td.get_text(strip=True)
-                                        data.append(value)
-                                        
-                                    print(f"Extracted {len(data)} data values:")
-                                    for i, value in enumerate(data):
-                                        print(f"  {i}: {value}")
-                                    
-                                    # Map data to a dictionary using column positions
-                                    column_positions = {
-                                        "PA": 0,
-                                        "AB": 1,  # Use the first AB column
-                                        "H": 3,
-                                        "1B": 4,
-                                        "2B": 5,
-                                        "3B": 6,
-                                        "HR": 7,
-                                        "SO": 8,
-                                        "BB": 9,
-                                        "BA": 10,
-                                        "xBA": 11,
-                                        "HR%": 12,
-                                        "K%": 13,
-                                        "BB%": 14,
-                                        "Brls": 15,
-                                        "HardHit%": 16,
-                                        "EV (MPH)": 17,  # Average EV
-                                        "LA (°)": 18,
-                                        "Dist (ft)": 19  # Average Distance
-                                    }
-                                    
-                                    # Prepare the row for CSV
-                                    row = {
-                                        "BBRefID": bbref_id,
-                                        "BSID": bs_id,
-                                        "Name": f"{first_name} {last_name}",
-                                        "Team": player['team']
-                                    }
-                                    
-                                    # Extract values using the position mapping
-                                    for field, pos in column_positions.items():
-                                        if pos < len(data):
-                                            row[field] = data[pos]
-                                    
-                                    # Write to CSV
-                                    writer.writerow(row)
-                                    print(f"Successfully scraped data for {first_name} {last_name}\n")
-                                else:
-                                    print("Could not find data row in the table\n")
-                            else:
-                                print("Not enough rows found in the table\n")
-                        else:
-                            print("Could not find table element inside the metrics div\n")
-                            # Print the raw HTML for debugging
-                            print("Raw HTML of metrics div:")
-                            print(metrics_div.prettify()[:500])
-                    else:
-                        print("Could not find metrics div in the HTML\n")
-                        
-                except Exception as e:
-                    print(f"Error scraping data for {first_name} {last_name}: {e}\n")
-                    import traceback
-                    traceback.print_exc()
-                
-                # Wait before next request
-                time.sleep(SLEEP_TIME)
-            
-            print(f"Data has been saved to {output_file}")
-            
-        finally:
-            # Always close the WebDriver
-            driver.quit()
+        # Rows come back in PLAYER_MAPPING order
+        for row in rows:
+            if isinstance(row, dict):
+                writer.writerow(row)
+
+    print(f"Data has been saved to {output_file}")
 
 if __name__ == "__main__":
     scrape_baseball_savant_stats()
\ No newline at end of file
@@ -1,11 +1,12 @@
-import pandas as pd
-import numpy as np
-import statsmodels.api as sm
 import os
 import glob
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+# pandas, numpy, statsmodels, matplotlib and seaborn are imported inside the
+# functions that use them, so importing this module (modeltrainer does, for
+# prepare_data) and finding no CSV don't wait on them
+
+REGRESSION_FEATURES = ["EV (MPH)", "LA (°)", "Barrel%", "HardHit%", "xBA", "HR%", "K%"]
 
 def load_latest_data(directory="output"):
     """
@@ -31,6 +32,8 @@ def load_latest_data(directory="output"):
     latest_file = csv_files[0]
     print(f"Loading data from {latest_file}")
     
+    import pandas as pd
+
     # Load the CSV file
     df = pd.read_csv(latest_file)
     return df
@@ -77,7 +80,7 @@ def run_regression(df):
         statsmodels.regression.linear_model.RegressionResultsWrapper: Regression results
     """
     # Define features and target
-    features = ["EV (MPH)", "LA (°)", "Barrel%", "HardHit%", "xBA", "HR%", "K%"]
+    features = list(REGRESSION_FEATURES)
     
     # Check if all features exist in the dataframe
     missing_features = [feature for feature in features if feature not in df.columns]
@@ -89,6 +92,8 @@ def run_regression(df):
         print("Error: No valid features available for regression")
         return None
     
+    import statsmodels.api as sm
+
     X = df[features]
     X = sm.add_constant(X)  # Add intercept term
     y = df["actual_xwOBA"]
@@ -109,6 +114,12 @@ def generate_visualizations(df, model, X, y, features):
         y: Target variable
         features: List of feature names
     """
+    import numpy as np
+    import matplotlib
+    matplotlib.use("Agg")  # Files only; no display backend to start
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Create output directory for visualizations
     viz_dir = "output/visualizations"
     os.makedirs(viz_dir, exist_ok=True)
@@ -258,8 +269,6 @@ def main():
     
     # Generate visualizations
     try:
-        import matplotlib
-        import seaborn
         print("\nGenerating visualizations...")
         generate_visualizations(df, model, X, y, features)
     except ImportError:
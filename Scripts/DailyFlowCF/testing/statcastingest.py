@@ -0,0 +1,514 @@
+import os
+import json
+import argparse
+from datetime import datetime, timedelta
+import requests
+import urllib3
+import numpy as np
+import pandas as pd
+
+from updatebsgmlog import SEASON, API_BASE_URL, OUTPUT_DIR, get_existing_records, create_last14_record
+
+# Disable SSL warnings
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Configuration
+SEARCH_CSV_URL = "https://baseballsavant.mlb.com/statcast_search/csv"
+STATCAST_DIR = os.path.join(OUTPUT_DIR, "statcast")
+SEASON_START = "03-15"  # First date searched each season (mm-dd); empty days cost one small request
+DAYS_PER_REQUEST = 2  # A full slate is ~4,500 pitches, well under the export's row cap
+SAVANT_ROW_LIMIT = 25000  # A search export stops here; a download this long was cut off
+CHUNK_ROWS = 50000  # Pitches parsed at a time
+LAST_DAYS = 14  # Window for the 'last14' split
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Pitch-level columns the aggregation needs, out of the ~90 in the export
+PITCH_COLUMNS = [
+    "pitcher", "player_name", "game_date", "game_pk", "home_team", "away_team", "inning_topbot",
+    "events", "bb_type", "launch_speed", "launch_angle", "launch_speed_angle",
+    "estimated_ba_using_speedangle", "hit_distance_sc",
+]
+PITCH_DTYPES = {
+    "pitcher": "int64", "game_pk": "int64", "launch_speed": "float64", "launch_angle": "float64",
+    "launch_speed_angle": "float64", "estimated_ba_using_speedangle": "float64", "hit_distance_sc": "float64",
+}
+
+WALK_EVENTS = ["walk", "intent_walk"]
+STRIKEOUT_EVENTS = ["strikeout", "strikeout_double_play"]
+HIT_EVENTS = ["single", "double", "triple", "home_run"]
+NON_AB_EVENTS = WALK_EVENTS + ["hit_by_pitch", "sac_fly", "sac_bunt", "sac_fly_double_play",
+                               "sac_bunt_double_play", "catcher_interf", "truncated_pa"]
+
+GAME_KEY = ["pitcher", "game_date", "game_pk"]
+# Per-game totals; every window is a sum of these
+COUNTS = ["pa", "ab", "h", "doubles", "triples", "hr", "so", "bb", "bbe", "barrels", "hard_hit",
+          "ev_sum", "ev_n", "la_sum", "la_n", "xba_sum", "dist_sum", "dist_n"]
+
+# Fields each split takes from the Statcast metrics (see extract_advanced_metrics)
+SEASON_FIELDS = ["pa", "bip", "k_perc", "hR_perc", "ev", "la", "barrel_perc", "hardHit_perc", "ba", "xBA"]
+LAST14_FIELDS = SEASON_FIELDS + ["slg", "xaWoba"]
+
+
+def download_search_csv(start_date, end_date, session=None):
+    """
+    Download every regular season pitch thrown between two dates
+    (inclusive) from the Statcast search CSV export
+
+    Args:
+        start_date (str): First date, YYYY-MM-DD
+        end_date (str): Last date, YYYY-MM-DD
+        session (requests.Session): Session to reuse between downloads
+
+    Returns:
+        str: Path of the downloaded CSV
+    """
+    params = {
+        "all": "true",
+        "type": "details",
+        "player_type": "pitcher",
+        "hfGT": "R|",
+        "hfSea": f"{start_date[:4]}|",
+        "game_date_gt": start_date,
+        "game_date_lt": end_date,
+    }
+    raw_dir = os.path.join(STATCAST_DIR, "raw")
+    os.makedirs(raw_dir, exist_ok=True)
+    csv_path = os.path.join(raw_dir, f"pitches_{start_date}_{end_date}.csv")
+
+    print(f"Downloading pitches {start_date} to {end_date}")
+
+    # Stream the CSV to a file
+    with (session or requests).get(SEARCH_CSV_URL, params=params, headers=HEADERS, verify=False, stream=True) as r:
+        r.raise_for_status()
+        with open(csv_path, 'wb') as f:
+            for chunk in r.iter_content(chunk_size=65536):
+                f.write(chunk)
+
+    return csv_path
+
+
+def aggregate_pitches(pitches):
+    """
+    Reduce pitch rows to one row of counting totals per pitcher per game
+
+    Args:
+        pitches (pandas.DataFrame): Pitch-level rows with PITCH_COLUMNS
+
+    Returns:
+        pandas.DataFrame: GAME_KEY, player_name, team and COUNTS columns
+    """
+    events = pitches["events"].fillna("")
+    pa = events != ""
+    # Batted ball events: the pitch that ended the PA was put in play
+    bbe = pa & pitches["bb_type"].notna()
+    ev = pitches["launch_speed"].where(bbe)
+    la = pitches["launch_angle"].where(bbe)
+    dist = pitches["hit_distance_sc"].where(bbe)
+
+    totals = pd.DataFrame({
+        "pitcher": pitches["pitcher"],
+        "game_date": pitches["game_date"],
+        "game_pk": pitches["game_pk"],
+        "player_name": pitches["player_name"],
+        # The pitcher's team fields while the home team bats in the top
+        "team": np.where(pitches["inning_topbot"] == "Top", pitches["home_team"], pitches["away_team"]),
+        "pa": pa,
+        "ab": pa & ~events.isin(NON_AB_EVENTS),
+        "h": events.isin(HIT_EVENTS),
+        "doubles": events == "double",
+        "triples": events == "triple",
+        "hr": events == "home_run",
+        "so": events.isin(STRIKEOUT_EVENTS),
+        "bb": events.isin(WALK_EVENTS),
+        "bbe": bbe,
+        "barrels": bbe & (pitches["launch_speed_angle"] == 6),
+        "hard_hit": ev >= 95,
+        "ev_sum": ev.fillna(0.0),
+        "ev_n": ev.notna(),
+        "la_sum": la.fillna(0.0),
+        "la_n": la.notna(),
+        # Strikeouts and other non-batted-ball outs count as 0 toward xBA
+        "xba_sum": pitches["estimated_ba_using_speedangle"].where(bbe).fillna(0.0),
+        "dist_sum": dist.fillna(0.0),
+        "dist_n": dist.notna(),
+    })
+    return combine_games([totals])
+
+
+def empty_games():
+    return pd.DataFrame(columns=GAME_KEY + ["player_name", "team"] + COUNTS)
+
+
+def combine_games(frames):
+    """
+    Merge per-game totals that may cover the same game (a game split across
+    chunks or downloads) by summing their counts
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return empty_games()
+    games = pd.concat(frames, ignore_index=True)
+    aggregations = {column: "sum" for column in COUNTS}
+    aggregations.update(player_name="first", team="first")
+    games = games.groupby(GAME_KEY, as_index=False, sort=False).agg(aggregations)
+    integer_counts = [column for column in COUNTS if not column.endswith("_sum")]
+    games[integer_counts] = games[integer_counts].astype("int64")
+    return games
+
+
+def read_pitch_csv(csv_path, chunk_rows=CHUNK_ROWS):
+    """
+    Parse a downloaded pitch CSV CHUNK_ROWS pitches at a time, keeping only
+    per-game totals in memory
+
+    Returns:
+        tuple: (per-game totals, number of pitch rows read)
+    """
+    frames = []
+    rows = 0
+    reader = pd.read_csv(csv_path, usecols=PITCH_COLUMNS, dtype=PITCH_DTYPES, chunksize=chunk_rows)
+    for chunk in reader:
+        rows += len(chunk)
+        if len(chunk):
+            frames.append(aggregate_pitches(chunk))
+    return combine_games(frames), rows
+
+
+def download_games(start, end, session=None):
+    """
+    Per-game totals for every pitch between two dates (inclusive). A
+    download that reaches SAVANT_ROW_LIMIT was truncated, so its range is
+    split in half and each half fetched again
+
+    Args:
+        start (datetime): First date
+        end (datetime): Last date
+        session (requests.Session): Session to reuse between downloads
+
+    Returns:
+        list: Per-game total frames, one per download kept
+    """
+    csv_path = download_search_csv(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), session)
+    batch, rows = read_pitch_csv(csv_path)
+    os.remove(csv_path)
+
+    if rows >= SAVANT_ROW_LIMIT:
+        if start < end:
+            middle = start + (end - start) // 2
+            print(f"  {rows} pitches hit the export limit, splitting the range")
+            return download_games(start, middle, session) + download_games(middle + timedelta(days=1), end, session)
+        print(f"  Warning: {rows} pitches on {start:%Y-%m-%d} hit the export limit, the day is incomplete")
+
+    print(f"  {len(batch)} pitcher games")
+    return [batch]
+
+
+def load_game_metrics(season=SEASON, end_date=None, refresh=False, session=None):
+    """
+    Per-game pitcher totals for a season, kept in
+    output/statcast/pitcher_games_{season}.parquet. Only dates from the
+    last stored game date on are downloaded again (that day may have been
+    partial), unless refresh is set.
+
+    Args:
+        season (str): Season year
+        end_date (str): Last date to include, YYYY-MM-DD (default today)
+        refresh (bool): Download the whole season again
+        session (requests.Session): Session to reuse between downloads
+
+    Returns:
+        pandas.DataFrame: One row per pitcher per game
+    """
+    os.makedirs(STATCAST_DIR, exist_ok=True)
+    store_path = os.path.join(STATCAST_DIR, f"pitcher_games_{season}.parquet")
+    end_date = end_date or min(datetime.now().strftime("%Y-%m-%d"), f"{season}-12-31")
+
+    stored = None
+    start = datetime.strptime(f"{season}-{SEASON_START}", "%Y-%m-%d")
+    if os.path.exists(store_path) and not refresh:
+        stored = pd.read_parquet(store_path)
+        if len(stored):
+            last_date = stored["game_date"].max()
+            start = datetime.strptime(last_date, "%Y-%m-%d")
+            stored = stored[stored["game_date"] < last_date]
+
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    frames = [stored] if stored is not None else []
+    session = session or requests.Session()
+    while start <= end:
+        batch_end = min(start + timedelta(days=DAYS_PER_REQUEST - 1), end)
+        frames.extend(download_games(start, batch_end, session))
+        start = batch_end + timedelta(days=1)
+
+    games = combine_games(frames).sort_values(["game_date", "game_pk", "pitcher"], ignore_index=True)
+    games.to_parquet(store_path, index=False, compression="zstd")
+    print(f"Stored {len(games)} pitcher games through {end_date} in {store_path}")
+    return games
+
+
+def estimate_xwoba(ev, la, barrel_perc, hardhit_perc, xba, hr_perc, k_perc):
+    """
+    xwOBA estimate used for the 'last14' split:
+    0.4049 - 0.0044*EV - 0.0016*LA + 0.0018*Barrel% - 0.0002*HardHit% + 0.9572*xBA + 1.0630*HR% + 0.2227*K%
+    with Barrel% and HardHit% on a 0-100 scale. Works on numbers or arrays.
+    """
+    return (0.4049 - 0.0044 * ev - 0.0016 * la + 0.0018 * barrel_perc * 100 - 0.0002 * hardhit_perc * 100
+            + 0.9572 * xba + 1.0630 * hr_perc + 0.2227 * k_perc)
+
+
+def window_metrics(games, start_date=None, end_date=None):
+    """
+    Sum per-game totals over a date window and derive the rate stats the
+    StatcastPitcherData records hold
+
+    Args:
+        games (pandas.DataFrame): Output of load_game_metrics
+        start_date (str): First date included, YYYY-MM-DD (default: season start)
+        end_date (str): Last date included, YYYY-MM-DD (default: latest game)
+
+    Returns:
+        pandas.DataFrame: One row per pitcher indexed by bsID (str)
+    """
+    selected = games
+    if start_date is not None:
+        selected = selected[selected["game_date"] >= start_date]
+    if end_date is not None:
+        selected = selected[selected["game_date"] <= end_date]
+
+    aggregations = {column: "sum" for column in COUNTS}
+    aggregations.update(player_name="last", team="last")
+    totals = selected.groupby("pitcher").agg(aggregations)
+    totals.index = totals.index.astype(str).rename("bsID")
+
+    def ratio(numerator, denominator):
+        numerator = totals[numerator].to_numpy(dtype=float)
+        denominator = totals[denominator].to_numpy(dtype=float)
+        return np.divide(numerator, denominator, out=np.full(len(totals), np.nan), where=denominator > 0)
+
+    singles = totals["h"] - totals["doubles"] - totals["triples"] - totals["hr"]
+    totals["tb"] = singles + 2 * totals["doubles"] + 3 * totals["triples"] + 4 * totals["hr"]
+    totals["bip"] = totals["pa"] - totals["bb"] - totals["so"]
+    totals["k_perc"] = ratio("so", "pa")
+    totals["bb_perc"] = ratio("bb", "pa")
+    totals["hR_perc"] = ratio("hr", "pa")
+    totals["ev"] = ratio("ev_sum", "ev_n")
+    totals["la"] = ratio("la_sum", "la_n")
+    totals["dist"] = ratio("dist_sum", "dist_n")
+    # Barrels per PA, as the game log page scraper computed it
+    totals["barrel_perc"] = ratio("barrels", "pa")
+    totals["hardHit_perc"] = ratio("hard_hit", "ev_n")
+    totals["ba"] = ratio("h", "ab")
+    totals["xBA"] = ratio("xba_sum", "ab")
+    totals["slg"] = ratio("tb", "ab")
+    totals["xaWoba"] = estimate_xwoba(totals["ev"], totals["la"], totals["barrel_perc"], totals["hardHit_perc"],
+                                      totals["xBA"], totals["hR_perc"], totals["k_perc"])
+
+    totals = totals.round({"k_perc": 4, "bb_perc": 4, "hR_perc": 4, "barrel_perc": 4, "hardHit_perc": 4,
+                           "ev": 1, "la": 1, "dist": 0, "ba": 3, "xBA": 3, "slg": 4, "xaWoba": 4})
+    return totals
+
+
+def metrics_for(totals, bs_id, fields):
+    """
+    Metric payload for one pitcher (None where a rate has no denominator),
+    or None if the pitcher has no games in the window
+    """
+    if bs_id not in totals.index:
+        return None
+    row = totals.loc[bs_id]
+    metrics = {}
+    for field in fields:
+        value = row[field]
+        if pd.isna(value):
+            metrics[field] = None
+        elif field in ("pa", "bip"):
+            metrics[field] = int(value)
+        else:
+            metrics[field] = float(value)
+    return metrics
+
+
+def changed_fields(record, metrics):
+    """
+    Names of the metrics whose value differs from the stored record
+    """
+    changed = []
+    for field, value in metrics.items():
+        stored = record.get(field)
+        if stored is None or value is None:
+            if stored is not value:
+                changed.append(field)
+        elif abs(float(stored) - float(value)) > 1e-6:
+            changed.append(field)
+    return changed
+
+
+def diff_records(records, season_totals, last14_totals):
+    """
+    Compare stored records with the ingested metrics
+
+    Args:
+        records (list): StatcastPitcherData records from get_existing_records
+        season_totals (pandas.DataFrame): window_metrics for the season
+        last14_totals (pandas.DataFrame): window_metrics for the last 14 days
+
+    Returns:
+        tuple: (updates, creates), updates being records to PUT with new
+        metrics and creates new 'last14' records to POST
+    """
+    by_key = {(str(r["bsID"]), r["split"].lower()): r for r in records}
+    updates = []
+    creates = []
+
+    for (bs_id, split), record in by_key.items():
+        if split != "season":
+            continue
+
+        metrics = metrics_for(season_totals, bs_id, SEASON_FIELDS)
+        if metrics and changed_fields(record, metrics):
+            updates.append({**record, **metrics})
+
+        last14_metrics = metrics_for(last14_totals, bs_id, LAST14_FIELDS)
+        if not last14_metrics:
+            continue
+        last14_record = by_key.get((bs_id, "last14"))
+        if last14_record is None:
+            creates.append(create_last14_record(record, last14_metrics))
+        elif changed_fields(last14_record, last14_metrics):
+            updates.append({**last14_record, **last14_metrics})
+
+    return updates, creates
+
+
+def send_changes(updates, creates, session=None):
+    """
+    PUT changed records and POST new 'last14' records
+
+    Returns:
+        tuple: (updated, created) success counts
+    """
+    session = session or requests.Session()
+    headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    updated = created = 0
+
+    for record in updates:
+        url = f"{API_BASE_URL}/StatcastPitcherData/{record['bsID']}/{record['split']}/{record['year']}"
+        try:
+            response = session.put(url, json=record, verify=False, headers=headers)
+            if response.status_code != 204:  # 204 No Content is success for PUT
+                print(f"Error updating {record['firstName']} {record['lastName']} ({record['split']}): "
+                      f"Status code {response.status_code}")
+                print(f"Response: {response.text}")
+            else:
+                updated += 1
+        except Exception as e:
+            print(f"Error updating {record['firstName']} {record['lastName']}: {e}")
+
+    for record in creates:
+        try:
+            response = session.post(f"{API_BASE_URL}/StatcastPitcherData", json=record, verify=False, headers=headers)
+            if response.status_code not in [200, 201]:
+                print(f"Error creating 'last14' record for {record['firstName']} {record['lastName']}: "
+                      f"Status code {response.status_code}")
+                print(f"Response: {response.text}")
+            else:
+                created += 1
+        except Exception as e:
+            print(f"Error creating 'last14' record for {record['firstName']} {record['lastName']}: {e}")
+
+    return updated, created
+
+
+def write_savant_stats_csv(season_totals, records):
+    """
+    Write the season totals in the baseball_savant_stats_*.csv layout that
+    bsgmlg.py produced and findweights.py reads
+
+    Returns:
+        str: Path of the CSV
+    """
+    bbref_ids = {str(r["bsID"]): r.get("bbrefId") for r in records}
+
+    def percent(column):
+        return season_totals[column].map(lambda v: "" if pd.isna(v) else f"{v * 100:.1f}%")
+
+    names = season_totals["player_name"].str.split(", ", n=1)
+    stats = pd.DataFrame({
+        "BBRefID": [bbref_ids.get(bs_id) for bs_id in season_totals.index],
+        "BSID": season_totals.index,
+        "Name": names.str[1].fillna("") + " " + names.str[0].fillna(""),
+        "Team": season_totals["team"],
+        "PA": season_totals["pa"],
+        "AB": season_totals["ab"],
+        "H": season_totals["h"],
+        "1B": season_totals["h"] - season_totals["doubles"] - season_totals["triples"] - season_totals["hr"],
+        "2B": season_totals["doubles"],
+        "3B": season_totals["triples"],
+        "HR": season_totals["hr"],
+        "SO": season_totals["so"],
+        "BB": season_totals["bb"],
+        "BA": season_totals["ba"],
+        "xBA": season_totals["xBA"],
+        "HR%": percent("hR_perc"),
+        "K%": percent("k_perc"),
+        "BB%": percent("bb_perc"),
+        "Brls": season_totals["barrels"],
+        "HardHit%": percent("hardHit_perc"),
+        "EV (MPH)": season_totals["ev"],
+        "LA (°)": season_totals["la"],
+        "Dist (ft)": season_totals["dist"],
+    })
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = os.path.join(OUTPUT_DIR, f"baseball_savant_stats_{timestamp}.csv")
+    stats.to_csv(output_file, index=False)
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Update StatcastPitcherData from the Statcast bulk CSV export, sending only changed records")
+    parser.add_argument("--end-date", help="Last game date to include, YYYY-MM-DD (default today)")
+    parser.add_argument("--refresh", action="store_true", help="Download the whole season again")
+    parser.add_argument("--dry-run", action="store_true", help="Write the changes to output/ without sending them")
+    parser.add_argument("--csv", action="store_true", help="Also write the season totals as a baseball_savant_stats CSV")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    games = load_game_metrics(SEASON, args.end_date, args.refresh, session)
+    if games.empty:
+        print("No Statcast games found")
+        return
+
+    end_date = args.end_date or games["game_date"].max()
+    last14_start = (datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=LAST_DAYS)).strftime("%Y-%m-%d")
+    season_totals = window_metrics(games, end_date=end_date)
+    last14_totals = window_metrics(games, start_date=last14_start, end_date=end_date)
+    print(f"Season metrics for {len(season_totals)} pitchers, last {LAST_DAYS} days for {len(last14_totals)}")
+
+    records = get_existing_records()
+    if args.csv:
+        print(f"Season stats written to {write_savant_stats_csv(season_totals, records)}")
+    if not records:
+        print("No records found to update")
+        return
+
+    updates, creates = diff_records(records, season_totals, last14_totals)
+    print(f"{len(updates)} of {len(records)} records changed, {len(creates)} new 'last14' records")
+
+    if args.dry_run:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        changes_path = os.path.join(STATCAST_DIR, f"changes_{timestamp}.json")
+        with open(changes_path, 'w') as f:
+            json.dump({"updates": updates, "creates": creates}, f, indent=2)
+        print(f"Changes saved to {changes_path}")
+        return
+
+    updated, created = send_changes(updates, creates, session)
+    print(f"Successfully updated {updated} of {len(updates)} records and created {created} of {len(creates)}")
+
+
+if __name__ == "__main__":
+    main()
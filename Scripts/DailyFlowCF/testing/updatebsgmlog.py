@@ -2,17 +2,13 @@ import requests
 import os
 import json
 from datetime import datetime, timedelta
-import time
+import sys
 import urllib3
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from browserpool import BrowserPool
+
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -21,7 +17,8 @@ OUTPUT_DIR = "output"
 SEASON = "2025"  # The season you want to scrape data for
 CHROME_DRIVER_PATH = "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"  # Path to your ChromeDriver
 WAIT_TIMEOUT = 15  # Maximum seconds to wait for elements to load
-SLEEP_TIME = 2  # Time to wait between requests to avoid rate limiting
+BROWSERS = 2  # Headless browsers updating pitchers in parallel; also caps the request rate
+METRICS_ROWS = "#gamelogs_metrics tbody tr"  # Present once the metrics table has data
 API_BASE_URL = "https://localhost:44346/api"
 
 def get_existing_records():
@@ -45,21 +42,6 @@ def get_existing_records():
         print(f"Error fetching existing records: {e}")
         return []
 
-def initialize_webdriver():
-    """Initialize and return a Chrome WebDriver instance."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--ignore-certificate-errors")  # Ignore SSL errors
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")  # Set window size
-    
-    service = Service(CHROME_DRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
-
 def build_baseball_savant_url(first_name, last_name, bs_id, season):
     """Build URL for Baseball Savant player page"""
     player_slug = f"{first_name.lower()}-{last_name.lower()}-{bs_id}"
@@ -386,12 +368,13 @@ def extract_advanced_metrics(soup, include_raw_data=False, is_season_split=False
     else:
         return metrics
 
-def update_pitcher_metrics(record):
+def update_pitcher_metrics(record, tab):
     """
     Update advanced metrics for a pitcher
     
     Args:
         record (dict): Pitcher record
+        tab (browserpool.Tab): Browser tab to load the player page in
         
     Returns:
         bool: True if successful, False otherwise
@@ -411,20 +394,17 @@ def update_pitcher_metrics(record):
     # Build the URL
     url = build_baseball_savant_url(first_name, last_name, bs_id, year)
     
-    # Initialize WebDriver and set it to quit when done
-    driver = initialize_webdriver()
-    
     try:
-        # Load the initial page and wait for it to be ready
-        driver.get(url)
-        
-        # Wait for the page to load properly
-        time.sleep(5)
+        # Load the initial page and wait for the metrics table to fill
+        try:
+            tab.get(url, ready=METRICS_ROWS, timeout=WAIT_TIMEOUT)
+        except Exception as e:
+            print(f"Error waiting for page elements: {e}")
         
         # Get metrics for the whole season
         print("Getting metrics for full season...")
         # Parse the page
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = BeautifulSoup(tab.source(), 'html.parser')
         metrics, raw_data = extract_advanced_metrics(soup, True, is_season_split)
         
         if not metrics:
@@ -477,7 +457,7 @@ def update_pitcher_metrics(record):
         end_date = today.strftime("%Y-%m-%d")            # YYYY-MM-DD format
         
         # Get metrics for the date range
-        date_range_soup = get_metrics_with_date_range(driver, url, start_date, end_date)
+        date_range_soup = get_metrics_with_date_range(tab, url, start_date, end_date)
         # For last14 split, we always want to calculate SLG and xaWoba
         last14_metrics, last14_raw_data = extract_advanced_metrics(date_range_soup, True, False)
         
@@ -550,17 +530,13 @@ def update_pitcher_metrics(record):
         import traceback
         traceback.print_exc()
         return False
-        
-    finally:
-        # Always close the WebDriver
-        driver.quit()
 
-def get_metrics_with_date_range(driver, url, start_date=None, end_date=None):
+def get_metrics_with_date_range(tab, url, start_date=None, end_date=None):
     """
     Get metrics by setting a custom date range
     
     Args:
-        driver (WebDriver): Selenium WebDriver instance
+        tab (browserpool.Tab): Browser tab to use
         url (str): URL of the player page
         start_date (str): Start date in YYYY-MM-DD format
         end_date (str): End date in YYYY-MM-DD format
@@ -568,25 +544,14 @@ def get_metrics_with_date_range(driver, url, start_date=None, end_date=None):
     Returns:
         BeautifulSoup: Parsed HTML after date range is applied
     """
-    # Navigate to the page
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Navigate to the page and wait for the metrics table to have data rows
     print(f"Loading {url} with date range: {start_date} to {end_date}")
-    driver.get(url)
-    
-    # Wait for the metrics div to load
     try:
-        WebDriverWait(driver, WAIT_TIMEOUT).until(
-            EC.presence_of_element_located((By.ID, "gamelogs_metrics"))
-        )
-        
-        # Wait for the table to load
-        WebDriverWait(driver, WAIT_TIMEOUT).until(
-            lambda d: len(d.find_element(By.ID, "gamelogs_metrics").find_elements(By.TAG_NAME, "table")) > 0
-        )
-        
-        # Wait for data rows
-        WebDriverWait(driver, WAIT_TIMEOUT).until(
-            lambda d: len(d.find_elements(By.CSS_SELECTOR, "#gamelogs_metrics tbody tr")) > 0
-        )
+        tab.get(url, ready=METRICS_ROWS, timeout=WAIT_TIMEOUT)
     except Exception as e:
         print(f"Error waiting for page elements: {e}")
         return BeautifulSoup("<html></html>", 'html.parser')  # Return empty soup
@@ -596,62 +561,41 @@ def get_metrics_with_date_range(driver, url, start_date=None, end_date=None):
         try:
             print("Attempting to set date range...")
             
-            # Wait an extra second for all elements to be fully loaded
-            time.sleep(1)
-            
+            # Both inputs must be interactable before typing into them
             if start_date:
-                # Find and fill the start date input - use YYYY-MM-DD format
-                start_input = WebDriverWait(driver, WAIT_TIMEOUT).until(
-                    EC.element_to_be_clickable((By.ID, "gamelogs-type-dgt"))
-                )
-                
-                # Clear the input first
-                start_input.clear()
-                
-                # Click to make sure it's active
-                start_input.click()
-                
-                # Send keys with the correct format
-                start_input.send_keys(start_date)  # YYYY-MM-DD format
-                start_input.send_keys(Keys.TAB)  # Tab out to trigger date change
-                print(f"Set start date to {start_date}")
-                
-                # Wait a moment for the input to register
-                time.sleep(1)
-            
+                tab.wait(EC.element_to_be_clickable((By.ID, "gamelogs-type-dgt")), WAIT_TIMEOUT)
             if end_date:
-                # Find and fill the end date input - use YYYY-MM-DD format
-                end_input = WebDriverWait(driver, WAIT_TIMEOUT).until(
-                    EC.element_to_be_clickable((By.ID, "gamelogs-type-dlt"))
-                )
-                
-                # Clear the input first
-                end_input.clear()
-                
-                # Click to make sure it's active
-                end_input.click()
+                tab.wait(EC.element_to_be_clickable((By.ID, "gamelogs-type-dlt")), WAIT_TIMEOUT)
+            
+            with tab.focus() as driver:
+                # A row of the current table, to tell when it is replaced
+                old_row = driver.find_element(By.CSS_SELECTOR, METRICS_ROWS)
                 
-                # Send keys with the correct format
-                end_input.send_keys(end_date)  # YYYY-MM-DD format
-                end_input.send_keys(Keys.TAB)  # Tab out to trigger date change
-                print(f"Set end date to {end_date}")
+                for input_id, value in (("gamelogs-type-dgt", start_date), ("gamelogs-type-dlt", end_date)):
+                    if not value:
+                        continue
+                    date_input = driver.find_element(By.ID, input_id)
+                    
+                    # Clear the input first, then click to make sure it's active
+                    date_input.clear()
+                    date_input.click()
+                    
+                    # Send keys in YYYY-MM-DD format and tab out to trigger the date change
+                    date_input.send_keys(value)
+                    date_input.send_keys(Keys.TAB)
+                    print(f"Set {'start' if input_id.endswith('dgt') else 'end'} date to {value}")
                 
-                # Wait a moment for the input to register
-                time.sleep(1)
-            
-            # Simply press Enter on the last input field
-            if end_date:
-                end_input.send_keys(Keys.ENTER)
-            elif start_date:
-                start_input.send_keys(Keys.ENTER)
+                # Simply press Enter on the last input field
+                date_input.send_keys(Keys.ENTER)
             
-            # Give the page time to reload with the new date range
-            time.sleep(5)
+            # Wait for the page to redraw the table for the new date range
+            try:
+                tab.wait(EC.staleness_of(old_row), WAIT_TIMEOUT)
+            except Exception:
+                print("Metrics table was not redrawn; reading it as it is")
             
             # Check if the table still exists and has data
-            WebDriverWait(driver, WAIT_TIMEOUT).until(
-                lambda d: len(d.find_elements(By.CSS_SELECTOR, "#gamelogs_metrics tbody tr")) > 0
-            )
+            tab.wait(METRICS_ROWS, WAIT_TIMEOUT)
         except Exception as e:
             print(f"Error setting date range: {e}")
             import traceback
@@ -664,11 +608,11 @@ def get_metrics_with_date_range(driver, url, start_date=None, end_date=None):
     
     player_name = url.split('/')[4].split('?')[0]
     screenshot_path = os.path.join(screenshot_dir, f"{player_name}_{timestamp}.png")
-    driver.save_screenshot(screenshot_path)
+    tab.screenshot(screenshot_path)
     print(f"Saved screenshot to {screenshot_path}")
     
     # Parse the updated page
-    return BeautifulSoup(driver.page_source, 'html.parser')
+    return BeautifulSoup(tab.source(), 'html.parser')
 
 def get_player_by_split(bs_id, split, year):
     """
@@ -775,14 +719,11 @@ def main():
     # Process a subset for testing if needed
     season_records = season_records[:5]  # Process just the first 5 records
     
-    # Update metrics for each record
-    success_count = 0
-    for record in season_records:
-        if update_pitcher_metrics(record):
-            success_count += 1
-        
-        # Add a small delay between requests
-        time.sleep(SLEEP_TIME)
+    # Update metrics for each record, BROWSERS at a time; the browsers
+    # start once and every pitcher reuses them
+    with BrowserPool(size=BROWSERS, driver_path=CHROME_DRIVER_PATH) as pool:
+        results = pool.map(lambda tab, record: update_pitcher_metrics(record, tab), season_records)
+    success_count = sum(1 for result in results if result is True)
     
     print(f"\nSuccessfully updated {success_count} of {len(season_records)} records")
 
@@ -0,0 +1,403 @@
+import os
+import re
+import csv
+import glob
+import gzip
+import time
+import argparse
+from datetime import datetime
+from multiprocessing import Pool
+
+import pandas as pd
+import requests
+import urllib3
+from bs4 import BeautifulSoup
+
+from scrapeInfoFrombox import calculate_wind_direction
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BOX_SCORES_CSV = os.path.join(BASE_DIR, "box_scores.csv")
+HTML_CACHE_DIR = os.path.join(BASE_DIR, "box_html")
+OUTPUT_DIR = os.path.join(BASE_DIR, "box_data")
+BALLPARK_API_URL = "https://localhost:44346/api/ParkFactors"
+BBREF_BASE_URL = "https://www.baseball-reference.com"
+
+TABLES = ["games", "lineups", "batting", "pitching", "weather"]
+DOWNLOAD_DELAY = 3  # seconds between Baseball Reference requests, same as the link scrapers
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36"
+}
+
+# Batting "details" tokens counted into columns, e.g. "HR,2·SB,GDP"
+DETAIL_STATS = ["2B", "3B", "HR", "SB", "CS", "SF", "SH", "HBP", "GDP", "IW"]
+
+# Percent columns in the Baseball Reference tables
+PERCENT_STATS = {"cwpa_bat", "cwpa_def"}
+
+
+def game_id_from_link(link):
+    """
+    /boxes/LAN/LAN202408280.shtml -> LAN202408280
+    """
+    return os.path.basename(link).replace(".shtml", "")
+
+
+def read_box_links(path=BOX_SCORES_CSV):
+    """
+    Rows of (date, link) from the geteverybox / dailyUpdateboxLinks CSV.
+    """
+    links = []
+    with open(path, 'r', newline='') as infile:
+        for row in csv.reader(infile):
+            if len(row) >= 2 and row[1].endswith(".shtml"):
+                links.append((row[0], row[1]))
+    return links
+
+
+def cache_path(game_id, cache_dir=HTML_CACHE_DIR):
+    return os.path.join(cache_dir, f"{game_id}.html.gz")
+
+
+def download_missing(links, cache_dir=HTML_CACHE_DIR, delay=DOWNLOAD_DELAY):
+    """
+    Download box score pages that are not cached yet (gzip on disk).
+    Sequential and rate-limited; parsing happens afterwards in a pool.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    missing = [link for _, link in links if not os.path.exists(cache_path(game_id_from_link(link), cache_dir))]
+    if not missing:
+        return 0
+
+    print(f"Downloading {len(missing)} box scores...")
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    downloaded = 0
+    for i, link in enumerate(missing, 1):
+        try:
+            response = session.get(f"{BBREF_BASE_URL}{link}")
+            if response.status_code == 200:
+                with gzip.open(cache_path(game_id_from_link(link), cache_dir), 'wb') as outfile:
+                    outfile.write(response.content)
+                downloaded += 1
+            else:
+                print(f"Failed to download {link}: {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            print(f"Exception while downloading {link}: {e}")
+        if i % 50 == 0:
+            print(f"  {i}/{len(missing)}")
+        time.sleep(delay)
+    return downloaded
+
+
+def to_number(text):
+    text = (text or "").strip().replace(",", "")
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def innings_to_outs(ip):
+    """
+    Baseball Reference IP "4.2" means 4 innings and 2 outs.
+    """
+    if ip is None:
+        return None
+    whole = int(ip)
+    return whole * 3 + int(round((ip - whole) * 10))
+
+
+def parse_details(details):
+    counts = dict.fromkeys(DETAIL_STATS, 0)
+    for token in (details or "").split(","):
+        token = token.strip()
+        match = re.match(r'^(?:(\d+)·)?(.+)$', token)
+        if match and match.group(2) in counts:
+            counts[match.group(2)] += int(match.group(1) or 1)
+    return counts
+
+
+def row_stats(row):
+    """
+    All data-stat cells of a table row as floats (None when blank).
+    """
+    stats = {}
+    for cell in row.find_all('td'):
+        name = cell.get('data-stat')
+        if not name or name == "details":
+            continue
+        text = cell.get_text(strip=True)
+        if name in PERCENT_STATS:
+            value = to_number(text.replace('%', ''))
+            stats[name] = value / 100 if value is not None else None
+        else:
+            stats[name] = to_number(text)
+    return stats
+
+
+def split_player_cell(cell):
+    """
+    Returns (bbrefId, name, position, is_substitute). Substitutes are
+    indented with non-breaking spaces.
+    """
+    raw = cell.get_text()
+    link = cell.find('a')
+    name = link.get_text(strip=True) if link else raw.strip()
+    position = raw.replace(name, "").strip() if link else ""
+    return cell.get('data-append-csv'), name, position, raw.startswith('\xa0')
+
+
+def parse_batting(table, game_id, side, team):
+    lineups, batting = [], []
+    slot = 0
+    for row in table.find('tbody').find_all('tr'):
+        if 'spacer' in (row.get('class') or []):
+            break  # pitchers listed below the spacer are not part of the lineup
+        cell = row.find('th', {'data-stat': 'player'})
+        if cell is None or not cell.get('data-append-csv'):
+            continue
+        bbref_id, name, position, is_sub = split_player_cell(cell)
+        if not is_sub:
+            slot += 1
+        details = row.find('td', {'data-stat': 'details'})
+
+        lineups.append({
+            "game_id": game_id, "side": side, "team": team, "slot": slot,
+            "bbref_id": bbref_id, "name": name, "position": position, "starter": not is_sub,
+        })
+        line = {"game_id": game_id, "side": side, "team": team, "slot": slot, "bbref_id": bbref_id,
+                "starter": not is_sub}
+        line.update(row_stats(row))
+        line.update(parse_details(details.get_text(strip=True) if details else ""))
+        batting.append(line)
+    return lineups, batting
+
+
+def parse_pitching(table, game_id, side, team):
+    pitching = []
+    for order, row in enumerate(table.find('tbody').find_all('tr'), 1):
+        cell = row.find('th', {'data-stat': 'player'})
+        if cell is None or not cell.get('data-append-csv'):
+            continue
+        text = cell.get_text(strip=True)
+        decision = re.search(r',\s*(W|L|S|H|BS)\s*\(', text)
+        line = {
+            "game_id": game_id, "side": side, "team": team, "order": order,
+            "bbref_id": cell.get('data-append-csv'), "starter": order == 1,
+            "decision": decision.group(1) if decision else None,
+        }
+        line.update(row_stats(row))
+        line["outs"] = innings_to_outs(line.get("IP"))
+        pitching.append(line)
+    return pitching
+
+
+def parse_linescore(soup):
+    """
+    Runs per inning for (away, home); "X" (home did not bat) becomes None.
+    """
+    table = soup.find('table', class_='linescore')
+    if table is None:
+        return [], []
+    lines = []
+    for tr in table.find('tbody').find_all('tr'):
+        cells = [c.get_text(strip=True) for c in tr.find_all('td')]
+        if len(cells) < 5:
+            continue
+        # logo, team, innings..., R, H, E
+        lines.append([None if c == "X" else to_number(c) for c in cells[2:-3]])
+    return (lines + [[], []])[:2]
+
+
+def _search(pattern, html):
+    match = re.search(pattern, html)
+    return match.group(1).strip() if match else None
+
+
+def extract_tables(html, table_ids, table_class=None):
+    """
+    Cut the wanted <table> elements out of the page text so BeautifulSoup
+    only tokenizes those fragments instead of the whole ~600KB page.
+    """
+    fragments = []
+    markers = [f'id="{table_id}"' for table_id in table_ids]
+    if table_class:
+        markers.append(f'class="{table_class}')
+    for marker in markers:
+        at = html.find(marker)
+        if at < 0:
+            continue
+        start = html.rfind('<table', 0, at)
+        end = html.find('</table>', at)
+        if start >= 0 and end >= 0:
+            fragments.append(html[start:end + len('</table>')])
+    return "".join(fragments)
+
+
+def parse_weather(html, game_id, park_direction):
+    text = _search(r'Start Time Weather:</strong>\s*([^<]*)<', html)
+    if not text:
+        return None
+    text = text.replace('&deg;', '')
+    wind = re.search(r'Wind (\d+)mph ([^,]+)', text)
+    wind_description = wind.group(2).strip().lower() if wind else None
+    if text.lower().find("wind 0mph") >= 0:
+        wind_description = "calm"
+    return {
+        "game_id": game_id,
+        "temperature": to_number(_search(r'(\d+)\s*F', text)),
+        "wind_speed": to_number(wind.group(1)) if wind else 0.0,
+        "wind_description": wind_description,
+        "wind_direction": calculate_wind_direction(wind_description, park_direction),
+        "precipitation": 0 if "no precipitation" in text.lower() else 1,
+        "conditions": text,
+    }
+
+
+def parse_box_score(args):
+    """
+    Parse one cached box score into rows for every output table.
+    Runs in a worker process, so it only takes picklable arguments.
+    """
+    path, ballparks = args
+    game_id = os.path.basename(path).replace(".html.gz", "")
+    try:
+        with gzip.open(path, 'rb') as infile:
+            # Most tables ship inside HTML comments; uncomment once instead of re-parsing each comment
+            html = infile.read().decode('utf-8', errors='replace').replace('<!--', '').replace('-->', '')
+    except OSError as e:
+        return {"error": f"{game_id}: {e}"}
+
+    header = _search(r'<h1>(.*?)</h1>', html)
+    if not header or ' Box Score: ' not in header:
+        return {"error": f"{game_id}: no box score header"}
+    teams_part, raw_date = header.split(' Box Score: ')
+    away_team, home_team = teams_part.split(' vs ')
+
+    keys = {side: team.replace(" ", "").replace(".", "") for side, team in (("away", away_team), ("home", home_team))}
+    table_ids = [f"{key}{kind}" for key in keys.values() for kind in ("batting", "pitching")]
+    soup = BeautifulSoup(extract_tables(html, table_ids, "linescore"), 'html.parser')
+    away_lines, home_lines = parse_linescore(soup)
+
+    rows = {table: [] for table in TABLES}
+    for side, team in (("away", away_team), ("home", home_team)):
+        key = keys[side]
+        batting_table = soup.find('table', id=f"{key}batting")
+        if batting_table is not None:
+            lineups, batting = parse_batting(batting_table, game_id, side, team)
+            rows["lineups"].extend(lineups)
+            rows["batting"].extend(batting)
+        pitching_table = soup.find('table', id=f"{key}pitching")
+        if pitching_table is not None:
+            rows["pitching"].extend(parse_pitching(pitching_table, game_id, side, team))
+
+    def runs_through(lines, innings):
+        return sum(r or 0 for r in lines[:innings]) if lines else None
+
+    park = next((p for p in ballparks if p.get('team') and p['team'].lower() in home_team.lower()), {})
+    game = {
+        "game_id": game_id,
+        "date": datetime.strptime(raw_date, "%B %d, %Y"),
+        "away_team": away_team,
+        "home_team": home_team,
+        "away_score": runs_through(away_lines, len(away_lines)),
+        "home_score": runs_through(home_lines, len(home_lines)),
+        "innings": len(away_lines),
+        "away_first": away_lines[0] if away_lines else None,
+        "home_first": home_lines[0] if home_lines else None,
+        "away_f5": runs_through(away_lines, 5),
+        "home_f5": runs_through(home_lines, 5),
+        "venue": _search(r'<strong>Venue</strong>:\s*([^<]*)<', html),
+        "start_time": _search(r'Start Time:\s*([^<]*)<', html),
+        "attendance": to_number(_search(r'Attendance</strong>:\s*([^<]*)<', html)),
+        "duration": _search(r'Game Duration</strong>:\s*([^<]*)<', html),
+        "day_night": _search(r'<div>((?:Day|Night) Game[^<]*)</div>', html),
+    }
+    game["nrfi"] = (game["away_first"] == 0 and game["home_first"] == 0) if away_lines and home_lines else None
+    rows["games"].append(game)
+
+    weather = parse_weather(html, game_id, park.get('direction'))
+    if weather:
+        rows["weather"].append(weather)
+    return rows
+
+
+def parsed_game_ids(output_dir=OUTPUT_DIR):
+    files = glob.glob(os.path.join(output_dir, "games", "*.parquet"))
+    if not files:
+        return set()
+    return set(pd.concat([pd.read_parquet(f, columns=["game_id"]) for f in files])["game_id"])
+
+
+def fetch_ballparks():
+    try:
+        response = requests.get(BALLPARK_API_URL, verify=False)
+        if response.status_code == 200:
+            return response.json()
+        print(f"Failed to retrieve ballpark data. Status code: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while fetching ballpark data: {e}")
+    return []
+
+
+def backfill(links=None, processes=None, download=True, output_dir=OUTPUT_DIR, cache_dir=HTML_CACHE_DIR):
+    """
+    Parse every cached box score not yet in the Parquet tables and append
+    one part file per table. links defaults to all of box_scores.csv.
+    """
+    links = links if links is not None else read_box_links()
+    if download:
+        download_missing(links, cache_dir)
+
+    done = parsed_game_ids(output_dir)
+    paths = [cache_path(game_id_from_link(link), cache_dir) for _, link in links
+             if game_id_from_link(link) not in done]
+    paths = [p for p in dict.fromkeys(paths) if os.path.exists(p)]
+    if not paths:
+        print("No new box scores to parse")
+        return {}
+
+    ballparks = fetch_ballparks()
+    print(f"Parsing {len(paths)} box scores...")
+    start = time.time()
+    collected = {table: [] for table in TABLES}
+    errors = 0
+    with Pool(processes) as pool:
+        for result in pool.imap_unordered(parse_box_score, [(p, ballparks) for p in paths], chunksize=8):
+            if "error" in result:
+                errors += 1
+                print(f"Skipped {result['error']}")
+                continue
+            for table in TABLES:
+                collected[table].extend(result[table])
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    counts = {}
+    for table, rows in collected.items():
+        counts[table] = len(rows)
+        if not rows:
+            continue
+        folder = os.path.join(output_dir, table)
+        os.makedirs(folder, exist_ok=True)
+        pd.DataFrame(rows).to_parquet(os.path.join(folder, f"part-{stamp}.parquet"), index=False)
+
+    print(f"Parsed {len(paths) - errors} box scores in {time.time() - start:.1f}s ({errors} skipped): {counts}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill box score tables from box_scores.csv")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-download", action="store_true", help="Only parse pages already cached")
+    args = parser.parse_args()
+    backfill(processes=args.processes, download=not args.no_download)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ import time
 import csv
 from datetime import datetime, timedelta
 
+from boxbackfill import backfill
+
 # Function to generate the URL for each day
 def generate_url(year, month, day):
     return f"https://www.baseball-reference.com/boxes/index.fcgi?year={year}&month={month}&day={day}"
@@ -52,6 +54,7 @@ def main():
 
     end_date = datetime.now()
     current_date = start_date
+    new_links = []
 
     while current_date <= end_date:
         year = current_date.year
@@ -65,6 +68,7 @@ def main():
         
         if data_to_save:
             save_to_csv(data_to_save)
+            new_links.extend(data_to_save)
             print(f"Found {len(data_to_save)} box score(s) for {month}/{day}/{year}.")
         
         time.sleep(3)  # Wait for 3 seconds before the next request
@@ -72,5 +76,9 @@ def main():
 
     print("Scraping completed!")
 
+    # Download and parse only the new box scores into the Parquet tables
+    if new_links:
+        backfill([tuple(row) for row in new_links])
+
 if __name__ == "__main__":
     main()
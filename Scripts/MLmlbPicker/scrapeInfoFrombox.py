@@ -1,9 +1,14 @@
+import os
+import sys
 import requests
 import re
 from bs4 import BeautifulSoup, Comment
 import json
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DailyFlowCF'))
+from records import BattingToDate, BoxBattingLine, BoxPitchingLine
+
 
 # Define the URL for the box score page
 BOX_SCORE_URL = "https://www.baseball-reference.com/boxes/LAN/LAN202408280.shtml"
@@ -69,7 +74,7 @@ def update_cumulative_stats(soup, lineup, team_type):
                 # Extract the number of HRs from the text
                 match = re.search(rf"{player['player']}.*?\((\d+)", hr_text)
                 if match:
-                    player['cumulative_stats']['HR'] = int(match.group(1))
+                    player['cumulative_stats'].hr = int(match.group(1))
 
     # Update RBI
     rbi_section = footer_section.find('div', id=f'RBI{team_type}')
@@ -80,7 +85,7 @@ def update_cumulative_stats(soup, lineup, team_type):
                 # Extract the number of RBIs from the text
                 match = re.search(rf"{player['player']}.*?\((\d+)", rbi_text)
                 if match:
-                    player['cumulative_stats']['RBI'] = int(match.group(1))
+                    player['cumulative_stats'].rbi = int(match.group(1))
 
     # Update SB
     sb_section = footer_section.find('div', id=f'SB{team_type}')
@@ -91,7 +96,7 @@ def update_cumulative_stats(soup, lineup, team_type):
                 # Extract the number of SBs from the text
                 match = re.search(rf"{player['player']}.*?\((\d+)", sb_text)
                 if match:
-                    player['cumulative_stats']['SB'] = int(match.group(1))
+                    player['cumulative_stats'].sb = int(match.group(1))
 
 def extract_pitching_stats(soup, game_id):
     pitching_stats = []
@@ -108,14 +113,7 @@ def extract_pitching_stats(soup, game_id):
             player_name = player_cell.get_text(strip=True)
             bbrefid = player_cell['data-append-csv']
             
-            # Game stats mapping
-            game_stats = {
-                'IP': 0, 'H': 0, 'R': 0, 'ER': 0, 'BB': 0, 'SO': 0,
-                'HR': 0, 'BF': 0, 'Pit': 0, 'Str': 0, 'Ctct': 0, 'StS': 0,
-                'StL': 0, 'GB': 0, 'FB': 0, 'LD': 0, 'Unk': 0, 'GSc': 0,
-                'IR': 0, 'IS': 0, 'WPA': 0, 'aLI': 0, 'cWPA': 0, 'acLI': 0,
-                'RE24': 0
-            }
+            game_stats = BoxPitchingLine()
             
             # Cumulative stats mapping
             cumulative_stats = {
@@ -125,11 +123,11 @@ def extract_pitching_stats(soup, game_id):
 
             # Mapping to the correct td elements
             game_stats_mapping = {
-                'IP': 0, 'H': 1, 'R': 2, 'ER': 3, 'BB': 4, 'SO': 5,
-                'HR': 6, 'ERA': 7, 'BF': 8, 'Pit': 9, 'Str': 10, 'Ctct': 11, 
-                'StS': 12, 'StL': 13, 'GB': 14, 'FB': 15, 'LD': 16, 'Unk': 17,
-                'GSc': 18, 'IR': 19, 'IS': 20, 'WPA': 21, 'aLI': 22, 'cWPA': 23,
-                'acLI': 24, 'RE24': 25
+                'ip': 0, 'h': 1, 'r': 2, 'er': 3, 'bb': 4, 'so': 5,
+                'hr': 6, 'ERA': 7, 'bf': 8, 'pit': 9, 'str': 10, 'ctct': 11,
+                'sts': 12, 'stl': 13, 'gb': 14, 'fb': 15, 'ld': 16, 'unk': 17,
+                'gsc': 18, 'ir': 19, 'is_': 20, 'wpa': 21, 'ali': 22, 'cwpa': 23,
+                'acli': 24, 're24': 25
             }
 
             tds = row.find_all('td')
@@ -138,7 +136,7 @@ def extract_pitching_stats(soup, game_id):
                     if stat == 'ERA':
                         cumulative_stats['ERA'] = float(tds[idx].get_text(strip=True))
                     else:
-                        game_stats[stat] = float(tds[idx].get_text(strip=True))
+                        setattr(game_stats, stat, float(tds[idx].get_text(strip=True)))
                 except (ValueError, IndexError):
                     continue
             
@@ -174,7 +172,7 @@ def update_player_stat(lineups, player_name, stat_key, stat_value):
     """
     for player in lineups:
         if player['player'].replace(u'\xa0', u' ') == player_name:
-            player['cumulative_stats'][stat_key] = stat_value
+            setattr(player['cumulative_stats'], stat_key.lower(), stat_value)
             break
 
 def convert_date_format(raw_date):
@@ -229,6 +227,9 @@ def scrape_box_score(url, ballpark_data):
     if weather_info:
         print("Weather Info:", weather_info)
 
+    # Everything needed is extracted; free the page's parse tree
+    soup.decompose()
+
 
 
 def extract_game_info(soup, ballpark_data):
@@ -418,6 +419,9 @@ def extract_lineups(soup, ballpark_id, home_team_name, away_team_name):
                 # Increment the order only for non-substitution entries
                 order += 1
 
+        # Rows are copied into records; drop the comment's parse tree
+        lineup_soup.decompose()
+
     # Print the six lists before returning
     print("Home Lineups:", home_lineups)
     print("Away Lineups:", away_lineups)
@@ -431,69 +435,63 @@ def extract_lineups(soup, ballpark_id, home_team_name, away_team_name):
 
 def extract_stats(row):
     """ Extract game and cumulative stats from a player's row. """
-    game_stats = {
-        'AB': 0, 'R': 0, 'H': 0, 'RBI': 0, 'BB': 0, 'SO': 0, 'PA': 0, 'Pit': 0, 'Str': 0,
-        'WPA': 0, 'ALI': 0, 'WPA+': 0, 'WPA-A': 0, 'cWPA': 0, 'acLI': 0, 'RE24': 0,
-        'PO': 0, 'A': 0, '2B': 0, '3B': 0, 'HR': 0, 'SB': 0, 'CS': 0, 'SF': 0, 'HBP': 0, 'E': 0
-    }
-    cumulative_stats = {
-        'BA': 0.000, 'OBP': 0.000, 'SLG': 0.000, 'OPS': 0.000
-    }
+    game_stats = BoxBattingLine()
+    cumulative_stats = BattingToDate()
 
     # Extract the td elements
     tds = row.find_all('td')
 
     # Mapping for game stats to the correct column indices
     stats_mapping = {
-        'AB': 0, 'R': 1, 'H': 2, 'RBI': 3, 'BB': 4, 'SO': 5, 'PA': 6,
-        'Pit': 11, 'Str': 12, 'WPA': 13, 'ALI': 14, 'WPA+': 15, 'WPA-A': 16,
-        'cWPA': 17, 'acLI': 18, 'RE24': 19, 'PO': 20, 'A': 21
+        'ab': 0, 'r': 1, 'h': 2, 'rbi': 3, 'bb': 4, 'so': 5, 'pa': 6,
+        'pit': 11, 'str': 12, 'wpa': 13, 'ali': 14, 'wpa_pos': 15, 'wpa_neg': 16,
+        'cwpa': 17, 'acli': 18, 're24': 19, 'po': 20, 'a': 21
     }
 
     for stat, idx in stats_mapping.items():
         try:
-            if stat == 'cWPA':
+            if stat == 'cwpa':
                 # Handle cWPA separately due to the percentage sign
                 cWPA_text = tds[idx].get_text().strip().replace('%', '')
-                game_stats['cWPA'] = float(cWPA_text) / 100  # Convert percentage to a decimal
+                game_stats.cwpa = float(cWPA_text) / 100  # Convert percentage to a decimal
             else:
-                game_stats[stat] = float(tds[idx].get_text().strip())
+                setattr(game_stats, stat, float(tds[idx].get_text().strip()))
         except (ValueError, IndexError):
-            game_stats[stat] = 0  # Default to 0 if conversion fails or index is out of range
+            setattr(game_stats, stat, 0)  # Default to 0 if conversion fails or index is out of range
 
     # Calculate AB based on PA - BB - HBP (this might be a different calculation)
-    game_stats['AB'] = game_stats['PA'] - game_stats['BB'] - game_stats['HBP']
+    game_stats.ab = game_stats.pa - game_stats.bb - game_stats.hbp
 
     # Extract the details column and parse extra stats
     if len(tds) > 0:
         details_text = tds[-1].get_text().strip()
         # Check for specific statistics in the details text
         if '2B' in details_text:
-            game_stats['2B'] += 1
+            game_stats.doubles += 1
         if '3B' in details_text:
-            game_stats['3B'] += 1
+            game_stats.triples += 1
         if 'HR' in details_text:
-            game_stats['HR'] += 1
+            game_stats.hr += 1
         if 'SB' in details_text:
             match = re.search(r'(\d+)·SB', details_text)
             if match:
-                game_stats['SB'] += int(match.group(1))
+                game_stats.sb += int(match.group(1))
             else:
-                game_stats['SB'] += 1
+                game_stats.sb += 1
         if 'CS' in details_text:
-            game_stats['CS'] += 1
+            game_stats.cs += 1
         if 'SF' in details_text:
-            game_stats['SF'] += 1
+            game_stats.sf += 1
         if 'HBP' in details_text:
-            game_stats['HBP'] += 1
+            game_stats.hbp += 1
 
     # Extract cumulative stats if they exist
     if len(tds) >= 11:  # Ensure we have enough tds for cumulative stats
         try:
-            cumulative_stats['BA'] = float(tds[7].get_text().strip())
-            cumulative_stats['OBP'] = float(tds[8].get_text().strip())
-            cumulative_stats['SLG'] = float(tds[9].get_text().strip())
-            cumulative_stats['OPS'] = float(tds[10].get_text().strip())
+            cumulative_stats.ba = float(tds[7].get_text().strip())
+            cumulative_stats.obp = float(tds[8].get_text().strip())
+            cumulative_stats.slg = float(tds[9].get_text().strip())
+            cumulative_stats.ops = float(tds[10].get_text().strip())
         except (ValueError, IndexError):
             pass  # If parsing fails, leave as default values
 
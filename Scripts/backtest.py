@@ -1,7 +1,14 @@
-import requests
+import argparse
 import warnings
+from datetime import timedelta
+
+import pandas as pd
+import requests
 from urllib3.exceptions import InsecureRequestWarning
 
+from oddsmath import profit
+from snapshots import SNAPSHOT_DIR, SnapshotReader
+
 # Suppress only the specific InsecureRequestWarning from urllib3
 warnings.simplefilter('ignore', InsecureRequestWarning)
 
@@ -20,6 +27,15 @@ lower_advantage_threshold = 100  # Lower boundary for SP advantage
 upper_advantage_threshold = 900  # Upper boundary for SP advantage
 odds_threshold = -251  # Skip games with odds worse than this value (e.g., -201 or worse)
 
+# Blending/compare2sp weights (BlendingService.CalculateComparisonMetrics)
+COMPARE2SP_WEIGHTS = {
+    "AB/R": 0.5, "AB/H": 0.5, "PA/HR": 1.5, "AB/SB": 0.1, "SB/SB+CS": 0.5, "PA/BB": 1.5, "AB/SO": 0.1,
+    "SOW": 1, "BA": 0.5, "OBP": 1, "SLG": 0.5, "OPS": 1, "PA/TB": 0.5, "AB/GDP": 0.25, "BAbip": 0.5,
+    "tOPSPlus": 1.5, "sOPSPlus": 0.5,
+}
+# Stats where the lower value is the pitcher's advantage
+LOWER_IS_BETTER = {"BA", "OBP", "SLG", "OPS", "BAbip", "SB/SB+CS", "AB/SO", "tOPSPlus", "sOPSPlus"}
+
 # Initialize individual and cumulative variables
 cumulative_total_games_with_sp_adv = 0
 cumulative_dog_wins = 0
@@ -43,12 +59,108 @@ cumulative_dis_fav_better = 0
 # Array to keep track of failed pitcher comparisons
 failed_comparisons = []
 
-# Function to calculate winnings for negative odds (favorites)
-def calculate_fav_winnings(odds):
-    return 100 * (100 / abs(odds))
+# Winnings on a 100 unit bet at American odds (favorite or underdog)
+def calculate_winnings(odds):
+    return float(profit(odds, 100))
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else 0.0
+
+
+def derived_metrics(totals):
+    """
+    compare2sp's metrics from a PitcherPlatoonAndTrackRecord Totals row.
+    """
+    get = lambda column: float(totals.get(column) or 0)
+    return {
+        "AB/R": _ratio(get("ab"), get("r")),
+        "AB/H": _ratio(get("ab"), get("h")),
+        "PA/HR": _ratio(get("pa"), get("hr")),
+        "AB/SB": _ratio(get("ab"), get("sb")),
+        "SB/SB+CS": _ratio(get("sb"), get("sb") + get("cs")),
+        "PA/BB": _ratio(get("pa"), get("bb")),
+        "AB/SO": _ratio(get("ab"), get("so")),
+        "SOW": get("sow"),
+        "BA": get("ba"),
+        "OBP": get("obp"),
+        "SLG": get("slg"),
+        "OPS": get("ops"),
+        "PA/TB": _ratio(get("pa"), get("tb")),
+        "AB/GDP": _ratio(get("ab"), get("gdp")),
+        "BAbip": get("bAbip"),
+        "tOPSPlus": get("tOPSPlus"),
+        "sOPSPlus": get("sOPSPlus"),
+    }
+
+
+def compare2sp(totals_a, totals_b, pitcher_a, pitcher_b):
+    """
+    Local Blending/compare2sp: weighted relative advantage of pitcher A
+    over pitcher B, in the endpoint's response shape.
+    """
+    metrics_a, metrics_b = derived_metrics(totals_a), derived_metrics(totals_b)
+    total = 0.0
+    for stat, weight in COMPARE2SP_WEIGHTS.items():
+        a, b = metrics_a[stat], metrics_b[stat]
+        difference = b - a if stat in LOWER_IS_BETTER else a - b
+        # Both zero is 0/0 in the API too, which leaves no clear advantage
+        total += difference / ((a + b) / 2) * 100 * weight if a + b else float("nan")
+    if total > 0:
+        advantage = f"{pitcher_a} (Home) has the advantage by {total:.2f}"
+    elif total < 0:
+        advantage = f"{pitcher_b} (Away) has the advantage by {abs(total):.2f}"
+    else:
+        advantage = "No clear advantage"
+    return {"PitcherA": pitcher_a, "PitcherB": pitcher_b, "Advantage": advantage}
+
+
+def api_comparison(pitcher, opposing_pitcher, game):
+    """
+    compare2sp from the API, on today's tables. Returns (response, status).
+    """
+    response = requests.get(
+        f"https://localhost:44346/api/Blending/compare2sp?pitchera={pitcher}&pitcherb={opposing_pitcher}", verify=False
+    )
+    if response.status_code in (404, 500):
+        return None, response.status_code
+    return response.json(), response.status_code
+
+
+class SnapshotComparison:
+    """
+    compare2sp on the Totals rows captured the day before each game
+    (snapshots.py pitcher_totals), so a game is judged only on stats
+    published before it. Like the API, a pitcher without a line for the
+    game's season falls back to the previous one.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.reader = SnapshotReader("pitcher_totals", root)
+        self._by_date = {}
+
+    def totals(self, day):
+        label = day.strftime('%Y-%m-%d')
+        if label not in self._by_date:
+            frame = self.reader.as_of(day)
+            self._by_date[label] = {(r.get('bbrefID'), r.get('year')): r for r in frame.to_dict('records')}
+        return self._by_date[label]
+
+    def __call__(self, pitcher, opposing_pitcher, game):
+        day = pd.to_datetime(game['date'], errors='coerce')
+        if pd.isna(day):
+            return None, "bad date"
+        totals = self.totals(day - timedelta(days=1))
+        if not totals:
+            return None, "no snapshot"
+        lines = [totals.get((p, day.year)) or totals.get((p, day.year - 1)) for p in (pitcher, opposing_pitcher)]
+        if None in lines:
+            return None, 404
+        return compare2sp(lines[0], lines[1], pitcher, opposing_pitcher), 200
+
 
 # Function to process each team's games
-def process_team_games(team_name):
+def process_team_games(team_name, compare):
     global cumulative_total_games_with_sp_adv, cumulative_dog_wins, cumulative_dog_loses
     global cumulative_fav_wins, cumulative_fav_loses, cumulative_total_wins, cumulative_total_loses
     global cumulative_total_better, cumulative_dog_better, cumulative_fav_better
@@ -99,26 +211,27 @@ def process_team_games(team_name):
             print(f"Skipping game: {game['date']} - {team_name}. Odds: {odds} are worse than threshold {odds_threshold}")
             continue
 
-        # Compare the pitchers using compare2sp endpoint
-        comparison_response = requests.get(
-            f"https://localhost:44346/api/Blending/compare2sp?pitchera={pitcher}&pitcherb={opposing_pitcher}", verify=False
-        )
-        
-        if comparison_response.status_code in (404, 500):
+        # Compare the pitchers with compare2sp
+        comparison_data, status = compare(pitcher, opposing_pitcher, game)
+
+        if comparison_data is None:
             # Add the failed comparison to the array
             failed_comparisons.append({
                 "team": team_name,
                 "date": game["date"],
                 "pitcher": pitcher,
                 "opposing_pitcher": opposing_pitcher,
-                "status_code": comparison_response.status_code
+                "status_code": status
             })
-            print(f"Skipping game: {game['date']} - {team_name}. Reason: No relevant stats.")
+            print(f"Skipping game: {game['date']} - {team_name}. Reason: No relevant stats ({status}).")
             continue
-        
-        comparison_data = comparison_response.json()
+
         advantage = comparison_data.get('Advantage', '')
-        advantage_value = float(advantage.split(' ')[-1])  # Extract the advantage score from the string
+        try:
+            advantage_value = float(advantage.split(' ')[-1])  # Extract the advantage score from the string
+        except ValueError:
+            # "No clear advantage"
+            continue
 
         # Check if the advantage falls within the specified range
         if lower_advantage_threshold <= advantage_value <= upper_advantage_threshold:
@@ -137,10 +250,10 @@ def process_team_games(team_name):
                 dis_wins += 1
                 if odds > 0:  # As underdog
                     dis_dog_wins += 1
-                    dis_dog_better += odds  # Underdog won
+                    dis_dog_better += calculate_winnings(odds)  # Underdog won
                 else:  # As favorite
                     dis_fav_wins += 1
-                    dis_fav_better += calculate_fav_winnings(odds)  # Favorite won
+                    dis_fav_better += calculate_winnings(odds)  # Favorite won
             elif result == 'L':
                 dis_losses += 1
                 if odds > 0:  # As underdog
@@ -159,10 +272,10 @@ def process_team_games(team_name):
             total_wins += 1
             if odds > 0:  # As underdog
                 dog_wins += 1
-                dog_better += odds
+                dog_better += calculate_winnings(odds)
             else:  # As favorite
                 fav_wins += 1
-                fav_better += calculate_fav_winnings(odds)
+                fav_better += calculate_winnings(odds)
         elif result == 'L':
             total_loses += 1
             if odds > 0:  # As underdog
@@ -205,25 +318,41 @@ def process_team_games(team_name):
     cumulative_dis_dog_better += dis_dog_better
     cumulative_dis_fav_better += dis_fav_better
 
-# Loop through each MLB team and process their games
-for team in mlb_teams:
-    process_team_games(team)
-
-# Print cumulative totals after processing all teams
-print(f"\nCumulative Results for All Teams:")
-print(f"Total games with SP advantage: {cumulative_total_games_with_sp_adv}")
-print(f"Dog Wins: {cumulative_dog_wins}, Dog Losses: {cumulative_dog_loses}")
-print(f"Fav Wins: {cumulative_fav_wins}, Fav Losses: {cumulative_fav_loses}")
-print(f"Total Wins: {cumulative_total_wins}, Total Losses: {cumulative_total_loses}")
-print(f"Dog Better: {cumulative_dog_better}")
-print(f"Fav Better: {cumulative_fav_better}")
-print(f"Disadvantaged Wins: {cumulative_dis_wins}, Disadvantaged Losses: {cumulative_dis_losses}")
-print(f"Disadvantaged Dog Wins: {cumulative_dis_dog_wins}, Disadvantaged Dog Losses: {cumulative_dis_dog_loses}")
-print(f"Disadvantaged Fav Wins: {cumulative_dis_fav_wins}, Disadvantaged Fav Losses: {cumulative_dis_fav_loses}")
-print(f"Disadvantaged Dog Better: {cumulative_dis_dog_better}")
-print(f"Disadvantaged Fav Better: {cumulative_dis_fav_better}\n")
-
-# Print failed comparisons
-print(f"\nFailed Comparisons:")
-for comparison in failed_comparisons:
-    print(f"Date: {comparison['date']}, Team: {comparison['team']}, Pitcher: {comparison['pitcher']}, Opposing Pitcher: {comparison['opposing_pitcher']}, Status Code: {comparison['status_code']}")
+def print_summary():
+    # Print cumulative totals after processing all teams
+    print(f"\nCumulative Results for All Teams:")
+    print(f"Total games with SP advantage: {cumulative_total_games_with_sp_adv}")
+    print(f"Dog Wins: {cumulative_dog_wins}, Dog Losses: {cumulative_dog_loses}")
+    print(f"Fav Wins: {cumulative_fav_wins}, Fav Losses: {cumulative_fav_loses}")
+    print(f"Total Wins: {cumulative_total_wins}, Total Losses: {cumulative_total_loses}")
+    print(f"Dog Better: {cumulative_dog_better}")
+    print(f"Fav Better: {cumulative_fav_better}")
+    print(f"Disadvantaged Wins: {cumulative_dis_wins}, Disadvantaged Losses: {cumulative_dis_losses}")
+    print(f"Disadvantaged Dog Wins: {cumulative_dis_dog_wins}, Disadvantaged Dog Losses: {cumulative_dis_dog_loses}")
+    print(f"Disadvantaged Fav Wins: {cumulative_dis_fav_wins}, Disadvantaged Fav Losses: {cumulative_dis_fav_loses}")
+    print(f"Disadvantaged Dog Better: {cumulative_dis_dog_better}")
+    print(f"Disadvantaged Fav Better: {cumulative_dis_fav_better}\n")
+
+    # Print failed comparisons
+    print(f"\nFailed Comparisons:")
+    for comparison in failed_comparisons:
+        print(f"Date: {comparison['date']}, Team: {comparison['team']}, Pitcher: {comparison['pitcher']}, Opposing Pitcher: {comparison['opposing_pitcher']}, Status Code: {comparison['status_code']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the compare2sp starting pitcher advantage against the moneyline")
+    parser.add_argument("--live", action="store_true",
+                        help="Compare with the API's current tables instead of the snapshot before each game "
+                             "(faster to set up, but later games leak into every comparison)")
+    args = parser.parse_args()
+    compare = api_comparison if args.live else SnapshotComparison()
+
+    # Loop through each MLB team and process their games
+    for team in mlb_teams:
+        process_team_games(team, compare)
+
+    print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,12 @@
 import time
-import requests
 import warnings
 import random
-import urllib3
-from urllib3.exceptions import InsecureRequestWarning
-from joblib import Parallel, delayed
+import argparse
 import multiprocessing
-from requests.exceptions import ConnectionError
-from skopt import gp_minimize
-from skopt.space import Real
 
-# Suppress warnings globally for the main thread
-urllib3.disable_warnings(InsecureRequestWarning)
-warnings.simplefilter('ignore', InsecureRequestWarning)
+# skopt and joblib are imported where they are used: they pull in scipy and
+# sklearn, which would otherwise load before --help or the game results fetch.
+# requests and urllib3 wait for open_session for the same reason.
 
 # List of all MLB teams
 mlb_teams = ["Los Angeles Dodgers"]
@@ -23,36 +17,53 @@ best_total_losses = float('inf')
 best_weights = {}
 total_pushes = 0  # New variable to track pushes
 
-# Define the weight bounds for Bayesian Optimization
-weight_bounds = [
-    Real(0, 1.5),  # AB_R
-    Real(0, 1.5),  # AB_H
-    Real(0, 1.5),  # PA_HR
-    Real(0.01, 0.1),  # AB_SB
-    Real(0.1, 1),  # SB_SB_CS
-    Real(0, 1.5),  # PA_BB
-    Real(0, 1),  # AB_SO
-    Real(0, 1),  # SOW
-    Real(0, 1.5),  # BA
-    Real(0, 1.5),  # OBP
-    Real(0, 1.5),  # SLG
-    Real(0, 1.5),  # OPS
-    Real(0, 1.5),  # PA_TB
-    Real(0.1, 1),  # AB_GDP
-    Real(0, 1.5),  # BAbip
-    Real(0.5, 1.5),  # tOPSPlus
-    Real(0.5, 1.5)  # sOPSPlus
-]
+# Weight bounds for Bayesian Optimization, keyed by the compare2spCustom
+# query parameter each weight is sent as
+weight_bounds = {
+    "AB_R": (0, 1.5),
+    "AB_H": (0, 1.5),
+    "PA_HR": (0, 1.5),
+    "AB_SB": (0.01, 0.1),
+    "SB_SB_CS": (0.1, 1),
+    "PA_BB": (0, 1.5),
+    "AB_SO": (0, 1),
+    "SOW": (0, 1),
+    "BA": (0, 1.5),
+    "OBP": (0, 1.5),
+    "SLG": (0, 1.5),
+    "OPS": (0, 1.5),
+    "PA_TB": (0, 1.5),
+    "AB_GDP": (0.1, 1),
+    "BAbip": (0, 1.5),
+    "tOPSPlus": (0.5, 1.5),
+    "sOPSPlus": (0.5, 1.5)
+}
 
 # Define weight ranges (needed for weight generation and processing)
 weight_ranges = list(weight_bounds)
 
 # API result caching
 api_cache = {}
-session = requests.Session()
+session = None
+
+
+def open_session():
+    """
+    The shared HTTP session, with the localhost certificate warnings
+    silenced for every thread.
+    """
+    import requests
+    import urllib3
+    from urllib3.exceptions import InsecureRequestWarning
+
+    urllib3.disable_warnings(InsecureRequestWarning)
+    warnings.simplefilter('ignore', InsecureRequestWarning)
+    return requests.Session()
 
 # Retry mechanism with exponential backoff
 def make_request_with_retry(url, retries=5, backoff=0.5):
+    from requests.exceptions import ConnectionError
+
     if url in api_cache:
         return api_cache[url]
     
@@ -105,7 +116,9 @@ def process_game_comparison(home_pitcher, away_pitcher, f5_result, weights):
 
 # Function to process games in parallel
 def process_team_games(weights, games):
-    results = Parallel(n_jobs=num_cores)(
+    from joblib import delayed
+
+    results = pool(
         delayed(process_game_comparison)(game['homeSP'], game['awaySP'], game['f5Result'], weights)
         for game in games if game['homeSP'] and game['awaySP'] and game['f5Result']
     )
@@ -143,25 +156,46 @@ def optimize_weights(weight_values):
     return score  # Return losses - wins as the score to minimize
 
 # Bayesian optimization using skopt
-def bayesian_optimization():
-    result = gp_minimize(optimize_weights, weight_bounds, n_calls=100, random_state=42)
+def bayesian_optimization(n_calls=100):
+    from skopt import gp_minimize
+    from skopt.space import Real
+
+    dimensions = [Real(low, high, name=key) for key, (low, high) in weight_bounds.items()]
+    result = gp_minimize(optimize_weights, dimensions, n_calls=n_calls, random_state=42)
     return result
 
 # Reduce number of concurrent jobs to prevent socket exhaustion
 num_cores = multiprocessing.cpu_count()
 
-# Perform the optimization
-best_total_wins = 0
-best_total_losses = float('inf')
-total_pushes = 0
-best_weights = {}
+games = []
+pool = None
+
+def main():
+    global games, pool, session
+
+    parser = argparse.ArgumentParser(description="Bayesian search for the compare2spCustom F5 weights")
+    parser.add_argument("--calls", type=int, default=100, help="Number of weight sets to evaluate")
+    args = parser.parse_args()
+
+    from joblib import Parallel
+
+    session = open_session()
+
+    # Fetch all game results once
+    games = fetch_game_results()
+
+    # One pool for every evaluation: the workers start once and stay warm
+    # across all the gp_minimize calls. Threads, because each comparison
+    # is an HTTP wait and they can share the session and api_cache.
+    with Parallel(n_jobs=num_cores, prefer="threads") as parallel:
+        pool = parallel
+        # Run Bayesian optimization to find the best weights
+        bayesian_optimization(args.calls)
 
-# Fetch all game results once
-games = fetch_game_results()
+    # Print the best results and corresponding weights
+    print(f"Best Weights: {dict(zip(weight_ranges, best_weights))}")
+    print(f"Total Wins: {best_total_wins}, Total Losses: {best_total_losses}, Total Pushes: {total_pushes}")
 
-# Run Bayesian optimization to find the best weights
-result = bayesian_optimization()
 
-# Print the best results and corresponding weights
-print(f"Best Weights: {best_weights}")
-print(f"Total Wins: {best_total_wins}, Total Losses: {best_total_losses}, Total Pushes: {total_pushes}")
+if __name__ == "__main__":
+    main()
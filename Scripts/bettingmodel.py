@@ -1,5 +1,8 @@
+import numpy as np
 import requests
 
+from oddsmath import average_price, game_odds_prices
+
 # Define the date variables
 date2 = '24-09-06'
 date = '20' + date2
@@ -231,13 +234,11 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, pitcher_adv_team
 
     return strong_list, slight_list, weak_list, avoid_list
 
-# Calculate average odds for a team with special handling for negative odds
+# Average price for a team across the books, averaged as probabilities (see oddsmath.average_price)
 def calculate_average_odds(team, game):
-    odds_list = [game.get(f'{team}Odds') for team in ['fanduelHome', 'draftkingsHome', 'betmgmHome']] if game['homeTeam'] == team else \
-                [game.get(f'{team}Odds') for team in ['fanduelAway', 'draftkingsAway', 'betmgmAway']]
-    abs_avg_odds = sum(abs(odds) for odds in odds_list) / len(odds_list)
-    negative_count = sum(1 for odds in odds_list if odds < 0)
-    return -abs_avg_odds if negative_count >= 2 else abs_avg_odds
+    side = 0 if game['homeTeam'] == team else 1
+    avg_odds = average_price(game_odds_prices([game])[0, :, side])
+    return None if np.isnan(avg_odds) else round(float(avg_odds))
 
 # Get average odds for a list of teams
 def get_avg_odds_for_list(teams_list, game_odds_data):
@@ -266,6 +267,8 @@ def ValueModel(pitcher_adv_teams, game_odds_data):
         for game in game_odds_data:
             if game['homeTeam'] == team or game['awayTeam'] == team:
                 team_odds = calculate_average_odds(team, game)
+                if team_odds is None:
+                    continue
                 if team_odds > 0:
                     value[team] = team_odds
                 else:
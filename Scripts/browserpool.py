@@ -0,0 +1,256 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# selenium is imported when the first browser starts, so scripts that only
+# import this module for a fallback path don't need it installed
+
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe")
+CHROME_ARGUMENTS = (
+    "--headless",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--ignore-certificate-errors",  # Ignore SSL errors
+    "--window-size=1920,1080",
+)
+WAIT_TIMEOUT = 15  # Maximum seconds to wait for a page condition
+PAGE_LOAD_TIMEOUT = 60
+
+
+def rows_present(css_selector):
+    """
+    Wait condition: at least one element matches css_selector, e.g.
+    rows_present("#gamelogs_metrics tbody tr").
+    """
+    def condition(driver):
+        return len(driver.find_elements("css selector", css_selector)) > 0
+    return condition
+
+
+def text_absent(*needles):
+    """
+    Wait condition: none of the strings appear in the page source (case
+    insensitive), e.g. text_absent("cloudflare", "challenge").
+    """
+    needles = [needle.lower() for needle in needles]
+
+    def condition(driver):
+        source = driver.page_source.lower()
+        return not any(needle in source for needle in needles)
+    return condition
+
+
+class _Browser:
+    """
+    One Chrome session and the window handles of its tabs. The lock
+    serializes WebDriver commands, which always go to the focused window.
+    """
+
+    def __init__(self, driver, handles):
+        self.driver = driver
+        self.handles = handles
+        self.lock = threading.Lock()
+
+
+class Tab:
+    """
+    A browser tab on loan from a BrowserPool. Every call switches the
+    session to this tab first, so tabs of the same browser can be used
+    from different threads. WebDriver drives one window at a time, so
+    page loads on tabs of one browser still run one after another; only
+    the ready waits overlap. Loads run in parallel across browsers.
+    """
+
+    def __init__(self, pool, browser, index):
+        self._pool = pool
+        self.browser = browser
+        self.index = index
+
+    @contextmanager
+    def focus(self):
+        """
+        Hold the browser and yield its driver switched to this tab, for
+        interaction beyond get()/wait() (typing into inputs, clicks).
+        """
+        with self.browser.lock:
+            driver = self.browser.driver
+            driver.switch_to.window(self.browser.handles[self.index])
+            yield driver
+
+    def get(self, url, ready=None, timeout=WAIT_TIMEOUT):
+        """
+        Load url and wait until ready holds. ready is a CSS selector (wait
+        for a match) or a condition taking the driver; None waits only for
+        the DOM to be parsed. Raises TimeoutException when ready never holds.
+        The browser is held until the DOM is parsed, blocking its other
+        tabs for that long.
+        """
+        with self.focus() as driver:
+            driver.get(url)
+        if ready is not None:
+            self.wait(ready, timeout)
+
+    def wait(self, ready, timeout=WAIT_TIMEOUT):
+        """
+        Poll ready (CSS selector or condition) until it holds. The browser
+        is only held for each poll, so other tabs keep working meanwhile.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        condition = rows_present(ready) if isinstance(ready, str) else ready
+
+        def on_this_tab(_):
+            with self.focus() as driver:
+                return condition(driver)
+
+        return WebDriverWait(self.browser.driver, timeout).until(on_this_tab)
+
+    def source(self):
+        with self.focus() as driver:
+            return driver.page_source
+
+    def screenshot(self, path):
+        with self.focus() as driver:
+            return driver.save_screenshot(path)
+
+    def alive(self):
+        try:
+            with self.focus() as driver:
+                driver.current_url
+            return True
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """
+    Keeps `size` headless Chrome sessions open, each with
+    `tabs_per_browser` tabs, and hands tabs out from a queue:
+
+        with BrowserPool(size=2, driver_path=CHROMEDRIVER_PATH) as pool:
+            with pool.tab() as tab:
+                tab.get(url, ready="#gamelogs_metrics tbody tr")
+                soup = BeautifulSoup(tab.source(), 'html.parser')
+
+    Browsers start once (in parallel) and are reused for every page, so a
+    page costs its load time rather than browser startup. Page loads run
+    in parallel across browsers. Extra tabs per browser only overlap the
+    ready waits, so for throughput raise size rather than tabs_per_browser. Sessions share
+    cookies across their tabs, which keeps a solved Cloudflare challenge.
+    A browser whose session dies is restarted when its tab comes back.
+    """
+
+    def __init__(self, size=1, tabs_per_browser=1, driver_path=None, arguments=CHROME_ARGUMENTS,
+                 user_agent=None, page_load_strategy="eager"):
+        self.size = size
+        self.tabs_per_browser = tabs_per_browser
+        self.driver_path = driver_path or CHROMEDRIVER_PATH
+        self.arguments = list(arguments)
+        self.user_agent = user_agent
+        self.page_load_strategy = page_load_strategy
+        self._tabs = queue.Queue()
+        self._browsers = []
+        self._restart_lock = threading.Lock()
+
+    def _start_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        options = Options()
+        for argument in self.arguments:
+            options.add_argument(argument)
+        if self.user_agent:
+            options.add_argument(f"user-agent={self.user_agent}")
+        # "eager" returns from get() once the DOM is parsed; the ready
+        # conditions decide when the page is actually usable
+        options.page_load_strategy = self.page_load_strategy
+
+        driver = webdriver.Chrome(service=Service(self.driver_path), options=options)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        handles = [driver.current_window_handle]
+        for _ in range(self.tabs_per_browser - 1):
+            driver.switch_to.new_window('tab')
+            handles.append(driver.current_window_handle)
+        return driver, handles
+
+    def start(self):
+        if self._browsers:
+            return self
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            sessions = list(executor.map(lambda _: self._start_driver(), range(self.size)))
+        for driver, handles in sessions:
+            browser = _Browser(driver, handles)
+            self._browsers.append(browser)
+            for index in range(len(handles)):
+                self._tabs.put(Tab(self, browser, index))
+        return self
+
+    def _restart(self, browser):
+        with self._restart_lock, browser.lock:
+            # Another tab of this browser may have restarted it while this
+            # one waited for the lock; quitting again would kill that session
+            try:
+                browser.driver.current_url
+                return
+            except Exception:
+                pass
+            try:
+                browser.driver.quit()
+            except Exception:
+                pass
+            browser.driver, browser.handles = self._start_driver()
+
+    @contextmanager
+    def tab(self, timeout=None):
+        """
+        Borrow a tab, waiting up to timeout seconds (None: forever) for one
+        to come free.
+        """
+        self.start()
+        tab = self._tabs.get(timeout=timeout)
+        try:
+            yield tab
+        except Exception:
+            if not tab.alive():
+                self._restart(tab.browser)
+            raise
+        finally:
+            self._tabs.put(tab)
+
+    def map(self, func, items):
+        """
+        Call func(tab, item) for every item with one worker per tab and
+        return the results in item order. An item whose call raises gets
+        the exception object as its result.
+        """
+        self.start()
+
+        def run(item):
+            try:
+                with self.tab() as tab:
+                    return func(tab, item)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.size * self.tabs_per_browser) as executor:
+            return list(executor.map(run, items))
+
+    def close(self):
+        for browser in self._browsers:
+            try:
+                browser.driver.quit()
+            except Exception:
+                pass
+        self._browsers = []
+        self._tabs = queue.Queue()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
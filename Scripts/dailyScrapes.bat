@@ -42,9 +42,18 @@ REM Continue with the rest of the scripts
 echo Running fetchgameodds.py with param %date1%...
 python fetchgameodds.py %date1%
 
+REM Closing lines (and CLV) are only as close as the last odds capture before
+REM first pitch, so keep capturing in its own window until the last game starts.
+REM Each capture spends Odds API quota (1 + 3 per upcoming game with the inning markets)
+echo Starting oddshistory.py capture loop...
+start "oddshistory capture" python oddshistory.py capture --every 15 --until-last-first-pitch
+
 echo Running scrapeteams.py...
 python scrapeteams.py
 
+echo Running snapshots.py capture...
+python snapshots.py capture
+
 echo Running pitchersbulksplits.py with param %date1%...
 python pitchersbulksplits.py %date1%
 
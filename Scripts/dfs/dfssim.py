@@ -0,0 +1,473 @@
+import argparse
+import re
+import unicodedata
+from datetime import datetime
+from typing import List, Dict, Any
+
+import numpy as np
+import requests
+import urllib3
+
+from projstore import ProjectionStore
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+
+# DraftKings classic MLB scoring
+DK_HITTER_POINTS = {'1b': 3.0, '2b': 5.0, '3b': 8.0, 'hr': 10.0, 'rbi': 2.0, 'r': 2.0, 'bb': 2.0, 'sb': 5.0}
+DK_PITCHER_POINTS = {'ip': 2.25, 'k': 2.0, 'w': 4.0, 'er': -2.0, 'h': -0.6, 'bb': -0.6, 'cg': 2.5}
+
+# Projections only carry season PA, so hitter games are estimated from PA per game
+PA_PER_GAME = 4.2
+
+# Fallback coefficient of variation when a player has no single-game DK history
+HITTER_DEFAULT_CV = 1.05
+PITCHER_DEFAULT_CV = 0.65
+MIN_GAMES_FOR_STD = 5
+
+# Correlation structure between player outcomes
+SAME_TEAM_HITTER_CORR = 0.20
+PITCHER_VS_OPP_HITTER_CORR = -0.30
+
+# DK classic MLB roster: 2 P, C, 1B, 2B, 3B, SS, 3 OF
+ROSTER_SIZE = 10
+
+# Upper bound for the (sims x lineups) score block held in memory at once
+DEFAULT_CHUNK_BYTES = 256 * 1024 * 1024
+
+HIST_BIN_WIDTH = 0.5
+HIST_MAX_POINTS = 300.0
+
+# GameOdds and ActualLineups store team nicknames, DK uses abbreviations
+NICKNAME_TO_DK = {
+    "Diamondbacks": "ARI", "Braves": "ATL", "Orioles": "BAL", "Red Sox": "BOS",
+    "Cubs": "CHC", "White Sox": "CWS", "Reds": "CIN", "Guardians": "CLE",
+    "Rockies": "COL", "Tigers": "DET", "Astros": "HOU", "Royals": "KC",
+    "Angels": "LAA", "Dodgers": "LAD", "Marlins": "MIA", "Brewers": "MIL",
+    "Twins": "MIN", "Mets": "NYM", "Yankees": "NYY", "Athletics": "ATH",
+    "Phillies": "PHI", "Pirates": "PIT", "Padres": "SD", "Mariners": "SEA",
+    "Giants": "SF", "Cardinals": "STL", "Rays": "TB", "Rangers": "TEX",
+    "Blue Jays": "TOR", "Nationals": "WSH"
+}
+
+
+def normalize_name(name):
+    """
+    Normalize a player name for joining DK draftables to projections.
+    Strips accents, punctuation and generational suffixes.
+    """
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii')
+    name = re.sub(r'[^a-z ]', '', name.lower())
+    name = re.sub(r'\b(jr|sr|ii|iii|iv)\b', '', name)
+    return ' '.join(name.split())
+
+
+def fetch_json(session, url):
+    """
+    GET a JSON list from the API, returning an empty list on any failure.
+    """
+    try:
+        response = session.get(url, verify=False)
+        if response.status_code == 200:
+            return response.json()
+        print(f"Error fetching {url}: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while fetching {url}: {e}")
+    return []
+
+
+def hitter_dk_mean(proj: Dict[str, Any]) -> float:
+    """
+    Convert a ProjectedHitterStats season line into expected DK points per game.
+    """
+    pa = float(proj.get('pa', 0) or 0)
+    if pa <= 0:
+        return 0.0
+    h = float(proj.get('h', 0) or 0)
+    doubles = float(proj.get('doubles', 0) or 0)
+    triples = float(proj.get('triples', 0) or 0)
+    hr = float(proj.get('hr', 0) or 0)
+    singles = max(h - doubles - triples - hr, 0.0)
+    season_points = (
+        DK_HITTER_POINTS['1b'] * singles
+        + DK_HITTER_POINTS['2b'] * doubles
+        + DK_HITTER_POINTS['3b'] * triples
+        + DK_HITTER_POINTS['hr'] * hr
+        + DK_HITTER_POINTS['rbi'] * float(proj.get('rbi', 0) or 0)
+        + DK_HITTER_POINTS['r'] * float(proj.get('r', 0) or 0)
+        + DK_HITTER_POINTS['bb'] * float(proj.get('bb', 0) or 0)
+        + DK_HITTER_POINTS['sb'] * float(proj.get('sb', 0) or 0)
+    )
+    return season_points / (pa / PA_PER_GAME)
+
+
+def pitcher_dk_mean(proj: Dict[str, Any]) -> float:
+    """
+    Convert a ProjectedPitcherStats season line into expected DK points per appearance.
+    Starters are scaled per start, everyone else per game.
+    """
+    gs = float(proj.get('gs', 0) or 0)
+    g = float(proj.get('g', 0) or 0)
+    appearances = gs if gs > 0 else g
+    if appearances <= 0:
+        return 0.0
+    season_points = (
+        DK_PITCHER_POINTS['ip'] * float(proj.get('ip', 0) or 0)
+        + DK_PITCHER_POINTS['k'] * float(proj.get('k', 0) or 0)
+        + DK_PITCHER_POINTS['w'] * float(proj.get('w', 0) or 0)
+        + DK_PITCHER_POINTS['er'] * float(proj.get('er', 0) or 0)
+        + DK_PITCHER_POINTS['h'] * float(proj.get('h', 0) or 0)
+        + DK_PITCHER_POINTS['bb'] * float(proj.get('bb', 0) or 0)
+        + DK_PITCHER_POINTS['cg'] * float(proj.get('cg', 0) or 0)
+    )
+    return season_points / appearances
+
+
+def fetch_dk_point_std(session, year):
+    """
+    Build per-player DK point standard deviations from the SingleGame rows that
+    gamelog_grabber posts to TrailingGameLogSplits (the dfs_dk column).
+
+    Returns:
+        Dictionary of bbrefId -> (games, std)
+    """
+    records = fetch_json(session, f"{API_BASE_URL}/TrailingGameLogSplits/year/{year}")
+    games = {}
+    for rec in records:
+        if not str(rec.get('split', '')).startswith('SingleGame'):
+            continue
+        key = (rec.get('dateUpdated'), rec.get('split'))
+        games.setdefault(rec.get('bbrefId'), {})[key] = float(rec.get('dfsDk', 0) or 0)
+
+    result = {}
+    for bbrefid, by_game in games.items():
+        values = np.fromiter(by_game.values(), dtype=np.float64)
+        if len(values) >= MIN_GAMES_FOR_STD:
+            result[bbrefid] = (len(values), float(values.std(ddof=1)))
+    return result
+
+
+def parse_matchups(pool: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Map each team to its opponent using the DK game string (e.g. "NYY@BOS").
+    """
+    opponents = {}
+    for player in pool:
+        game = player.get('game', '') or ''
+        if '@' not in game:
+            continue
+        away, home = [t.strip() for t in game.split(' ')[0].split('@', 1)]
+        opponents[away] = home
+        opponents[home] = away
+    return opponents
+
+
+def build_player_table(pool, hitter_proj, pitcher_proj, dk_std):
+    """
+    Join a DK player pool to projections and gamelog variance.
+
+    Args:
+        pool: DKPlayerPools rows for a draft group
+        hitter_proj: ProjectedHitterStats rows
+        pitcher_proj: ProjectedPitcherStats rows
+        dk_std: Output of fetch_dk_point_std
+
+    Returns:
+        Dictionary of parallel NumPy arrays describing the slate
+    """
+    hitters = {normalize_name(p.get('name')): p for p in hitter_proj}
+    pitchers = {normalize_name(p.get('name')): p for p in pitcher_proj}
+    opponents = parse_matchups(pool)
+
+    dk_ids, names, teams, opps, positions, salaries = [], [], [], [], [], []
+    means, stds, is_pitcher = [], [], []
+    bbref_ids, game_starts = [], []
+    missing = []
+
+    for player in pool:
+        name_key = normalize_name(player.get('fullName'))
+        position = player.get('position', '')
+        pitcher = 'P' in position.split('/') or position in ('SP', 'RP')
+        proj = pitchers.get(name_key) if pitcher else hitters.get(name_key)
+        if proj is None:
+            missing.append(player.get('fullName'))
+            continue
+
+        mean = pitcher_dk_mean(proj) if pitcher else hitter_dk_mean(proj)
+        history = dk_std.get(proj.get('bbrefId'))
+        if history:
+            std = history[1]
+        else:
+            std = mean * (PITCHER_DEFAULT_CV if pitcher else HITTER_DEFAULT_CV)
+
+        team = player.get('team', '')
+        dk_ids.append(player.get('playerDkId'))
+        names.append(player.get('fullName'))
+        teams.append(team)
+        opps.append(opponents.get(team, ''))
+        positions.append(position)
+        salaries.append(player.get('salary', 0))
+        means.append(mean)
+        stds.append(max(std, 0.1))
+        is_pitcher.append(pitcher)
+        bbref_ids.append(proj.get('bbrefId', ''))
+        game_starts.append(player.get('gameStart', ''))
+
+    if missing:
+        print(f"No projection found for {len(missing)} players in the pool")
+
+    return {
+        'playerDkId': np.array(dk_ids, dtype=np.int64),
+        'name': np.array(names, dtype=object),
+        'team': np.array(teams, dtype=object),
+        'opp': np.array(opps, dtype=object),
+        'position': np.array(positions, dtype=object),
+        'salary': np.array(salaries, dtype=np.int32),
+        'mean': np.array(means, dtype=np.float64),
+        'std': np.array(stds, dtype=np.float64),
+        'is_pitcher': np.array(is_pitcher, dtype=bool),
+        'bbrefId': np.array(bbref_ids, dtype=object),
+        'gameStart': np.array(game_starts, dtype=object),
+    }
+
+
+def build_correlation_matrix(teams, opps, is_pitcher,
+                             team_corr=SAME_TEAM_HITTER_CORR,
+                             pitcher_opp_corr=PITCHER_VS_OPP_HITTER_CORR):
+    """
+    Build the player outcome correlation matrix.
+    Hitters on the same team share team_corr, and each pitcher gets
+    pitcher_opp_corr against every hitter he faces. The result is projected
+    onto the nearest positive semi-definite matrix so it can be factored.
+    """
+    teams = np.asarray(teams)
+    opps = np.asarray(opps)
+    is_pitcher = np.asarray(is_pitcher, dtype=bool)
+    hitter = ~is_pitcher
+
+    same_team = teams[:, None] == teams[None, :]
+    corr = np.where(same_team & hitter[:, None] & hitter[None, :], team_corr, 0.0)
+
+    faces = (opps[:, None] == teams[None, :]) & (opps[:, None] != '')
+    pitcher_vs_hitter = faces & is_pitcher[:, None] & hitter[None, :]
+    corr = np.where(pitcher_vs_hitter | pitcher_vs_hitter.T, pitcher_opp_corr, corr)
+    np.fill_diagonal(corr, 1.0)
+
+    eigvals, eigvecs = np.linalg.eigh(corr)
+    if eigvals.min() < 1e-8:
+        eigvals = np.clip(eigvals, 1e-8, None)
+        corr = (eigvecs * eigvals) @ eigvecs.T
+        scale = np.sqrt(np.diag(corr))
+        corr = corr / np.outer(scale, scale)
+    return corr
+
+
+def draw_outcomes(means, stds, is_pitcher, chol, n_sims, rng):
+    """
+    Draw correlated DK point outcomes for every player.
+    Hitters use a lognormal marginal (non-negative, right skewed); pitchers,
+    who can post negative scores, use a normal marginal.
+
+    Returns:
+        Array of shape (n_sims, n_players), float32
+    """
+    z = rng.standard_normal((n_sims, len(means))) @ chol.T
+
+    safe_means = np.maximum(means, 1e-6)
+    sigma2 = np.log1p((stds / safe_means) ** 2)
+    mu = np.log(safe_means) - 0.5 * sigma2
+    lognormal = np.exp(mu + np.sqrt(sigma2) * z)
+    normal = means + stds * z
+
+    return np.where(is_pitcher, normal, lognormal).astype(np.float32)
+
+
+def lineups_to_matrix(lineups, n_players):
+    """
+    Convert lineups given as arrays of player row indices into a dense
+    (n_players, n_lineups) incidence matrix so scoring is one matmul.
+    """
+    lineups = np.asarray(lineups, dtype=np.int64)
+    incidence = np.zeros((n_players, lineups.shape[0]), dtype=np.float32)
+    rows = lineups.ravel()
+    cols = np.repeat(np.arange(lineups.shape[0]), lineups.shape[1])
+    incidence[rows, cols] = 1.0
+    return incidence
+
+
+def simulate_contest(players, lineups, n_sims=10000, field=None, seed=None,
+                     chunk_bytes=DEFAULT_CHUNK_BYTES, percentiles=(50, 90, 99)):
+    """
+    Simulate a GPP: score every lineup across n_sims correlated slates.
+
+    Args:
+        players: Output of build_player_table
+        lineups: (n_lineups, roster_size) array of row indices into players
+        n_sims: Number of simulated slates
+        field: Optional (n_field, roster_size) array of opponent lineups. When
+            omitted, the lineups compete only against each other.
+        seed: Optional RNG seed
+        chunk_bytes: Memory budget for one chunk of scores
+        percentiles: Score percentiles to report per lineup
+
+    Returns:
+        Dictionary of per-lineup arrays: mean, std, percentiles, win_rate,
+        top1pct_rate
+    """
+    rng = np.random.default_rng(seed)
+    means = players['mean']
+    stds = players['std']
+    is_pitcher = players['is_pitcher']
+    n_players = len(means)
+
+    corr = build_correlation_matrix(players['team'], players['opp'], is_pitcher)
+    chol = np.linalg.cholesky(corr)
+
+    lineups = np.asarray(lineups, dtype=np.int64)
+    n_lineups = lineups.shape[0]
+    entries = lineups if field is None else np.vstack([lineups, np.asarray(field, dtype=np.int64)])
+    n_entries = entries.shape[0]
+    incidence = lineups_to_matrix(entries, n_players)
+
+    # Each chunk holds a (chunk, n_players) outcome block and a (chunk, n_entries) score block
+    bytes_per_sim = 4 * (n_players + 2 * n_entries)
+    chunk = int(max(1, min(n_sims, chunk_bytes // bytes_per_sim)))
+
+    n_bins = int(HIST_MAX_POINTS / HIST_BIN_WIDTH)
+    hist = np.zeros(n_lineups * n_bins, dtype=np.int64)
+    score_sum = np.zeros(n_lineups, dtype=np.float64)
+    score_sumsq = np.zeros(n_lineups, dtype=np.float64)
+    wins = np.zeros(n_lineups, dtype=np.float64)
+    top_hits = np.zeros(n_lineups, dtype=np.int64)
+    top_k = max(1, int(np.ceil(n_entries * 0.01)))
+    offsets = np.arange(n_lineups) * n_bins
+
+    done = 0
+    while done < n_sims:
+        size = min(chunk, n_sims - done)
+        outcomes = draw_outcomes(means, stds, is_pitcher, chol, size, rng)
+        scores = outcomes @ incidence
+        ours = scores[:, :n_lineups]
+
+        score_sum += ours.sum(axis=0, dtype=np.float64)
+        score_sumsq += np.square(ours, dtype=np.float64).sum(axis=0)
+
+        bins = np.clip((ours / HIST_BIN_WIDTH).astype(np.int64), 0, n_bins - 1)
+        hist += np.bincount((bins + offsets).ravel(), minlength=n_lineups * n_bins)
+
+        # Ties for first split the win
+        best = scores.max(axis=1, keepdims=True)
+        at_best = ours == best
+        n_tied = (scores == best).sum(axis=1, keepdims=True)
+        wins += (at_best / n_tied).sum(axis=0)
+
+        if top_k < n_entries:
+            cutoff = np.partition(scores, n_entries - top_k, axis=1)[:, n_entries - top_k][:, None]
+        else:
+            cutoff = scores.min(axis=1, keepdims=True)
+        top_hits += (ours >= cutoff).sum(axis=0)
+
+        done += size
+
+    mean = score_sum / n_sims
+    std = np.sqrt(np.maximum(score_sumsq / n_sims - mean ** 2, 0.0))
+
+    cumulative = np.cumsum(hist.reshape(n_lineups, n_bins), axis=1)
+    result = {
+        'mean': mean,
+        'std': std,
+        'win_rate': wins / n_sims,
+        'top1pct_rate': top_hits / n_sims,
+    }
+    for pct in percentiles:
+        target = np.ceil(pct / 100.0 * n_sims)
+        result[f'p{pct}'] = (np.argmax(cumulative >= target, axis=1) + 1) * HIST_BIN_WIDTH
+    return result
+
+
+def lineups_from_dk_ids(players, dk_lineups, roster_size=ROSTER_SIZE):
+    """
+    Convert lineups expressed as lists of playerDkIds into a
+    (n_lineups, roster_size) row-index array. Lineups containing a player
+    without a projection are dropped, so the result can have 0 rows.
+    """
+    index = {int(dk_id): i for i, dk_id in enumerate(players['playerDkId'])}
+    rows = []
+    for lineup in dk_lineups:
+        try:
+            rows.append([index[int(dk_id)] for dk_id in lineup])
+        except KeyError:
+            continue
+    if not rows:
+        return np.empty((0, roster_size), dtype=np.int64)
+    return np.array(rows, dtype=np.int64)
+
+
+def load_slate(draftgroup_id, year=None):
+    """
+    Pull everything the simulator needs for a draft group from the API.
+    """
+    year = year or datetime.now().year
+    session = requests.Session()
+    session.verify = False
+    pool = fetch_json(session, f"{API_BASE_URL}/DKPlayerPools/draftgroup/{draftgroup_id}")
+
+    # Team-normalized projections, cached per draft group
+    store = ProjectionStore(draftgroup_id, year=year, session=session)
+    store.refresh()
+    hitter_proj = store.hitters.to_dict('records')
+    pitcher_proj = store.pitchers.to_dict('records')
+    dk_std = fetch_dk_point_std(session, year)
+    print(f"Pool: {len(pool)} players | Hitter proj: {len(hitter_proj)} | "
+          f"Pitcher proj: {len(pitcher_proj)} | Gamelog std: {len(dk_std)}")
+    return build_player_table(pool, hitter_proj, pitcher_proj, dk_std)
+
+
+def read_lineups_file(path):
+    """
+    Read lineups from a file with one comma-separated list of playerDkIds per line.
+    """
+    with open(path, 'r', encoding='utf-8') as infile:
+        return [[int(x) for x in line.strip().split(',') if x.strip()] for line in infile if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo DFS contest simulator")
+    parser.add_argument("draftgroup", type=int, help="DraftKings draft group id")
+    parser.add_argument("lineups", help="File with one comma-separated list of playerDkIds per line")
+    parser.add_argument("--field", help="Optional file of opponent lineups in the same format")
+    parser.add_argument("--sims", type=int, default=10000, help="Number of simulated slates")
+    parser.add_argument("--year", type=int, default=None, help="Projection year")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    players = load_slate(args.draftgroup, args.year)
+    if len(players['mean']) == 0:
+        print("No players with projections. Exiting...")
+        return
+
+    dk_lineups = read_lineups_file(args.lineups)
+    lineups = lineups_from_dk_ids(players, dk_lineups)
+    field = lineups_from_dk_ids(players, read_lineups_file(args.field)) if args.field else None
+    if len(lineups) == 0:
+        print("No scorable lineups: every lineup has a player without a projection. Exiting...")
+        return
+    if field is not None and len(field) == 0:
+        print("No scorable field lineups, simulating without a field")
+        field = None
+    print(f"Simulating {len(lineups)} lineups x {args.sims} sims...")
+
+    result = simulate_contest(players, lineups, n_sims=args.sims, field=field, seed=args.seed)
+
+    order = np.argsort(-result['win_rate'])
+    print("\nLineup   Mean    Std    P50    P90    P99   Win%   Top1%")
+    for i in order[:25]:
+        print(f"{i:<6} {result['mean'][i]:6.1f} {result['std'][i]:6.1f} {result['p50'][i]:6.1f} "
+              f"{result['p90'][i]:6.1f} {result['p99'][i]:6.1f} {result['win_rate'][i]*100:6.2f} "
+              f"{result['top1pct_rate'][i]*100:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+import csv
+import re
+import time
+import argparse
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterable
+
+import numpy as np
+import requests
+import urllib3
+
+from dfssim import NICKNAME_TO_DK, load_slate
+from getcontestpools import convert_dk_time_to_est_datetime
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+
+# DraftKings classic MLB roster
+ROSTER_SLOTS = ['P', 'P', 'C', '1B', '2B', '3B', 'SS', 'OF', 'OF', 'OF']
+SALARY_CAP = 50000
+MAX_HITTERS_PER_TEAM = 5
+MIN_GAMES = 2
+SALARY_UNIT = 100
+
+BATTING_KEYS = [f"batting{n}" for n in ("1st", "2nd", "3rd", "4th", "5th", "6th", "7th", "8th", "9th")]
+
+
+def parse_game_start(value) -> float:
+    """
+    Convert a DK/API game start into a UTC epoch timestamp.
+    Handles DK "/Date(ms)/" strings and ISO datetimes (naive values are UTC).
+    """
+    if not value:
+        return float('inf')
+    value = str(value)
+    if value.startswith('/Date('):
+        return convert_dk_time_to_est_datetime(value).timestamp()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return float('inf')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def slot_eligibility(positions, slots=ROSTER_SLOTS):
+    """
+    Boolean matrix (n_players, n_slots): can player i fill slot j.
+    DK lists multi-position players as "1B/3B"; pitchers as "SP"/"RP"/"P".
+    """
+    matrix = np.zeros((len(positions), len(slots)), dtype=bool)
+    for i, position in enumerate(positions):
+        parts = set(str(position).split('/'))
+        if parts & {'SP', 'RP', 'P'}:
+            parts.add('P')
+        for j, slot in enumerate(slots):
+            matrix[i, j] = slot in parts
+    return matrix
+
+
+class LateSwapOptimizer:
+    """
+    Holds a set of DK entries in memory and re-solves only the unlocked
+    slots of entries touched by a confirmed lineup or a scratch.
+
+    Args:
+        players: Output of dfssim.build_player_table / load_slate
+        entries: (n_entries, n_slots) array of player row indices
+    """
+
+    def __init__(self, players: Dict[str, np.ndarray], entries, slots=ROSTER_SLOTS,
+                 salary_cap=SALARY_CAP, now=None):
+        self.players = players
+        self.slots = list(slots)
+        self.salary_cap = salary_cap
+        self.entries = np.asarray(entries, dtype=np.int64).copy()
+        self.projection = players['mean'].astype(np.float64).copy()
+        self.salary = players['salary'].astype(np.int64)
+        self.team = players['team']
+        self.is_pitcher = players['is_pitcher']
+        self.game_start = np.array([parse_game_start(g) for g in players['gameStart']], dtype=np.float64)
+        self.game_key = np.array([f"{t}-{o}" if t < o else f"{o}-{t}" for t, o in zip(players['team'], players['opp'])],
+                                 dtype=object)
+        self.eligible = slot_eligibility(players['position'], self.slots)
+        self.active = np.ones(len(self.projection), dtype=bool)
+        self.dk_index = {int(dk_id): i for i, dk_id in enumerate(players['playerDkId'])}
+        self.bbref_index = {}
+        for i, bbrefid in enumerate(players['bbrefId']):
+            if bbrefid:
+                self.bbref_index.setdefault(bbrefid, []).append(i)
+        self.now = now
+        self._cache = {}
+
+    def _now(self):
+        return self.now if self.now is not None else time.time()
+
+    def locked(self):
+        """
+        Players whose game has started.
+        """
+        return self.game_start <= self._now()
+
+    def on_scratch(self, dk_ids: Iterable[int] = (), bbrefids: Iterable[str] = ()):
+        """
+        Remove players from the pool and re-solve affected entries.
+        """
+        rows = [self.dk_index[int(d)] for d in dk_ids if int(d) in self.dk_index]
+        for bbrefid in bbrefids:
+            rows.extend(self.bbref_index.get(bbrefid, []))
+        return self._deactivate(rows)
+
+    def on_confirmed_lineups(self, actual_lineups: List[Dict[str, Any]]):
+        """
+        Apply confirmed batting orders (Lineups/Actual rows). Any hitter on a
+        confirmed team who is not in the batting order is treated as scratched.
+        Lineup teams are nicknames ("Yankees"); the pool uses DK abbreviations.
+        """
+        out = []
+        for lineup in actual_lineups:
+            team = NICKNAME_TO_DK.get(lineup.get('team'), lineup.get('team'))
+            starters = {lineup.get(key) for key in BATTING_KEYS if lineup.get(key)}
+            if not team or not starters:
+                continue
+            on_team = np.flatnonzero((self.team == team) & ~self.is_pitcher & self.active)
+            out.extend(i for i in on_team if self.players['bbrefId'][i] not in starters)
+        return self._deactivate(out)
+
+    def _deactivate(self, rows):
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        rows = rows[self.active[rows]] if len(rows) else rows
+        if len(rows) == 0:
+            return {}
+        self.active[rows] = False
+        self._cache.clear()
+        affected = np.flatnonzero(np.isin(self.entries, rows).any(axis=1))
+        return self.resolve_entries(affected)
+
+    def resolve_entries(self, entry_ids):
+        """
+        Re-solve the unlocked slots of the given entries.
+
+        Returns:
+            Dictionary of entry index -> (old row indices, new row indices)
+        """
+        locked = self.locked()
+        changes = {}
+        for e in entry_ids:
+            current = self.entries[e]
+            fixed = locked[current]
+            if fixed.all():
+                continue
+            new = self._solve_entry(current, fixed, locked)
+            if new is not None and not np.array_equal(new, current):
+                changes[int(e)] = (current.copy(), new)
+                self.entries[e] = new
+        return changes
+
+    def _candidates(self, slot_idx, available, n_open):
+        """
+        Per-slot candidate rows: eligible, available players that are not
+        dominated (cheaper and better) by n_open or more other candidates.
+        """
+        rows = np.flatnonzero(self.eligible[:, slot_idx] & available)
+        if len(rows) == 0:
+            return rows
+        sal = self.salary[rows]
+        proj = self.projection[rows]
+        dominates = (sal[None, :] <= sal[:, None]) & (proj[None, :] >= proj[:, None])
+        dominates &= (sal[None, :] < sal[:, None]) | (proj[None, :] > proj[:, None])
+        keep = dominates.sum(axis=1) < n_open
+        rows = rows[keep]
+        return rows[np.argsort(-self.projection[rows])]
+
+    def _solve_entry(self, current, fixed, locked):
+        open_slots = np.flatnonzero(~fixed)
+        fixed_rows = current[fixed]
+        budget = self.salary_cap - int(self.salary[fixed_rows].sum())
+
+        key = (tuple(sorted(fixed_rows.tolist())), tuple(open_slots.tolist()), budget, int(locked.sum()))
+        if key in self._cache:
+            cached = self._cache[key]
+            if cached is None:
+                return None
+            new = current.copy()
+            new[open_slots] = cached
+            return new
+
+        available = self.active & ~locked
+        available[fixed_rows] = False
+        candidates = [self._candidates(s, available, len(open_slots)) for s in open_slots]
+        if any(len(c) == 0 for c in candidates):
+            self._cache[key] = None
+            return None
+
+        # Upper bound table: best projection for slots d.. with a given budget,
+        # ignoring duplicate players and team limits (salaries in $100 units)
+        unit = SALARY_UNIT
+        n_open = len(open_slots)
+        n_units = max(budget // unit, 0)
+        bound = np.full((n_open + 1, n_units + 1), -np.inf)
+        bound[n_open, :] = 0.0
+        for d in range(n_open - 1, -1, -1):
+            for r in candidates[d]:
+                cost = int(self.salary[r]) // unit
+                if cost > n_units:
+                    continue
+                shifted = bound[d + 1, :n_units + 1 - cost] + self.projection[r]
+                np.maximum(bound[d, cost:], shifted, out=bound[d, cost:])
+        if not np.isfinite(bound[0, n_units]):
+            self._cache[key] = None
+            return None
+
+        team_counts = {}
+        for r in fixed_rows:
+            if not self.is_pitcher[r]:
+                team_counts[self.team[r]] = team_counts.get(self.team[r], 0) + 1
+        games = set(self.game_key[fixed_rows])
+
+        best = {'score': -np.inf, 'rows': None}
+        chosen = []
+        used = set(fixed_rows.tolist())
+
+        def search(depth, remaining, score):
+            if score + bound[depth, remaining // unit] <= best['score'] + 1e-9:
+                return
+            if depth == n_open:
+                picked_games = games | {self.game_key[r] for r in chosen}
+                if len(picked_games) >= MIN_GAMES:
+                    best['score'] = score
+                    best['rows'] = list(chosen)
+                return
+            # Try the most promising candidates first so the first leaf is usually optimal
+            options = []
+            for r in candidates[depth]:
+                left = remaining - int(self.salary[r])
+                if r in used or left < 0:
+                    continue
+                value = self.projection[r] + bound[depth + 1, left // unit]
+                if np.isfinite(value):
+                    options.append((value, r, left))
+            options.sort(key=lambda o: -o[0])
+            for value, r, left in options:
+                if score + value <= best['score'] + 1e-9:
+                    break
+                hitter_team = None if self.is_pitcher[r] else self.team[r]
+                if hitter_team is not None and team_counts.get(hitter_team, 0) >= MAX_HITTERS_PER_TEAM:
+                    continue
+                used.add(r)
+                chosen.append(r)
+                if hitter_team is not None:
+                    team_counts[hitter_team] = team_counts.get(hitter_team, 0) + 1
+                search(depth + 1, left, score + self.projection[r])
+                if hitter_team is not None:
+                    team_counts[hitter_team] -= 1
+                chosen.pop()
+                used.discard(r)
+
+        search(0, budget, 0.0)
+        if best['rows'] is None:
+            self._cache[key] = None
+            return None
+
+        fill = np.array(best['rows'], dtype=np.int64)
+        self._cache[key] = fill
+        new = current.copy()
+        new[open_slots] = fill
+        return new
+
+
+def parse_entry_cell(value) -> Optional[int]:
+    """
+    DK entry exports hold "Name (12345678)" or a bare id; return the DK id.
+    """
+    match = re.search(r'\((\d+)\)\s*$', str(value)) or re.fullmatch(r'\s*(\d+)\s*', str(value))
+    return int(match.group(1)) if match else None
+
+
+def read_entries_csv(path, slots=ROSTER_SLOTS):
+    """
+    Read a DK entries export. Returns (rows as dicts, slot column names, dk id matrix).
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as infile:
+        reader = csv.reader(infile)
+        header = next(reader)
+        slot_cols = []
+        search_from = 0
+        for slot in slots:
+            idx = header.index(slot, search_from)
+            slot_cols.append(idx)
+            search_from = idx + 1
+        rows, ids = [], []
+        for line in reader:
+            if len(line) <= max(slot_cols) or not line[0].strip():
+                continue
+            dk_ids = [parse_entry_cell(line[c]) for c in slot_cols]
+            if None in dk_ids:
+                continue
+            rows.append(line)
+            ids.append(dk_ids)
+    return header, slot_cols, rows, ids
+
+
+def write_entries_csv(path, header, slot_cols, rows, entries, players):
+    """
+    Write the re-optimized entries back in DK's upload format.
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(header)
+        for line, entry in zip(rows, entries):
+            line = list(line)
+            for col, r in zip(slot_cols, entry):
+                line[col] = f"{players['name'][r]} ({players['playerDkId'][r]})"
+            writer.writerow(line)
+
+
+def fetch_actual_lineups(session, date_str):
+    try:
+        response = session.get(f"{API_BASE_URL}/Lineups/Actual/{date_str}", verify=False)
+        if response.status_code == 200:
+            return response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching actual lineups: {e}")
+    return []
+
+
+def print_changes(changes, players):
+    for e, (old, new) in sorted(changes.items()):
+        out = [players['name'][r] for r in old if r not in new]
+        inn = [players['name'][r] for r in new if r not in old]
+        print(f"  Entry {e}: out {out} -> in {inn}")
+
+
+def self_check():
+    """
+    Synthetic two-game slate (NYY-BOS, TB-TOR): the rostered Yankees
+    catcher is left out of the confirmed "Yankees" batting order, so his
+    entry must swap to the other catcher. Returns True when it does.
+    """
+    positions = ['SP', 'SP', 'C', 'C', '1B', '2B', '3B', 'SS', 'OF', 'OF', 'OF', 'OF']
+    teams = ['NYY', 'TB', 'NYY', 'TB', 'NYY', 'TB', 'NYY', 'TB', 'NYY', 'TB', 'NYY', 'TB']
+    players = {
+        'name': np.array([f"Player {i}" for i in range(len(positions))], dtype=object),
+        'bbrefId': np.array([f"player{i:02d}" for i in range(len(positions))], dtype=object),
+        'playerDkId': np.arange(100, 100 + len(positions), dtype=np.int64),
+        'position': np.array(positions, dtype=object),
+        'team': np.array(teams, dtype=object),
+        'opp': np.array(['BOS' if t == 'NYY' else 'TOR' for t in teams], dtype=object),
+        'is_pitcher': np.array([p == 'SP' for p in positions]),
+        'mean': np.array([20, 18, 9, 6, 8, 7, 7, 6, 8, 7, 7, 5], dtype=np.float64),
+        'salary': np.full(len(positions), 4000, dtype=np.int64),
+        'gameStart': np.array(['2100-01-01T23:05:00'] * len(positions), dtype=object),
+    }
+    entries = np.array([[0, 1, 2, 4, 5, 6, 7, 8, 9, 10]], dtype=np.int64)
+    optimizer = LateSwapOptimizer(players, entries, now=0.0)
+
+    starters = players['bbrefId'][[4, 6, 8, 10]]
+    lineup = {'team': 'Yankees', **{key: bbrefid for key, bbrefid in zip(BATTING_KEYS, starters)}}
+    changes = optimizer.on_confirmed_lineups([lineup])
+    swapped = 0 in changes and 2 not in changes[0][1] and 3 in changes[0][1]
+    print(f"Confirmed lineup check: {'OK' if swapped else 'FAILED'} ({len(changes)} entries swapped)")
+    return swapped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Late-swap lineup re-optimizer for DK classic MLB")
+    parser.add_argument("draftgroup", type=int, nargs="?", help="DraftKings draft group id")
+    parser.add_argument("entries", nargs="?", help="DK entries CSV export")
+    parser.add_argument("--output", default="lateswap_entries.csv", help="Where to write updated entries")
+    parser.add_argument("--date", default=datetime.now().strftime('%Y-%m-%d'), help="Slate date (yyyy-MM-dd)")
+    parser.add_argument("--scratch", nargs="*", default=[], help="Additional bbrefIds to scratch")
+    parser.add_argument("--poll", type=int, default=0, help="Re-check confirmed lineups every N seconds")
+    parser.add_argument("--self-check", action="store_true",
+                        help="Run the confirmed-lineup swap on a synthetic slate and exit")
+    args = parser.parse_args()
+
+    if args.self_check:
+        raise SystemExit(0 if self_check() else 1)
+    if args.draftgroup is None or args.entries is None:
+        parser.error("draftgroup and entries are required")
+
+    players = load_slate(args.draftgroup)
+    header, slot_cols, rows, dk_entries = read_entries_csv(args.entries)
+    keep = [i for i, e in enumerate(dk_entries) if all(d in set(players['playerDkId'].tolist()) for d in e)]
+    if len(keep) < len(dk_entries):
+        print(f"Skipping {len(dk_entries) - len(keep)} entries with players missing projections")
+    rows = [rows[i] for i in keep]
+    dk_index = {int(d): i for i, d in enumerate(players['playerDkId'])}
+    entries = np.array([[dk_index[d] for d in dk_entries[i]] for i in keep], dtype=np.int64)
+
+    optimizer = LateSwapOptimizer(players, entries)
+    session = requests.Session()
+    session.verify = False
+
+    seen_teams = set()
+    while True:
+        start = time.time()
+        changes = {}
+        lineups = [l for l in fetch_actual_lineups(session, args.date) if l.get('team') not in seen_teams]
+        if lineups:
+            seen_teams |= {l.get('team') for l in lineups}
+            changes.update(optimizer.on_confirmed_lineups(lineups))
+        if args.scratch:
+            changes.update(optimizer.on_scratch(bbrefids=args.scratch))
+            args.scratch = []
+
+        print(f"{len(lineups)} new confirmed lineups, {len(changes)} entries swapped in {time.time() - start:.2f}s")
+        print_changes(changes, players)
+        if changes:
+            write_entries_csv(args.output, header, slot_cols, rows, optimizer.entries, players)
+            print(f"Wrote updated entries to {args.output}")
+
+        if args.poll <= 0 or optimizer.locked().all():
+            break
+        time.sleep(args.poll)
+
+
+if __name__ == "__main__":
+    main()
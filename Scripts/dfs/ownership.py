@@ -0,0 +1,362 @@
+import os
+import sys
+import csv
+import glob
+import json
+import argparse
+from datetime import datetime
+from typing import List, Dict, Any
+
+import numpy as np
+import requests
+import urllib3
+
+from dfssim import NICKNAME_TO_DK, load_slate, normalize_name
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from oddsmath import consensus_probability, game_odds_prices
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_DIR = os.path.join(BASE_DIR, "ownership_history")
+MODEL_FILE = os.path.join(BASE_DIR, "ownership_model.json")
+
+# Without a posted game total, implied team totals split a league-average
+# total using the Pythagorean exponent
+LEAGUE_GAME_TOTAL = 8.8
+PYTHAG_EXPONENT = 1.83
+
+# Total ownership per slate in percent: DK classic rosters 2 P and 8 hitters
+PITCHER_OWNERSHIP_TOTAL = 200.0
+HITTER_OWNERSHIP_TOTAL = 800.0
+
+RIDGE_LAMBDA = 1.0
+OWNERSHIP_FLOOR = 0.1  # percent, keeps the logit finite
+
+FEATURES = [
+    "intercept", "salary_k", "projection", "value", "implied_total",
+    "projection_z", "value_z", "implied_z",
+    "pitcher", "pitcher_projection_z", "pitcher_value_z", "pitcher_implied_z",
+]
+
+
+def implied_team_totals(game_odds: List[Dict[str, Any]], game_total=LEAGUE_GAME_TOTAL):
+    """
+    Convert GameOdds moneylines into implied runs per team.
+    Each book's two-way price is de-vigged, books are averaged, and the
+    home win probability is split into runs with the Pythagorean exponent.
+
+    Returns:
+        Dictionary of DK team abbreviation -> implied runs
+    """
+    if not game_odds:
+        return {}
+    fair_home = consensus_probability(game_odds_prices(game_odds))[:, 0]
+    fair_home = np.where(np.isnan(fair_home), 0.5, fair_home)
+
+    ratio = (fair_home / (1.0 - fair_home)) ** (1.0 / PYTHAG_EXPONENT)
+    home_runs = game_total * ratio / (1.0 + ratio)
+    away_runs = game_total - home_runs
+
+    totals = {}
+    for g, h_runs, a_runs in zip(game_odds, home_runs, away_runs):
+        home_abbr = NICKNAME_TO_DK.get(g.get('homeTeam'), g.get('homeTeam'))
+        away_abbr = NICKNAME_TO_DK.get(g.get('awayTeam'), g.get('awayTeam'))
+        totals[home_abbr] = float(h_runs)
+        totals[away_abbr] = float(a_runs)
+    return totals
+
+
+def fetch_game_odds(session, date_str):
+    try:
+        response = session.get(f"{API_BASE_URL}/GameOdds/date/{date_str}", verify=False)
+        if response.status_code == 200:
+            return response.json()
+        print(f"Error fetching game odds for {date_str}: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while fetching game odds for {date_str}: {e}")
+    return []
+
+
+def _zscore_by_group(values, groups):
+    """
+    Z-score values within each group (pitchers vs hitters on the slate).
+    """
+    out = np.zeros_like(values, dtype=np.float64)
+    for g in np.unique(groups):
+        mask = groups == g
+        std = values[mask].std()
+        out[mask] = (values[mask] - values[mask].mean()) / std if std > 0 else 0.0
+    return out
+
+
+def build_features(players, implied):
+    """
+    Feature matrix for one slate. Rows align with the players table.
+    Slate-relative z-scores let one model serve 2-game and 15-game slates.
+    """
+    salary = players['salary'].astype(np.float64)
+    projection = players['mean'].astype(np.float64)
+    pitcher = players['is_pitcher'].astype(np.float64)
+    value = np.where(salary > 0, projection / np.maximum(salary, 1) * 1000.0, 0.0)
+
+    # Pitchers are scored on the opponent's implied total (lower is better)
+    own_total = np.array([implied.get(t, LEAGUE_GAME_TOTAL / 2) for t in players['team']])
+    opp_total = np.array([implied.get(o, LEAGUE_GAME_TOTAL / 2) for o in players['opp']])
+    implied_total = np.where(pitcher > 0, -opp_total, own_total)
+
+    group = players['is_pitcher']
+    projection_z = _zscore_by_group(projection, group)
+    value_z = _zscore_by_group(value, group)
+    implied_z = _zscore_by_group(implied_total, group)
+
+    columns = {
+        "intercept": np.ones_like(salary),
+        "salary_k": salary / 1000.0,
+        "projection": projection,
+        "value": value,
+        "implied_total": implied_total,
+        "projection_z": projection_z,
+        "value_z": value_z,
+        "implied_z": implied_z,
+        "pitcher": pitcher,
+        "pitcher_projection_z": pitcher * projection_z,
+        "pitcher_value_z": pitcher * value_z,
+        "pitcher_implied_z": pitcher * implied_z,
+    }
+    return np.column_stack([columns[name] for name in FEATURES])
+
+
+def fit_ridge(X, y, lam=RIDGE_LAMBDA):
+    """
+    Closed-form ridge regression; the intercept is not penalized.
+    """
+    penalty = lam * np.eye(X.shape[1])
+    penalty[0, 0] = 0.0
+    return np.linalg.solve(X.T @ X + penalty, X.T @ y)
+
+
+def predict_ownership(X, is_pitcher, coefficients):
+    """
+    Score a whole slate in one pass and rescale so pitchers and hitters
+    sum to the ownership DK rosters imply.
+
+    Returns:
+        Array of projected ownership in percent
+    """
+    raw = 1.0 / (1.0 + np.exp(-(X @ coefficients)))
+    own = np.zeros_like(raw)
+    for mask, total in ((is_pitcher, PITCHER_OWNERSHIP_TOTAL), (~is_pitcher, HITTER_OWNERSHIP_TOTAL)):
+        if mask.any() and raw[mask].sum() > 0:
+            own[mask] = raw[mask] / raw[mask].sum() * total
+    return np.clip(own, 0.0, 100.0)
+
+
+def read_contest_ownership(path):
+    """
+    Read %Drafted from a DK contest standings export.
+
+    Returns:
+        Dictionary of normalized player name -> ownership percent
+    """
+    ownership = {}
+    with open(path, 'r', encoding='utf-8-sig', newline='') as infile:
+        reader = csv.DictReader(infile)
+        for row in reader:
+            name = row.get('Player')
+            drafted = (row.get('%Drafted') or '').replace('%', '').strip()
+            if not name or not drafted:
+                continue
+            try:
+                ownership[normalize_name(name)] = float(drafted)
+            except ValueError:
+                continue
+    return ownership
+
+
+def slate_date(players):
+    """
+    Slate date (yyyy-MM-dd) from the earliest game start in the pool.
+    """
+    starts = sorted(str(s) for s in players['gameStart'] if s)
+    return starts[0][:10] if starts else datetime.now().strftime('%Y-%m-%d')
+
+
+def features_path(draftgroup_id, history_dir=HISTORY_DIR):
+    return os.path.join(history_dir, f"{draftgroup_id}_features.npz")
+
+
+def save_feature_snapshot(draftgroup_id, players, X, history_dir=HISTORY_DIR):
+    """
+    Keep the slate's features as they stood before lock, next to where its
+    contest standings will be saved, so training never rebuilds them from
+    later projections or odds.
+    """
+    os.makedirs(history_dir, exist_ok=True)
+    path = features_path(draftgroup_id, history_dir)
+    np.savez_compressed(
+        path,
+        X=X,
+        names=np.array([normalize_name(n) for n in players['name']], dtype=str),
+        is_pitcher=np.asarray(players['is_pitcher'], dtype=bool),
+        features=np.array(FEATURES, dtype=str),
+        captured_at=np.array(datetime.now().isoformat(timespec='seconds')),
+    )
+    return path
+
+
+def load_feature_snapshot(draftgroup_id, history_dir=HISTORY_DIR):
+    """
+    (X, normalized names) saved for a draft group, or None when it was
+    never snapshotted or used a different feature set.
+    """
+    path = features_path(draftgroup_id, history_dir)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as snapshot:
+        if snapshot['features'].tolist() != FEATURES:
+            print(f"Draft group {draftgroup_id}: features snapshot uses a different feature set, skipping")
+            return None
+        return snapshot['X'], snapshot['names'].tolist()
+
+
+def build_training_set(history_dir=HISTORY_DIR):
+    """
+    Assemble the historical design matrix from saved contest standings.
+    Files are named {draftGroupId}_*.csv; each slate's features come from
+    the {draftGroupId}_features.npz snapshot taken before lock (predict or
+    snapshot), never from today's projections. Slates without one are
+    skipped.
+    """
+    X_parts, y_parts = [], []
+
+    files = sorted(glob.glob(os.path.join(history_dir, "*.csv")))
+    by_group = {}
+    for path in files:
+        group_id = os.path.basename(path).split('_')[0]
+        if group_id.isdigit():
+            by_group.setdefault(int(group_id), []).append(path)
+
+    for group_id, paths in by_group.items():
+        snapshot = load_feature_snapshot(group_id, history_dir)
+        if snapshot is None:
+            print(f"Draft group {group_id}: no pre-lock features snapshot, skipping")
+            continue
+        X, names = snapshot
+        ownership = {}
+        for path in paths:
+            ownership.update(read_contest_ownership(path))
+        target = np.array([ownership.get(name, 0.0) for name in names])
+        share = np.clip(target, OWNERSHIP_FLOOR, 100.0 - OWNERSHIP_FLOOR) / 100.0
+        y = np.log(share / (1.0 - share))
+        X_parts.append(X)
+        y_parts.append(y)
+        print(f"Draft group {group_id}: {len(target)} players, {int((target > 0).sum())} with ownership")
+
+    if not X_parts:
+        return np.empty((0, len(FEATURES))), np.empty(0)
+    return np.vstack(X_parts), np.concatenate(y_parts)
+
+
+def save_model(coefficients, n_rows, path=MODEL_FILE):
+    model = {
+        "features": FEATURES,
+        "coefficients": [float(c) for c in coefficients],
+        "trainedOn": n_rows,
+        "trainedAt": datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(path, 'w', encoding='utf-8') as outfile:
+        json.dump(model, outfile, indent=2)
+
+
+def load_model(path=MODEL_FILE):
+    with open(path, 'r', encoding='utf-8') as infile:
+        model = json.load(infile)
+    if model.get("features") != FEATURES:
+        raise ValueError(f"Ownership model at {path} was trained on a different feature set; retrain it")
+    return np.array(model["coefficients"], dtype=np.float64)
+
+
+def slate_features(draftgroup_id):
+    """
+    (players table, design matrix) for a draft group from the current
+    projections and odds.
+    """
+    players = load_slate(draftgroup_id)
+    session = requests.Session()
+    session.verify = False
+    implied = implied_team_totals(fetch_game_odds(session, slate_date(players)))
+    return players, build_features(players, implied)
+
+
+def project_slate(draftgroup_id, model_path=MODEL_FILE, history_dir=HISTORY_DIR):
+    """
+    Projected ownership for every player in a draft group. The features are
+    snapshotted for training at the same time.
+
+    Returns:
+        (players table, ownership array in percent)
+    """
+    coefficients = load_model(model_path)
+    players, X = slate_features(draftgroup_id)
+    save_feature_snapshot(draftgroup_id, players, X, history_dir)
+    return players, predict_ownership(X, players['is_pitcher'], coefficients)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DK ownership projection model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="Fit the model from saved contest standings")
+    train.add_argument("--history", default=HISTORY_DIR, help="Folder of {draftGroupId}_*.csv standings exports")
+    snapshot = sub.add_parser("snapshot", help="Save a draft group's features before lock for later training")
+    snapshot.add_argument("draftgroup", type=int)
+    predict = sub.add_parser("predict", help="Project ownership for a draft group")
+    predict.add_argument("draftgroup", type=int)
+    predict.add_argument("--output", help="Optional CSV output path")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        X, y = build_training_set(args.history)
+        if len(y) == 0:
+            print(f"No contest standings found in {args.history}")
+            return
+        coefficients = fit_ridge(X, y)
+        save_model(coefficients, len(y))
+        print(f"Trained on {len(y)} player-slates. Saved model to {MODEL_FILE}")
+        for name, coef in zip(FEATURES, coefficients):
+            print(f"  {name:<22} {coef:8.4f}")
+        return
+
+    if args.command == "snapshot":
+        players, X = slate_features(args.draftgroup)
+        path = save_feature_snapshot(args.draftgroup, players, X)
+        print(f"Saved features for {len(players['name'])} players to {path}")
+        return
+
+    try:
+        players, own = project_slate(args.draftgroup)
+    except FileNotFoundError:
+        print(f"No model trained at {MODEL_FILE}; run `ownership.py train` first")
+        return
+    order = np.argsort(-own)
+    print("\nPlayer                     Team  Pos     Salary   Proj   Own%")
+    for i in order[:40]:
+        print(f"{players['name'][i]:<26} {players['team'][i]:<5} {players['position'][i]:<7} "
+              f"{players['salary'][i]:6d} {players['mean'][i]:6.1f} {own[i]:6.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(["playerDkId", "name", "team", "position", "salary", "projection", "ownership"])
+            for i in order:
+                writer.writerow([players['playerDkId'][i], players['name'][i], players['team'][i],
+                                 players['position'][i], players['salary'][i], round(players['mean'][i], 2),
+                                 round(own[i], 2)])
+        print(f"Wrote projected ownership to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ import re
 import csv
 import time
 import urllib3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 
 # Disable SSL warnings to avoid certificate verification issues
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -215,9 +215,12 @@ def get_bbref_id(player_name: str, team: str) -> Optional[str]:
         print(f"Error fetching bbrefid for {player_name} ({team}): {e}")
         return None
 
-def prepare_hitter_payload(row: Dict[str, Any]) -> Dict[str, Any]:
+def prepare_hitter_payload(row: Dict[str, Any], resolve_id: Optional[Callable[[str, str], Optional[str]]] = None,
+                           year: int = 2025) -> Dict[str, Any]:
     """
     Prepares a player row for insertion into the projectedHitterStats table
+    resolve_id defaults to get_bbref_id (one API call per player); year is
+    the projection season stored with the row
     """
     # Get player name - use 'Player' instead of 'PlayerName'
     player_name = row.get('Player', '')
@@ -229,12 +232,12 @@ def prepare_hitter_payload(row: Dict[str, Any]) -> Dict[str, Any]:
     print(f"Processing hitter: {player_info['name']}, team: {player_info['team']}, position: {player_info['position']}")
     
     # Try to get bbrefID
-    bbref_id = get_bbref_id(player_info['name'], player_info['team'])
+    bbref_id = (resolve_id or get_bbref_id)(player_info['name'], player_info['team'])
     
     # Create the payload
     payload = {
         "bbrefId": bbref_id or f"{player_info['name'].replace(' ', '').lower()}_{player_info['team']}",
-        "year": 2025,
+        "year": year,
         "name": player_info['name'],
         "team": player_info['team'],
         "position": player_info['position'],
@@ -341,9 +344,12 @@ def prepare_hitter_payload(row: Dict[str, Any]) -> Dict[str, Any]:
     
     return payload
 
-def prepare_pitcher_payload(row: Dict[str, Any]) -> Dict[str, Any]:
+def prepare_pitcher_payload(row: Dict[str, Any], resolve_id: Optional[Callable[[str, str], Optional[str]]] = None,
+                            year: int = 2025) -> Dict[str, Any]:
     """
     Prepares a player row for insertion into the projectedPitcherStats table
+    resolve_id defaults to get_bbref_id (one API call per player); year is
+    the projection season stored with the row
     """
     # Get player name - use 'Player' instead of 'PlayerName'
     player_name = row.get('Player', '')
@@ -355,12 +361,12 @@ def prepare_pitcher_payload(row: Dict[str, Any]) -> Dict[str, Any]:
     print(f"Processing pitcher: {player_info['name']}, team: {player_info['team']}, position: {player_info['position']}")
     
     # Try to get bbrefID
-    bbref_id = get_bbref_id(player_info['name'], player_info['team'])
+    bbref_id = (resolve_id or get_bbref_id)(player_info['name'], player_info['team'])
     
     # Create the payload
     payload = {
         "bbrefId": bbref_id or f"{player_info['name'].replace(' ', '').lower()}_{player_info['team']}",
-        "year": 2025,
+        "year": year,
         "name": player_info['name'],
         "team": player_info['team'],
         "position": player_info['position'],
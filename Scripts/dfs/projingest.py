@@ -0,0 +1,242 @@
+import os
+import json
+import hashlib
+import argparse
+import unicodedata
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+import requests
+import urllib3
+from bs4 import BeautifulSoup, SoupStrainer
+
+from popProj import (
+    prepare_hitter_payload,
+    prepare_pitcher_payload,
+    post_batch_to_api,
+    save_missing_players,
+)
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+PLAYER_INDEX_FILE = os.path.join(CACHE_DIR, "mlbplayers.json")
+
+PROJECTION_URLS = {
+    'hitter': "https://www.fantasypros.com/mlb/projections/hitters.php",
+    'pitcher': "https://www.fantasypros.com/mlb/projections/pitchers.php",
+}
+STORED_ENDPOINTS = {
+    'hitter': "ProjectedHitterStats",
+    'pitcher': "ProjectedPitcherStats",
+}
+PREPARE_PAYLOAD = {
+    'hitter': prepare_hitter_payload,
+    'pitcher': prepare_pitcher_payload,
+}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36"
+}
+
+BATCH_SIZE = 50
+
+
+def name_key(name: str) -> str:
+    """
+    Accent- and case-insensitive key, matching the MLBPlayer/search collation.
+    """
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(name.lower().split())
+
+
+class PlayerIndex:
+    """
+    Local bbrefId lookup built from one MLBPlayer/all call.
+    Resolution mirrors MLBPlayer/search: a unique name wins, otherwise the
+    team breaks the tie, and failing that the first match is taken.
+    """
+
+    def __init__(self, players: List[Dict[str, Any]]):
+        self.by_name = {}
+        for player in players:
+            key = name_key(player.get('fullName', ''))
+            if key:
+                self.by_name.setdefault(key, []).append(player)
+
+    @classmethod
+    def load(cls, session, cache_file=PLAYER_INDEX_FILE):
+        """
+        Fetch the player table once, falling back to the last cached copy.
+        """
+        try:
+            response = session.get(f"{API_BASE_URL}/MLBPlayer/all", verify=False)
+            response.raise_for_status()
+            players = response.json()
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as outfile:
+                json.dump(players, outfile)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Could not fetch MLBPlayer/all ({e}); using cached index {cache_file}")
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as infile:
+                    players = json.load(infile)
+            except (OSError, ValueError):
+                players = []
+        print(f"Loaded player index with {len(players)} players")
+        return cls(players)
+
+    def resolve(self, player_name: str, team: str) -> Optional[str]:
+        matches = self.by_name.get(name_key(player_name), [])
+        on_team = [p for p in matches if p.get('currentTeam') == team]
+        if on_team:
+            return on_team[0].get('bbrefId')
+        return matches[0].get('bbrefId') if matches else None
+
+
+def iter_projection_rows(url: str) -> Iterator[Dict[str, str]]:
+    """
+    Yield FantasyPros projection rows one at a time as header -> cell text dicts.
+    Only the projections table is parsed (SoupStrainer), not the whole page.
+    """
+    response = requests.get(url, headers=HEADERS, verify=False)
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.content, 'html.parser', parse_only=SoupStrainer('table', id='data'))
+    table = soup.find('table', id='data')
+    if not table:
+        print("Could not find the projections table")
+        return
+
+    headers = [th.get_text(strip=True) for th in table.find('thead').find('tr').find_all('th')]
+    for tr in table.find('tbody').find_all('tr', recursive=False):
+        cells = tr.find_all('td')
+        yield {headers[i]: cell.get_text(strip=True) for i, cell in enumerate(cells) if i < len(headers)}
+        tr.decompose()
+
+
+def canonical_hash(record: Dict[str, Any]) -> str:
+    """
+    Content hash of a projection payload or stored API row. Keys are compared
+    case-insensitively so "PA" (payload) and "pa" (API JSON) match, and
+    numbers are rounded so 0.250 and .25 hash the same.
+    """
+    canonical = {}
+    for key, value in record.items():
+        key = key.lower()
+        if isinstance(value, bool) or value is None:
+            canonical[key] = value
+        elif isinstance(value, (int, float)):
+            canonical[key] = round(float(value), 3)
+        else:
+            canonical[key] = str(value).strip()
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def fetch_stored_hashes(session, player_type: str, year: int, fields: List[str]) -> Dict[str, str]:
+    """
+    Hash the projections currently stored in the API, restricted to the
+    fields the scraper writes, keyed by bbrefId.
+    """
+    url = f"{API_BASE_URL}/{STORED_ENDPOINTS[player_type]}/year/{year}"
+    try:
+        response = session.get(url, verify=False)
+        response.raise_for_status()
+        stored = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Could not fetch stored {player_type} projections ({e}); every row will be posted")
+        return {}
+
+    wanted = {f.lower() for f in fields}
+    hashes = {}
+    for row in stored:
+        subset = {k: v for k, v in row.items() if k.lower() in wanted}
+        hashes[row.get('bbrefId')] = canonical_hash(subset)
+    return hashes
+
+
+def changed_payloads(rows: Iterator[Dict[str, str]], player_type: str, index: PlayerIndex,
+                     stored_hashes: Optional[Dict[str, str]], year: int) -> Iterator[Tuple[Dict[str, Any], bool]]:
+    """
+    Turn scraped rows into payloads and yield only those whose content hash
+    differs from the stored projection. Yields (payload, is_missing_id).
+    """
+    prepare = PREPARE_PAYLOAD[player_type]
+    for row in rows:
+        payload = prepare(row, resolve_id=index.resolve, year=year)
+        if stored_hashes is not None and stored_hashes.get(payload['bbrefId']) == canonical_hash(payload):
+            continue
+        yield payload, '_' in payload['bbrefId']
+
+
+def ingest(session, player_type: str, index: PlayerIndex, year: int, batch_size: int = BATCH_SIZE,
+           dry_run: bool = False) -> Dict[str, int]:
+    """
+    Stream one projection table and post only changed rows in batches.
+    """
+    rows = iter_projection_rows(PROJECTION_URLS[player_type])
+
+    # Peek at the first row to learn the payload's field set for stored hashing
+    first = next(rows, None)
+    if first is None:
+        return {'scraped': 0, 'changed': 0, 'posted': 0, 'missing': 0}
+    sample = PREPARE_PAYLOAD[player_type](dict(first), resolve_id=lambda name, team: None, year=year)
+    stored_hashes = fetch_stored_hashes(session, player_type, year, list(sample.keys()))
+
+    def all_rows():
+        yield first
+        yield from rows
+
+    counts = {'scraped': 0, 'changed': 0, 'posted': 0, 'missing': 0}
+
+    def counted(source):
+        for row in source:
+            counts['scraped'] += 1
+            yield row
+
+    batch = []
+    missing = []
+    for payload, is_missing in changed_payloads(counted(all_rows()), player_type, index, stored_hashes, year):
+        counts['changed'] += 1
+        if is_missing:
+            missing.append({'name': payload['name'], 'team': payload['team']})
+        batch.append(payload)
+        if len(batch) >= batch_size:
+            if not dry_run and post_batch_to_api(batch, player_type):
+                counts['posted'] += len(batch)
+            batch = []
+    if batch and not dry_run and post_batch_to_api(batch, player_type):
+        counts['posted'] += len(batch)
+
+    counts['missing'] = len(missing)
+    if missing:
+        filename = f"missing_{player_type}s.csv"
+        save_missing_players(missing, filename)
+        print(f"Saved {len(missing)} missing {player_type}s to {filename}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental FantasyPros projection ingest")
+    parser.add_argument("--year", type=int, default=2025, help="Projection year stored in the API")
+    parser.add_argument("--type", choices=['hitter', 'pitcher', 'all'], default='all')
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Diff only, do not post")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.verify = False
+    index = PlayerIndex.load(session)
+
+    types = ['hitter', 'pitcher'] if args.type == 'all' else [args.type]
+    for player_type in types:
+        print(f"Ingesting {player_type} projections...")
+        counts = ingest(session, player_type, index, args.year, args.batch_size, args.dry_run)
+        print(f"{player_type}: scraped {counts['scraped']}, changed {counts['changed']}, "
+              f"posted {counts['posted']}, missing ids {counts['missing']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+import os
+import pickle
+import argparse
+from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "projections")
+
+# Team season targets the projections are rescaled to. The pitching target is the
+# midpoint of normpitch's TARGET_MIN/TARGET_MAX window.
+TEAM_PA_TARGET = 6150.0
+TEAM_IP_TARGET = 1450.0
+
+# Teams that are not real rosters and are never rescaled
+UNNORMALIZED_TEAMS = {"FA", ""}
+
+HITTER_COUNTING = ["pa", "ab", "r", "h", "doubles", "triples", "hr", "rbi", "sb", "bb", "so"]
+PITCHER_COUNTING = ["ip", "k", "w", "l", "sv", "er", "h", "bb", "hr", "g", "gs", "cg"]
+
+
+def fetch_frame(session, url):
+    """
+    Fetch a projection table from the API as a DataFrame (one call for all teams).
+    """
+    try:
+        response = session.get(url, verify=False)
+        if response.status_code == 200:
+            return pd.DataFrame(response.json())
+        print(f"Error fetching {url}: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while fetching {url}: {e}")
+    return pd.DataFrame()
+
+
+def team_hashes(df):
+    """
+    Order-independent content hash of each team's projection rows.
+    """
+    if df.empty:
+        return pd.Series(dtype=np.uint64)
+    row_hash = pd.util.hash_pandas_object(df, index=False)
+    return row_hash.groupby(df["team"].values).sum()
+
+
+def compute_team_hitting(hitters):
+    """
+    Vectorized equivalent of normhit.compute_team_totals + compute_team_stats
+    for every team at once.
+    """
+    totals = hitters.groupby("team")[["ab", "r", "h", "doubles", "triples", "hr", "bb"]].sum()
+    ab = totals["ab"].to_numpy(dtype=float)
+    h = totals["h"].to_numpy(dtype=float)
+    bb = totals["bb"].to_numpy(dtype=float)
+    singles = h - totals["doubles"] - totals["triples"] - totals["hr"]
+    total_bases = singles + 2 * totals["doubles"] + 3 * totals["triples"] + 4 * totals["hr"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        totals["ba"] = np.where(ab > 0, h / ab, 0.0)
+        totals["obp"] = np.where(ab + bb > 0, (h + bb) / (ab + bb), 0.0)
+        totals["slg"] = np.where(ab > 0, total_bases / ab, 0.0)
+    totals["ops"] = totals["obp"] + totals["slg"]
+    return totals
+
+
+def compute_team_pitching(pitchers):
+    """
+    Team IP, ER, W, L and ERA from the normalized pitcher projections.
+    """
+    totals = pitchers.groupby("team")[["ip", "er", "w", "l"]].sum()
+    ip = totals["ip"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        totals["era"] = np.where(ip > 0, totals["er"] * 9 / ip, 0.0)
+    return totals
+
+
+def normalize_hitters(hitters, target_pa=TEAM_PA_TARGET):
+    """
+    Rescale every team's hitter counting stats so active players sum to target_pa.
+    Scratched players are zeroed and their playing time is absorbed by teammates.
+    """
+    df = hitters.copy()
+    active = ~df["scratched"]
+    team_pa = df["pa"].where(active, 0).groupby(df["team"]).transform("sum")
+    factor = np.where((team_pa > 0) & active, target_pa / team_pa.replace(0, np.nan), 0.0)
+    factor = np.where(df["team"].isin(UNNORMALIZED_TEAMS), active.astype(float), factor)
+    df["scale"] = factor
+    df[HITTER_COUNTING] = df[HITTER_COUNTING].mul(factor, axis=0)
+
+    ab = df["ab"].to_numpy(dtype=float)
+    singles = df["h"] - df["doubles"] - df["triples"] - df["hr"]
+    total_bases = singles + 2 * df["doubles"] + 3 * df["triples"] + 4 * df["hr"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["avg"] = np.where(ab > 0, df["h"] / ab, 0.0)
+        df["obp"] = np.where(ab + df["bb"] > 0, (df["h"] + df["bb"]) / (ab + df["bb"]), 0.0)
+        df["slg"] = np.where(ab > 0, total_bases / ab, 0.0)
+    df["ops"] = df["obp"] + df["slg"]
+    return df
+
+
+def normalize_pitchers(pitchers, target_ip=TEAM_IP_TARGET):
+    """
+    Rescale each team's pitcher counting stats so the staff sums to target_ip.
+    Follows normpitch.adjust_team's eligibility rules: MiLB arms, placeholder
+    ids (underscore in bbrefId) and low-volume SPs are excluded from the staff.
+    """
+    df = pitchers.copy()
+    eligible = (
+        ~df["scratched"]
+        & (df["miLB"].str.lower() != "yes")
+        & ~df["bbrefId"].str.contains("_", regex=False)
+        & ~((df["position"] == "SP") & (df["ip"] < 30))
+    )
+    team_ip = df["ip"].where(eligible, 0).groupby(df["team"]).transform("sum")
+    factor = np.where((team_ip > 0) & eligible, target_ip / team_ip.replace(0, np.nan), 0.0)
+    factor = np.where(df["team"].isin(UNNORMALIZED_TEAMS), (~df["scratched"]).astype(float), factor)
+    df["scale"] = factor
+    df[PITCHER_COUNTING] = df[PITCHER_COUNTING].mul(factor, axis=0)
+
+    ip = df["ip"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["era"] = np.where(ip > 0, df["er"] * 9 / ip, 0.0)
+        df["whip"] = np.where(ip > 0, (df["h"] + df["bb"]) / ip, 0.0)
+    return df
+
+
+def prepare_raw(df, counting):
+    """
+    Coerce API rows into the numeric/string dtypes used for normalization.
+    """
+    if df.empty:
+        return df
+    df = df.copy()
+    for col in counting:
+        if col not in df:
+            df[col] = 0.0
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype(float)
+    for col in ("team", "bbrefId", "miLB", "position", "name"):
+        if col not in df:
+            df[col] = ""
+        df[col] = df[col].fillna("").astype(str)
+    return df.sort_values(["team", "bbrefId"]).reset_index(drop=True)
+
+
+class ProjectionStore:
+    """
+    Columnar, slate-scoped cache of normalized hitter and pitcher projections.
+
+    Raw projections for every team are fetched in a single call per table.
+    Each team's rows are content-hashed, so a refresh only re-normalizes the
+    teams whose inputs changed, and a scratch only touches the scratched
+    player's team.
+    """
+
+    def __init__(self, slate, year=None, cache_dir=CACHE_DIR, session=None):
+        self.slate = str(slate)
+        self.year = year or datetime.now().year
+        self.cache_dir = cache_dir
+        self.session = session
+        self.scratches = set()
+        self.raw = {"hitters": pd.DataFrame(), "pitchers": pd.DataFrame()}
+        self.hashes = {"hitters": pd.Series(dtype=np.uint64), "pitchers": pd.Series(dtype=np.uint64)}
+        self.normalized = {"hitters": pd.DataFrame(), "pitchers": pd.DataFrame()}
+        self._load_cache()
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f"{self.slate}.pkl")
+
+    @property
+    def hitters(self):
+        return self.normalized["hitters"]
+
+    @property
+    def pitchers(self):
+        return self.normalized["pitchers"]
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "rb") as infile:
+                state = pickle.load(infile)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"Ignoring unreadable projection cache {self.cache_path}: {e}")
+            return
+        if state.get("year") != self.year:
+            return
+        self.raw = state["raw"]
+        self.hashes = state["hashes"]
+        self.normalized = state["normalized"]
+        self.scratches = set(state.get("scratches", ()))
+
+    def _save_cache(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        state = {
+            "year": self.year,
+            "raw": self.raw,
+            "hashes": self.hashes,
+            "normalized": self.normalized,
+            "scratches": sorted(self.scratches),
+        }
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "wb") as outfile:
+            pickle.dump(state, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+
+    def _session(self):
+        if self.session is None:
+            self.session = requests.Session()
+            self.session.verify = False
+        return self.session
+
+    def _update(self, kind, raw, teams=None):
+        """
+        Re-normalize one table. When teams is None, only teams whose content
+        hash changed (or that were added/removed) are recomputed.
+        """
+        counting = HITTER_COUNTING if kind == "hitters" else PITCHER_COUNTING
+        normalize = normalize_hitters if kind == "hitters" else normalize_pitchers
+
+        raw = prepare_raw(raw, counting)
+        if raw.empty:
+            return []
+        raw["scratched"] = raw["bbrefId"].isin(self.scratches)
+
+        new_hashes = team_hashes(raw)
+        if teams is None:
+            old_hashes = self.hashes[kind]
+            joined = pd.concat([old_hashes.rename("old"), new_hashes.rename("new")], axis=1)
+            changed = joined.index[joined["old"] != joined["new"]].tolist()
+        else:
+            changed = sorted(set(teams))
+
+        if changed:
+            recompute = normalize(raw[raw["team"].isin(changed)])
+            previous = self.normalized[kind]
+            if not previous.empty:
+                previous = previous[~previous["team"].isin(changed) & previous["team"].isin(new_hashes.index)]
+            self.normalized[kind] = (
+                pd.concat([previous, recompute], ignore_index=True)
+                .sort_values(["team", "bbrefId"])
+                .reset_index(drop=True)
+            )
+
+        self.raw[kind] = raw.drop(columns="scratched")
+        self.hashes[kind] = new_hashes
+        return changed
+
+    def refresh(self):
+        """
+        Fetch all teams' projections (one call per table) and re-normalize
+        only the teams whose projections changed since the cached copy.
+
+        Returns:
+            Dictionary of table -> list of re-normalized teams
+        """
+        session = self._session()
+        hitters = fetch_frame(session, f"{API_BASE_URL}/ProjectedHitterStats/year/{self.year}")
+        pitchers = fetch_frame(session, f"{API_BASE_URL}/ProjectedPitcherStats/year/{self.year}")
+        changed = {
+            "hitters": self._update("hitters", hitters) if not hitters.empty else [],
+            "pitchers": self._update("pitchers", pitchers) if not pitchers.empty else [],
+        }
+        self._save_cache()
+        return changed
+
+    def scratch(self, bbrefids: Iterable[str], restore: bool = False):
+        """
+        Mark players as scratched (or restore them) and re-normalize only
+        their teams, reusing the cached raw projections.
+
+        Returns:
+            Dictionary of table -> list of re-normalized teams
+        """
+        ids = set(bbrefids)
+        if restore:
+            self.scratches -= ids
+        else:
+            self.scratches |= ids
+
+        changed = {}
+        for kind, raw in self.raw.items():
+            if raw.empty:
+                changed[kind] = []
+                continue
+            teams = raw.loc[raw["bbrefId"].isin(ids), "team"].unique().tolist()
+            changed[kind] = self._update(kind, raw, teams=teams) if teams else []
+        self._save_cache()
+        return changed
+
+    def team_hitting(self):
+        return compute_team_hitting(self.hitters) if not self.hitters.empty else pd.DataFrame()
+
+    def team_pitching(self):
+        return compute_team_pitching(self.pitchers) if not self.pitchers.empty else pd.DataFrame()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and normalize DFS projections for a slate")
+    parser.add_argument("slate", help="Slate key used for the cache (e.g. draft group id or date)")
+    parser.add_argument("--year", type=int, default=None, help="Projection year")
+    parser.add_argument("--scratch", nargs="*", default=[], help="bbrefIds to mark as scratched")
+    parser.add_argument("--restore", nargs="*", default=[], help="bbrefIds to un-scratch")
+    args = parser.parse_args()
+
+    store = ProjectionStore(args.slate, year=args.year)
+    changed = store.refresh()
+    print(f"Re-normalized hitters for {len(changed['hitters'])} teams, pitchers for {len(changed['pitchers'])} teams")
+
+    if args.scratch:
+        changed = store.scratch(args.scratch)
+        print(f"Scratched {args.scratch}: re-normalized {changed}")
+    if args.restore:
+        changed = store.scratch(args.restore, restore=True)
+        print(f"Restored {args.restore}: re-normalized {changed}")
+
+    hitting = store.team_hitting()
+    if not hitting.empty:
+        print("\nTeam     AB    R     BA     OBP    SLG    OPS")
+        for team, row in hitting.sort_values("ab", ascending=False).iterrows():
+            print(f"{team:<8} {row['ab']:5.0f}  {row['r']:4.0f}  {row['ba']:.3f}  {row['obp']:.3f}  {row['slg']:.3f}  {row['ops']:.3f}")
+
+    pitching = store.team_pitching()
+    if not pitching.empty:
+        print("\nTeam     IP       ER       W   L   ERA")
+        for team, row in pitching.sort_values("ip", ascending=False).iterrows():
+            print(f"{team:<8} {row['ip']:7.1f}   {row['er']:7.1f}  {row['w']:3.0f} {row['l']:3.0f} {row['era']:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
+import os
+import sys
 import math
 import json
 import requests
 from datetime import datetime
 
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from oddsmath import probability_to_american, probability_to_decimal
+
 def calculate_win_probability(home_runs, away_runs):
     """
     Calculate win probability based on expected runs.
@@ -16,16 +23,12 @@ def calculate_odds(probability):
     """
     Convert probability to American, Decimal, and Fractional odds
     """
-    if probability > 0.5:
-        american = -100 * (probability / (1 - probability))
-        decimal = 1 + (1 - probability) / probability
-    else:
-        american = 100 * ((1 - probability) / probability)
-        decimal = 1 + probability / (1 - probability)
-    
+    american = probability_to_american(probability)
+    decimal = probability_to_decimal(probability)
+
     return {
-        'american': round(american),
-        'decimal': round(decimal, 2),
+        'american': int(np.rint(american)),
+        'decimal': round(float(decimal), 2),
         'probability': round(probability * 100, 1)
     }
 
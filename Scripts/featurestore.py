@@ -0,0 +1,346 @@
+import os
+import json
+import glob
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from profiling import run
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BOX_DATA_DIR = os.path.join(BASE_DIR, "MLmlbPicker", "box_data")
+STORE_DIR = os.path.join(BASE_DIR, "feature_store")
+
+DEFAULT_WINDOWS = [7, 14, 28]
+
+# Per-game columns summed over a window, as written by MLmlbPicker/boxbackfill.py
+STATS = {
+    "batting": ["starter", "PA", "AB", "R", "H", "2B", "3B", "HR", "RBI", "BB", "IW", "SO", "HBP",
+                "SF", "SH", "GDP", "SB", "CS", "wpa_bat", "cwpa_bat", "re24_bat",
+                "leverage_index_avg", "cli_avg"],
+    "pitching": ["starter", "outs", "batters_faced", "pitches", "strikes_total", "H", "R", "ER", "BB",
+                 "SO", "HR", "inplay_gb_total", "inplay_fb_total", "inplay_ld", "game_score",
+                 "wpa_def", "cwpa_def", "re24_def", "leverage_index_avg"],
+}
+
+# Per-game averages rather than totals (same as the aLI/acLI lists in grabLast7bbref)
+MEAN_STATS = {"leverage_index_avg", "cli_avg", "game_score"}
+
+
+def to_day(value):
+    """
+    Date-like -> days since 1970-01-01, the store's date key.
+    """
+    return int(np.datetime64(pd.Timestamp(value).date(), 'D').astype(np.int64))
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def add_rates(frame, kind):
+    """
+    Rate stats computed from the window sums, so every window uses the
+    same formulas.
+    """
+    if kind == "batting":
+        singles = frame["H"] - frame["2B"] - frame["3B"] - frame["HR"]
+        total_bases = singles + 2 * frame["2B"] + 3 * frame["3B"] + 4 * frame["HR"]
+        frame["AVG"] = _ratio(frame["H"], frame["AB"])
+        frame["OBP"] = _ratio(frame["H"] + frame["BB"] + frame["HBP"],
+                              frame["AB"] + frame["BB"] + frame["HBP"] + frame["SF"])
+        frame["SLG"] = _ratio(total_bases, frame["AB"])
+        frame["OPS"] = frame["OBP"] + frame["SLG"]
+        frame["ISO"] = frame["SLG"] - frame["AVG"]
+        frame["K%"] = _ratio(frame["SO"], frame["PA"])
+        frame["BB%"] = _ratio(frame["BB"], frame["PA"])
+    else:
+        innings = frame["outs"] / 3
+        frame["IP"] = innings
+        frame["ERA"] = _ratio(9 * frame["ER"], innings)
+        frame["WHIP"] = _ratio(frame["H"] + frame["BB"], innings)
+        frame["K%"] = _ratio(frame["SO"], frame["batters_faced"])
+        frame["BB%"] = _ratio(frame["BB"], frame["batters_faced"])
+        frame["K-BB%"] = frame["K%"] - frame["BB%"]
+        frame["HR/9"] = _ratio(9 * frame["HR"], innings)
+        frame["GB%"] = _ratio(frame["inplay_gb_total"],
+                              frame["inplay_gb_total"] + frame["inplay_fb_total"] + frame["inplay_ld"])
+    return frame
+
+
+class FeatureStore:
+    """
+    Per-game player logs for one kind (batting or pitching) held as
+    columnar arrays sorted by date: day[i], player[i] and values[i, :].
+
+    Every window is a contiguous slice of rows, so any "last N days as of
+    D" aggregate is one bincount over that slice, and new days only ever
+    append to the end.
+    """
+
+    def __init__(self, kind):
+        if kind not in STATS:
+            raise ValueError(f"Unknown kind {kind}; expected one of {list(STATS)}")
+        self.kind = kind
+        self.stats = list(STATS[kind])
+        self.ids = []
+        self.index = {}
+        self.game_ids = set()
+        self.day = np.empty(0, dtype=np.int32)
+        self.player = np.empty(0, dtype=np.int32)
+        self.values = np.empty((0, len(self.stats)), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def n_players(self):
+        return len(self.ids)
+
+    def _player_codes(self, bbref_ids):
+        codes = np.empty(len(bbref_ids), dtype=np.int32)
+        for i, bbref_id in enumerate(bbref_ids):
+            code = self.index.get(bbref_id)
+            if code is None:
+                code = self.index[bbref_id] = len(self.ids)
+                self.ids.append(bbref_id)
+            codes[i] = code
+        return codes
+
+    def append(self, frame):
+        """
+        Add per-game rows (bbref_id, game_id, date and the stat columns).
+        Games already stored are skipped. Returns the number of rows added.
+        """
+        frame = frame[~frame["game_id"].isin(self.game_ids)].dropna(subset=["bbref_id", "date"])
+        if frame.empty:
+            return 0
+
+        values = frame.reindex(columns=self.stats).astype(np.float64).fillna(0.0).to_numpy()
+        day = frame["date"].to_numpy(dtype='datetime64[D]').astype(np.int32)
+        player = self._player_codes(frame["bbref_id"].tolist())
+
+        order = np.argsort(day, kind='stable')
+        day, player, values = day[order], player[order], values[order]
+        if len(self.day) and day[0] < self.day[-1]:
+            # Backfilled games land mid-history: merge and re-sort once
+            day = np.concatenate([self.day, day])
+            player = np.concatenate([self.player, player])
+            values = np.concatenate([self.values, values])
+            order = np.argsort(day, kind='stable')
+            self.day, self.player, self.values = day[order], player[order], values[order]
+        else:
+            self.day = np.concatenate([self.day, day])
+            self.player = np.concatenate([self.player, player])
+            self.values = np.concatenate([self.values, values])
+
+        self.game_ids.update(frame["game_id"].unique().tolist())
+        return len(frame)
+
+    def rows_between(self, start_day, end_day):
+        """
+        Row slice for start_day <= day < end_day.
+        """
+        lo = int(np.searchsorted(self.day, start_day, side='left'))
+        hi = int(np.searchsorted(self.day, end_day, side='left'))
+        return lo, hi
+
+    def _sum_rows(self, rows):
+        player = self.player[rows]
+        sums = np.empty((self.n_players, len(self.stats)))
+        for j in range(len(self.stats)):
+            sums[:, j] = np.bincount(player, weights=self.values[rows, j], minlength=self.n_players)
+        games = np.bincount(player, minlength=self.n_players)
+        return games, sums
+
+    def last_days(self, as_of, days):
+        """
+        (games, sums) per player over the `days` calendar days before
+        as_of. as_of itself is excluded, so the window is exactly what was
+        known going into that day's games.
+        """
+        end = to_day(as_of)
+        lo, hi = self.rows_between(end - days, end)
+        return self._sum_rows(slice(lo, hi))
+
+    def last_games(self, as_of, games):
+        """
+        (games, sums) per player over each player's last `games` games
+        before as_of, like the game-log "last 7" scrapes.
+        """
+        hi = int(np.searchsorted(self.day, to_day(as_of), side='left'))
+        # Newest first, grouped by player, then keep the first N of each group
+        newest_first = np.arange(hi - 1, -1, -1)
+        order = newest_first[np.argsort(self.player[newest_first], kind='stable')]
+        grouped = self.player[order]
+        rank = np.arange(len(order)) - np.searchsorted(grouped, grouped, side='left')
+        return self._sum_rows(np.sort(order[rank < games]))
+
+    def to_frame(self, games, sums):
+        """
+        Window sums -> DataFrame indexed by bbref_id with rate stats, for
+        players with at least one game in the window.
+        """
+        frame = pd.DataFrame(sums, columns=self.stats, index=pd.Index(self.ids, name="bbref_id"))
+        frame.insert(0, "G", games)
+        frame = frame[frame["G"] > 0].copy()
+        for stat in MEAN_STATS.intersection(self.stats):
+            frame[stat] = frame[stat] / frame["G"]
+        return add_rates(frame, self.kind)
+
+    def window(self, as_of, days=None, games=None):
+        """
+        Aggregates as of a date over either the last `days` days or each
+        player's last `games` games.
+        """
+        if (days is None) == (games is None):
+            raise ValueError("Pass exactly one of days or games")
+        sums = self.last_days(as_of, days) if days is not None else self.last_games(as_of, games)
+        return self.to_frame(*sums)
+
+    def features(self, as_of, windows=DEFAULT_WINDOWS, by="days"):
+        """
+        One wide row per player with every window side by side, e.g.
+        OPS_7d, OPS_14d, OPS_28d.
+        """
+        suffix = "d" if by == "days" else "g"
+        frames = []
+        for w in windows:
+            frame = self.window(as_of, **{by: w})
+            frames.append(frame.add_suffix(f"_{w}{suffix}"))
+        return pd.concat(frames, axis=1)
+
+    def save(self, root=STORE_DIR):
+        os.makedirs(root, exist_ok=True)
+        np.savez(os.path.join(root, f"{self.kind}.npz"), day=self.day, player=self.player, values=self.values)
+        with open(os.path.join(root, f"{self.kind}.json"), 'w', encoding='utf-8') as outfile:
+            json.dump({"stats": self.stats, "ids": self.ids, "game_ids": sorted(self.game_ids)}, outfile)
+
+    @classmethod
+    def load(cls, kind, root=STORE_DIR):
+        """
+        Load a saved store, or an empty one when nothing is saved or the
+        stat columns changed since it was written.
+        """
+        store = cls(kind)
+        try:
+            with open(os.path.join(root, f"{kind}.json"), 'r', encoding='utf-8') as infile:
+                meta = json.load(infile)
+            arrays = np.load(os.path.join(root, f"{kind}.npz"))
+        except (OSError, ValueError):
+            return store
+        if meta["stats"] != store.stats:
+            print(f"{kind} store was built with different stats; rebuilding")
+            return store
+        store.ids = meta["ids"]
+        store.index = {bbref_id: i for i, bbref_id in enumerate(store.ids)}
+        store.game_ids = set(meta["game_ids"])
+        store.day, store.player, store.values = arrays["day"], arrays["player"], arrays["values"]
+        return store
+
+
+class RollingWindow:
+    """
+    Running per-player sums over a fixed window of days, moved forward one
+    date at a time: each advance adds the rows entering the window and
+    evicts the rows leaving it. Backtests that walk the season day by day
+    touch every game row twice instead of re-summing each window.
+    """
+
+    def __init__(self, store, days):
+        self.store = store
+        self.days = days
+        self.as_of = None
+        self.games = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros((0, len(store.stats)))
+
+    def _apply(self, lo, hi, sign):
+        if hi <= lo:
+            return
+        games, sums = self.store._sum_rows(slice(lo, hi))
+        self.games += sign * games
+        self.sums += sign * sums
+
+    def advance(self, as_of):
+        """
+        Move the window so it covers the `days` days before as_of and
+        return it as a frame (same shape as FeatureStore.window).
+        """
+        end = to_day(as_of)
+        n_players = self.store.n_players
+        if len(self.games) < n_players:
+            grow = n_players - len(self.games)
+            self.games = np.concatenate([self.games, np.zeros(grow, dtype=np.int64)])
+            self.sums = np.vstack([self.sums, np.zeros((grow, self.sums.shape[1]))])
+
+        if self.as_of is None or end < self.as_of or end - self.as_of >= self.days:
+            # First call, a step backwards, or a jump past the whole window: start over
+            self.games, self.sums = self.store.last_days(as_of, self.days)
+        else:
+            self._apply(*self.store.rows_between(self.as_of, end), 1)
+            self._apply(*self.store.rows_between(self.as_of - self.days, end - self.days), -1)
+        self.as_of = end
+        return self.store.to_frame(self.games.copy(), self.sums.copy())
+
+
+def read_box_logs(kind, exclude_games=(), box_dir=BOX_DATA_DIR):
+    """
+    Per-game player rows from the box score backfill joined to game dates.
+    """
+    parts = glob.glob(os.path.join(box_dir, kind, "*.parquet"))
+    game_parts = glob.glob(os.path.join(box_dir, "games", "*.parquet"))
+    if not parts or not game_parts:
+        return pd.DataFrame()
+    logs = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+    logs = logs[~logs["game_id"].isin(set(exclude_games))]
+    games = pd.concat([pd.read_parquet(p, columns=["game_id", "date"]) for p in game_parts], ignore_index=True)
+    return logs.merge(games.drop_duplicates("game_id"), on="game_id", how="inner")
+
+
+def update(kinds=STATS, root=STORE_DIR, box_dir=BOX_DATA_DIR):
+    """
+    Fold any box score games not yet stored into each feature store.
+    """
+    stores = {}
+    for kind in kinds:
+        store = FeatureStore.load(kind, root)
+        added = store.append(read_box_logs(kind, store.game_ids, box_dir))
+        if added:
+            store.save(root)
+        print(f"{kind}: {added} new rows, {len(store)} rows for {store.n_players} players")
+        stores[kind] = store
+    return stores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-window hitter and pitcher features from box score logs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="Ingest new box score rows into the stores")
+    show = sub.add_parser("show", help="Print windowed features as of a date")
+    show.add_argument("kind", choices=list(STATS))
+    show.add_argument("--date", default=datetime.now().strftime('%Y-%m-%d'), help="As-of date (games before it count)")
+    show.add_argument("--windows", type=int, nargs="+", default=DEFAULT_WINDOWS)
+    show.add_argument("--games", action="store_true", help="Windows are last-N games instead of days")
+    show.add_argument("--players", nargs="+", help="bbrefIds to show")
+    args = parser.parse_args()
+
+    if args.command == "update":
+        update()
+        return
+
+    store = FeatureStore.load(args.kind)
+    if not len(store):
+        print(f"No {args.kind} rows stored; run update first")
+        return
+    frame = store.features(args.date, args.windows, by="games" if args.games else "days")
+    if args.players:
+        frame = frame.reindex(args.players)
+    with pd.option_context('display.max_rows', 200, 'display.max_columns', 30, 'display.width', 200):
+        print(frame)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -69,6 +69,14 @@ else:
 odds_response = requests.get(odds_url)
 odds_data = odds_response.json()
 
+# Keep this pull in the odds history; GameOdds only holds the latest price.
+# Imported here so a missing pandas/pyarrow can't stop the odds refresh
+try:
+    from oddshistory import append_snapshot, snapshot_rows
+    append_snapshot(snapshot_rows(odds_data))
+except Exception as e:
+    print(f"Exception occurred when storing the odds snapshot: {str(e)}")
+
 # Function to find odds for a particular team from a bookmaker
 def get_odds_for_team(bookmaker, team_name):
     if not bookmaker:
@@ -0,0 +1,378 @@
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import requests
+import urllib3
+
+from oddsmath import probability_to_american
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+
+# Plate appearance outcomes, in the column order of every rate table
+EVENTS = ["OUT", "K", "BB", "1B", "2B", "3B", "HR"]
+OUT, K, BB, SINGLE, DOUBLE, TRIPLE, HR = range(len(EVENTS))
+
+# League per-PA rates (BB includes HBP); out is the in-play remainder
+LEAGUE_RATES = np.array([0.461, 0.226, 0.093, 0.142, 0.043, 0.004, 0.031])
+
+# Regression toward league average, in plate appearances / batters faced
+HITTER_PRIOR_PA = 200
+PITCHER_PRIOR_BF = 300
+
+STARTER_INNINGS = 5
+MAX_INNINGS = 15
+SAC_FLY_RATE = 0.30  # share of in-play outs that score a runner from third with < 2 outs
+MAX_RUNS_BUCKET = 20
+
+TEAM_SIDES = ("away", "home")
+
+
+def _build_transitions():
+    """
+    Base-out transition tables indexed [event, bases] where bases is a
+    3-bit mask (1 = first, 2 = second, 4 = third).
+    Runners advance station-to-station on singles except from second,
+    score from first on triples, and are forced on walks.
+    """
+    next_bases = np.zeros((len(EVENTS), 8), dtype=np.int8)
+    runs = np.zeros((len(EVENTS), 8), dtype=np.int8)
+    outs = np.array([1, 1, 0, 0, 0, 0, 0], dtype=np.int8)
+
+    for bases in range(8):
+        on1, on2, on3 = bases & 1, (bases >> 1) & 1, (bases >> 2) & 1
+        runners = on1 + on2 + on3
+
+        next_bases[OUT, bases] = bases
+        next_bases[K, bases] = bases
+
+        # Walk: force only the runners behind the batter
+        if on1 and on2 and on3:
+            next_bases[BB, bases], runs[BB, bases] = 7, 1
+        elif on1 and on2:
+            next_bases[BB, bases] = 7
+        elif on1:
+            next_bases[BB, bases] = 3 | (on3 << 2)
+        else:
+            next_bases[BB, bases] = bases | 1
+
+        # Single: runners on second and third score, first goes to second
+        next_bases[SINGLE, bases] = 1 | (on1 << 1)
+        runs[SINGLE, bases] = on2 + on3
+
+        # Double: first goes to third, everyone else scores
+        next_bases[DOUBLE, bases] = 2 | (on1 << 2)
+        runs[DOUBLE, bases] = on2 + on3
+
+        next_bases[TRIPLE, bases] = 4
+        runs[TRIPLE, bases] = runners
+
+        next_bases[HR, bases] = 0
+        runs[HR, bases] = runners + 1
+
+    return next_bases, runs, outs
+
+
+NEXT_BASES, EVENT_RUNS, EVENT_OUTS = _build_transitions()
+
+
+def hitter_rates(hitter):
+    """
+    Per-PA event rates from a Hitters row, shrunk toward league average.
+    Missing hitters get league-average rates.
+    """
+    if not hitter:
+        return LEAGUE_RATES.copy()
+    pa = hitter.get('pa') or 0
+    doubles = hitter.get('doubles') or 0
+    triples = hitter.get('triples') or 0
+    hr = hitter.get('hr') or 0
+    singles = max((hitter.get('h') or 0) - doubles - triples - hr, 0)
+    counts = np.array([0, hitter.get('so') or 0, hitter.get('bb') or 0, singles, doubles, triples, hr],
+                      dtype=np.float64)
+    counts[OUT] = max(pa - counts[1:].sum(), 0)
+    return (counts + HITTER_PRIOR_PA * LEAGUE_RATES) / (counts.sum() + HITTER_PRIOR_PA)
+
+
+def pitcher_rates(pitcher):
+    """
+    Per-batter-faced event rates from a Pitchers row, shrunk toward league
+    average. Non-HR hits are split into 1B/2B/3B with league proportions.
+    """
+    if not pitcher:
+        return LEAGUE_RATES.copy()
+    bf = pitcher.get('bf') or 0
+    hr = pitcher.get('hr') or 0
+    non_hr_hits = max((pitcher.get('h') or 0) - hr, 0)
+    hit_split = LEAGUE_RATES[SINGLE:HR] / LEAGUE_RATES[SINGLE:HR].sum()
+    counts = np.zeros(len(EVENTS))
+    counts[K] = pitcher.get('so') or 0
+    counts[BB] = (pitcher.get('bb') or 0) + (pitcher.get('hbp') or 0)
+    counts[SINGLE:HR] = non_hr_hits * hit_split
+    counts[HR] = hr
+    counts[OUT] = max(bf - counts[1:].sum(), 0)
+    return (counts + PITCHER_PRIOR_BF * LEAGUE_RATES) / (counts.sum() + PITCHER_PRIOR_BF)
+
+
+def matchup_rates(batters, pitcher):
+    """
+    Generalized log5: each event's probability is proportional to
+    batter_rate * pitcher_rate / league_rate, renormalized per batter.
+    Works on any leading batch shape: batters (..., 9, 7), pitcher (..., 7).
+    """
+    raw = batters * pitcher[..., None, :] / LEAGUE_RATES
+    return raw / raw.sum(axis=-1, keepdims=True)
+
+
+def build_rate_tensor(games):
+    """
+    Stack every game's matchups into one tensor indexed
+    [game, batting side (0 away / 1 home), pitcher phase (0 starter / 1 bullpen), slot, event].
+    Each game dict holds 'away_batters'/'home_batters' (9 x 7) and
+    'away_pitcher'/'home_pitcher' (7) rate arrays.
+    """
+    away_batters = np.stack([g['away_batters'] for g in games])
+    home_batters = np.stack([g['home_batters'] for g in games])
+    away_pitcher = np.stack([g['away_pitcher'] for g in games])
+    home_pitcher = np.stack([g['home_pitcher'] for g in games])
+    bullpen = np.broadcast_to(LEAGUE_RATES, away_pitcher.shape)
+
+    rates = np.empty((len(games), 2, 2) + away_batters.shape[1:])
+    rates[:, 0, 0] = matchup_rates(away_batters, home_pitcher)
+    rates[:, 0, 1] = matchup_rates(away_batters, bullpen)
+    rates[:, 1, 0] = matchup_rates(home_batters, away_pitcher)
+    rates[:, 1, 1] = matchup_rates(home_batters, bullpen)
+    return rates
+
+
+def _play_half_inning(cum_rates, game_idx, side, phase, lineup_pos, score, active, rng,
+                      ghost_runner=False, walk_off=False):
+    """
+    Play one half inning for every active simulated game at once.
+    Loops over plate appearances; each pass is one vectorized PA for all
+    games still batting. Returns runs scored in the half inning.
+    """
+    n = len(game_idx)
+    outs = np.zeros(n, dtype=np.int8)
+    bases = np.full(n, 2 if ghost_runner else 0, dtype=np.int8)
+    inning_runs = np.zeros(n, dtype=np.int32)
+    batting = active.copy()
+
+    while True:
+        idx = np.flatnonzero(batting)
+        if idx.size == 0:
+            break
+        slot = lineup_pos[side, idx]
+        cum = cum_rates[game_idx[idx], side, phase, slot]
+        event = (rng.random(idx.size)[:, None] > cum).sum(axis=1)
+        event = np.minimum(event, len(EVENTS) - 1)
+
+        current = bases[idx]
+        outs_before = outs[idx]
+        runs = EVENT_RUNS[event, current].astype(np.int32)
+        new_bases = NEXT_BASES[event, current]
+
+        sac = ((event == OUT) & ((current & 4) > 0) & (outs_before < 2)
+               & (rng.random(idx.size) < SAC_FLY_RATE))
+        runs += sac
+        new_bases = np.where(sac, new_bases & 3, new_bases)
+
+        outs[idx] = outs_before + EVENT_OUTS[event]
+        bases[idx] = new_bases
+        inning_runs[idx] += runs
+        score[side, idx] += runs
+        lineup_pos[side, idx] = (slot + 1) % 9
+
+        done = outs[idx] >= 3
+        if walk_off:
+            done |= score[1, idx] > score[0, idx]
+        batting[idx[done]] = False
+
+    return inning_runs
+
+
+def simulate_games(rates, n_sims=10000, seed=None, starter_innings=STARTER_INNINGS):
+    """
+    Simulate every game on the slate in one batched call.
+
+    Args:
+        rates: Tensor from build_rate_tensor, shape (games, 2, 2, 9, 7)
+        n_sims: Simulated games per matchup
+
+    Returns:
+        Dictionary of (games, n_sims) int arrays: 'first_away', 'first_home',
+        'f5_away', 'f5_home', 'final_away', 'final_home', plus 'innings'
+    """
+    rng = np.random.default_rng(seed)
+    n_games = rates.shape[0]
+    cum_rates = np.cumsum(rates, axis=-1)
+    game_idx = np.repeat(np.arange(n_games), n_sims)
+    n = game_idx.size
+
+    score = np.zeros((2, n), dtype=np.int32)
+    lineup_pos = np.zeros((2, n), dtype=np.int8)
+    everyone = np.ones(n, dtype=bool)
+    innings = np.full(n, 9, dtype=np.int16)
+    first = f5 = None
+
+    for inning in range(1, 10):
+        phase = 0 if inning <= starter_innings else 1
+        _play_half_inning(cum_rates, game_idx, 0, phase, lineup_pos, score, everyone, rng)
+        home_bats = everyone if inning < 9 else score[1] <= score[0]
+        _play_half_inning(cum_rates, game_idx, 1, phase, lineup_pos, score, home_bats, rng,
+                          walk_off=inning == 9)
+        if inning == 1:
+            first = score.copy()
+        if inning == 5:
+            f5 = score.copy()
+
+    # Extra innings start with a runner on second
+    inning = 9
+    tied = score[0] == score[1]
+    while tied.any() and inning < MAX_INNINGS:
+        inning += 1
+        innings[tied] = inning
+        _play_half_inning(cum_rates, game_idx, 0, 1, lineup_pos, score, tied, rng, ghost_runner=True)
+        home_bats = tied & (score[1] <= score[0])
+        _play_half_inning(cum_rates, game_idx, 1, 1, lineup_pos, score, home_bats, rng,
+                          ghost_runner=True, walk_off=True)
+        tied = score[0] == score[1]
+
+    shape = (n_games, n_sims)
+    return {
+        'first_away': first[0].reshape(shape), 'first_home': first[1].reshape(shape),
+        'f5_away': f5[0].reshape(shape), 'f5_home': f5[1].reshape(shape),
+        'final_away': score[0].reshape(shape), 'final_home': score[1].reshape(shape),
+        'innings': innings.reshape(shape),
+    }
+
+
+def run_distribution(runs, max_runs=MAX_RUNS_BUCKET):
+    """
+    Per-game probability of scoring 0..max_runs (last bucket is max_runs+).
+    runs is a (games, n_sims) array; returns (games, max_runs + 1).
+    """
+    n_games, n_sims = runs.shape
+    buckets = max_runs + 1
+    flat = np.minimum(runs, max_runs) + np.arange(n_games)[:, None] * buckets
+    counts = np.bincount(flat.ravel(), minlength=n_games * buckets)
+    return counts.reshape(n_games, buckets) / n_sims
+
+
+def summarize(sim):
+    """
+    Per-game probabilities for the markets the model scripts care about.
+    """
+    first_total = sim['first_away'] + sim['first_home']
+    f5_diff = sim['f5_home'] - sim['f5_away']
+    final_diff = sim['final_home'] - sim['final_away']
+    return {
+        'nrfi': (first_total == 0).mean(axis=1),
+        'first_away_runs': sim['first_away'].mean(axis=1),
+        'first_home_runs': sim['first_home'].mean(axis=1),
+        'f5_home_win': (f5_diff > 0).mean(axis=1),
+        'f5_away_win': (f5_diff < 0).mean(axis=1),
+        'f5_tie': (f5_diff == 0).mean(axis=1),
+        'f5_total': (sim['f5_away'] + sim['f5_home']).mean(axis=1),
+        'home_win': (final_diff > 0).mean(axis=1),
+        'away_runs': sim['final_away'].mean(axis=1),
+        'home_runs': sim['final_home'].mean(axis=1),
+        'total_distribution': run_distribution(sim['final_away'] + sim['final_home']),
+    }
+
+
+def fetch_json(session, url):
+    try:
+        response = session.get(url, verify=False)
+        if response.status_code == 200:
+            return response.json()
+        print(f"Request to {url} returned {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while requesting {url}: {e}")
+    return None
+
+
+def load_slate_games(session, date_str, year):
+    """
+    Build simulator inputs for every game preview on a date. Actual lineups
+    are preferred, predicted lineups fill the gaps, unknown hitters and
+    unannounced starters fall back to league-average rates.
+    """
+    previews = fetch_json(session, f"{API_BASE_URL}/GamePreviews/{date_str}") or []
+    lineups = {}
+    for row in fetch_json(session, f"{API_BASE_URL}/Lineups/Predictions/date/{date_str}") or []:
+        lineups[row.get('team')] = row
+    for row in fetch_json(session, f"{API_BASE_URL}/Lineups/Actual/{date_str}") or []:
+        lineups[row.get('team')] = row
+
+    pitchers = {p.get('bbrefId'): p for p in fetch_json(session, f"{API_BASE_URL}/Pitchers/year/{year}") or []}
+    hitter_cache = {}
+
+    def batter_rates(team):
+        lineup = lineups.get(team) or {}
+        rows = []
+        for key in ("batting1st", "batting2nd", "batting3rd", "batting4th", "batting5th",
+                    "batting6th", "batting7th", "batting8th", "batting9th"):
+            bbref_id = lineup.get(key)
+            if bbref_id and bbref_id != "N/A" and bbref_id not in hitter_cache:
+                hitter_cache[bbref_id] = fetch_json(session, f"{API_BASE_URL}/Hitters/{bbref_id}")
+            rows.append(hitter_rates(hitter_cache.get(bbref_id)))
+        return np.stack(rows)
+
+    games = []
+    for preview in previews:
+        games.append({
+            'homeTeam': preview.get('homeTeam'),
+            'awayTeam': preview.get('awayTeam'),
+            'homePitcher': preview.get('homePitcher'),
+            'awayPitcher': preview.get('awayPitcher'),
+            'home_batters': batter_rates(preview.get('homeTeam')),
+            'away_batters': batter_rates(preview.get('awayTeam')),
+            'home_pitcher': pitcher_rates(pitchers.get(preview.get('homePitcher'))),
+            'away_pitcher': pitcher_rates(pitchers.get(preview.get('awayPitcher'))),
+        })
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plate-appearance Monte Carlo simulator for a slate of games")
+    parser.add_argument("--date", default=datetime.now().strftime('%Y-%m-%d'), help="Slate date (yyyy-MM-dd)")
+    parser.add_argument("--year", type=int, help="Stats season (defaults to the slate year)")
+    parser.add_argument("--sims", type=int, default=10000, help="Simulated games per matchup")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--starter-innings", type=int, default=STARTER_INNINGS)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.verify = False
+    year = args.year or int(args.date[:4])
+    games = load_slate_games(session, args.date, year)
+    if not games:
+        print(f"No game previews found for {args.date}")
+        return
+
+    start = time.time()
+    sim = simulate_games(build_rate_tensor(games), args.sims, args.seed, args.starter_innings)
+    summary = summarize(sim)
+    print(f"Simulated {len(games)} games x {args.sims} sims in {time.time() - start:.2f}s\n")
+
+    print(f"{'Matchup':<32} {'NRFI%':>6} {'1st R':>6} {'F5 H%':>6} {'F5 Tot':>6} {'Home%':>6} "
+          f"{'HomeML':>7} {'Runs':>11}")
+    order = np.argsort(-summary['nrfi'])
+    home_ml = probability_to_american(summary['home_win'])
+    for i in order:
+        game = games[i]
+        matchup = f"{game['awayTeam']} @ {game['homeTeam']}"
+        first_runs = summary['first_away_runs'][i] + summary['first_home_runs'][i]
+        print(f"{matchup:<32} {summary['nrfi'][i] * 100:6.1f} {first_runs:6.2f} "
+              f"{summary['f5_home_win'][i] * 100:6.1f} {summary['f5_total'][i]:6.2f} "
+              f"{summary['home_win'][i] * 100:6.1f} {home_ml[i]:7.0f} "
+              f"{summary['away_runs'][i]:5.2f}-{summary['home_runs'][i]:<5.2f}")
+
+
+if __name__ == "__main__":
+    main()
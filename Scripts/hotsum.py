@@ -1,5 +1,12 @@
+import logging
 import requests
 
+from logconfig import configure_logging, REPORT_FORMAT
+
+# The report prints at INFO; API status codes and per-team detail are DEBUG (set LOG_LEVEL=DEBUG)
+configure_logging("hotsum", console_format=REPORT_FORMAT)
+logger = logging.getLogger(__name__)
+
 # Define the date variables
 
 date2 = '24-09-06'
@@ -18,18 +25,18 @@ def safe_get_json(response):
     try:
         return response.json()
     except requests.exceptions.JSONDecodeError:
-        print("Error: Failed to parse JSON response")
-        print(f"Response status code: {response.status_code}")
-        print(f"Response content: {response.text}")
+        logger.error("Error: Failed to parse JSON response")
+        logger.debug("Response status code: %s", response.status_code)
+        logger.error("Response content: %s", response.text)
         return None
 
 # Get the outperformers data
 response = requests.get(outperformers_api, verify=False)
-print(f"Outperformers API status code: {response.status_code}")
+logger.debug("Outperformers API status code: %s", response.status_code)
 players = safe_get_json(response)
 
 if not players:
-    print("No players data retrieved.")
+    logger.warning("No players data retrieved.")
     exit(1)
 
 # Create a dictionary to map bbrefId to a tuple (playerName, outperformanceScore)
@@ -37,11 +44,11 @@ player_scores = {p['bbrefId']: (p['playerName'], p['outperformanceScore']) for p
 
 # Get the blending data
 response = requests.get(blending_api, verify=False)
-print(f"Blending API status code: {response.status_code}")
+logger.debug("Blending API status code: %s", response.status_code)
 blending_data = safe_get_json(response)
 
 if not blending_data:
-    print("No blending data retrieved.")
+    logger.warning("No blending data retrieved.")
     exit(1)
 
 # Create a dictionary to map pitcher IDs to their message, using a default value if message is missing
@@ -52,11 +59,11 @@ pitcher_trends = {
 
 # Get the team splits data
 response = requests.get(teamsplits_api, verify=False)
-print(f"TeamSplits API status code: {response.status_code}")
+logger.debug("TeamSplits API status code: %s", response.status_code)
 teamsplits_data = safe_get_json(response)
 
 if not teamsplits_data:
-    print("No team splits data retrieved.")
+    logger.warning("No team splits data retrieved.")
     exit(1)
 
 # Create a dictionary to map team names to their vsLHP and vsRHP records
@@ -67,11 +74,11 @@ team_vs_records = {
 
 # Get the game previews for the date
 response = requests.get(gamepreviews_api, verify=False)
-print(f"GamePreviews API status code: {response.status_code}")
+logger.debug("GamePreviews API status code: %s", response.status_code)
 game_previews = safe_get_json(response)
 
 if not game_previews:
-    print("No game previews retrieved.")
+    logger.warning("No game previews retrieved.")
     exit(1)
 
 # Function to filter players by position, including logic for UTIL
@@ -84,7 +91,7 @@ def filter_by_position(players, positions, exact=False):
 def print_top_n(stat, players, n=10):
     sorted_players = sorted(players, key=lambda x: x[stat], reverse=True)[:n]
     for p in sorted_players:
-        print(f"{p[stat]:.2f} {p['playerName']} {p['team']} {p['pos']} {p['bbrefId']}")
+        logger.info("%.2f %s %s %s %s", p[stat], p['playerName'], p['team'], p['pos'], p['bbrefId'])
 
 # Function to count positive outperformanceScore by team
 def count_positive_scores_by_team(players):
@@ -132,41 +139,41 @@ for player in players:
 # Print top 10 outperformanceScore for each position (with adjustment for catcher)
 for pos, players_list in positions_dict.items():
     if pos == "C":
-        print(f"\nTop 15 outperformanceScore for {pos}:")
+        logger.info("\nTop 15 outperformanceScore for %s:", pos)
         print_top_n("outperformanceScore", players_list, n=15)
     elif pos == "OF":
-        print(f"\nTop 30 outperformanceScore for OF combined:")
+        logger.info("\nTop 30 outperformanceScore for OF combined:")
         print_top_n("outperformanceScore", players_list, n=30)
     elif pos == "UTIL":
-        print(f"\nTop 30 outperformanceScore for UTIL:")
+        logger.info("\nTop 30 outperformanceScore for UTIL:")
         print_top_n("outperformanceScore", players_list, n=30)
     else:
-        print(f"\nTop 15 outperformanceScore for {pos}:")
+        logger.info("\nTop 15 outperformanceScore for %s:", pos)
         print_top_n("outperformanceScore", players_list, n=15)
 
 # Print top 20 slG_Difference
-print("\nTop 20 slG_Difference:")
+logger.info("\nTop 20 slG_Difference:")
 print_top_n("slG_Difference", players, n=20)
 
 # Print top 20 bA_Difference
-print("\nTop 20 bA_Difference:")
+logger.info("\nTop 20 bA_Difference:")
 print_top_n("bA_Difference", players, n=20)
 
 # Print top 20 outperformanceScore where rostered > 50
-print("\nTop 20 outperformanceScore with rostered > 50:")
+logger.info("\nTop 20 outperformanceScore with rostered > 50:")
 filtered_players = [p for p in players if p['rostered'] > 50]
 print_top_n("outperformanceScore", filtered_players, n=20)
 
 # Print top 20 outperformanceScore where rostered < 50
-print("\nTop 20 outperformanceScore with rostered < 50:")
+logger.info("\nTop 20 outperformanceScore with rostered < 50:")
 filtered_players = [p for p in players if p['rostered'] < 50]
 print_top_n("outperformanceScore", filtered_players, n=20)
 
 # Count positive outperformanceScore by team and print the results
 team_counts = count_positive_scores_by_team(players)
-print("\nPositive outperformanceScore counts by team:")
+logger.info("\nPositive outperformanceScore counts by team:")
 for team, count in team_counts.items():
-    print(f"{team} = {count}")
+    logger.info("%s = %s", team, count)
 
 # Function to map ordinal suffixes (1st, 2nd, 3rd, etc.)
 def ordinal_suffix(i):
@@ -199,7 +206,7 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
                 is_predictive = True
 
             if not lineup:
-                print(f"Warning: No lineup found for {team} (neither actual nor predicted).")
+                logger.warning("Warning: No lineup found for %s (neither actual nor predicted).", team)
                 continue
 
             opponent = home_team if team == away_team else away_team
@@ -217,13 +224,13 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
                 lineup.get(f"batting{i}{ordinal_suffix(i)}", None) for i in range(1, 10)
             ]
 
-            print(f"\nTeam: {team}")
-            print(f"Opponent: {opponent}")
-            print(f"Opposing SP: {blending_message}")
+            logger.debug("\nTeam: %s", team)
+            logger.debug("Opponent: %s", opponent)
+            logger.debug("Opposing SP: %s", blending_message)
             if lhp:
-                print(f"(Team vs LHP record: {vs_record})")
+                logger.debug("(Team vs LHP record: %s)", vs_record)
             else:
-                print(f"(Team vs RHP record: {vs_record})")
+                logger.debug("(Team vs RHP record: %s)", vs_record)
 
             total_score = 0
             for i, player_id in enumerate(batting_order, start=1):
@@ -234,20 +241,20 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
 
                     if player_info:
                         player_name, score = player_info
-                        print(f"Batting {i}: {player_name} ({score:.2f})")
+                        logger.debug("Batting %s: %s (%.2f)", i, player_name, score)
                         total_score += score
                     else:
-                        print(f"Batting {i}: {player_id} (N/A)")
+                        logger.debug("Batting %s: %s (N/A)", i, player_id)
                 else:
-                    print(f"Batting {i}: N/A")
+                    logger.debug("Batting %s: N/A", i)
 
             avg_score = total_score / 9 if total_score > 0 else 0  # Calculate the average score
 
-            print(f"\n{team} lineup total = {total_score:.2f}")
-            print(f"\n{team} lineup avg = {avg_score:.2f}")
+            logger.debug("\n%s lineup total = %.2f", team, total_score)
+            logger.debug("\n%s lineup avg = %.2f", team, avg_score)
             
             if is_predictive:
-                print(f"{team} using Predictive Lineup Service")
+                logger.debug("%s using Predictive Lineup Service", team)
 
             # Store total and avg score in the dictionary
             team_scores[team] = {'total_score': total_score, 'avg_score': avg_score}
@@ -258,8 +265,8 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
 def get_predictive_lineups():
     response = requests.get(PredLineups_api, verify=False)
     if response.status_code != 200:
-        print(f"Error: Received status code {response.status_code} for predicted lineups")
-        print(f"Response content: {response.text}")
+        logger.error("Error: Received status code %s for predicted lineups", response.status_code)
+        logger.error("Response content: %s", response.text)
         return {}
 
     predicted_lineups = safe_get_json(response) or []
@@ -274,6 +281,6 @@ predicted_lineups = get_predictive_lineups()
 team_scores = print_actual_or_predicted_lineups_with_scores(predicted_lineups)
 
 # Print the returned dictionary
-print("\nTeam Scores:")
+logger.info("\nTeam Scores:")
 for team, scores in team_scores.items():
-    print(f"{team}: Total = {scores['total_score']:.2f}, Avg = {scores['avg_score']:.2f}")
\ No newline at end of file
+    logger.info("%s: Total = %.2f, Avg = %.2f", team, scores['total_score'], scores['avg_score'])
\ No newline at end of file
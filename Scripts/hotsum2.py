@@ -1,9 +1,16 @@
+import logging
 import requests
 import urllib3
 
+from logconfig import configure_logging, REPORT_FORMAT
+
 # Suppress only the insecure request warning for localhost
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# The report prints at INFO; API status codes and per-team detail are DEBUG (set LOG_LEVEL=DEBUG)
+configure_logging("hotsum2", console_format=REPORT_FORMAT)
+logger = logging.getLogger(__name__)
+
 # Define the date variables
 
 date2 = '24-09-21'
@@ -24,18 +31,18 @@ def safe_get_json(response):
     try:
         return response.json()
     except requests.exceptions.JSONDecodeError:
-        print("Error: Failed to parse JSON response")
-        print(f"Response status code: {response.status_code}")
-        print(f"Response content: {response.text}")
+        logger.error("Error: Failed to parse JSON response")
+        logger.debug("Response status code: %s", response.status_code)
+        logger.error("Response content: %s", response.text)
         return None
 
 # Get the outperformers data
 response = requests.get(outperformers_api, verify=False)
-print(f"Outperformers API status code: {response.status_code}")
+logger.debug("Outperformers API status code: %s", response.status_code)
 players = safe_get_json(response)
 
 if not players:
-    print("No players data retrieved.")
+    logger.warning("No players data retrieved.")
     exit(1)
 
 # Create a dictionary to map bbrefId to a tuple (playerName, outperformanceScore)
@@ -43,11 +50,11 @@ player_scores = {p['bbrefId']: (p['playerName'], p['outperformanceScore']) for p
 
 # Get the blending data
 response = requests.get(blending_api, verify=False)
-print(f"Blending API status code: {response.status_code}")
+logger.debug("Blending API status code: %s", response.status_code)
 blending_data = safe_get_json(response)
 
 if not blending_data:
-    print("No blending data retrieved.")
+    logger.warning("No blending data retrieved.")
     exit(1)
 
 # Create a dictionary to map pitcher IDs to their message, using a default value if message is missing
@@ -58,11 +65,11 @@ pitcher_trends = {
 
 # Get the team splits data
 response = requests.get(teamsplits_api, verify=False)
-print(f"TeamSplits API status code: {response.status_code}")
+logger.debug("TeamSplits API status code: %s", response.status_code)
 teamsplits_data = safe_get_json(response)
 
 if not teamsplits_data:
-    print("No team splits data retrieved.")
+    logger.warning("No team splits data retrieved.")
     exit(1)
 
 # Create a dictionary to map team names to their vsLHP and vsRHP records
@@ -73,22 +80,22 @@ team_vs_records = {
 
 # Get the game previews for the date
 response = requests.get(gamepreviews_api, verify=False)
-print(f"GamePreviews API status code: {response.status_code}")
+logger.debug("GamePreviews API status code: %s", response.status_code)
 game_previews = safe_get_json(response)
 
 
 if not game_previews:
-    print("No game previews retrieved.")
+    logger.warning("No game previews retrieved.")
     exit(1)
 
 # Fetch game odds data and inspect it
 response = requests.get(gameOdds_api, verify=False)
-print(f"GameOdds API status code: {response.status_code}")
+logger.debug("GameOdds API status code: %s", response.status_code)
 game_odds_data = safe_get_json(response)
 
 
 if not game_odds_data:
-    print("No game odds data retrieved.")
+    logger.warning("No game odds data retrieved.")
     exit(1)
 
 # Extract all pitchers from gamePreviews and get their "throws" information
@@ -102,7 +109,7 @@ def get_pitcher_hand(game_previews):
             pitcher_ids.add(game['awayPitcher'])
 
     if not pitcher_ids:
-        print("No pitchers found in game previews.")
+        logger.warning("No pitchers found in game previews.")
         return {}
 
     pitcher_hand_dict = {}
@@ -116,8 +123,8 @@ def get_pitcher_hand(game_previews):
         response = requests.get(pitcher_api_url, verify=False)
         
         if response.status_code != 200:
-            print(f"Error: Received status code {response.status_code} for pitcher {pitcher_id}")
-            print(f"Response content: {response.text}")
+            logger.error("Error: Received status code %s for pitcher %s", response.status_code, pitcher_id)
+            logger.error("Response content: %s", response.text)
             continue
 
         pitcher_data = safe_get_json(response)
@@ -126,7 +133,7 @@ def get_pitcher_hand(game_previews):
         if pitcher_data and 'throws' in pitcher_data:
             pitcher_hand_dict[pitcher_id] = pitcher_data['throws']
         else:
-            print(f"Warning: No 'throws' data found for pitcher {pitcher_id}")
+            logger.warning("Warning: No 'throws' data found for pitcher %s", pitcher_id)
 
     return pitcher_hand_dict
 
@@ -143,7 +150,7 @@ def filter_by_position(players, positions, exact=False):
 def print_top_n(stat, players, n=10):
     sorted_players = sorted(players, key=lambda x: x[stat], reverse=True)[:n]
     for p in sorted_players:
-        print(f"{p[stat]:.2f} {p['playerName']} {p['team']} {p['pos']} {p['bbrefId']}")
+        logger.info("%.2f %s %s %s %s", p[stat], p['playerName'], p['team'], p['pos'], p['bbrefId'])
 
 # Function to count positive outperformanceScore by team
 def count_positive_scores_by_team(players):
@@ -191,41 +198,41 @@ for player in players:
 # Print top 10 outperformanceScore for each position (with adjustment for catcher)
 for pos, players_list in positions_dict.items():
     if pos == "C":
-        print(f"\nTop 15 outperformanceScore for {pos}:")
+        logger.info("\nTop 15 outperformanceScore for %s:", pos)
         print_top_n("outperformanceScore", players_list, n=15)
     elif pos == "OF":
-        print(f"\nTop 30 outperformanceScore for OF combined:")
+        logger.info("\nTop 30 outperformanceScore for OF combined:")
         print_top_n("outperformanceScore", players_list, n=30)
     elif pos == "UTIL":
-        print(f"\nTop 30 outperformanceScore for UTIL:")
+        logger.info("\nTop 30 outperformanceScore for UTIL:")
         print_top_n("outperformanceScore", players_list, n=30)
     else:
-        print(f"\nTop 15 outperformanceScore for {pos}:")
+        logger.info("\nTop 15 outperformanceScore for %s:", pos)
         print_top_n("outperformanceScore", players_list, n=15)
 
 # Print top 20 slG_Difference
-print("\nTop 20 slG_Difference:")
+logger.info("\nTop 20 slG_Difference:")
 print_top_n("slG_Difference", players, n=20)
 
 # Print top 20 bA_Difference
-print("\nTop 20 bA_Difference:")
+logger.info("\nTop 20 bA_Difference:")
 print_top_n("bA_Difference", players, n=20)
 
 # Print top 20 outperformanceScore where rostered > 50
-print("\nTop 20 outperformanceScore with rostered > 50:")
+logger.info("\nTop 20 outperformanceScore with rostered > 50:")
 filtered_players = [p for p in players if p['rostered'] > 50]
 print_top_n("outperformanceScore", filtered_players, n=20)
 
 # Print top 20 outperformanceScore where rostered < 50
-print("\nTop 20 outperformanceScore with rostered < 50:")
+logger.info("\nTop 20 outperformanceScore with rostered < 50:")
 filtered_players = [p for p in players if p['rostered'] < 50]
 print_top_n("outperformanceScore", filtered_players, n=20)
 
 # Count positive outperformanceScore by team and print the results
 team_counts = count_positive_scores_by_team(players)
-print("\nPositive outperformanceScore counts by team:")
+logger.info("\nPositive outperformanceScore counts by team:")
 for team, count in team_counts.items():
-    print(f"{team} = {count}")
+    logger.info("%s = %s", team, count)
 
 # Function to map ordinal suffixes (1st, 2nd, 3rd, etc.)
 def ordinal_suffix(i):
@@ -258,7 +265,7 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
                 is_predictive = True
 
             if not lineup:
-                print(f"Warning: No lineup found for {team} (neither actual nor predicted).")
+                logger.warning("Warning: No lineup found for %s (neither actual nor predicted).", team)
                 continue
 
             opponent = home_team if team == away_team else away_team
@@ -276,13 +283,13 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
                 lineup.get(f"batting{i}{ordinal_suffix(i)}", None) for i in range(1, 10)
             ]
 
-            print(f"\nTeam: {team}")
-            print(f"Opponent: {opponent}")
-            print(f"Opposing SP: {blending_message}")
+            logger.debug("\nTeam: %s", team)
+            logger.debug("Opponent: %s", opponent)
+            logger.debug("Opposing SP: %s", blending_message)
             if lhp:
-                print(f"(Team vs LHP record: {vs_record})")
+                logger.debug("(Team vs LHP record: %s)", vs_record)
             else:
-                print(f"(Team vs RHP record: {vs_record})")
+                logger.debug("(Team vs RHP record: %s)", vs_record)
 
             total_score = 0
             valid_player_count = 0  # Keep track of players with valid scores (not N/A)
@@ -295,22 +302,22 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
 
                     if player_info:
                         player_name, score = player_info
-                        print(f"Batting {i}: {player_name} ({score:.2f})")
+                        logger.debug("Batting %s: %s (%.2f)", i, player_name, score)
                         total_score += score
                         valid_player_count += 1  # Increment valid player count
                     else:
-                        print(f"Batting {i}: {player_id} (N/A)")
+                        logger.debug("Batting %s: %s (N/A)", i, player_id)
                 else:
-                    print(f"Batting {i}: N/A")
+                    logger.debug("Batting %s: N/A", i)
 
             # Calculate the average score, using valid_player_count instead of 9
             avg_score = total_score / valid_player_count if valid_player_count > 0 else 0
 
-            print(f"\n{team} lineup total = {total_score:.2f}")
-            print(f"\n{team} lineup avg = {avg_score:.2f}")
+            logger.debug("\n%s lineup total = %.2f", team, total_score)
+            logger.debug("\n%s lineup avg = %.2f", team, avg_score)
             
             if is_predictive:
-                print(f"{team} using Predictive Lineup Service")
+                logger.debug("%s using Predictive Lineup Service", team)
 
             # Store total and avg score in the dictionary
             team_scores[team] = {'total_score': total_score, 'avg_score': avg_score}
@@ -322,8 +329,8 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
 def get_predictive_lineups():
     response = requests.get(PredLineups_api, verify=False)
     if response.status_code != 200:
-        print(f"Error: Received status code {response.status_code} for predicted lineups")
-        print(f"Response content: {response.text}")
+        logger.error("Error: Received status code %s for predicted lineups", response.status_code)
+        logger.error("Response content: %s", response.text)
         return {}
 
     predicted_lineups = safe_get_json(response) or []
@@ -340,12 +347,12 @@ def pitching_advantage():
     
     # Get the pitching advantage data
     response = requests.get(pitching_adv_api, verify=False)
-    print(f"Pitching Advantage API status code: {response.status_code}")
+    logger.debug("Pitching Advantage API status code: %s", response.status_code)
     
     pitching_data = safe_get_json(response)
     
     if not pitching_data:
-        print("No pitching advantage data retrieved.")
+        logger.warning("No pitching advantage data retrieved.")
         return {}
 
     # Initialize an empty dictionary to store teams with their advantage score
@@ -358,13 +365,13 @@ def pitching_advantage():
 
         if "Not enough data to determine advantage" in advantage_info:
             score = 0  # Set the advantage score to 0 for this case
-            print(f"No team has the advantage in {game_info}, look manually.")
+            logger.warning("No team has the advantage in %s, look manually.", game_info)
         else:
             # Extract the advantage score (the last part of the advantage string)
             try:
                 score = float(advantage_info.split("by")[-1].strip())
             except ValueError:
-                print(f"Error: Could not extract advantage score for {game_info}.")
+                logger.error("Error: Could not extract advantage score for %s.", game_info)
                 score = 0
 
         # Determine whether it's the home or away team that has the advantage
@@ -454,25 +461,25 @@ def game_analysis(pitcher_adv_teams, team_scores, game_previews, teamsplits_data
 
         if int(adv_team_hand.split('-')[0]) > int(adv_team_hand.split('-')[1]) and int(home_or_away_record.split('-')[0]) > int(home_or_away_record.split('-')[1]):
             if adv_team_lineup['total_score'] > opposing_team_lineup['total_score'] and adv_team_lineup['avg_score'] > opposing_team_lineup['avg_score']:
-                print(f"{adv_team} to Strong list because it passed all conditions (SP adv, lineup, records)")
+                logger.debug("%s to Strong list because it passed all conditions (SP adv, lineup, records)", adv_team)
                 strong_list.append(adv_team)
             else:
-                print(f"{adv_team} to Slight list because lineup score is lower despite passing SP adv and records")
+                logger.debug("%s to Slight list because lineup score is lower despite passing SP adv and records", adv_team)
                 slight_list.append(adv_team)
         else:
-            print(f"{adv_team} to Weak list because it failed either vsHand or home/away record")
+            logger.debug("%s to Weak list because it failed either vsHand or home/away record", adv_team)
             weak_list.append(adv_team)
 
         game_outputs.append(game_output)
 
-    print("\nStrong list:")
-    print(strong_list)
+    logger.info("\nStrong list:")
+    logger.info("%s", strong_list)
 
-    print("\nSlight list:")
-    print(slight_list)
+    logger.info("\nSlight list:")
+    logger.info("%s", slight_list)
 
-    print("\nWeak list:")
-    print(weak_list)
+    logger.info("\nWeak list:")
+    logger.info("%s", weak_list)
 
     return game_outputs, strong_list, slight_list, weak_list  # Return the lists
 
@@ -536,14 +543,14 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, pitcher_adv_team
         if target_tier == 1:  # Move to slight
             strong_list.remove(team)
             slight_list.append(team)
-            print(f"Moving {team} to Slight list (failed {move_by} condition{'s' if move_by > 1 else ''}: {failed_conditions_str})")
+            logger.debug("Moving %s to Slight list (failed %s condition%s: %s)", team, move_by, 's' if move_by > 1 else '', failed_conditions_str)
         elif target_tier == 2:  # Move to weak
             if team in strong_list:
                 strong_list.remove(team)
             elif team in slight_list:
                 slight_list.remove(team)
             weak_list.append(team)
-            print(f"Moving {team} to Weak list (failed {move_by} condition{'s' if move_by > 1 else ''}: {failed_conditions_str})")
+            logger.debug("Moving %s to Weak list (failed %s condition%s: %s)", team, move_by, 's' if move_by > 1 else '', failed_conditions_str)
         elif target_tier == 3:  # Move to avoid
             if team in strong_list:
                 strong_list.remove(team)
@@ -552,7 +559,7 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, pitcher_adv_team
             elif team in weak_list:
                 weak_list.remove(team)
             avoid_list.append(team)
-            print(f"Moving {team} to Avoid list (failed {move_by} condition{'s' if move_by > 1 else ''}: {failed_conditions_str})")
+            logger.debug("Moving %s to Avoid list (failed %s condition%s: %s)", team, move_by, 's' if move_by > 1 else '', failed_conditions_str)
 
     # Process the teams starting from the weakest tier to the strongest
     for team in weak_list[:]:
@@ -570,7 +577,7 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, pitcher_adv_team
                 move_by += 1
                 failed_conditions.append("SP adv < 50")
             else:
-                print(f"Canceled moving {team} to Avoid (failed 1 condition: SP adv < 50; Opponent record vs{pitcher_hand}: {opponent_vs_hand})")
+                logger.debug("Canceled moving %s to Avoid (failed 1 condition: SP adv < 50; Opponent record vs%s: %s)", team, pitcher_hand, opponent_vs_hand)
 
         # Check losing streak condition
         if check_losing_streak(streak):
@@ -595,7 +602,7 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, pitcher_adv_team
                 move_by += 1
                 failed_conditions.append("SP adv < 50")
             else:
-                print(f"Canceled moving {team} to Weak (failed 1 condition: SP adv < 50; Opponent record vs{pitcher_hand}: {opponent_vs_hand})")
+                logger.debug("Canceled moving %s to Weak (failed 1 condition: SP adv < 50; Opponent record vs%s: %s)", team, pitcher_hand, opponent_vs_hand)
 
         # Check losing streak condition
         if check_losing_streak(streak):
@@ -620,7 +627,7 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, pitcher_adv_team
                 move_by += 1
                 failed_conditions.append("SP adv < 50")
             else:
-                print(f"Canceled moving {team} to Slight (failed 1 condition: SP adv < 50; Opponent record vs{pitcher_hand}: {opponent_vs_hand})")
+                logger.debug("Canceled moving %s to Slight (failed 1 condition: SP adv < 50; Opponent record vs%s: %s)", team, pitcher_hand, opponent_vs_hand)
 
         # Check losing streak condition
         if check_losing_streak(streak):
@@ -665,7 +672,7 @@ def get_avg_odds_for_list(teams_list, game_odds_data):
 
     # Check the structure of game_odds_data
     if not isinstance(game_odds_data, list):
-        print("Error: game_odds_data is not a list. Current type:", type(game_odds_data))
+        logger.error("Error: game_odds_data is not a list. Current type: %s", type(game_odds_data))
         return team_odds_dict
 
     for team in teams_list:
@@ -674,7 +681,7 @@ def get_avg_odds_for_list(teams_list, game_odds_data):
         # Check if each game in game_odds_data is a dictionary
         for game in game_odds_data:
             if not isinstance(game, dict):
-                print(f"Error: Found an invalid game entry. Expected a dictionary but got {type(game)}")
+                logger.error("Error: Found an invalid game entry. Expected a dictionary but got %s", type(game))
                 continue
 
             # Search for the team's odds in the game odds data
@@ -685,24 +692,24 @@ def get_avg_odds_for_list(teams_list, game_odds_data):
 
         if team_odds:
             team_odds_dict.update(team_odds)
-            print(f"{team} average odds: {team_odds[team]:.2f}")
+            logger.debug("%s average odds: %.2f", team, team_odds[team])
         else:
-            print(f"No odds data found for {team}.")
+            logger.warning("No odds data found for %s.", team)
 
     return team_odds_dict
 
 # Function to calculate the average odds for each list
 def print_and_return_avg_odds_lists(strong_list, slight_list, weak_list, avoid_list, game_odds_data):
-    print("\nCalculating average odds for Strong list:")
+    logger.debug("\nCalculating average odds for Strong list:")
     strong_odds = get_avg_odds_for_list(strong_list, game_odds_data)
     
-    print("\nCalculating average odds for Slight list:")
+    logger.debug("\nCalculating average odds for Slight list:")
     slight_odds = get_avg_odds_for_list(slight_list, game_odds_data)
 
-    print("\nCalculating average odds for Weak list:")
+    logger.debug("\nCalculating average odds for Weak list:")
     weak_odds = get_avg_odds_for_list(weak_list, game_odds_data)
 
-    print("\nCalculating average odds for Avoid list:")
+    logger.debug("\nCalculating average odds for Avoid list:")
     avoid_odds = get_avg_odds_for_list(avoid_list, game_odds_data)
 
     return strong_odds, slight_odds, weak_odds, avoid_odds
@@ -736,9 +743,9 @@ def ValueModel(pitcher_adv_teams, game_odds_data):
 
 # Call the pitching_advantage method and print the teams with an advantage and their score
 pitcher_adv_teams = pitching_advantage()
-print("\nTeams with Pitching Advantage and their Scores:")
+logger.info("\nTeams with Pitching Advantage and their Scores:")
 for team, score in pitcher_adv_teams.items():
-    print(f"{team}: {score:.2f}")
+    logger.info("%s: %.2f", team, score)
 
 
 # Get predicted lineups ahead of time
@@ -748,14 +755,14 @@ predicted_lineups = get_predictive_lineups()
 team_scores = print_actual_or_predicted_lineups_with_scores(predicted_lineups)
 
 # Print the returned dictionary
-print("\nTeam Scores:")
+logger.info("\nTeam Scores:")
 for team, scores in team_scores.items():
-    print(f"{team}: Total = {scores['total_score']:.2f}, Avg = {scores['avg_score']:.2f}")
+    logger.info("%s: Total = %.2f, Avg = %.2f", team, scores['total_score'], scores['avg_score'])
 
 
 pitcher_adv_teams = pitching_advantage()
-print("\nTeams with Pitching Advantage:")
-print(pitcher_adv_teams)
+logger.info("\nTeams with Pitching Advantage:")
+logger.info("%s", pitcher_adv_teams)
 
 # Example call to the method
 game_outputs, strong_list, slight_list, weak_list = game_analysis(
@@ -765,8 +772,8 @@ game_outputs, strong_list, slight_list, weak_list = game_analysis(
 # Print the formatted output for each game
 for game_output in game_outputs:
     for key, value in game_output.items():
-        print(f"{key}: {value}")
-    print("\n" + "-" * 40 + "\n")
+        logger.info("%s: %s", key, value)
+    logger.info("%s", '\n' + '-' * 40 + '\n')
 
 
 # After generating the strong, slight, and weak lists, call the function to adjust them
@@ -783,24 +790,24 @@ strong_odds, slight_odds, weak_odds, avoid_odds = print_and_return_avg_odds_list
 value_output, chalk_output = ValueModel(pitcher_adv_teams, game_odds_data)
 
 # Print the final lists
-print("\nFinal Strong list:")
-print(strong_list)
+logger.info("\nFinal Strong list:")
+logger.info("%s", strong_list)
 
-print("\nFinal Slight list:")
-print(slight_list)
+logger.info("\nFinal Slight list:")
+logger.info("%s", slight_list)
 
-print("\nFinal Weak list:")
-print(weak_list)
+logger.info("\nFinal Weak list:")
+logger.info("%s", weak_list)
 
-print("\nAvoid list:")
-print(avoid_list)
+logger.info("\nAvoid list:")
+logger.info("%s", avoid_list)
 
-print("\nValue:")
-print(value_output)
+logger.info("\nValue:")
+logger.info("%s", value_output)
 
-print("\nChalk:")
-print(chalk_output)
-print(pitcher_adv_teams)
+logger.info("\nChalk:")
+logger.info("%s", chalk_output)
+logger.info("%s", pitcher_adv_teams)
 
 # Create a filtered copy of dict1 with keys that exist in dict2
 filtered_dict = {key: value for key, value in pitcher_adv_teams.items() if key in chalk_output}
@@ -1,8 +1,18 @@
+import logging
 import requests
 import urllib3
+import numpy as np
+
+from logconfig import configure_logging, REPORT_FORMAT
+from oddsmath import average_price, game_odds_prices
 
 # Suppress only the insecure request warning for localhost
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# The report prints at INFO; API status codes and per-team detail are DEBUG (set LOG_LEVEL=DEBUG)
+configure_logging("hotsum4", console_format=REPORT_FORMAT)
+logger = logging.getLogger(__name__)
+
 # Define the date variables
 
 date2 = '24-10-14'
@@ -25,18 +35,18 @@ def safe_get_json(response):
     try:
         return response.json()
     except requests.exceptions.JSONDecodeError:
-        print("Error: Failed to parse JSON response")
-        print(f"Response status code: {response.status_code}")
-        print(f"Response content: {response.text}")
+        logger.error("Error: Failed to parse JSON response")
+        logger.debug("Response status code: %s", response.status_code)
+        logger.error("Response content: %s", response.text)
         return None
 
 # Get the outperformers data
 response = requests.get(outperformers_api, verify=False)
-print(f"Outperformers API status code: {response.status_code}")
+logger.debug("Outperformers API status code: %s", response.status_code)
 players = safe_get_json(response)
 
 if not players:
-    print("No players data retrieved.")
+    logger.warning("No players data retrieved.")
     exit(1)
 
 # Create a dictionary to map bbrefId to a tuple (playerName, outperformanceScore)
@@ -44,11 +54,11 @@ player_scores = {p['bbrefId']: (p['playerName'], p['outperformanceScore']) for p
 
 # Get the blending data
 response = requests.get(blending_api, verify=False)
-print(f"Blending API status code: {response.status_code}")
+logger.debug("Blending API status code: %s", response.status_code)
 blending_data = safe_get_json(response)
 
 if not blending_data:
-    print("No blending data retrieved.")
+    logger.warning("No blending data retrieved.")
     exit(1)
 
 # Create a dictionary to map pitcher IDs to their message, using a default value if message is missing
@@ -59,11 +69,11 @@ pitcher_trends = {
 
 # Get the team splits data
 response = requests.get(teamsplits_api, verify=False)
-print(f"TeamSplits API status code: {response.status_code}")
+logger.debug("TeamSplits API status code: %s", response.status_code)
 teamsplits_data = safe_get_json(response)
 
 if not teamsplits_data:
-    print("No team splits data retrieved.")
+    logger.warning("No team splits data retrieved.")
     exit(1)
 
 # Create a dictionary to map team names to their vsLHP and vsRHP records
@@ -74,22 +84,22 @@ team_vs_records = {
 
 # Get the game previews for the date
 response = requests.get(gamepreviews_api, verify=False)
-print(f"GamePreviews API status code: {response.status_code}")
+logger.debug("GamePreviews API status code: %s", response.status_code)
 game_previews = safe_get_json(response)
 
 
 if not game_previews:
-    print("No game previews retrieved.")
+    logger.warning("No game previews retrieved.")
     exit(1)
 
 # Fetch game odds data and inspect it
 response = requests.get(gameOdds_api, verify=False)
-print(f"GameOdds API status code: {response.status_code}")
+logger.debug("GameOdds API status code: %s", response.status_code)
 game_odds_data = safe_get_json(response)
 
 
 if not game_odds_data:
-    print("No game odds data retrieved.")
+    logger.warning("No game odds data retrieved.")
     exit(1)
 
 # Extract all pitchers from gamePreviews and get their "throws" information
@@ -103,13 +113,16 @@ def get_pitcher_hand(game_previews):
             pitcher_ids.add(game['awayPitcher'])
 
     if not pitcher_ids:
-        print("No pitchers found in game previews.")
+        logger.warning("No pitchers found in game previews.")
         return {}
 
-    pitcher_hand_dict = {}
+    # Hands already packed by statmatrix.py build skip the per-pitcher lookup.
+    # Imported here so the report doesn't load duckdb and pandas at startup
+    from statmatrix import pitcher_hands
+    pitcher_hand_dict = pitcher_hands(pitcher_ids)
 
-    # Iterate over each pitcher ID and make a request for each one
-    for pitcher_id in pitcher_ids:
+    # Iterate over each remaining pitcher ID and make a request for each one
+    for pitcher_id in pitcher_ids - set(pitcher_hand_dict):
         # Create the individual request URL for the pitcher
         pitcher_api_url = f"https://localhost:44346/api/Pitchers/{pitcher_id}"
 
@@ -117,8 +130,8 @@ def get_pitcher_hand(game_previews):
         response = requests.get(pitcher_api_url, verify=False)
         
         if response.status_code != 200:
-            print(f"Error: Received status code {response.status_code} for pitcher {pitcher_id}")
-            print(f"Response content: {response.text}")
+            logger.error("Error: Received status code %s for pitcher %s", response.status_code, pitcher_id)
+            logger.error("Response content: %s", response.text)
             continue
 
         pitcher_data = safe_get_json(response)
@@ -127,7 +140,7 @@ def get_pitcher_hand(game_previews):
         if pitcher_data and 'throws' in pitcher_data:
             pitcher_hand_dict[pitcher_id] = pitcher_data['throws']
         else:
-            print(f"Warning: No 'throws' data found for pitcher {pitcher_id}")
+            logger.warning("Warning: No 'throws' data found for pitcher %s", pitcher_id)
 
     return pitcher_hand_dict
 
@@ -144,7 +157,7 @@ def filter_by_position(players, positions, exact=False):
 def print_top_n(stat, players, n=10):
     sorted_players = sorted(players, key=lambda x: x[stat], reverse=True)[:n]
     for p in sorted_players:
-        print(f"{p[stat]:.2f} {p['playerName']} {p['team']} {p['pos']} {p['bbrefId']}")
+        logger.info("%.2f %s %s %s %s", p[stat], p['playerName'], p['team'], p['pos'], p['bbrefId'])
 
 # Function to count positive outperformanceScore by team
 def count_positive_scores_by_team(players):
@@ -224,9 +237,9 @@ for player in players:
 
 # Count positive outperformanceScore by team and print the results
 team_counts = count_positive_scores_by_team(players)
-print("\nPositive outperformanceScore counts by team:")
+logger.info("\nPositive outperformanceScore counts by team:")
 for team, count in team_counts.items():
-    print(f"{team} = {count}")
+    logger.info("%s = %s", team, count)
 
 # Function to map ordinal suffixes (1st, 2nd, 3rd, etc.)
 def ordinal_suffix(i):
@@ -259,7 +272,7 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
                 is_predictive = True
 
             if not lineup:
-                print(f"Warning: No lineup found for {team} (neither actual nor predicted).")
+                logger.warning("Warning: No lineup found for %s (neither actual nor predicted).", team)
                 continue
 
             opponent = home_team if team == away_team else away_team
@@ -277,13 +290,13 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
                 lineup.get(f"batting{i}{ordinal_suffix(i)}", None) for i in range(1, 10)
             ]
 
-            print(f"\nTeam: {team}")
-            print(f"Opponent: {opponent}")
-            print(f"Opposing SP: {blending_message}")
+            logger.debug("\nTeam: %s", team)
+            logger.debug("Opponent: %s", opponent)
+            logger.debug("Opposing SP: %s", blending_message)
             if lhp:
-                print(f"(Team vs LHP record: {vs_record})")
+                logger.debug("(Team vs LHP record: %s)", vs_record)
             else:
-                print(f"(Team vs RHP record: {vs_record})")
+                logger.debug("(Team vs RHP record: %s)", vs_record)
 
             total_score = 0
             valid_player_count = 0  # Keep track of players with valid scores (not N/A)
@@ -296,22 +309,22 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
 
                     if player_info:
                         player_name, score = player_info
-                        print(f"Batting {i}: {player_name} ({score:.2f})")
+                        logger.debug("Batting %s: %s (%.2f)", i, player_name, score)
                         total_score += score
                         valid_player_count += 1  # Increment valid player count
                     else:
-                        print(f"Batting {i}: {player_id} (N/A)")
+                        logger.debug("Batting %s: %s (N/A)", i, player_id)
                 else:
-                    print(f"Batting {i}: N/A")
+                    logger.debug("Batting %s: N/A", i)
 
             # Calculate the average score, using valid_player_count instead of 9
             avg_score = total_score / valid_player_count if valid_player_count > 0 else 0
 
-            print(f"\n{team} lineup total = {total_score:.2f}")
-            print(f"\n{team} lineup avg = {avg_score:.2f}")
+            logger.debug("\n%s lineup total = %.2f", team, total_score)
+            logger.debug("\n%s lineup avg = %.2f", team, avg_score)
             
             if is_predictive:
-                print(f"{team} using Predictive Lineup Service")
+                logger.debug("%s using Predictive Lineup Service", team)
 
             # Store total and avg score in the dictionary
             team_scores[team] = {'total_score': total_score, 'avg_score': avg_score}
@@ -323,8 +336,8 @@ def print_actual_or_predicted_lineups_with_scores(predicted_lineups):
 def get_predictive_lineups():
     response = requests.get(PredLineups_api, verify=False)
     if response.status_code != 200:
-        print(f"Error: Received status code {response.status_code} for predicted lineups")
-        print(f"Response content: {response.text}")
+        logger.error("Error: Received status code %s for predicted lineups", response.status_code)
+        logger.error("Response content: %s", response.text)
         return {}
 
     predicted_lineups = safe_get_json(response) or []
@@ -341,12 +354,12 @@ def pitching_advantage():
     
     # Get the pitching advantage data
     response = requests.get(pitching_adv_api, verify=False)
-    print(f"Pitching Advantage API status code: {response.status_code}")
+    logger.debug("Pitching Advantage API status code: %s", response.status_code)
     
     pitching_data = safe_get_json(response)
     
     if not pitching_data:
-        print("No pitching advantage data retrieved.")
+        logger.warning("No pitching advantage data retrieved.")
         return {}
 
     # Initialize an empty dictionary to store teams with their advantage score
@@ -359,13 +372,13 @@ def pitching_advantage():
 
         if "Not enough data to determine advantage" in advantage_info:
             score = 0  # Set the advantage score to 0 for this case
-            print(f"No team has the advantage in {game_info}, look manually.")
+            logger.warning("No team has the advantage in %s, look manually.", game_info)
         else:
             # Extract the advantage score (the last part of the advantage string)
             try:
                 score = float(advantage_info.split("by")[-1].strip())
             except ValueError:
-                print(f"Error: Could not extract advantage score for {game_info}.")
+                logger.error("Error: Could not extract advantage score for %s.", game_info)
                 score = 0
 
         # Determine whether it's the home or away team that has the advantage
@@ -401,11 +414,11 @@ def initial_classification(pitcher_adv_teams, value_teams):
             else:
                 avoid_list.append(team)
 
-    print("\nInitial Classification:")
-    print(f"Strong: {strong_list}")
-    print(f"Slight: {slight_list}")
-    print(f"Weak: {weak_list}")
-    print(f"Avoid: {avoid_list}")
+    logger.info("\nInitial Classification:")
+    logger.info("Strong: %s", strong_list)
+    logger.info("Slight: %s", slight_list)
+    logger.info("Weak: %s", weak_list)
+    logger.info("Avoid: %s", avoid_list)
 
     return strong_list, slight_list, weak_list, avoid_list
 
@@ -415,7 +428,7 @@ def refine_classification(strong_list, slight_list, weak_list, avoid_list, pitch
     Avoid list should persist unless specific conditions move teams out.
     """
     # Start by printing current lists before refinement
-    print("\nStarting refinement process...")
+    logger.info("\nStarting refinement process...")
 
     # Example refinement conditions
     for team in avoid_list[:]:  # Process a copy of the list to avoid modifying it during iteration
@@ -423,13 +436,13 @@ def refine_classification(strong_list, slight_list, weak_list, avoid_list, pitch
         if sp_adv > 100:  # Move the team out of Avoid if its SP advantage rises above a threshold
             avoid_list.remove(team)
             weak_list.append(team)
-            print(f"{team} moved from Avoid to Weak due to SP advantage of {sp_adv:.2f}")
+            logger.debug("%s moved from Avoid to Weak due to SP advantage of %.2f", team, sp_adv)
 
-    print("\nRefinement Complete:")
-    print(f"Strong: {strong_list}")
-    print(f"Slight: {slight_list}")
-    print(f"Weak: {weak_list}")
-    print(f"Avoid: {avoid_list}")
+    logger.info("\nRefinement Complete:")
+    logger.info("Strong: %s", strong_list)
+    logger.info("Slight: %s", slight_list)
+    logger.info("Weak: %s", weak_list)
+    logger.info("Avoid: %s", avoid_list)
 
     return strong_list, slight_list, weak_list, avoid_list
 
@@ -454,15 +467,15 @@ def refine_classification_with_locks(strong_list, slight_list, weak_list, avoid_
         if home_team in pitcher_adv_teams and pitcher_adv_teams[home_team] > 0 and home_team_avg_score > 0 and away_team_avg_score < 0:
             if home_team not in locks:
                 locks.append(home_team)
-                print(f"{home_team} added to Locks (Pitching Advantage, Positive Avg Score: {home_team_avg_score}, Negative Opponent Avg Score: {away_team_avg_score})")
+                logger.info("%s added to Locks (Pitching Advantage, Positive Avg Score: %s, Negative Opponent Avg Score: %s)", home_team, home_team_avg_score, away_team_avg_score)
 
         if away_team in pitcher_adv_teams and pitcher_adv_teams[away_team] > 0 and away_team_avg_score > 0 and home_team_avg_score < 0:
             if away_team not in locks:
                 locks.append(away_team)
-                print(f"{away_team} added to Locks (Pitching Advantage, Positive Avg Score: {away_team_avg_score}, Negative Opponent Avg Score: {home_team_avg_score})")
+                logger.info("%s added to Locks (Pitching Advantage, Positive Avg Score: %s, Negative Opponent Avg Score: %s)", away_team, away_team_avg_score, home_team_avg_score)
 
-    print("\nLocks Updated:")
-    print(f"Locks: {locks}")
+    logger.info("\nLocks Updated:")
+    logger.info("Locks: %s", locks)
     
     return locks
 
@@ -493,12 +506,12 @@ def classify_teams(pitcher_adv_teams, team_scores, game_previews, teamsplits_dat
     )
 
     # Final lists after refinement
-    print("\nFinal Classification after Refinement:")
-    print(f"Strong: {strong_list}")
-    print(f"Slight: {slight_list}")
-    print(f"Weak: {weak_list}")
-    print(f"Avoid: {avoid_list}")
-    print(f"Locks: {locks}")
+    logger.info("\nFinal Classification after Refinement:")
+    logger.info("Strong: %s", strong_list)
+    logger.info("Slight: %s", slight_list)
+    logger.info("Weak: %s", weak_list)
+    logger.info("Avoid: %s", avoid_list)
+    logger.info("Locks: %s", locks)
 
     return strong_list, slight_list, weak_list, avoid_list, locks
 
@@ -509,21 +522,21 @@ def game_analysis(pitcher_adv_teams, team_scores, game_previews, teamsplits_data
         if current_tier == 'Strong':
             strong_list.remove(team)  # Remove from Strong
             slight_list.append(team)  # Move down to Slight
-            print(f"{team} moved down to Slight ({reason})")
+            logger.debug("%s moved down to Slight (%s)", team, reason)
         elif current_tier == 'Slight':
             slight_list.remove(team)  # Remove from Slight
             weak_list.append(team)  # Move down to Weak
-            print(f"{team} moved down to Weak ({reason})")
+            logger.debug("%s moved down to Weak (%s)", team, reason)
         elif current_tier == 'Weak':
             weak_list.remove(team)  # Remove from Weak
             if positive_odds:
                 dawgs_list.append(team)  # Add to Dawgs instead of moving to Avoid
-                print(f"{team} moved to Dawgs (positive odds despite failing criteria)")
+                logger.debug("%s moved to Dawgs (positive odds despite failing criteria)", team)
             else:
                 avoid_list.append(team)  # Move down to Avoid
-                print(f"{team} moved down to Avoid ({reason})")
+                logger.debug("%s moved down to Avoid (%s)", team, reason)
         elif current_tier == 'Avoid':
-            print(f"{team} remains in Avoid ({reason})")  # If already in Avoid, no further action
+            logger.debug("%s remains in Avoid (%s)", team, reason)  # If already in Avoid, no further action
 
     # Identify the current tier for the advantage team
     def get_current_tier(team):
@@ -615,7 +628,7 @@ def game_analysis(pitcher_adv_teams, team_scores, game_previews, teamsplits_data
 
         # Adjust team placement based on conditions
         if record_check and record_criteria:
-            print(f"{adv_team} stays in {current_tier} (passed SP adv, lineup, and records)")
+            logger.debug("%s stays in %s (passed SP adv, lineup, and records)", adv_team, current_tier)
         else:
             move_team_down_one_tier(adv_team, current_tier, positive_odds, "failed criteria")
 
@@ -657,7 +670,7 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, avoid_list, pitc
 
     def move_team_down_tiers(team, current_tier, move_by, failed_conditions):
         if team not in pitcher_adv_teams:
-            print(f"Skipping {team} since it doesn't have a pitching advantage.")
+            logger.debug("Skipping %s since it doesn't have a pitching advantage.", team)
             return
 
         target_tier = min(current_tier + move_by, 3)
@@ -666,18 +679,18 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, avoid_list, pitc
         if target_tier == 1:  # Move to slight
             strong_list.remove(team) if team in strong_list else None
             slight_list.append(team)
-            print(f"Moving {team} to Slight list (failed {failed_conditions_str})")
+            logger.debug("Moving %s to Slight list (failed %s)", team, failed_conditions_str)
         elif target_tier == 2:  # Move to weak
             strong_list.remove(team) if team in strong_list else None
             slight_list.remove(team) if team in slight_list else None
             weak_list.append(team)
-            print(f"Moving {team} to Weak list (failed {failed_conditions_str})")
+            logger.debug("Moving %s to Weak list (failed %s)", team, failed_conditions_str)
         elif target_tier == 3:  # Move to avoid
             strong_list.remove(team) if team in strong_list else None
             slight_list.remove(team) if team in slight_list else None
             weak_list.remove(team) if team in weak_list else None
             avoid_list.append(team)
-            print(f"Moving {team} to Avoid list (failed {failed_conditions_str})")
+            logger.debug("Moving %s to Avoid list (failed %s)", team, failed_conditions_str)
 
     # Process teams from weak to strong
     for team in weak_list[:]:
@@ -747,31 +760,22 @@ def adjust_lists_by_sp_adv(strong_list, slight_list, weak_list, avoid_list, pitc
     return strong_list, slight_list, weak_list, avoid_list
 
 
-# Function to calculate the average odds for a team with special handling for negative odds
+# Function to calculate the average odds for a team across the books, averaged as
+# probabilities so a -110/+110 split comes out near even money (see oddsmath.average_price)
 def calculate_average_odds(team, game):
     # Determine if the team is home or away
     if game['homeTeam'] == team:
-        # Get the home team odds
-        odds_list = [game['fanduelHomeOdds'], game['draftkingsHomeOdds'], game['betmgmHomeOdds']]
+        side = 0
     elif game['awayTeam'] == team:
-        # Get the away team odds
-        odds_list = [game['fanduelAwayOdds'], game['draftkingsAwayOdds'], game['betmgmAwayOdds']]
+        side = 1
     else:
         return None  # Return None if the team is not found
 
-    # Calculate the average of the absolute values
-    abs_avg_odds = sum(abs(odds) for odds in odds_list) / len(odds_list)
-
-    # Count how many odds were negative originally
-    negative_count = sum(1 for odds in odds_list if odds < 0)
-
-    # If two or more odds were negative, make the result negative
-    if negative_count >= 2:
-        avg_odds = -abs_avg_odds
-    else:
-        avg_odds = abs_avg_odds
+    avg_odds = average_price(game_odds_prices([game])[0, :, side])
+    if np.isnan(avg_odds):
+        return None  # No book has posted a line yet
 
-    return {team: avg_odds}
+    return {team: round(float(avg_odds))}
 
 # Function to get average odds for teams in a list
 def get_avg_odds_for_list(teams_list, game_odds_data):
@@ -779,7 +783,7 @@ def get_avg_odds_for_list(teams_list, game_odds_data):
 
     # Check the structure of game_odds_data
     if not isinstance(game_odds_data, list):
-        print("Error: game_odds_data is not a list. Current type:", type(game_odds_data))
+        logger.error("Error: game_odds_data is not a list. Current type: %s", type(game_odds_data))
         return team_odds_dict
 
     for team in teams_list:
@@ -788,7 +792,7 @@ def get_avg_odds_for_list(teams_list, game_odds_data):
         # Check if each game in game_odds_data is a dictionary
         for game in game_odds_data:
             if not isinstance(game, dict):
-                print(f"Error: Found an invalid game entry. Expected a dictionary but got {type(game)}")
+                logger.error("Error: Found an invalid game entry. Expected a dictionary but got %s", type(game))
                 continue
 
             # Search for the team's odds in the game odds data
@@ -799,24 +803,24 @@ def get_avg_odds_for_list(teams_list, game_odds_data):
 
         if team_odds:
             team_odds_dict.update(team_odds)
-            print(f"{team} average odds: {team_odds[team]:.2f}")
+            logger.debug("%s average odds: %.2f", team, team_odds[team])
         else:
-            print(f"No odds data found for {team}.")
+            logger.warning("No odds data found for %s.", team)
 
     return team_odds_dict
 
 # Function to calculate the average odds for each list
 def print_and_return_avg_odds_lists(strong_list, slight_list, weak_list, avoid_list, game_odds_data):
-    print("\nCalculating average odds for Strong list:")
+    logger.debug("\nCalculating average odds for Strong list:")
     strong_odds = get_avg_odds_for_list(strong_list, game_odds_data)
     
-    print("\nCalculating average odds for Slight list:")
+    logger.debug("\nCalculating average odds for Slight list:")
     slight_odds = get_avg_odds_for_list(slight_list, game_odds_data)
 
-    print("\nCalculating average odds for Weak list:")
+    logger.debug("\nCalculating average odds for Weak list:")
     weak_odds = get_avg_odds_for_list(weak_list, game_odds_data)
 
-    print("\nCalculating average odds for Avoid list:")
+    logger.debug("\nCalculating average odds for Avoid list:")
     avoid_odds = get_avg_odds_for_list(avoid_list, game_odds_data)
 
     return strong_odds, slight_odds, weak_odds, avoid_odds
@@ -885,21 +889,21 @@ def initial_classification_with_locks(pitcher_adv_teams, team_scores):
             if away_team_score > 0 and home_team_score < 0:
                 locks.append(away_team)
 
-    print("\nInitial Classification:")
-    print(f"Strong: {strong_list}")
-    print(f"Slight: {slight_list}")
-    print(f"Weak: {weak_list}")
-    print(f"Avoid: {avoid_list}")
-    print(f"Lineup Adv and SP adv: {locks}")
+    logger.info("\nInitial Classification:")
+    logger.info("Strong: %s", strong_list)
+    logger.info("Slight: %s", slight_list)
+    logger.info("Weak: %s", weak_list)
+    logger.info("Avoid: %s", avoid_list)
+    logger.info("Lineup Adv and SP adv: %s", locks)
 
     return strong_list, slight_list, weak_list, avoid_list, locks
 
 
 # Call the pitching_advantage method and print the teams with an advantage and their score
 pitcher_adv_teams = pitching_advantage()
-print("\nTeams with Pitching Advantage and their Scores:")
+logger.info("\nTeams with Pitching Advantage and their Scores:")
 for team, score in pitcher_adv_teams.items():
-    print(f"{team}: {score:.2f}")
+    logger.info("%s: %.2f", team, score)
 
 
 # Get predicted lineups ahead of time
@@ -909,9 +913,9 @@ predicted_lineups = get_predictive_lineups()
 team_scores = print_actual_or_predicted_lineups_with_scores(predicted_lineups)
 
 # Print the returned dictionary
-print("\nTeam Scores:")
+logger.info("\nTeam Scores:")
 for team, scores in team_scores.items():
-    print(f"{team}: Total = {scores['total_score']:.2f}, Avg = {scores['avg_score']:.2f}")
+    logger.info("%s: Total = %.2f, Avg = %.2f", team, scores['total_score'], scores['avg_score'])
 
 
 # Main Execution Flow
@@ -920,14 +924,14 @@ for team, scores in team_scores.items():
 
 # Call the pitching_advantage method and print the teams with an advantage and their score
 pitcher_adv_teams = pitching_advantage()
-print("\nTeams with Pitching Advantage and their Scores:")
+logger.info("\nTeams with Pitching Advantage and their Scores:")
 for team, score in pitcher_adv_teams.items():
-    print(f"{team}: {score:.2f}")
+    logger.info("%s: %.2f", team, score)
 
 # Step 1: Get value and chalk output from the ValueModel function
 value_output, chalk_output = ValueModel(pitcher_adv_teams, game_odds_data)
-print("\nValue Model Output (Positive Odds):", value_output)
-print("\nChalk Model Output (Negative Odds):", chalk_output)
+logger.info("\nValue Model Output (Positive Odds): %s", value_output)
+logger.info("\nChalk Model Output (Negative Odds): %s", chalk_output)
 
 # Step 2: Initial classification based on pitching advantage and value_output
 strong_list, slight_list, weak_list, avoid_list = initial_classification(pitcher_adv_teams, value_output)
@@ -943,13 +947,13 @@ locks = refine_classification_with_locks(strong_list, slight_list, weak_list, av
 
 
 # Final Output of Lists after refinement
-print("\nFinal Classification after Refinement:")
-print(f"Strong: {strong_list}")
-print(f"Slight: {slight_list}")
-print(f"Weak: {weak_list}")
-print(f"Avoid: {avoid_list}")
-print(f"Locks: {locks}")
-print('------------------------------------------------------------------------------')
+logger.info("\nFinal Classification after Refinement:")
+logger.info("Strong: %s", strong_list)
+logger.info("Slight: %s", slight_list)
+logger.info("Weak: %s", weak_list)
+logger.info("Avoid: %s", avoid_list)
+logger.info("Locks: %s", locks)
+logger.info("------------------------------------------------------------------------------")
 
 # Step 2: Adjust classifications with game analysis, keeping Locks unchanged
 strong_list, slight_list, weak_list, avoid_list, dawgs_list, locks_list = game_analysis(
@@ -958,16 +962,16 @@ strong_list, slight_list, weak_list, avoid_list, dawgs_list, locks_list = game_a
 )
 
 # Print final output
-print("\nFinal Classification after game analysis:")
+logger.info("\nFinal Classification after game analysis:")
 
-print(f"Strong: {strong_list}")
-print(f"Slight: {slight_list}")
-print(f"Weak: {weak_list}")
-print(f"Dawgs: {dawgs_list}")
-print(f"Avoid: {avoid_list}")
+logger.info("Strong: %s", strong_list)
+logger.info("Slight: %s", slight_list)
+logger.info("Weak: %s", weak_list)
+logger.info("Dawgs: %s", dawgs_list)
+logger.info("Avoid: %s", avoid_list)
 
 
-print(f"Specialized lists")
-print(f"Lineup Adv and SP adv: {locks}")
+logger.info("Specialized lists")
+logger.info("Lineup Adv and SP adv: %s", locks)
 
 
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import functools
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics_data")
+
+
+class RunMetrics:
+    """
+    Timings and request counters for one run of a script.
+
+    Stages (fetch, parse, transform, post, sleep, ...) are timed with the
+    stage() context manager or the timed() decorator; HTTP responses are
+    counted per host through a requests session hook (track_session) or
+    record_response(). Every event is appended to
+    metrics_data/{script}/{run}.jsonl, and close() adds a summary line and
+    prints the summary table.
+    """
+
+    def __init__(self, script, root=METRICS_DIR):
+        self.script = script
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.path = os.path.join(root, script, f"{self.run_id}.jsonl")
+        self.started = time.perf_counter()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = Counter()
+        self.counters = Counter()
+        self.requests = Counter()
+        self.request_bytes = Counter()
+        self.request_seconds = defaultdict(float)
+        self.statuses = defaultdict(Counter)
+        self._file = None
+
+    def _write(self, event):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        event = {"ts": datetime.now().isoformat(timespec='milliseconds'), **event}
+        self._file.write(json.dumps(event) + "\n")
+
+    @contextmanager
+    def stage(self, name, **tags):
+        """
+        Time a block: with metrics.stage("parse", player=bbrefid): ...
+        """
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.stage_seconds[name] += seconds
+            self.stage_calls[name] += 1
+            self._write({"type": "stage", "stage": name, "seconds": round(seconds, 6), "ok": ok, **tags})
+
+    def timed(self, name):
+        """
+        Decorator form of stage().
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def sleep(self, seconds):
+        """
+        time.sleep, booked to the "sleep" stage so throttling shows up in
+        the summary next to real work.
+        """
+        with self.stage("sleep"):
+            time.sleep(seconds)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def record_response(self, response, *args, **kwargs):
+        """
+        Count one HTTP response by host, status and size. Also usable
+        directly as a requests response hook.
+        """
+        host = urlparse(response.url).netloc or "unknown"
+        length = response.headers.get('Content-Length')
+        size = int(length) if length and length.isdigit() else len(response.content or b"")
+        seconds = response.elapsed.total_seconds() if response.elapsed else 0.0
+        self.requests[host] += 1
+        self.request_bytes[host] += size
+        self.request_seconds[host] += seconds
+        self.statuses[host][response.status_code] += 1
+        self._write({
+            "type": "request", "host": host, "method": response.request.method if response.request else None,
+            "status": response.status_code, "bytes": size, "seconds": round(seconds, 6),
+        })
+        return response
+
+    def track_session(self, session):
+        """
+        Record every response a requests (or cloudscraper) session receives.
+        """
+        session.hooks.setdefault('response', []).append(self.record_response)
+        return session
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """
+        Plain-text table of stage timings, per-host requests and counters.
+        """
+        total = self.elapsed()
+        lines = [f"{'Stage':<14}{'Calls':>8}{'Seconds':>12}{'% of run':>10}"]
+        for name, seconds in sorted(self.stage_seconds.items(), key=lambda item: -item[1]):
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"{name:<14}{self.stage_calls[name]:>8}{seconds:>12.2f}{share:>9.1f}%")
+        lines.append(f"{'total':<14}{'':>8}{total:>12.2f}")
+        if self.requests:
+            lines.append("")
+            lines.append(f"{'Host':<32}{'Requests':>9}{'MB':>9}{'Seconds':>10}  Statuses")
+            for host, n in self.requests.most_common():
+                statuses = ", ".join(f"{code}: {c}" for code, c in sorted(self.statuses[host].items()))
+                lines.append(f"{host:<32}{n:>9}{self.request_bytes[host] / 1e6:>9.2f}{self.request_seconds[host]:>10.2f}  {statuses}")
+        if self.counters:
+            lines.append("")
+            for name, n in sorted(self.counters.items()):
+                lines.append(f"{name:<32}{n:>9}")
+        return "\n".join(lines)
+
+    def close(self, print_summary=True):
+        """
+        Write the run summary line, close the file and print the table.
+        """
+        self._write({
+            "type": "summary",
+            "script": self.script,
+            "seconds": round(self.elapsed(), 3),
+            "stages": {name: round(s, 3) for name, s in self.stage_seconds.items()},
+            "stage_calls": dict(self.stage_calls),
+            "requests": dict(self.requests),
+            "bytes": dict(self.request_bytes),
+            "statuses": {host: {str(code): c for code, c in codes.items()} for host, codes in self.statuses.items()},
+            "counters": dict(self.counters),
+        })
+        self._file.close()
+        self._file = None
+        if print_summary:
+            print(self.summary())
+            print(f"Metrics written to {self.path}")
@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import atexit
+import logging
+import logging.handlers
+import queue
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+REPORT_FORMAT = '%(message)s'
+
+# Records held in memory before a write to the log file (errors flush at once)
+FILE_BUFFER_RECORDS = 500
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger, message, plus any
+    fields passed with extra= (e.g. extra={"player": bbrefid}).
+    """
+
+    def format(self, record):
+        event = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                event[key] = value
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves msg % args for the listener thread, so the
+    calling loop only pays for building the record.
+    """
+
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+
+_listener = None
+
+
+def configure_logging(script, level=None, log_dir=LOG_DIR, console_format=CONSOLE_FORMAT):
+    """
+    Route the root logger through a queue to a console handler and a
+    buffered JSON-lines file (logs/{script}.log, rewritten each run).
+
+    level defaults to the LOG_LEVEL environment variable, else INFO; pass
+    logging.DEBUG (e.g. from a --debug flag) to see per-row messages.
+    Messages below the level are dropped before they are formatted.
+    Report scripts pass console_format=REPORT_FORMAT to keep their output
+    free of timestamps.
+    """
+    global _listener
+    if level is None:
+        level = os.environ.get("LOG_LEVEL", "INFO").upper()
+    if isinstance(level, str):
+        level = logging.getLevelName(level)
+
+    os.makedirs(log_dir, exist_ok=True)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(console_format))
+    file_handler = logging.FileHandler(os.path.join(log_dir, f"{script}.log"), mode='w', encoding='utf-8')
+    file_handler.setFormatter(JsonLinesFormatter())
+    buffered = logging.handlers.MemoryHandler(FILE_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler)
+
+    if _listener is not None:
+        _listener.stop()
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, console, buffered, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_LazyQueueHandler(records))
+    root.setLevel(level)
+    return logging.getLogger(script)
+
+
+def shutdown_logging():
+    """
+    Drain the queue and flush the file buffer. Registered with atexit.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        target = getattr(handler, "target", None)
+        handler.flush()
+        handler.close()
+        if target is not None:
+            target.close()
+    _listener = None
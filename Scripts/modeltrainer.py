@@ -0,0 +1,325 @@
+import os
+import sys
+import copy
+import glob
+import json
+import pickle
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+
+import nrfipipeline
+from nrfipipeline import API_BASE_URL, FEATURES_FILE, fetch_json
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_DIR = os.path.join(BASE_DIR, "model_registry")
+SAVANT_OUTPUT_DIR = os.path.join(BASE_DIR, "DailyFlowCF", "testing", "output")
+
+# Warm-start settings for the NRFI booster: new trees are fit on the new
+# games plus a trailing window, so nightly cost tracks the new data
+ADD_TREES = 20
+RECENT_WINDOW = 600
+MAX_TREES = 600  # past this, fall back to a full refit
+
+
+class ModelRegistry:
+    """
+    Versioned model store: {root}/{name}/v0001.pkl plus a registry.json
+    listing every version with its metrics. The newest version is current.
+    """
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+
+    def _index_path(self, name):
+        return os.path.join(self.root, name, "registry.json")
+
+    def versions(self, name):
+        try:
+            with open(self._index_path(name), 'r', encoding='utf-8') as infile:
+                return json.load(infile)
+        except (OSError, ValueError):
+            return []
+
+    def register(self, name, obj, metrics, **info):
+        versions = self.versions(name)
+        version = versions[-1]["version"] + 1 if versions else 1
+        folder = os.path.join(self.root, name)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"v{version:04d}.pkl")
+        with open(path, 'wb') as outfile:
+            pickle.dump(obj, outfile)
+
+        versions.append({
+            "version": version,
+            "path": os.path.basename(path),
+            "created": datetime.now().isoformat(timespec='seconds'),
+            "metrics": metrics,
+            **info,
+        })
+        with open(self._index_path(name), 'w', encoding='utf-8') as outfile:
+            json.dump(versions, outfile, indent=2)
+        return version
+
+    def load(self, name, version=None):
+        """
+        Load a version (default: current). Returns None when nothing is registered.
+        """
+        versions = self.versions(name)
+        if not versions:
+            return None
+        entry = versions[-1] if version is None else next((v for v in versions if v["version"] == version), None)
+        if entry is None:
+            raise ValueError(f"No version {version} registered for {name}")
+        with open(os.path.join(self.root, name, entry["path"]), 'rb') as infile:
+            return pickle.load(infile)
+
+
+class IncrementalOLS:
+    """
+    Ordinary least squares kept as sufficient statistics (X'X, X'y, y'y, n),
+    so adding or retracting rows never touches the rest of the history.
+    """
+
+    def __init__(self, n_features):
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.yty = 0.0
+        self.n = 0
+
+    def update(self, X, y, sign=1.0):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.xtx += sign * (X.T @ X)
+        self.xty += sign * (X.T @ y)
+        self.yty += sign * float(y @ y)
+        self.n += int(sign) * len(y)
+
+    def downdate(self, X, y):
+        self.update(X, y, sign=-1.0)
+
+    @property
+    def coef_(self):
+        return np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_
+
+    def metrics(self):
+        """
+        In-sample R^2 and RMSE straight from the sufficient statistics.
+        Assumes column 0 is the intercept.
+        """
+        if self.n == 0:
+            return {"rows": 0}
+        beta = self.coef_
+        sse = self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        sst = self.yty - self.xty[0] ** 2 / self.n
+        return {
+            "rows": self.n,
+            "r2": float(1 - sse / sst) if sst > 0 else None,
+            "rmse": float(np.sqrt(max(sse, 0.0) / self.n)),
+        }
+
+
+class KeyedOLS(IncrementalOLS):
+    """
+    IncrementalOLS over rows keyed by player. Season-to-date snapshots
+    restate a player's line every day, so an upsert retracts the player's
+    previous row before adding the new one.
+    """
+
+    def __init__(self, n_features):
+        super().__init__(n_features)
+        self.rows = {}
+
+    def upsert(self, keys, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        changed = 0
+        for key, x_row, y_val in zip(keys, X, y):
+            previous = self.rows.get(key)
+            if previous is not None:
+                if np.array_equal(previous[0], x_row) and previous[1] == y_val:
+                    continue
+                self.downdate(previous[0][None, :], [previous[1]])
+            self.update(x_row[None, :], [y_val])
+            self.rows[key] = (x_row, float(y_val))
+            changed += 1
+        return changed
+
+    def to_state(self):
+        """
+        Plain-data form for pickling, so registry files load without this
+        module being __main__.
+        """
+        return {"xtx": self.xtx, "xty": self.xty, "yty": self.yty, "n": self.n, "rows": self.rows}
+
+    @classmethod
+    def from_state(cls, state):
+        ols = cls(len(state["xty"]))
+        ols.xtx, ols.xty, ols.yty, ols.n, ols.rows = (state["xtx"], state["xty"], state["yty"],
+                                                     state["n"], state["rows"])
+        return ols
+
+
+def _warm_start(model, X, y, add_trees):
+    """
+    Grow a fitted GradientBoostingClassifier by add_trees stages. Existing
+    stages are kept; only the new ones are fit, on X/y.
+    """
+    model = copy.deepcopy(model)
+    model.set_params(warm_start=True, n_estimators=model.n_estimators_ + add_trees)
+    model.fit(X, y)
+    return model
+
+
+def update_nrfi(session, registry, add_trees=ADD_TREES, recent_window=RECENT_WINDOW, full=False):
+    """
+    Nightly NRFI update: append completed games missing from the Parquet
+    matrix, score them with the current model (out-of-sample metrics),
+    then warm-start new trees on the new games plus a trailing window.
+    New rows come from the snapshots taken before each game. A matrix or
+    registered model built from season totals (no as_of column, no
+    point_in_time flag) is discarded and the model refit from scratch.
+    """
+    frame = pd.DataFrame(columns=["game_id", "date", "as_of"] + nrfipipeline.FEATURES + ["nrfi"])
+    if os.path.exists(FEATURES_FILE):
+        stored = pd.read_parquet(FEATURES_FILE)
+        if "as_of" in stored.columns:
+            frame = stored
+        else:
+            print(f"{FEATURES_FILE} predates point-in-time features; rebuilding it")
+            full = True
+
+    known = set(frame["game_id"].tolist())
+    results = fetch_json(session, f"{API_BASE_URL}/GameResults") or []
+    new_results = [r for r in results if r.get('id') not in known]
+    new_rows = nrfipipeline.build_feature_matrix(session, new_results)
+    print(f"{len(new_rows)} new completed games ({len(frame)} already stored)")
+
+    combined = pd.concat([frame, new_rows], ignore_index=True) if len(frame) else new_rows
+    if combined.empty:
+        print("No games to train on")
+        return None
+    if not new_rows.empty:
+        os.makedirs(os.path.dirname(FEATURES_FILE), exist_ok=True)
+        combined.to_parquet(FEATURES_FILE, index=False)
+
+    bundle = registry.load("nrfi")
+    if bundle is not None and not bundle.get("point_in_time"):
+        print("Registered NRFI model was trained on season totals; refitting")
+        bundle = None
+    if bundle is None or full or bundle["model"].n_estimators_ + add_trees > MAX_TREES:
+        print("Fitting NRFI model from scratch")
+        bundle = nrfipipeline.train_model(combined)
+        parent = None
+    else:
+        if new_rows.empty:
+            print("Model is already current")
+            return bundle
+        medians = pd.Series(bundle["medians"])
+        X_new = new_rows[bundle["features"]].fillna(medians).to_numpy(dtype=np.float64)
+        y_new = new_rows["nrfi"].to_numpy()
+        prequential = nrfipipeline.evaluate(bundle["model"], X_new, y_new)
+
+        window = pd.concat([frame.tail(recent_window), new_rows], ignore_index=True)
+        X_window = window[bundle["features"]].fillna(medians).to_numpy(dtype=np.float64)
+        model = _warm_start(bundle["model"], X_window, window["nrfi"].to_numpy(), add_trees)
+
+        parent = registry.versions("nrfi")[-1]["version"]
+        bundle = dict(bundle, model=model, metrics=prequential, trained_rows=int(len(combined)),
+                      trained_through=str(combined["date"].max().date()),
+                      trained_at=datetime.now().isoformat(timespec='seconds'))
+
+    version = registry.register("nrfi", bundle, bundle["metrics"], parent=parent,
+                                trees=int(bundle["model"].n_estimators_), rows=bundle["trained_rows"],
+                                trained_through=bundle["trained_through"])
+    # nrfipipeline score reads the fixed model path
+    nrfipipeline.save_bundle(bundle)
+    print(f"Registered nrfi v{version}: {bundle['metrics']}")
+    return bundle
+
+
+def _latest_savant_csv(directory=SAVANT_OUTPUT_DIR):
+    files = glob.glob(os.path.join(directory, "baseball_savant_stats_*.csv"))
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def update_xwoba(registry, path=None):
+    """
+    Fold the newest Baseball Savant snapshot into the findweights OLS.
+    Only players whose row changed since the last snapshot touch the
+    sufficient statistics.
+    """
+    sys.path.insert(0, os.path.join(BASE_DIR, "DailyFlowCF", "testing"))
+    from findweights import REGRESSION_FEATURES, prepare_data
+
+    path = path or _latest_savant_csv()
+    if not path:
+        print(f"No Baseball Savant snapshots found in {SAVANT_OUTPUT_DIR}")
+        return None
+
+    df = prepare_data(pd.read_csv(path))
+    features = [f for f in REGRESSION_FEATURES if f in df.columns]
+    df = df.dropna(subset=features + ["actual_xwOBA"])
+    X = np.column_stack([np.ones(len(df))] + [df[f].astype(float).to_numpy() for f in features])
+    y = df["actual_xwOBA"].astype(float).to_numpy()
+
+    state = registry.load("xwoba")
+    if state is None or state["features"] != features:
+        ols = KeyedOLS(len(features) + 1)
+    else:
+        ols = KeyedOLS.from_state(state["ols"])
+
+    changed = ols.upsert(df["BBRefID"].tolist(), X, y)
+    if changed == 0:
+        print("Snapshot matches the current regression; nothing to update")
+        return ols
+
+    metrics = ols.metrics()
+    metrics["coefficients"] = dict(zip(["const"] + features, [float(c) for c in ols.coef_]))
+    version = registry.register("xwoba", {"features": features, "ols": ols.to_state()}, metrics,
+                                snapshot=os.path.basename(path), changed_rows=changed)
+    print(f"Registered xwoba v{version} ({changed} changed rows): r2={metrics.get('r2')}, rmse={metrics.get('rmse')}")
+    return ols
+
+
+def print_versions(registry, name):
+    for entry in registry.versions(name):
+        print(f"v{entry['version']:04d}  {entry['created']}  {json.dumps(entry['metrics'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental model training with versioned outputs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    nrfi = sub.add_parser("nrfi", help="Append new game results and warm-start the NRFI model")
+    nrfi.add_argument("--add-trees", type=int, default=ADD_TREES)
+    nrfi.add_argument("--window", type=int, default=RECENT_WINDOW, help="Trailing games refit alongside new ones")
+    nrfi.add_argument("--full", action="store_true", help="Refit from scratch on the whole history")
+    xwoba = sub.add_parser("xwoba", help="Update the findweights xwOBA regression from a Savant snapshot")
+    xwoba.add_argument("--csv", help="Snapshot to fold in (default: newest in the output folder)")
+    history = sub.add_parser("versions", help="List registered versions and metrics")
+    history.add_argument("name", choices=["nrfi", "xwoba"])
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    if args.command == "nrfi":
+        session = requests.Session()
+        session.verify = False
+        update_nrfi(session, registry, args.add_trees, args.window, args.full)
+    elif args.command == "xwoba":
+        update_xwoba(registry, args.csv)
+    else:
+        print_versions(registry, args.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+import os
+import time
+import pickle
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.metrics import log_loss, brier_score_loss, roc_auc_score
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nrfi_data")
+FEATURES_FILE = os.path.join(DATA_DIR, "features.parquet")
+MODEL_FILE = os.path.join(DATA_DIR, "nrfi_model.pkl")
+
+# Snapshot tables a historical row reads, as captured by snapshots.py
+SNAPSHOT_TABLES = ("pitcher_first_inning", "nrfi_records")
+
+# Pitcher1stInning keeps a league-average row under this id for unknown starters
+UNANNOUNCED = "Unannounced"
+
+TEAM_NICKNAMES = [
+    "Diamondbacks", "Braves", "Orioles", "Red Sox", "White Sox", "Cubs", "Reds", "Guardians",
+    "Rockies", "Tigers", "Astros", "Royals", "Angels", "Dodgers", "Marlins", "Brewers", "Twins",
+    "Mets", "Yankees", "Athletics", "Phillies", "Pirates", "Padres", "Mariners", "Giants",
+    "Cardinals", "Rays", "Rangers", "Blue Jays", "Nationals"
+]
+
+FEATURES = [
+    "home_sp_era", "home_sp_whip", "home_sp_k_rate", "home_sp_bb_rate", "home_sp_hr_rate", "home_sp_ops",
+    "home_sp_starts",
+    "away_sp_era", "away_sp_whip", "away_sp_k_rate", "away_sp_bb_rate", "away_sp_hr_rate", "away_sp_ops",
+    "away_sp_starts",
+    "home_runs_at_home", "home_runs_per_first", "home_nrfi_pct",
+    "away_runs_at_away", "away_runs_per_first", "away_nrfi_pct",
+    "park_factor", "park_runs", "park_hr",
+]
+
+MODEL_PARAMS = {
+    "n_estimators": 200,
+    "learning_rate": 0.05,
+    "max_depth": 3,
+    "subsample": 0.8,
+    "random_state": 42,
+}
+HOLDOUT_FRACTION = 0.2
+
+# NRFI probability at or above which score calls a game NRFI, else YRFI
+NRFI_THRESHOLD = 0.5
+
+
+def to_nickname(team):
+    """
+    GameResults stores full names ("New York Yankees"), everything else
+    stores nicknames ("Yankees").
+    """
+    team = (team or "").strip()
+    for nickname in TEAM_NICKNAMES:
+        if team.endswith(nickname):
+            return nickname
+    return team
+
+
+def parse_record(record):
+    """
+    "84-72" -> 0.538 (NRFI share). Returns NaN for blank records.
+    """
+    try:
+        wins, losses = (int(x) for x in str(record).split('-'))
+        return wins / (wins + losses) if wins + losses else np.nan
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def fetch_json(session, url):
+    try:
+        response = session.get(url, verify=False)
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code != 404:
+            print(f"Request to {url} returned {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while requesting {url}: {e}")
+    return None
+
+
+class FeatureSources:
+    """
+    Lookup tables behind the feature transform. Team and park tables are
+    fetched once per year; pitcher first-inning rows are fetched once per
+    pitcher-season and memoized.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._pitchers = {}
+        self._nrfi_records = {}
+        self._parks = None
+
+    def pitcher_first_inning(self, bbref_id, year):
+        if not bbref_id or bbref_id == "Unknown":
+            bbref_id = UNANNOUNCED
+        key = (bbref_id, year)
+        if key not in self._pitchers:
+            if bbref_id == UNANNOUNCED:
+                row = fetch_json(self.session, f"{API_BASE_URL}/Pitcher1stInning/{UNANNOUNCED}") or {}
+            else:
+                row = fetch_json(self.session, f"{API_BASE_URL}/Pitcher1stInning/{bbref_id}/{year}")
+                if row is None:
+                    row = self.pitcher_first_inning(UNANNOUNCED, year)
+            self._pitchers[key] = row
+        return self._pitchers[key]
+
+    def team_nrfi(self, team, year):
+        if year not in self._nrfi_records:
+            rows = fetch_json(self.session, f"{API_BASE_URL}/NRFIRecords2024/{year}") or []
+            self._nrfi_records[year] = {r.get('team'): r for r in rows}
+        return self._nrfi_records[year].get(team, {})
+
+    def park(self, home_team):
+        if self._parks is None:
+            rows = fetch_json(self.session, f"{API_BASE_URL}/ParkFactors") or []
+            self._parks = {r.get('team'): r for r in rows}
+        return self._parks.get(home_team, {})
+
+
+class SnapshotSources(FeatureSources):
+    """
+    FeatureSources for past games. Pitcher and team tables come from the
+    snapshot store as they stood the day before the game, so a row never
+    sees the game itself or anything after it. Park factors are multi-season
+    ratings and still come from the API. Call at(date) before each game,
+    walking dates forward.
+    """
+
+    def __init__(self, session, root=None):
+        super().__init__(session)
+        # snapshots pulls in the warehouse; daily scoring doesn't need it
+        from snapshots import SNAPSHOT_DIR, SnapshotReader
+
+        self._readers = {table: SnapshotReader(table, root or SNAPSHOT_DIR) for table in SNAPSHOT_TABLES}
+        self.day = None
+        self._unannounced = {}
+
+    def at(self, day):
+        """
+        Point the lookups at the snapshots captured through day - 1.
+        Returns False when nothing had been captured by then.
+        """
+        if day == self.day:
+            return bool(self._pitchers) and bool(self._nrfi_records)
+        self.day = day
+        as_of = day - timedelta(days=1)
+        pitchers = self._readers["pitcher_first_inning"].as_of(as_of).to_dict('records')
+        records = self._readers["nrfi_records"].as_of(as_of).to_dict('records')
+        self._pitchers = {(r.get('bbrefId'), r.get('year')): r for r in pitchers}
+        self._nrfi_records = {(r.get('team'), r.get('year')): r for r in records}
+        self._unannounced = next((r for r in reversed(pitchers) if r.get('bbrefId') == UNANNOUNCED), {})
+        return bool(self._pitchers) and bool(self._nrfi_records)
+
+    def pitcher_first_inning(self, bbref_id, year):
+        # A starter without a line yet gets the league average, as the API does
+        row = self._pitchers.get((bbref_id, year))
+        return row if row is not None else self._unannounced
+
+    def team_nrfi(self, team, year):
+        return self._nrfi_records.get((team, year), {})
+
+
+def pitcher_features(prefix, row):
+    ip = row.get('ip') or 0
+    pa = row.get('pa') or 0
+    return {
+        f"{prefix}_era": row.get('era', np.nan),
+        f"{prefix}_whip": ((row.get('h') or 0) + (row.get('bb') or 0)) / ip if ip else np.nan,
+        f"{prefix}_k_rate": (row.get('so') or 0) / pa if pa else np.nan,
+        f"{prefix}_bb_rate": (row.get('bb') or 0) / pa if pa else np.nan,
+        f"{prefix}_hr_rate": (row.get('hr') or 0) / pa if pa else np.nan,
+        f"{prefix}_ops": row.get('ops', np.nan),
+        f"{prefix}_starts": row.get('g', 0),
+    }
+
+
+def game_features(sources, home_team, away_team, home_sp, away_sp, year):
+    """
+    One feature row for a game. Used for both the historical matrix and
+    daily scoring so the two can never drift apart.
+    """
+    home_nrfi = sources.team_nrfi(home_team, year)
+    away_nrfi = sources.team_nrfi(away_team, year)
+    park = sources.park(home_team)
+
+    row = {}
+    row.update(pitcher_features("home_sp", sources.pitcher_first_inning(home_sp, year)))
+    row.update(pitcher_features("away_sp", sources.pitcher_first_inning(away_sp, year)))
+    row.update({
+        "home_runs_at_home": home_nrfi.get('runsAtHome', np.nan),
+        "home_runs_per_first": home_nrfi.get('runsPerFirst', np.nan),
+        "home_nrfi_pct": parse_record(home_nrfi.get('nrfiRecord')),
+        "away_runs_at_away": away_nrfi.get('runsAtAway', np.nan),
+        "away_runs_per_first": away_nrfi.get('runsPerFirst', np.nan),
+        "away_nrfi_pct": parse_record(away_nrfi.get('nrfiRecord')),
+        "park_factor": park.get('parkFactorRating', np.nan),
+        "park_runs": park.get('r', np.nan),
+        "park_hr": park.get('hr', np.nan),
+    })
+    return row
+
+
+def game_date(result):
+    """
+    yesterdaysresults stamps GameResults.date with the morning it ran, so
+    the game itself was played the day before.
+    """
+    posted = datetime.fromisoformat(str(result.get('date'))[:19])
+    return (posted - timedelta(days=1)).date()
+
+
+def build_feature_matrix(session, results, sources=None):
+    """
+    Historical first-inning feature matrix, one row per completed game,
+    with the GameResults id, game date, the snapshot date its features
+    were read as of and the NRFI label. Games played before the first
+    snapshot have no point-in-time features and are left out.
+    """
+    sources = sources or SnapshotSources(session)
+    dated = []
+    for result in results:
+        try:
+            dated.append((game_date(result), result))
+        except ValueError:
+            continue
+    dated.sort(key=lambda pair: pair[0])
+
+    rows = []
+    skipped = 0
+    for date, result in dated:
+        if not sources.at(date):
+            skipped += 1
+            continue
+        row = game_features(sources, to_nickname(result.get('homeTeam')), to_nickname(result.get('awayTeam')),
+                            result.get('homeSP'), result.get('awaySP'), date.year)
+        row.update({"game_id": result.get('id'), "date": pd.Timestamp(date),
+                    "as_of": pd.Timestamp(date - timedelta(days=1)), "nrfi": int(bool(result.get('nrfi')))})
+        rows.append(row)
+    if skipped:
+        print(f"Skipped {skipped} games with no snapshot captured before them")
+    frame = pd.DataFrame(rows, columns=["game_id", "date", "as_of"] + FEATURES + ["nrfi"])
+    return frame.sort_values(["date", "game_id"]).reset_index(drop=True)
+
+
+def load_feature_matrix(session, rebuild=False, path=FEATURES_FILE):
+    """
+    Read the cached Parquet matrix, building it from the API the first time.
+    A cache without the as_of column was built from season totals that
+    include each game's own result, and is rebuilt.
+    """
+    if os.path.exists(path) and not rebuild:
+        frame = pd.read_parquet(path)
+        if "as_of" in frame.columns:
+            return frame
+        print(f"{path} predates point-in-time features; rebuilding it")
+    results = fetch_json(session, f"{API_BASE_URL}/GameResults") or []
+    print(f"Building feature matrix from {len(results)} game results...")
+    frame = build_feature_matrix(session, results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame.to_parquet(path, index=False)
+    print(f"Cached {len(frame)} rows to {path}")
+    return frame
+
+
+def evaluate(model, X, y):
+    proba = model.predict_proba(X)[:, 1]
+    metrics = {
+        "rows": int(len(y)),
+        "log_loss": float(log_loss(y, proba, labels=[0, 1])),
+        "brier": float(brier_score_loss(y, proba)),
+    }
+    if len(np.unique(y)) > 1:
+        metrics["auc"] = float(roc_auc_score(y, proba))
+    return metrics
+
+
+def train_model(frame, params=None):
+    """
+    Fit on the earliest games and score the most recent HOLDOUT_FRACTION
+    (a time split, not a shuffle), then refit on everything. The holdout
+    is filled with medians of the training split only; the refit's medians
+    cover every row and are stored on the bundle for scoring.
+    """
+    y = frame["nrfi"].to_numpy()
+    split = int(len(frame) * (1 - HOLDOUT_FRACTION))
+    train, test = frame[FEATURES].iloc[:split], frame[FEATURES].iloc[split:]
+    train_medians = train.median().fillna(0.0)
+    holdout = GradientBoostingClassifier(**(params or MODEL_PARAMS)).fit(
+        train.fillna(train_medians).to_numpy(dtype=np.float64), y[:split])
+    metrics = evaluate(holdout, test.fillna(train_medians).to_numpy(dtype=np.float64), y[split:])
+
+    medians = frame[FEATURES].median().fillna(0.0)
+    X = frame[FEATURES].fillna(medians).to_numpy(dtype=np.float64)
+    model = GradientBoostingClassifier(**(params or MODEL_PARAMS)).fit(X, y)
+    return {
+        "model": model,
+        "features": FEATURES,
+        "medians": medians.to_dict(),
+        "metrics": metrics,
+        # Rows were built from snapshots taken before each game
+        "point_in_time": True,
+        "trained_rows": int(len(frame)),
+        "trained_through": str(frame["date"].max().date()),
+        "trained_at": datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def save_bundle(bundle, path=MODEL_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as outfile:
+        pickle.dump(bundle, outfile)
+
+
+def load_bundle(path=MODEL_FILE):
+    with open(path, 'rb') as infile:
+        return pickle.load(infile)
+
+
+def score_games(bundle, rows):
+    """
+    Daily transform + predict: rows are game_features dicts.
+    Returns NRFI probabilities in row order.
+    """
+    frame = pd.DataFrame(rows, columns=bundle["features"]).astype(np.float64)
+    X = frame.fillna(bundle["medians"]).to_numpy()
+    return bundle["model"].predict_proba(X)[:, 1]
+
+
+def score_date(session, date_str, bundle):
+    """
+    Score every GamePreview on a date with the pickled model.
+    """
+    day = datetime.strptime(date_str, '%Y-%m-%d')
+    previews = fetch_json(session, f"{API_BASE_URL}/GamePreviews/{day.strftime('%y-%m-%d')}") or []
+    year = day.year
+    sources = FeatureSources(session)
+    rows = [game_features(sources, p.get('homeTeam'), p.get('awayTeam'), p.get('homePitcher'),
+                          p.get('awayPitcher'), year) for p in previews]
+    if not rows:
+        return previews, np.array([])
+    return previews, score_games(bundle, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NRFI model: build features, train once, score daily")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="Build (or reuse) the feature matrix and fit the model")
+    train.add_argument("--rebuild", action="store_true", help="Rebuild the Parquet feature cache from the API")
+    score = sub.add_parser("score", help="Score a date's games with the saved model")
+    score.add_argument("--date", default=datetime.now().strftime('%Y-%m-%d'))
+    score.add_argument("--threshold", type=float, default=NRFI_THRESHOLD,
+                       help="NRFI probability at or above which a game is called NRFI")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.verify = False
+
+    if args.command == "train":
+        frame = load_feature_matrix(session, rebuild=args.rebuild)
+        if frame.empty:
+            print("No game results with a snapshot captured before them; run snapshots.py capture daily")
+            return
+        bundle = train_model(frame)
+        save_bundle(bundle)
+        print(f"Trained on {bundle['trained_rows']} games through {bundle['trained_through']}")
+        print(f"Holdout metrics: {bundle['metrics']}")
+        print(f"Saved model to {MODEL_FILE}")
+        return
+
+    bundle = load_bundle()
+    start = time.time()
+    previews, proba = score_date(session, args.date, bundle)
+    elapsed = time.time() - start
+    if not previews:
+        print(f"No game previews found for {args.date}")
+        return
+
+    for i in np.argsort(-proba):
+        game = previews[i]
+        print(f"Game: {game.get('homeTeam')} vs {game.get('awayTeam')} at {game.get('venue')}")
+        call = "NRFI" if proba[i] >= args.threshold else "YRFI"
+        print(f"Prediction: {call}, NRFI probability: {proba[i]:.2f}\n")
+    print(f"Scored {len(previews)} games in {elapsed:.2f}s (model trained through {bundle['trained_through']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+import os
+import glob
+import time
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+
+from oddsmath import american_to_probability, remove_vig
+from profiling import run
+
+ODDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "odds_history")
+ODDS_API_URL = "https://api.the-odds-api.com/v4/sports/baseball_mlb"
+ODDS_API_KEY = os.environ.get("ODDS_API_KEY", "cae244ec5ed018e4316521fb277d6800")
+
+# Games are filed under their local (Eastern) date, like GamePreviews, so
+# a 10pm ET first pitch doesn't land on the next day's partition
+GAME_TIMEZONE = "America/New_York"
+
+# Odds API market key -> stored market. Full-game markets come from the
+# sport odds endpoint in one call; the inning markets are only served per
+# event and cost one request (and one quota unit per market) per game.
+GAME_MARKETS = {"h2h": "ml", "totals": "total"}
+PERIOD_MARKETS = {
+    "h2h_1st_5_innings": "f5_ml",
+    "totals_1st_5_innings": "f5_total",
+    "totals_1st_1_innings": "nrfi",
+}
+EVENT_WORKERS = 4
+
+# A repeating capture also wakes this long before each first pitch, so
+# every game's close is at most this stale even with a long --every
+CLOSE_LEAD_MINUTES = 2
+
+# Markets whose price depends on the line (point) it was posted at
+TOTAL_MARKETS = ("total", "f5_total")
+
+# One row per (game, book, market, outcome) per capture
+KEY = ["event_id", "book", "market", "outcome"]
+COLUMNS = ["captured_at", "game_date", "event_id", "commence_time", "home_team", "away_team",
+           "book", "market", "outcome", "point", "price", "last_update"]
+
+TEAM_NAMES = {
+    "Arizona Diamondbacks": "Diamondbacks",
+    "Atlanta Braves": "Braves",
+    "Baltimore Orioles": "Orioles",
+    "Boston Red Sox": "Red Sox",
+    "Chicago Cubs": "Cubs",
+    "Chicago White Sox": "White Sox",
+    "Cincinnati Reds": "Reds",
+    "Cleveland Guardians": "Guardians",
+    "Colorado Rockies": "Rockies",
+    "Detroit Tigers": "Tigers",
+    "Houston Astros": "Astros",
+    "Kansas City Royals": "Royals",
+    "Los Angeles Angels": "Angels",
+    "Los Angeles Dodgers": "Dodgers",
+    "Miami Marlins": "Marlins",
+    "Milwaukee Brewers": "Brewers",
+    "Minnesota Twins": "Twins",
+    "New York Mets": "Mets",
+    "New York Yankees": "Yankees",
+    "Oakland Athletics": "Athletics",
+    "Athletics": "Athletics",
+    "Philadelphia Phillies": "Phillies",
+    "Pittsburgh Pirates": "Pirates",
+    "San Diego Padres": "Padres",
+    "San Francisco Giants": "Giants",
+    "Seattle Mariners": "Mariners",
+    "St. Louis Cardinals": "Cardinals",
+    "Tampa Bay Rays": "Rays",
+    "Texas Rangers": "Rangers",
+    "Toronto Blue Jays": "Blue Jays",
+    "Washington Nationals": "Nationals"
+}
+
+
+def fetch_odds(session, markets=GAME_MARKETS, api_key=ODDS_API_KEY):
+    """
+    Every listed MLB game with its bookmakers' prices for the given
+    full-game markets, as The Odds API returns them.
+    """
+    response = session.get(f"{ODDS_API_URL}/odds/", params={
+        "apiKey": api_key, "regions": "us", "oddsFormat": "american", "markets": ",".join(markets),
+    })
+    response.raise_for_status()
+    print(f"Odds API: {response.headers.get('x-requests-remaining', '?')} requests remaining")
+    return response.json()
+
+
+def fetch_event_odds(session, event_id, markets=PERIOD_MARKETS, api_key=ODDS_API_KEY):
+    response = session.get(f"{ODDS_API_URL}/events/{event_id}/odds", params={
+        "apiKey": api_key, "regions": "us", "oddsFormat": "american", "markets": ",".join(markets),
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+def _outcome(market, outcome, home_team, away_team):
+    """
+    Stored outcome for an Odds API outcome: home/away for moneylines,
+    over/under for totals, nrfi/yrfi for the 1st inning 0.5 total.
+    None for anything else (e.g. alternate 1st inning lines).
+    """
+    name = outcome["name"]
+    if market in ("ml", "f5_ml"):
+        if name == home_team:
+            return "home"
+        if name == away_team:
+            return "away"
+        return "draw" if name == "Draw" else None
+    side = name.lower()
+    if market == "nrfi":
+        if outcome.get("point") != 0.5:
+            return None
+        return "nrfi" if side == "under" else "yrfi"
+    return side if side in ("over", "under") else None
+
+
+def snapshot_rows(games, captured_at=None):
+    """
+    Flatten Odds API games (from the sport or event odds endpoint) into
+    one row per book, market and outcome, stamped with captured_at
+    (default now, UTC). Markets outside GAME_MARKETS and PERIOD_MARKETS
+    are skipped.
+    """
+    captured_at = pd.Timestamp(captured_at or datetime.now(timezone.utc))
+    captured_at = captured_at.tz_localize("UTC") if captured_at.tzinfo is None else captured_at.tz_convert("UTC")
+    market_names = {**GAME_MARKETS, **PERIOD_MARKETS}
+
+    rows = []
+    for game in games:
+        home_team, away_team = game["home_team"], game["away_team"]
+        for bookmaker in game.get("bookmakers", []):
+            for market in bookmaker.get("markets", []):
+                stored = market_names.get(market["key"])
+                if stored is None:
+                    continue
+                for outcome in market["outcomes"]:
+                    side = _outcome(stored, outcome, home_team, away_team)
+                    if side is None:
+                        continue
+                    rows.append((game["id"], game["commence_time"], home_team, away_team, bookmaker["key"],
+                                 stored, side, outcome.get("point"), outcome["price"],
+                                 market.get("last_update", bookmaker.get("last_update"))))
+
+    frame = pd.DataFrame(rows, columns=["event_id", "commence_time", "home_team", "away_team", "book",
+                                        "market", "outcome", "point", "price", "last_update"])
+    frame["captured_at"] = captured_at
+    frame["commence_time"] = pd.to_datetime(frame["commence_time"], utc=True)
+    frame["last_update"] = pd.to_datetime(frame["last_update"], utc=True)
+    frame["game_date"] = frame["commence_time"].dt.tz_convert(GAME_TIMEZONE).dt.strftime('%Y-%m-%d')
+    frame["home_team"] = frame["home_team"].map(TEAM_NAMES).fillna(frame["home_team"])
+    frame["away_team"] = frame["away_team"].map(TEAM_NAMES).fillna(frame["away_team"])
+    frame["point"] = frame["point"].astype("float64")
+    frame["price"] = frame["price"].astype("int64")
+    return frame[COLUMNS]
+
+
+def append_snapshot(frame, root=ODDS_DIR):
+    """
+    Write one capture as a new part file under each game date it covers,
+    {root}/{game_date}/{captured_at}.parquet. Existing files are never
+    rewritten (compact() only merges closed dates). Returns rows written.
+    """
+    if frame.empty:
+        return 0
+    stamp = frame["captured_at"].iloc[0].strftime('%Y%m%dT%H%M%S%f')
+    for game_date, rows in frame.groupby("game_date", sort=False):
+        folder = os.path.join(root, game_date)
+        os.makedirs(folder, exist_ok=True)
+        rows.to_parquet(os.path.join(folder, f"{stamp}.parquet"), index=False, compression="zstd")
+    return len(frame)
+
+
+def capture(session=None, periods=True, root=ODDS_DIR):
+    """
+    Snapshot the current prices for every listed game. With periods, the
+    F5 and 1st inning markets are fetched per game for games that haven't
+    started yet. Returns the stored rows.
+    """
+    session = session or requests.Session()
+    captured_at = datetime.now(timezone.utc)
+    games = fetch_odds(session)
+
+    if periods:
+        upcoming = [g["id"] for g in games if pd.Timestamp(g["commence_time"]) > captured_at]
+
+        def event(event_id):
+            try:
+                return fetch_event_odds(session, event_id)
+            except requests.RequestException as e:
+                print(f"Skipping inning markets for event {event_id}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=EVENT_WORKERS) as executor:
+            games = games + [g for g in executor.map(event, upcoming) if g]
+
+    frame = snapshot_rows(games, captured_at)
+    append_snapshot(frame, root)
+    print(f"Captured {len(frame)} prices for {frame['event_id'].nunique()} games at {captured_at:%Y-%m-%d %H:%M:%S} UTC")
+    return frame
+
+
+def capture_every(minutes, until_last_first_pitch=False, session=None, periods=True, root=ODDS_DIR):
+    """
+    Capture every `minutes` (and CLOSE_LEAD_MINUTES before each of today's
+    first pitches) so closing_lines has a price from just before each game
+    starts. With until_last_first_pitch the loop stops once today's last
+    game has started; without it, it runs until interrupted. A failed
+    capture is reported and retried at the next wake-up.
+    """
+    session = session or requests.Session()
+    interval = pd.Timedelta(minutes=minutes)
+    lead = pd.Timedelta(minutes=CLOSE_LEAD_MINUTES)
+    today = pd.Timestamp.now(GAME_TIMEZONE).strftime('%Y-%m-%d')
+    # None until a capture succeeds, so a failed first call doesn't read as "no games"
+    first_pitches = None
+
+    while True:
+        try:
+            frame = capture(session, periods=periods, root=root)
+            first_pitches = frame.loc[frame["game_date"] == today, "commence_time"].drop_duplicates()
+        except requests.RequestException as e:
+            print(f"Capture failed, retrying at the next wake-up: {e}")
+
+        now = pd.Timestamp.now(tz="UTC")
+        if until_last_first_pitch and first_pitches is not None \
+                and (first_pitches.empty or first_pitches.max() <= now):
+            print("Today's last game has started; stopping")
+            return
+
+        wake = now + interval
+        if first_pitches is not None:
+            upcoming = first_pitches[first_pitches - lead > now]
+            if not upcoming.empty:
+                wake = min(wake, upcoming.min() - lead)
+        print(f"Next capture at {wake:%H:%M:%S} UTC")
+        time.sleep(max((wake - pd.Timestamp.now(tz="UTC")).total_seconds(), 0))
+
+
+def odds_files(start, end=None, root=ODDS_DIR):
+    """
+    Part files for game dates start..end (yyyy-mm-dd, inclusive).
+    """
+    start = pd.Timestamp(start).strftime('%Y-%m-%d')
+    end = pd.Timestamp(end).strftime('%Y-%m-%d') if end else start
+    folders = sorted(glob.glob(os.path.join(root, "????-??-??")))
+    return [path
+            for folder in folders if start <= os.path.basename(folder) <= end
+            for path in sorted(glob.glob(os.path.join(folder, "*.parquet")))]
+
+
+def read_odds(start, end=None, root=ODDS_DIR, markets=None, books=None, columns=None):
+    """
+    Every captured price for games dated start..end, oldest capture first.
+    markets and books narrow the rows while reading.
+    """
+    files = odds_files(start, end, root)
+    if not files:
+        return pd.DataFrame(columns=COLUMNS)
+    filters = []
+    if markets:
+        filters.append(("market", "in", list(markets)))
+    if books:
+        filters.append(("book", "in", list(books)))
+    frames = [pd.read_parquet(path, columns=columns, filters=filters or None) for path in files]
+    odds = pd.concat(frames, ignore_index=True)
+    # A compaction interrupted before its parts were removed leaves copies
+    odds = odds.drop_duplicates(subset=[c for c in KEY + ["captured_at"] if c in odds.columns])
+    return odds.sort_values("captured_at", kind="stable", ignore_index=True)
+
+
+def price_as_of(odds, as_of):
+    """
+    The latest price per game, book, market and outcome captured at or
+    before as_of. as_of is a single time, or a frame of queries with the
+    KEY columns plus an "as_of" column, in which case each query gets the
+    price that stood at its own time (NaN price when none did yet).
+    Naive times are taken as UTC.
+    """
+    if isinstance(as_of, pd.DataFrame):
+        queries = as_of.copy()
+        queries["as_of"] = _utc(queries["as_of"])
+        ordered = queries.reset_index().sort_values("as_of", kind="stable")
+        matched = pd.merge_asof(ordered, odds.sort_values("captured_at", kind="stable"),
+                                left_on="as_of", right_on="captured_at", by=KEY, direction="backward",
+                                suffixes=("_query", ""))
+        return matched.set_index("index").sort_index().rename_axis(as_of.index.name)
+
+    cutoff = _utc(pd.Series([as_of])).iloc[0]
+    standing = odds[odds["captured_at"] <= cutoff]
+    return standing.drop_duplicates(subset=KEY, keep="last").reset_index(drop=True)
+
+
+def closing_lines(odds):
+    """
+    Each book's last price before first pitch, per game, market and
+    outcome. This is only as close as the last capture before the game
+    started (see capture_every); captured_at shows how stale it is.
+    """
+    pregame = odds[odds["captured_at"] < odds["commence_time"]]
+    return pregame.drop_duplicates(subset=KEY, keep="last").reset_index(drop=True)
+
+
+def fair_probabilities(odds, method="multiplicative"):
+    """
+    odds with a "fair" column: each price's no-vig probability within its
+    own book's market at that capture (see oddsmath.remove_vig). NaN when
+    the book was missing a side.
+    """
+    market = ["event_id", "book", "market", "captured_at"]
+    fair = []
+    for _, rows in odds.groupby("market", sort=False):
+        wide = rows.pivot_table(index=market, columns="outcome", values="price", aggfunc="last")
+        probabilities = remove_vig(american_to_probability(wide.to_numpy()), method)
+        fair.append(pd.DataFrame(probabilities, index=wide.index, columns=wide.columns).stack().rename("fair"))
+    if not fair:
+        return odds.assign(fair=np.nan)
+    return odds.join(pd.concat(fair), on=market + ["outcome"])
+
+
+def closing_line_value(bets, closing, method="multiplicative"):
+    """
+    Join bets to the closing line and measure how far the close moved
+    toward them. bets needs event_id, market, outcome and price (American);
+    with a book column each bet is compared to that book's close, without
+    one to the consensus close across books. Total bets also need the
+    point they were placed at, and only closes at that same point count:
+    a bet with no book closing at its point gets NaN. clv is the no-vig
+    closing probability minus the bet's implied probability, so positive
+    means the bet beat the close.
+    """
+    by = [c for c in KEY if c in bets.columns]
+    if "point" in bets.columns:
+        by.append("point")
+    elif bets["market"].isin(TOTAL_MARKETS).any():
+        raise ValueError("Total bets need a point column to be compared with the close at the same line")
+
+    close = fair_probabilities(closing, method)
+    # Moneylines have no point; keep their NaN point as a group of its own
+    close = close.groupby(by, as_index=False, dropna=False).agg(
+        close_fair=("fair", "mean"),
+        close_price=("price", "median"),
+        books=("book", "nunique"),
+    )
+    joined = bets.merge(close, on=by, how="left", validate="many_to_one")
+    joined["bet_implied"] = american_to_probability(joined["price"])
+    joined["clv"] = joined["close_fair"] - joined["bet_implied"]
+    return joined
+
+
+def compact(before=None, root=ODDS_DIR):
+    """
+    Merge each game date's part files into one compacted.parquet for dates
+    before `before` (default today), once no more captures can land there.
+    The rows are unchanged; reads just open one file instead of dozens.
+    """
+    before = pd.Timestamp(before or datetime.now()).strftime('%Y-%m-%d')
+    merged = 0
+    for folder in sorted(glob.glob(os.path.join(root, "????-??-??"))):
+        parts = sorted(glob.glob(os.path.join(folder, "*.parquet")))
+        if os.path.basename(folder) >= before or len(parts) < 2:
+            continue
+        odds = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        odds = odds.drop_duplicates(subset=KEY + ["captured_at"]).sort_values(KEY + ["captured_at"], ignore_index=True)
+        target = os.path.join(folder, "compacted.parquet")
+        odds.to_parquet(target + ".tmp", index=False, compression="zstd")
+        os.replace(target + ".tmp", target)
+        for path in parts:
+            if path != target:
+                os.remove(path)
+        merged += 1
+        print(f"{os.path.basename(folder)}: {len(parts)} files -> {len(odds)} rows")
+    return merged
+
+
+def _utc(times):
+    times = pd.to_datetime(times)
+    return times.dt.tz_localize("UTC") if times.dt.tz is None else times.dt.tz_convert("UTC")
+
+
+def _print(frame):
+    with pd.option_context('display.max_rows', 500, 'display.width', 200):
+        print(frame if not frame.empty else "No odds captured for that range")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timestamped odds snapshots per book and market, with as-of and closing-line lookups")
+    sub = parser.add_subparsers(dest="command", required=True)
+    capture_parser = sub.add_parser("capture", help="Store the current prices for every listed game")
+    capture_parser.add_argument("--no-periods", action="store_true",
+                                help="Skip the per-game F5 and 1st inning markets (one API request per game)")
+    capture_parser.add_argument("--every", type=float, metavar="MINUTES",
+                                help="Keep capturing every MINUTES, plus just before each of today's first pitches. "
+                                     "Each capture spends Odds API quota")
+    capture_parser.add_argument("--until-last-first-pitch", action="store_true",
+                                help="With --every, stop once today's last game has started")
+    close = sub.add_parser("close", help="Print the closing lines for a date")
+    close.add_argument("date", help="yyyy-mm-dd")
+    close.add_argument("--market", choices=list(GAME_MARKETS.values()) + list(PERIOD_MARKETS.values()))
+    as_of = sub.add_parser("asof", help="Print the prices that stood at a time")
+    as_of.add_argument("date", help="Game date, yyyy-mm-dd")
+    as_of.add_argument("time", help="e.g. '2025-06-01 17:30' (UTC)")
+    as_of.add_argument("--market", choices=list(GAME_MARKETS.values()) + list(PERIOD_MARKETS.values()))
+    clv = sub.add_parser("clv", help="Closing-line value of the bets in a CSV (event_id, market, outcome, price[, book][, point])")
+    clv.add_argument("bets")
+    compact_parser = sub.add_parser("compact", help="Merge the part files of past game dates")
+    compact_parser.add_argument("--before", help="yyyy-mm-dd, default today")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        session = requests.Session()
+        if args.every:
+            capture_every(args.every, args.until_last_first_pitch, session, periods=not args.no_periods)
+        else:
+            capture(session, periods=not args.no_periods)
+    elif args.command == "close":
+        markets = [args.market] if args.market else None
+        _print(closing_lines(read_odds(args.date, markets=markets)))
+    elif args.command == "asof":
+        markets = [args.market] if args.market else None
+        _print(price_as_of(read_odds(args.date, markets=markets), args.time))
+    elif args.command == "clv":
+        bets = pd.read_csv(args.bets, dtype={"event_id": str})
+        if "game_date" in bets.columns:
+            dates = pd.to_datetime(bets["game_date"])
+            odds = read_odds(dates.min(), dates.max(), markets=bets["market"].unique())
+        else:
+            odds = read_odds("2000-01-01", "2100-01-01", markets=bets["market"].unique())
+        result = closing_line_value(bets, closing_lines(odds))
+        _print(result)
+        print(f"\n{len(result)} bets, mean CLV {result['clv'].mean() * 100:+.2f} pts, "
+              f"beat the close {(result['clv'] > 0).mean() * 100:.1f}% of the time")
+    else:
+        compact(args.before)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,183 @@
+import warnings
+
+import numpy as np
+
+# Every function takes scalars or arrays of any shape and works elementwise;
+# NaN (a missing price) stays NaN. Prices are American odds unless a name
+# says otherwise. Market arrays put the outcomes of one market on the last
+# axis, e.g. a slate's moneylines as (games, books, [home, away]).
+
+# Probabilities are clipped to this distance from 0 and 1 before becoming
+# prices, so a simulated 100% doesn't turn into an infinite line
+PROBABILITY_EPSILON = 1e-4
+
+# Shin's insider share is found by bisection; 50 halvings of [0, 1) is
+# far below a basis point of probability
+SHIN_ITERATIONS = 50
+
+# GameOdds columns per book, (home, away)
+GAME_ODDS_BOOKS = {
+    "fanduel": ("fanduelHomeOdds", "fanduelAwayOdds"),
+    "draftkings": ("draftkingsHomeOdds", "draftkingsAwayOdds"),
+    "betmgm": ("betmgmHomeOdds", "betmgmAwayOdds"),
+}
+
+
+def american_to_decimal(american):
+    american = np.asarray(american, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(american < 0, 1.0 - 100.0 / american, 1.0 + american / 100.0)
+
+
+def decimal_to_american(decimal):
+    decimal = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal >= 2.0, (decimal - 1.0) * 100.0, -100.0 / (decimal - 1.0))
+
+
+def american_to_probability(american):
+    """
+    Implied probability of a price, vig included.
+    """
+    american = np.asarray(american, dtype=np.float64)
+    # np.where evaluates both branches, so -100 hits the underdog branch's 100 / 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(american < 0, -american / (100.0 - american), 100.0 / (american + 100.0))
+
+
+def probability_to_american(probability):
+    """
+    Fair price for a probability; > 0.5 gives a favorite's negative line.
+    Not rounded, use np.rint for a posted-style line.
+    """
+    probability = np.clip(np.asarray(probability, dtype=np.float64), PROBABILITY_EPSILON, 1.0 - PROBABILITY_EPSILON)
+    return np.where(probability > 0.5, -100.0 * probability / (1.0 - probability),
+                    100.0 * (1.0 - probability) / probability)
+
+
+def probability_to_decimal(probability):
+    probability = np.clip(np.asarray(probability, dtype=np.float64), PROBABILITY_EPSILON, 1.0 - PROBABILITY_EPSILON)
+    return 1.0 / probability
+
+
+def profit(american, stake=1.0):
+    """
+    Profit on a winning bet of stake (e.g. profit(-150, 100) == 66.67).
+    """
+    return stake * (american_to_decimal(american) - 1.0)
+
+
+def overround(implied, axis=-1):
+    """
+    The book's margin: implied probabilities of a market summed, minus 1.
+    """
+    return np.sum(implied, axis=axis) - 1.0
+
+
+def remove_vig(implied, method="multiplicative", axis=-1):
+    """
+    Fair probabilities from a market's implied probabilities (outcomes on
+    axis). "multiplicative" scales them to sum to 1. "shin" assumes part
+    of the margin guards against informed bettors and takes more of it
+    off longshots, which fits favorite-longshot bias in moneylines better.
+    A market with any outcome missing comes back all NaN.
+    """
+    implied = np.moveaxis(np.asarray(implied, dtype=np.float64), axis, -1)
+    total = implied.sum(axis=-1, keepdims=True)
+    if method == "multiplicative":
+        fair = implied / total
+    elif method == "shin":
+        fair = _shin(implied, total)
+    else:
+        raise ValueError(f"Unknown vig removal method: {method}")
+    return np.moveaxis(fair, -1, axis)
+
+
+def _shin_probabilities(implied, total, z):
+    return (np.sqrt(z * z + 4.0 * (1.0 - z) * implied * implied / total) - z) / (2.0 * (1.0 - z))
+
+
+def _shin(implied, total):
+    # The fair probabilities sum to sqrt(total) > 1 at z = 0 and fall below
+    # 1 as z -> 1, so bisect every market's z at once
+    low = np.zeros_like(total)
+    high = np.ones_like(total)
+    for _ in range(SHIN_ITERATIONS):
+        z = (low + high) / 2.0
+        over = _shin_probabilities(implied, total, z).sum(axis=-1, keepdims=True) > 1.0
+        low = np.where(over, z, low)
+        high = np.where(over, high, z)
+    fair = _shin_probabilities(implied, total, (low + high) / 2.0)
+    # A market without margin (total <= 1) has nothing for Shin to remove
+    return np.where(total > 1.0, fair / fair.sum(axis=-1, keepdims=True), implied / total)
+
+
+def fair_probability(american, method="multiplicative", axis=-1):
+    """
+    No-vig probabilities straight from a market's prices.
+    """
+    return remove_vig(american_to_probability(american), method, axis)
+
+
+def consensus_probability(american, method="multiplicative", book_axis=-2):
+    """
+    Consensus fair probabilities across books: each book's market is
+    de-vigged on its own, then averaged over the books that price every
+    outcome. Prices shaped (games, books, outcomes) give (games, outcomes);
+    a game no book prices comes back NaN.
+    """
+    fair = fair_probability(american, method, axis=-1)
+    consensus = _nanmean(fair, book_axis)
+    return consensus / np.sum(consensus, axis=-1, keepdims=True)
+
+
+def consensus_price(american, method="multiplicative", book_axis=-2):
+    """
+    consensus_probability as fair American prices.
+    """
+    return probability_to_american(consensus_probability(american, method, book_axis))
+
+
+def average_price(american, axis=-1):
+    """
+    Average of several books' prices for the same outcome, taken in
+    probability space so -110 and +110 average to even money rather than
+    0. Vig stays in; missing prices are skipped.
+    """
+    return probability_to_american(_nanmean(american_to_probability(american), axis))
+
+
+def _nanmean(values, axis):
+    # All-NaN slices are expected (a game no book has posted yet)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmean(values, axis=axis)
+
+
+def expected_value(probability, american):
+    """
+    Expected profit per unit staked at a price, given the true win
+    probability.
+    """
+    return np.asarray(probability, dtype=np.float64) * american_to_decimal(american) - 1.0
+
+
+def kelly_fraction(probability, american, fraction=1.0):
+    """
+    Share of bankroll to stake by the Kelly criterion, 0 for bets without
+    an edge. fraction scales it down (0.25 for quarter Kelly).
+    """
+    net = american_to_decimal(american) - 1.0
+    edge = expected_value(probability, american)
+    return fraction * np.maximum(edge / net, 0.0)
+
+
+def game_odds_prices(game_odds, books=GAME_ODDS_BOOKS):
+    """
+    GameOdds rows from the API as a (games, books, [home, away]) price
+    array, NaN where a book has no line.
+    """
+    columns = [column for pair in books.values() for column in pair]
+    prices = np.array([[game.get(c) if game.get(c) is not None else np.nan for c in columns] for game in game_odds],
+                      dtype=np.float64)
+    return prices.reshape(len(game_odds), len(books), 2)
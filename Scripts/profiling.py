@@ -0,0 +1,313 @@
+import os
+import sys
+import json
+import time
+import runpy
+import pstats
+import cProfile
+import argparse
+import threading
+import subprocess
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+MODES = ("cprofile", "sample")
+DEFAULT_TOP = 25
+
+# Seconds between stack samples in sample mode
+SAMPLE_INTERVAL = 0.005
+
+# Import-time budget for a script, interpreter start included (--mode imports)
+STARTUP_BUDGET_MS = 200
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack on a timer from a background thread.
+    Cheap enough to leave the sleeps, network waits and parsing in a
+    scraper at their real proportions, unlike tracing profilers.
+    """
+
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval
+        # stack (root first) -> samples, and -> seconds between samples
+        self.stacks = Counter()
+        self.seconds = Counter()
+        self.frames = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.started = self.stopped = None
+
+    def _frame_key(self, frame):
+        code = frame.f_code
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self.frames:
+            self.frames[key] = len(self.frames)
+        return self.frames[key]
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_key(frame))
+                frame = frame.f_back
+            if stack:
+                # Root first, as flamegraph and speedscope expect
+                key = tuple(reversed(stack))
+                self.stacks[key] += 1
+                self.seconds[key] += elapsed
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.stopped = time.perf_counter()
+
+    def frame_names(self):
+        names = [None] * len(self.frames)
+        for (name, filename, line), index in self.frames.items():
+            names[index] = (name, filename, line)
+        return names
+
+    def write_speedscope(self, path, title):
+        frames = self.frame_names()
+        samples, weights = [], []
+        for stack, seconds in self.seconds.items():
+            samples.append(list(stack))
+            weights.append(round(seconds, 6))
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": title,
+            "exporter": "profiling.py",
+            "shared": {"frames": [{"name": n, "file": f, "line": l} for n, f, l in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": title,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+        with open(path, 'w', encoding='utf-8') as outfile:
+            json.dump(document, outfile)
+
+    def write_folded(self, path):
+        """
+        Collapsed stacks ("a;b;c count"), the input flamegraph.pl and most
+        flamegraph viewers take.
+        """
+        frames = self.frame_names()
+        with open(path, 'w', encoding='utf-8') as outfile:
+            for stack, count in self.stacks.items():
+                names = ";".join(f"{frames[i][0]} ({os.path.basename(frames[i][1])}:{frames[i][2]})" for i in stack)
+                outfile.write(f"{names} {count}\n")
+
+    def hotspots(self, top=DEFAULT_TOP):
+        """
+        Top functions by time spent in the function itself, with their
+        inclusive share.
+        """
+        total = sum(self.seconds.values()) or 1
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.seconds.items():
+            own[stack[-1]] += count
+            for index in set(stack):
+                inclusive[index] += count
+        frames = self.frame_names()
+        lines = [f"{'Self %':>7}{'Total %':>9}  Function"]
+        for index, count in own.most_common(top):
+            name, filename, line = frames[index]
+            lines.append(f"{count / total * 100:>6.1f}%{inclusive[index] / total * 100:>8.1f}%  "
+                         f"{name} ({os.path.basename(filename)}:{line})")
+        return "\n".join(lines)
+
+
+def _output_base(script, root=PROFILE_DIR):
+    folder = os.path.join(root, script)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, datetime.now().strftime('%Y%m%d-%H%M%S'))
+
+
+def profile_call(func, script, mode="cprofile", top=DEFAULT_TOP, root=PROFILE_DIR):
+    """
+    Run func() under the chosen profiler and write the results to
+    profiles/{script}/:
+      cprofile: {run}.pstats plus the top functions by cumulative time
+      sample:   {run}.speedscope.json and {run}.folded plus top self time
+    Returns func's return value; output is written even if func raises.
+    """
+    base = _output_base(script, root)
+    if mode == "sample":
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            return func()
+        finally:
+            sampler.stop()
+            sampler.write_speedscope(base + ".speedscope.json", script)
+            sampler.write_folded(base + ".folded")
+            print(f"\nProfile of {script}: {sum(sampler.stacks.values())} samples over "
+                  f"{sampler.stopped - sampler.started:.1f}s")
+            print(sampler.hotspots(top))
+            print(f"Open {base}.speedscope.json at https://www.speedscope.app or pass {base}.folded to flamegraph.pl")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(base + ".pstats")
+        print(f"\nProfile of {script}: top {top} by cumulative time")
+        pstats.Stats(profiler, stream=sys.stdout).strip_dirs().sort_stats("cumulative").print_stats(top)
+        print(f"Stats written to {base}.pstats (python -m pstats, snakeviz)")
+
+
+def _pop_profile_args(argv):
+    """
+    Take --profile[=mode] and --profile-top N out of argv so the script's
+    own argument parser never sees them.
+    """
+    mode, top, rest = None, DEFAULT_TOP, []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--profile":
+            mode = "cprofile"
+        elif arg.startswith("--profile="):
+            mode = arg.split("=", 1)[1]
+        elif arg == "--profile-top":
+            top = int(next(args))
+        elif arg.startswith("--profile-top="):
+            top = int(arg.split("=", 1)[1])
+        else:
+            rest.append(arg)
+    if mode is not None and mode not in MODES:
+        raise SystemExit(f"--profile must be one of {', '.join(MODES)}")
+    return mode, top, rest
+
+
+def run(main, script=None):
+    """
+    Entry point for pipeline scripts: `if __name__ == "__main__": run(main)`.
+    Adds --profile[=cprofile|sample] and --profile-top N to any script.
+    """
+    mode, top, sys.argv[1:] = _pop_profile_args(sys.argv[1:])
+    if mode is None:
+        return main()
+    script = script or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    return profile_call(main, script, mode, top)
+
+
+def _import_command(path):
+    """
+    Python source that loads a script the way `python script.py` would,
+    minus its `if __name__ == "__main__":` block.
+    """
+    folder = os.path.dirname(path)
+    return f"import runpy, sys; sys.path.insert(0, {folder!r}); runpy.run_path({path!r}, run_name='__imports__')"
+
+
+def import_times(path):
+    """
+    Load a script in a fresh interpreter under -X importtime and return
+    one (module, self_us, cumulative_us, depth) tuple per import, in the
+    order Python reports them (children before their parent).
+    Scripts without a main() guard run in full, so only point this at
+    ones that have one.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _import_command(path)],
+        cwd=os.path.dirname(path), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {path} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def startup_ms(path=None, runs=3):
+    """
+    Best-of-runs wall time, in milliseconds, to start an interpreter and
+    load the script without running main(). No path times the bare
+    interpreter, the floor any script starts from.
+    """
+    command = _import_command(path) if path else "pass"
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", command], cwd=os.path.dirname(path) if path else None,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def import_report(path, top=DEFAULT_TOP, budget_ms=STARTUP_BUDGET_MS):
+    """
+    Print the slowest top-level imports of a script and its startup time
+    against the budget. Returns True when the script is within budget.
+    """
+    imports = import_times(path)
+    roots = [entry for entry in imports if entry[3] == 0]
+    total_us = sum(cumulative for _, _, cumulative, _ in roots)
+    script = os.path.basename(path)
+
+    print(f"Imports of {script}: {len(imports)} modules, {total_us / 1000:.1f} ms (-X importtime)")
+    print(f"{'Cumulative ms':>14}{'Self ms':>10}  Module")
+    for name, own, cumulative, _ in sorted(roots, key=lambda entry: -entry[2])[:top]:
+        print(f"{cumulative / 1000:>14.1f}{own / 1000:>10.1f}  {name}")
+
+    elapsed = startup_ms(path)
+    within = elapsed <= budget_ms
+    print(f"Startup: {elapsed:.0f} ms, bare interpreter {startup_ms():.0f} ms "
+          f"(budget {budget_ms} ms) - {'OK' if within else 'OVER BUDGET'}")
+    return within
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile any pipeline script, including ones without a main(): "
+                    "python profiling.py [--mode sample] script.py [script args]. "
+                    "--mode imports reports the script's import times and startup "
+                    "against --budget-ms instead of running it.")
+    parser.add_argument("--mode", choices=MODES + ("imports",), default="cprofile")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--budget-ms", type=int, default=STARTUP_BUDGET_MS)
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.mode == "imports":
+        within = import_report(os.path.abspath(args.script), args.top, args.budget_ms)
+        raise SystemExit(0 if within else 1)
+
+    path = os.path.abspath(args.script)
+    sys.argv = [path] + args.args
+    sys.path.insert(0, os.path.dirname(path))
+    script = os.path.splitext(os.path.basename(path))[0]
+    profile_call(lambda: runpy.run_path(path, run_name="__main__"), script, args.mode, args.top)
+
+
+if __name__ == "__main__":
+    main()
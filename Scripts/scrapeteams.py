@@ -3,12 +3,22 @@ from bs4 import BeautifulSoup, Comment
 import json
 from datetime import datetime
 import re
-import time
+import logging
 import urllib3
 
+from instrumentation import RunMetrics
+from logconfig import configure_logging
+
 # Suppress only the insecure request warning for localhost
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Per-player detail is DEBUG; set LOG_LEVEL=DEBUG to see it
+configure_logging("scrapeteams")
+logger = logging.getLogger(__name__)
+
+# Stage timings and request counts for this run (metrics_data/scrapeteams/)
+metrics = RunMetrics("scrapeteams")
+
 current_datetime = datetime.now().isoformat()  # This will give you the current date and time in ISO format
 
 # Team abbreviation dictionary for all MLB teams
@@ -58,15 +68,15 @@ def get_game_teams(date_str):
     date_str = '24-09-28'#this is a passthrough....
     # Fetch games for the given date
     game_previews_url = f"https://localhost:44346/api/GamePreviews/{date_str}"
-    print(f"Requesting game previews from: {game_previews_url}")
+    logger.debug("Requesting game previews from: %s", game_previews_url)
     
     try:
         response = requests.get(game_previews_url, verify=False)  # Disable SSL verification
-        print(f"Response status code: {response.status_code}")
+        logger.debug("Response status code: %s", response.status_code)
         
         if response.status_code == 200:
             games = response.json()
-            print(f"Games retrieved: {games}")  # Log the games retrieved
+            logger.debug("Games retrieved: %s", games)  # Log the games retrieved
             teams = set()
             for game in games:
                 home_team = game['homeTeam']
@@ -75,10 +85,10 @@ def get_game_teams(date_str):
                 teams.add(away_team)
             return teams
         else:
-            print(f"Failed to retrieve games for {date_str}. Response content: {response.text}")
+            logger.warning("Failed to retrieve games for %s. Response content: %s", date_str, response.text)
             return set()
     except Exception as e:
-        print(f"Error occurred while fetching game previews: {e}")
+        logger.error("Error occurred while fetching game previews: %s", e)
         return set()
 
 # Format the date as yy-MM-dd
@@ -94,32 +104,35 @@ def send_pitcher_data_to_db(pitcher_data, bbrefID):
 
         # Check if the pitcher exists
         response = requests.get(api_urlGET, verify=False)
+        metrics.record_response(response)
         
         if response.status_code == 200:
             # Pitcher exists, so update the record
             put_response = requests.put(api_urlPUT, json=pitcher_data, verify=False)
+            metrics.record_response(put_response)
             if put_response.status_code == 200:
-                print(f"Successfully updated pitcher {bbrefID}.")
+                logger.debug("Successfully updated pitcher %s.", bbrefID)
             else:
-                print(f"Failed to update pitcher {bbrefID}. Response: {put_response.status_code} - {put_response.text}")
+                logger.warning("Failed to update pitcher %s. Response: %s - %s", bbrefID, put_response.status_code, put_response.text)
         elif response.status_code == 404:
             # Pitcher does not exist, so create a new record
             post_response = requests.post(api_urlPOST, json=pitcher_data, verify=False)
+            metrics.record_response(post_response)
             if post_response.status_code == 201:
-                print(f"Successfully created pitcher {bbrefID}.")
+                logger.debug("Successfully created pitcher %s.", bbrefID)
             else:
-                print(f"Failed to create pitcher {bbrefID}. Response: {post_response.status_code} - {post_response.text}")
+                logger.warning("Failed to create pitcher %s. Response: %s - %s", bbrefID, post_response.status_code, post_response.text)
         else:
-            print(f"Error checking existence of pitcher {bbrefID}. Response: {response.status_code} - {response.text}")
+            logger.error("Error checking existence of pitcher %s. Response: %s - %s", bbrefID, response.status_code, response.text)
 
     except Exception as e:
-        print(f"Error sending pitcher data to the database: {e}")
+        logger.error("Error sending pitcher data to the database: %s", e)
 
 def debug_print_all_tables(soup, team_name):
-    print(f"Debugging all tables for {team_name}:")
+    logger.debug("Debugging all tables for %s:", team_name)
     tables = soup.find_all('table')
     if not tables:
-        print(f"No tables found for {team_name}.")
+        logger.debug("No tables found for %s.", team_name)
         return
     
     for i, table in enumerate(tables):
@@ -128,11 +141,11 @@ def debug_print_all_tables(soup, team_name):
         caption = table.find('caption')
         caption_text = caption.get_text(strip=True) if caption else 'No Caption'
         
-        print(f"Table {i + 1}:")
-        print(f"  ID: {table_id}")
-        print(f"  Classes: {table_classes}")
-        print(f"  Caption: {caption_text}")
-        print('-' * 40)
+        logger.debug("Table %s:", i + 1)
+        logger.debug("  ID: %s", table_id)
+        logger.debug("  Classes: %s", table_classes)
+        logger.debug("  Caption: %s", caption_text)
+        logger.debug("%s", '-' * 40)
 
 def debug_team_divs(soup):
     # Find the parent divs for batting and pitching tables
@@ -141,44 +154,44 @@ def debug_team_divs(soup):
 
     # Check if the batting div is found
     if batting_div:
-        print("Batting div found.")
+        logger.debug("Batting div found.")
         # Find the table inside the batting div
         batting_table = batting_div.find('table')
         if batting_table:
-            print("Batting table found in batting div.")
-            print(f"Table ID: {batting_table.get('id')}")
+            logger.debug("Batting table found in batting div.")
+            logger.debug("Table ID: %s", batting_table.get('id'))
         else:
-            print("No table found in batting div.")
+            logger.debug("No table found in batting div.")
     else:
-        print("Batting div not found.")
+        logger.warning("Batting div not found.")
 
     # Check if the pitching div is found
     if pitching_div:
-        print("Pitching div found.")
-        print("Printing full HTML content of the pitching div for debugging:")
-        print(pitching_div.prettify())  # Print the full HTML of the pitching div
+        logger.debug("Pitching div found.")
+        logger.debug("Printing full HTML content of the pitching div for debugging:")
+        logger.debug("%s", pitching_div.prettify())  # Print the full HTML of the pitching div
         
         # Attempt to find the direct child div with the table
         pitching_table_div = pitching_div.find('div', id='div_players_standard_pitching')
         if pitching_table_div:
-            print("Pitching table div found.")
+            logger.debug("Pitching table div found.")
             # Find the table inside this div
             pitching_table = pitching_table_div.find('table')
             if pitching_table:
-                print("Pitching table found in pitching table div.")
-                print(f"Table ID: {pitching_table.get('id')}")
+                logger.debug("Pitching table found in pitching table div.")
+                logger.debug("Table ID: %s", pitching_table.get('id'))
             else:
-                print("No table found in pitching table div.")
+                logger.debug("No table found in pitching table div.")
         else:
-            print("Pitching table div not found.")
+            logger.warning("Pitching table div not found.")
     else:
-        print("Pitching div not found.")
+        logger.warning("Pitching div not found.")
 
 
 def get_team_pitching_data(team_name, soup):
     team_abbr = team_abbreviations.get(team_name, None)
     if not team_abbr:
-        print(f"Team {team_name} not found.")
+        logger.warning("Team %s not found.", team_name)
         return
 
 # we might have to move all out pitching scraping into this comment section.... might only be bc 2024 is finalized though
@@ -215,7 +228,7 @@ def get_team_pitching_data(team_name, soup):
     table = soup.find('table', id='players_standard_pitching')#something changed now season numbers are finalized
     
     if not table:
-        print("Team Pitching table not found via divs."+ team_name)
+        logger.warning("Team Pitching table not found via divs. %s", team_name)
         return
     
     rows = table.find_all('tr')
@@ -293,19 +306,19 @@ def get_team_pitching_data(team_name, soup):
             send_pitcher_data_to_db(pitcher_data, bbrefID)
 
         except Exception as e:
-            print(f"Error processing row for {team_name}: {e}")
+            logger.error("Error processing row for %s: %s", team_name, e)
 
 def get_team_batting_data(team_name, soup):
     team_abbr = team_abbreviations.get(team_name, None)
     if not team_abbr:
-        print(f"Team {team_name} not found.")
+        logger.warning("Team %s not found.", team_name)
         return
     
     table = soup.find('table', id='team_batting')#this was correct for regular season....
     #table = soup.find('table', id='players_standard_batting')#something changed now season numbers are finalized
     
     if not table:
-        print("Team Batting table not found."+ team_name)
+        logger.warning("Team Batting table not found. %s", team_name)
         return
     
     rows = table.find_all('tr')
@@ -361,6 +374,7 @@ def get_team_batting_data(team_name, soup):
 
                 # Check if the player exists (GET request)
                 response = requests.get(api_urlGET, verify=False)  # Disable SSL verification
+                metrics.record_response(response)
                 
                 if response.status_code == 200:
                     # Player exists, perform a PUT request
@@ -408,12 +422,13 @@ def get_team_batting_data(team_name, soup):
 
                     # Perform the PUT request
                     put_response = requests.put(api_urlPUT, json=put_payload, verify=False)  # Disable SSL verification
+                    metrics.record_response(put_response)
                     if put_response.status_code == 200:
-                        print(f"Successfully updated {player_data['Name']} ({bbrefID})")
+                        logger.debug("Successfully updated %s (%s)", player_data['Name'], bbrefID)
                     if put_response.status_code == 204:
-                        print(f"Successfully Partial update for {player_data['Name']} ({bbrefID})")
+                        logger.debug("Successfully Partial update for %s (%s)", player_data['Name'], bbrefID)
                     else:
-                        print(f"Failed to update {player_data['Name']} ({bbrefID}) post response code:{put_response.status_code}")
+                        logger.warning("Failed to update %s (%s) post response code:%s", player_data['Name'], bbrefID, put_response.status_code)
 
                 elif response.status_code == 404:
                     # Player does not exist, perform a POST request
@@ -458,40 +473,46 @@ def get_team_batting_data(team_name, soup):
 
                     # Perform the POST request
                     post_response = requests.post(api_urlPOST, json=post_payload, verify=False)  # Disable SSL verification
+                    metrics.record_response(post_response)
                     if post_response.status_code == 201:
-                        print(f"Successfully created {player_data['Name']} ({bbrefID})")
+                        logger.debug("Successfully created %s (%s)", player_data['Name'], bbrefID)
                     else:
-                        print(f"Failed to create {player_data['Name']} ({bbrefID}) post response code:{post_response.status_code}")
-                        print(post_payload)
+                        logger.warning("Failed to create %s (%s) post response code:%s", player_data['Name'], bbrefID, post_response.status_code)
+                        logger.error("Payload that caused error: %s", post_payload)
                 else:
-                    print(f"Error checking {player_data['Name']} ({bbrefID}): {response.status_code}")
+                    logger.error("Error checking %s (%s): %s", player_data['Name'], bbrefID, response.status_code)
 
 def process_team_data(team_name):
     # Get the abbreviation for the team
     team_abbr = team_abbreviations.get(team_name, None)
     if not team_abbr:
-        print(f"Team {team_name} not found.")
+        logger.warning("Team %s not found.", team_name)
         return
     
     # Create the URL
     url = f"https://www.baseball-reference.com/teams/{team_abbr}/2024.shtml"
-    time.sleep(2)
+    metrics.sleep(2)
     # Fetch the page
-    response = requests.get(url)
+    with metrics.stage("fetch", team=team_abbr):
+        response = requests.get(url)
+    metrics.record_response(response)
     response.encoding = 'utf-8'
 
     if response.status_code != 200:
-        print(f"Failed to retrieve data for {team_name}")
+        logger.warning("Failed to retrieve data for %s", team_name)
         return
     else:
-        print(f"fetched {url}")
+        logger.info("fetched %s", url)
     
     # Parse the page
-    soup = BeautifulSoup(response.text, 'html.parser',from_encoding='utf-8') #need encoding to handle letters with spanish accents
+    with metrics.stage("parse", team=team_abbr):
+        soup = BeautifulSoup(response.text, 'html.parser',from_encoding='utf-8') #need encoding to handle letters with spanish accents
     
-    # Get both batting and pitching data
-    get_team_batting_data(team_name, soup)
-    get_team_pitching_data(team_name, soup)
+    # Get both batting and pitching data (table extraction plus the per-player API writes)
+    with metrics.stage("batting", team=team_abbr):
+        get_team_batting_data(team_name, soup)
+    with metrics.stage("pitching", team=team_abbr):
+        get_team_pitching_data(team_name, soup)
 
 # Add a passthrough flag
 process_all_teams = False  # Set to True to process all teams, False to process only teams with games
@@ -504,3 +525,5 @@ else:
     for team in teams_with_games:  # Process only teams with games
         process_team_data(team)
 
+metrics.close()
+
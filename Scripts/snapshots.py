@@ -0,0 +1,277 @@
+import os
+import glob
+import argparse
+from datetime import datetime
+
+import pandas as pd
+import requests
+import urllib3
+
+from warehouse import API_BASE_URL, fetch_hitters, fetch_json
+from profiling import run
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_data")
+
+# Write a full copy of a table this often so an as-of read replays at most
+# this many deltas
+BASE_INTERVAL_DAYS = 28
+
+# Bookkeeping columns that change on every PUT; ignored when diffing
+IGNORE_COLUMNS = {"id", "dateModified", "dateUpdated", "date"}
+
+# Tables the daily scrapes overwrite in place. "full" tables are fetched
+# whole each day, so a missing key means the row was deleted. Hitters and
+# first-inning pitcher lines are only fetched for the day's slate, so
+# missing keys are carried forward.
+TABLES = {
+    "pitchers": {
+        "endpoint": "Pitchers/year/{year}",
+        "key": ["bbrefId", "year", "team"],
+        "full": True,
+    },
+    "hitters": {
+        "endpoint": None,
+        "key": ["bbrefId", "year", "team"],
+        "full": False,
+    },
+    "team_rec_splits": {
+        "endpoint": "TeamRecSplits",
+        "key": ["team"],
+        "full": True,
+    },
+    "pitcher_totals": {
+        # compare2sp reads the Totals split, falling back to the previous season
+        "endpoint": "PitcherPlatoonAndTrackRecord/year/{year}/Totals",
+        "key": ["bbrefID", "year", "split"],
+        "full": True,
+        "seasons": 2,
+    },
+    "nrfi_records": {
+        "endpoint": "NRFIRecords2024/{year}",
+        "key": ["team", "year"],
+        "full": True,
+    },
+    "pitcher_first_inning": {
+        "endpoint": None,
+        "key": ["bbrefId", "year"],
+        "full": False,
+    },
+}
+
+OP_COLUMN = "_op"
+
+
+def snapshot_files(table, root=SNAPSHOT_DIR):
+    """
+    [(date string, path)] for every stored snapshot of table, oldest first.
+    """
+    paths = sorted(glob.glob(os.path.join(root, table, "????-??-??.parquet")))
+    return [(os.path.basename(p)[:-len(".parquet")], p) for p in paths]
+
+
+def deleted_path(path):
+    """
+    Deleted keys sit next to their delta so the delta keeps its column types.
+    """
+    return path[:-len(".parquet")] + ".deleted.parquet"
+
+
+def fetch_first_inning(session, day):
+    """
+    Pitcher1stInning rows for the day's probable starters, plus the
+    league-average Unannounced row.
+    """
+    rows = []
+    pitchers = set()
+    for game in fetch_json(session, f"{API_BASE_URL}/GamePreviews/{day.strftime('%y-%m-%d')}"):
+        pitchers.update(p for p in (game.get('homePitcher'), game.get('awayPitcher')) if p and p != "Unknown")
+    for bbref_id in sorted(pitchers):
+        row = fetch_json(session, f"{API_BASE_URL}/Pitcher1stInning/{bbref_id}/{day.year}")
+        if row:
+            rows.append(row)
+    unannounced = fetch_json(session, f"{API_BASE_URL}/Pitcher1stInning/Unannounced")
+    if unannounced:
+        rows.append(unannounced)
+    return rows
+
+
+def fetch_current(session, table, day):
+    spec = TABLES[table]
+    if table == "pitcher_first_inning":
+        rows = fetch_first_inning(session, day)
+    elif spec["endpoint"] is None:
+        rows = fetch_hitters(session, day, day)
+    elif "{year}" in spec["endpoint"]:
+        rows = []
+        for year in range(day.year - spec.get("seasons", 1) + 1, day.year + 1):
+            rows.extend(fetch_json(session, f"{API_BASE_URL}/{spec['endpoint'].format(year=year)}"))
+    else:
+        rows = fetch_json(session, f"{API_BASE_URL}/{spec['endpoint']}")
+    return pd.DataFrame(rows)
+
+
+def row_hashes(frame, key):
+    """
+    key tuple -> hash of the row's tracked columns, for change detection.
+    """
+    columns = sorted(c for c in frame.columns if c not in IGNORE_COLUMNS and c != OP_COLUMN)
+    hashes = pd.util.hash_pandas_object(frame[columns].astype(str), index=False)
+    keys = frame[key].itertuples(index=False, name=None)
+    return dict(zip(keys, hashes.tolist()))
+
+
+def apply_snapshot(state, path, key):
+    """
+    Replay one stored snapshot on top of state. Base snapshots replace the
+    state; deltas upsert changed rows and drop deleted keys.
+    """
+    snapshot = pd.read_parquet(path)
+    if (snapshot[OP_COLUMN] == "base").any():
+        return snapshot.drop(columns=[OP_COLUMN])
+
+    upserts = snapshot.drop(columns=[OP_COLUMN])
+    deleted = set()
+    if os.path.exists(deleted_path(path)):
+        deleted = set(pd.read_parquet(deleted_path(path))[key].itertuples(index=False, name=None))
+    merged = pd.concat([state, upserts], ignore_index=True) if len(state) else upserts.reset_index(drop=True)
+    merged = merged.drop_duplicates(subset=key, keep="last")
+    if deleted:
+        keys = pd.Series(list(merged[key].itertuples(index=False, name=None)), index=merged.index)
+        merged = merged[~keys.isin(deleted)]
+    return merged.reset_index(drop=True)
+
+
+def capture(table, session=None, day=None, root=SNAPSHOT_DIR):
+    """
+    Store today's copy of table as a delta against the last snapshot, or as
+    a new base when none exists within BASE_INTERVAL_DAYS. Returns the
+    number of rows written.
+    """
+    spec = TABLES[table]
+    key = spec["key"]
+    day = day or datetime.now()
+    label = day.strftime('%Y-%m-%d')
+    session = session or requests.Session()
+
+    current = fetch_current(session, table, day)
+    if current.empty or not set(key).issubset(current.columns):
+        print(f"{table}: nothing returned by the API, no snapshot written")
+        return 0
+    current = current.drop_duplicates(subset=key, keep="last")
+
+    files = [(d, p) for d, p in snapshot_files(table, root) if d < label]
+    last_base = max((d for d, p in files if _is_base(p)), default=None)
+    folder = os.path.join(root, table)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{label}.parquet")
+    # A rerun on the same day replaces that day's snapshot, deletions included
+    if os.path.exists(deleted_path(path)):
+        os.remove(deleted_path(path))
+
+    if last_base is None or (day - datetime.strptime(last_base, '%Y-%m-%d')).days >= BASE_INTERVAL_DAYS:
+        if not spec["full"] and files:
+            # Partial tables carry unfetched rows forward into the new base
+            current = pd.concat([read_as_of(table, label, root, include_today=False), current], ignore_index=True)
+            current = current.drop_duplicates(subset=key, keep="last")
+        current[OP_COLUMN] = "base"
+        current.to_parquet(path, index=False, compression="zstd")
+        print(f"{table}: base snapshot of {len(current)} rows for {label}")
+        return len(current)
+
+    previous = read_as_of(table, label, root, include_today=False)
+    previous_hashes = row_hashes(previous, key)
+    current_hashes = row_hashes(current, key)
+    changed = [k for k, h in current_hashes.items() if previous_hashes.get(k) != h]
+    changed_keys = set(changed)
+    keys = pd.Series(list(current[key].itertuples(index=False, name=None)), index=current.index)
+    upserts = current[keys.isin(changed_keys)].copy()
+    upserts[OP_COLUMN] = "upsert"
+
+    upserts.to_parquet(path, index=False, compression="zstd")
+
+    removed = [k for k in previous_hashes if k not in current_hashes] if spec["full"] else []
+    if removed:
+        pd.DataFrame(removed, columns=key).to_parquet(deleted_path(path), index=False)
+    print(f"{table}: {len(upserts)} changed and {len(removed)} deleted rows for {label} ({len(current)} fetched)")
+    return len(upserts) + len(removed)
+
+
+def _is_base(path):
+    ops = pd.read_parquet(path, columns=[OP_COLUMN])[OP_COLUMN]
+    return bool((ops == "base").any())
+
+
+def read_as_of(table, as_of, root=SNAPSHOT_DIR, include_today=True):
+    """
+    The table as it stood on as_of (the latest snapshot captured on or
+    before that date; strictly before when include_today is False).
+    Empty when nothing was captured yet.
+    """
+    return SnapshotReader(table, root).as_of(as_of, include_today)
+
+
+class SnapshotReader:
+    """
+    As-of reader for one table. Walking dates forward (the usual backtest
+    loop) replays only the snapshots captured since the previous call.
+    """
+
+    def __init__(self, table, root=SNAPSHOT_DIR):
+        self.table = table
+        self.key = TABLES[table]["key"]
+        self.files = snapshot_files(table, root)
+        self._position = -1
+        self._state = pd.DataFrame()
+
+    def dates(self):
+        return [d for d, _ in self.files]
+
+    def as_of(self, as_of, include_today=True):
+        label = pd.Timestamp(as_of).strftime('%Y-%m-%d')
+        target = -1
+        for i, (d, _) in enumerate(self.files):
+            if d < label or (include_today and d == label):
+                target = i
+        if target < 0:
+            return pd.DataFrame()
+
+        if target < self._position:
+            self._position, self._state = -1, pd.DataFrame()
+        # Start from the newest base in range instead of replaying older deltas
+        start = self._position + 1
+        for i in range(target, self._position, -1):
+            if _is_base(self.files[i][1]):
+                start = i
+                break
+        for _, path in self.files[start:target + 1]:
+            self._state = apply_snapshot(self._state, path, self.key)
+        self._position = target
+        return self._state.copy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Point-in-time snapshots of API tables the daily scrapes overwrite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    capture_parser = sub.add_parser("capture", help="Store today's tables as deltas against the previous snapshot")
+    capture_parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    show = sub.add_parser("show", help="Print a table as of a date")
+    show.add_argument("table", choices=list(TABLES))
+    show.add_argument("date", help="yyyy-mm-dd")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        session = requests.Session()
+        session.verify = False
+        for table in args.tables:
+            capture(table, session)
+    else:
+        frame = read_as_of(args.table, args.date)
+        with pd.option_context('display.max_rows', 200, 'display.width', 200):
+            print(frame if not frame.empty else f"No {args.table} snapshot on or before {args.date}")
+
+
+if __name__ == "__main__":
+    run(main)
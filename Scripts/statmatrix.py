@@ -0,0 +1,238 @@
+import os
+import json
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+
+from warehouse import API_BASE_URL, fetch_json
+from snapshots import read_as_of
+from profiling import run
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+MATRIX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "statmatrix_data")
+DTYPE = np.float32
+
+# Text columns with at most this many distinct values are stored as codes
+MAX_CATEGORIES = 64
+
+# Row ids and timestamps, not stats
+SKIP_COLUMNS = {"id", "dateModified", "dateUpdated", "date"}
+
+# Matrices and the columns that identify a row. Rows are player-seasons
+# (plus team or split where the API keys on it).
+MATRICES = {
+    "pitchers": ["bbrefId", "year", "team"],
+    "pitcher_splits": ["bbrefID", "year", "split"],
+    "hitters": ["bbrefId", "year", "team"],
+    "hitter_splits": ["bbrefId", "year", "split"],
+}
+
+
+def fetch_frame(session, name, years):
+    if name == "pitchers":
+        rows = []
+        for year in years:
+            rows.extend(fetch_json(session, f"{API_BASE_URL}/Pitchers/year/{year}"))
+        return pd.DataFrame(rows)
+    if name == "pitcher_splits":
+        frame = pd.DataFrame(fetch_json(session, f"{API_BASE_URL}/PitcherPlatoonAndTrackRecord"))
+        return frame[frame["year"].isin(years)] if "year" in frame else frame
+    if name == "hitters":
+        # No bulk Hitters endpoint; the daily snapshots hold every hitter seen
+        frame = read_as_of("hitters", datetime.now())
+        return frame[frame["year"].isin(years)] if "year" in frame else frame
+    rows = []
+    for year in years:
+        rows.extend(fetch_json(session, f"{API_BASE_URL}/TrailingGameLogSplits/year/{year}"))
+    frame = pd.DataFrame(rows)
+    if "dateUpdated" in frame:
+        frame = frame.sort_values("dateUpdated")
+    return frame
+
+
+def pack(frame, key):
+    """
+    DataFrame -> (float32 matrix, metadata). Numeric columns are stored as
+    is; low-cardinality text columns (e.g. throws) as category codes; the
+    rest (dates, free text) are dropped.
+    """
+    frame = frame.drop_duplicates(subset=key, keep="last").reset_index(drop=True)
+    columns, categories, data = [], {}, []
+    for column in frame.columns:
+        if column in key or column in SKIP_COLUMNS:
+            continue
+        series = frame[column]
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            data.append(series.astype(np.float64).to_numpy())
+        else:
+            values = series.dropna().astype(str)
+            if values.empty or values.nunique() > MAX_CATEGORIES:
+                continue
+            labels = sorted(values.unique())
+            codes = pd.Categorical(series.astype("string"), categories=labels).codes.astype(np.float64)
+            codes[codes < 0] = np.nan
+            data.append(codes)
+            categories[column] = labels
+        columns.append(column)
+
+    matrix = np.column_stack(data).astype(DTYPE) if data else np.empty((len(frame), 0), dtype=DTYPE)
+    keys = ["|".join(str(v) for v in row) for row in frame[key].itertuples(index=False, name=None)]
+
+    # bbrefId -> row of the player's newest season (most games if traded),
+    # precomputed so opening the matrix does no per-row work
+    games = pd.to_numeric(frame["g"], errors='coerce').fillna(0) if "g" in frame else pd.Series(0, index=frame.index)
+    order = pd.DataFrame({"player": frame[key[0]], "year": frame[key[1]], "games": games})
+    newest = order.sort_values(["year", "games"]).drop_duplicates("player", keep="last")
+    players = {str(p): int(i) for p, i in zip(newest["player"], newest.index)}
+
+    meta = {
+        "key": key,
+        "columns": columns,
+        "categories": categories,
+        "keys": keys,
+        "players": players,
+        "built": datetime.now().isoformat(timespec='seconds'),
+    }
+    return matrix, meta
+
+
+def save(name, matrix, meta, root=MATRIX_DIR):
+    """
+    Write next to the live files and swap them in, so a reader never maps a
+    half-written matrix.
+    """
+    os.makedirs(root, exist_ok=True)
+    base = os.path.join(root, name)
+    np.save(base + ".tmp.npy", np.ascontiguousarray(matrix))
+    with open(base + ".tmp.json", 'w', encoding='utf-8') as outfile:
+        json.dump(meta, outfile)
+    os.replace(base + ".tmp.npy", base + ".npy")
+    os.replace(base + ".tmp.json", base + ".json")
+
+
+def build(names=MATRICES, years=None, root=MATRIX_DIR):
+    session = requests.Session()
+    session.verify = False
+    years = years or [datetime.now().year - 1, datetime.now().year]
+    for name in names:
+        frame = fetch_frame(session, name, years)
+        key = MATRICES[name]
+        if frame.empty or not set(key).issubset(frame.columns):
+            print(f"{name}: no rows, matrix not rebuilt")
+            continue
+        matrix, meta = pack(frame, key)
+        save(name, matrix, meta, root)
+        print(f"{name}: {matrix.shape[0]} rows x {matrix.shape[1]} columns")
+
+
+class StatMatrix:
+    """
+    Read-only, memory-mapped view of one packed matrix. Opening costs a
+    JSON read plus an mmap; workers in a process pool that open the same
+    file share its pages through the OS cache.
+    """
+
+    def __init__(self, name, root=MATRIX_DIR):
+        base = os.path.join(root, name)
+        with open(base + ".json", 'r', encoding='utf-8') as infile:
+            meta = json.load(infile)
+        self.name = name
+        self.values = np.load(base + ".npy", mmap_mode='r')
+        self.columns = meta["columns"]
+        self.categories = meta["categories"]
+        self.keys = meta["keys"]
+        self.column_index = {c: i for i, c in enumerate(self.columns)}
+        self.row_index = {k: i for i, k in enumerate(self.keys)}
+
+        self.player_index = meta["players"]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def row(self, *key):
+        """
+        Row number for a full key (e.g. "smithjo01", 2024, "NYY"), or for a
+        bare bbrefId (newest season). None when absent.
+        """
+        if len(key) == 1:
+            return self.player_index.get(key[0])
+        return self.row_index.get("|".join(str(k) for k in key))
+
+    def take(self, keys, columns=None):
+        """
+        Feature block in the given column order, one row per key. A key is
+        a bare bbrefId (newest season) or a full key tuple such as
+        (bbrefId, year, split). Players not in the matrix get NaN rows.
+        """
+        columns = columns or self.columns
+        col_idx = [self.column_index[c] for c in columns]
+        rows = [self.row(*k) if isinstance(k, tuple) else self.row(k) for k in keys]
+        rows = np.array([-1 if r is None else r for r in rows], dtype=np.int64)
+        block = np.full((len(rows), len(col_idx)), np.nan, dtype=DTYPE)
+        found = rows >= 0
+        if found.any():
+            block[found] = self.values[rows[found]][:, col_idx]
+        return block
+
+    def get(self, bbref_id, column):
+        i = self.player_index.get(bbref_id)
+        if i is None:
+            return None
+        value = self.values[i, self.column_index[column]]
+        if np.isnan(value):
+            return None
+        if column in self.categories:
+            return self.categories[column][int(value)]
+        return float(value)
+
+
+def pitcher_hands(pitcher_ids, root=MATRIX_DIR):
+    """
+    bbrefId -> throws for the pitchers found in the packed matrix. Empty
+    when the matrix has not been built.
+    """
+    try:
+        matrix = StatMatrix("pitchers", root)
+    except (OSError, ValueError):
+        return {}
+    if "throws" not in matrix.column_index:
+        return {}
+    hands = {}
+    for pitcher_id in pitcher_ids:
+        throws = matrix.get(pitcher_id, "throws")
+        if throws:
+            hands[pitcher_id] = throws
+    return hands
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack player-season stats into memory-mapped NumPy matrices")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build", help="Rebuild matrices from the API")
+    build_parser.add_argument("--matrices", nargs="+", choices=list(MATRICES), default=list(MATRICES))
+    build_parser.add_argument("--years", type=int, nargs="+", help="Seasons to pack (default: last and current)")
+    show = sub.add_parser("show", help="Print one player's row")
+    show.add_argument("matrix", choices=list(MATRICES))
+    show.add_argument("bbref_id")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.matrices, args.years)
+        return
+
+    matrix = StatMatrix(args.matrix)
+    if matrix.row(args.bbref_id) is None:
+        print(f"{args.bbref_id} not found in {args.matrix}")
+        return
+    for column in matrix.columns:
+        print(f"{column}: {matrix.get(args.bbref_id, column)}")
+
+
+if __name__ == "__main__":
+    run(main)
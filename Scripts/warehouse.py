@@ -0,0 +1,254 @@
+"""
+Local Parquet + DuckDB copy of the API tables. Only the writes are
+incremental: the API has no date-bounded endpoints for these tables, so
+every sync still downloads each table in full (Hitters costs one
+todaysHitters call plus one call per hitter for each day back to the
+watermark) and then keeps the rows dated after the watermark.
+"""
+import os
+import json
+import glob
+import argparse
+from datetime import datetime, timedelta
+
+import duckdb
+import pandas as pd
+import requests
+import urllib3
+
+from profiling import run
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+API_BASE_URL = "https://localhost:44346/api"
+WAREHOUSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "warehouse_data")
+STATE_FILE = os.path.join(WAREHOUSE_DIR, "_sync_state.json")
+
+# Re-pull this many days before the watermark so late edits to recent rows land
+OVERLAP_DAYS = 2
+
+# table -> endpoint (with {year} where the API is per-season), date column used
+# for partitioning/watermarks, and the key identifying one logical row
+TABLES = {
+    "game_results": {
+        "endpoint": "GameResults",
+        "date": "date",
+        "key": ["id"],
+    },
+    "game_results_with_odds": {
+        "endpoint": "GameResultsWithOdds",
+        "date": "date",
+        "key": ["id"],
+    },
+    "trailing_gamelog_splits": {
+        "endpoint": "TrailingGameLogSplits/year/{year}",
+        "date": "dateUpdated",
+        "key": ["bbrefId", "split", "dateUpdated", "year"],
+    },
+    "pitcher_platoon": {
+        "endpoint": "PitcherPlatoonAndTrackRecord",
+        "date": "dateModified",
+        "key": ["bbrefID", "year", "split"],
+    },
+    "bullpen_usage": {
+        "endpoint": "BullpenUsage",
+        "date": "datePitched",
+        "key": ["bbrefid", "year", "teamGameNumber"],
+    },
+    "pitchers": {
+        "endpoint": "Pitchers/year/{year}",
+        "date": "dateModified",
+        "key": ["bbrefId", "year", "team"],
+    },
+    "hitters": {
+        # No bulk endpoint: pulled per day from the hitters on that day's slate
+        "endpoint": None,
+        "date": "date",
+        "key": ["bbrefId", "year", "team"],
+    },
+}
+
+
+def fetch_json(session, url):
+    try:
+        response = session.get(url, verify=False)
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code != 404:
+            print(f"Request to {url} returned {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        print(f"Exception while requesting {url}: {e}")
+    return []
+
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as infile:
+            return json.load(infile)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as outfile:
+        json.dump(state, outfile, indent=2)
+
+
+def fetch_hitters(session, start, end):
+    """
+    Hitters rows for everyone on each slate between start and end. A
+    hitter's season line only changes on days they play, so this is the
+    incremental set.
+    """
+    rows, seen = [], set()
+    day = start
+    while day <= end:
+        for bbref_id in fetch_json(session, f"{API_BASE_URL}/Hitters/todaysHitters/{day.strftime('%y-%m-%d')}"):
+            if bbref_id in seen:
+                continue
+            seen.add(bbref_id)
+            hitter = fetch_json(session, f"{API_BASE_URL}/Hitters/{bbref_id}")
+            if hitter:
+                rows.append(hitter)
+        day += timedelta(days=1)
+    return rows
+
+
+def fetch_table(session, table, start, end):
+    """
+    Every row of table from the API. start/end only pick the seasons of
+    per-year endpoints and the slates hitters are pulled for; nothing is
+    filtered by date here.
+    """
+    spec = TABLES[table]
+    if spec["endpoint"] is None:
+        return fetch_hitters(session, start, end)
+    if "{year}" in spec["endpoint"]:
+        rows = []
+        for year in range(start.year, end.year + 1):
+            rows.extend(fetch_json(session, f"{API_BASE_URL}/{spec['endpoint'].format(year=year)}"))
+        return rows
+    return fetch_json(session, f"{API_BASE_URL}/{spec['endpoint']}")
+
+
+def to_frame(rows, date_column):
+    """
+    Rows -> DataFrame with a parsed date column and a dt (yyyy-mm-dd)
+    partition column. Rows with unparseable dates are dropped.
+    """
+    frame = pd.DataFrame(rows)
+    if frame.empty or date_column not in frame:
+        return pd.DataFrame()
+    frame[date_column] = pd.to_datetime(frame[date_column], errors='coerce')
+    frame = frame.dropna(subset=[date_column])
+    frame["dt"] = frame[date_column].dt.strftime('%Y-%m-%d')
+    return frame
+
+
+def write_partitions(table, frame, key, root=WAREHOUSE_DIR):
+    """
+    Upsert rows into {root}/{table}/dt=YYYY-MM-DD/data.parquet. Only the
+    partitions present in frame are rewritten.
+    """
+    written = 0
+    for dt, part in frame.groupby("dt"):
+        folder = os.path.join(root, table, f"dt={dt}")
+        path = os.path.join(folder, "data.parquet")
+        part = part.drop(columns=["dt"])
+        if os.path.exists(path):
+            part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+        part = part.drop_duplicates(subset=[k for k in key if k in part], keep="last")
+        os.makedirs(folder, exist_ok=True)
+        part.to_parquet(path, index=False)
+        written += 1
+    return written
+
+
+def sync_table(session, table, state, end=None, root=WAREHOUSE_DIR):
+    """
+    Download one table in full and write only rows dated after its
+    watermark (minus OVERLAP_DAYS). Returns (rows written, partitions
+    touched).
+    """
+    spec = TABLES[table]
+    end = end or datetime.now()
+    watermark = state.get(table)
+    if watermark:
+        start = datetime.fromisoformat(watermark) - timedelta(days=OVERLAP_DAYS)
+    else:
+        start = datetime(end.year, 3, 1)
+
+    frame = to_frame(fetch_table(session, table, start, end), spec["date"])
+    if frame.empty:
+        return 0, 0
+    if watermark:
+        frame = frame[frame[spec["date"]] >= start]
+    if frame.empty:
+        return 0, 0
+
+    partitions = write_partitions(table, frame, spec["key"], root)
+    state[table] = frame[spec["date"]].max().isoformat()
+    return len(frame), partitions
+
+
+def sync(tables=None, end=None, root=WAREHOUSE_DIR):
+    session = requests.Session()
+    session.verify = False
+    state_path = os.path.join(root, "_sync_state.json")
+    state = load_state(state_path)
+    for table in tables or TABLES:
+        rows, partitions = sync_table(session, table, state, end, root)
+        print(f"{table}: {rows} rows into {partitions} partitions (watermark {state.get(table)})")
+        save_state(state, state_path)
+
+
+def connect(root=WAREHOUSE_DIR):
+    """
+    DuckDB connection with two views per synced table:
+    {table}_history holds every stored version of a row, {table} keeps only
+    the latest version of each key.
+    """
+    con = duckdb.connect()
+    for table, spec in TABLES.items():
+        if not glob.glob(os.path.join(root, table, "dt=*", "*.parquet")):
+            continue
+        pattern = os.path.join(root, table, "*", "*.parquet").replace("\\", "/")
+        con.execute(f"CREATE VIEW {table}_history AS "
+                    f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)")
+        key = ", ".join(f'"{k}"' for k in spec["key"] if k != spec["date"])
+        con.execute(f"CREATE VIEW {table} AS SELECT * FROM {table}_history "
+                    f"QUALIFY row_number() OVER (PARTITION BY {key} ORDER BY \"{spec['date']}\" DESC) = 1")
+    return con
+
+
+def query(sql, root=WAREHOUSE_DIR):
+    """
+    Run SQL against the warehouse views and return a DataFrame.
+    """
+    con = connect(root)
+    try:
+        return con.execute(sql).df()
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Parquet warehouse of API tables with a DuckDB query layer")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_parser = sub.add_parser("sync", help="Incrementally pull API tables into partitioned Parquet")
+    sync_parser.add_argument("--tables", nargs="+", choices=list(TABLES), help="Subset of tables to sync")
+    query_parser = sub.add_parser("query", help="Run a SQL query against the warehouse")
+    query_parser.add_argument("sql")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        sync(args.tables)
+    else:
+        with pd.option_context('display.max_rows', 200, 'display.width', 200):
+            print(query(args.sql))
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,248 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+
+from profiling import run
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MLmlbPicker'))
+from scrapeInfoFrombox import calculate_wind_direction
+
+# Disable SSL warnings to avoid certificate verification issues
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+API_BASE_URL = "https://localhost:44346/api"
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+VENUE_FILE = os.path.join(BASE_DIR, "..", "SQLDB", "dbscripts", "addlatlong.txt")
+CACHE_DIR = os.path.join(BASE_DIR, "weather_cache")
+
+# Open-Meteo refreshes its forecasts hourly
+CACHE_TTL_SECONDS = 3600
+
+# Game times in GamePreviews are Eastern; asking Open-Meteo for the same
+# zone keeps every venue's forecast on the schedule's clock
+TIMEZONE = "America/New_York"
+
+# Weather features average over first pitch to this many hours after
+GAME_WINDOW_HOURS = 3
+
+FORECAST_FIELDS = {
+    "temperature_2m": "temperature",
+    "relative_humidity_2m": "humidity",
+    "precipitation": "rain",
+    "precipitation_probability": "rain_probability",
+    "wind_speed_10m": "wind_speed",
+    "wind_direction_10m": "wind_direction",
+    "wind_gusts_10m": "wind_gusts",
+}
+
+
+def load_venues(path=VENUE_FILE):
+    """
+    Home team -> latitude, longitude and field direction, read from the
+    ParkFactors UPDATE script. Later statements win, as they do when the
+    script runs.
+    """
+    venues = {}
+    with open(path, encoding='utf-8') as infile:
+        for line in infile:
+            match = re.search(r"SET (.+?) WHERE Team = '(.+?)'", line)
+            if not match:
+                continue
+            venue = venues.setdefault(match.group(2), {})
+            for column, value in re.findall(r"(\w+) = (-?[\d.]+)", match.group(1)):
+                venue[column.lower()] = float(value)
+    frame = pd.DataFrame.from_dict(venues, orient="index").rename_axis("venue")
+    # Bearing the wind blows toward when it is "out to centerfield"
+    frame["out_bearing"] = [calculate_wind_direction('out to centerfield', d) if pd.notna(d) else np.nan
+                            for d in frame.get("direction", pd.Series(np.nan, index=frame.index))]
+    return frame
+
+
+def open_meteo_get(params, session=None):
+    """
+    One Open-Meteo forecast request. Comma-separated latitude/longitude
+    lists return one forecast per location.
+    """
+    response = (session or requests).get(OPEN_METEO_URL, params=params, verify=False)
+    response.raise_for_status()
+    data = response.json()
+    return data if isinstance(data, list) else [data]
+
+
+class ForecastCache:
+    """
+    15-minute forecasts per venue coordinates and date range, kept in
+    memory and in weather_cache/ for ttl seconds. fetch(params) -> list of
+    Open-Meteo responses is the only network call, so tests can pass a
+    stub that returns canned JSON.
+    """
+
+    def __init__(self, fetch=open_meteo_get, ttl=CACHE_TTL_SECONDS, cache_dir=CACHE_DIR):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._memory = {}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, "{:.4f}_{:.4f}_{}_{}.json".format(*key))
+
+    def _cached(self, key, now):
+        entry = self._memory.get(key)
+        if entry and now - entry[0] < self.ttl:
+            return entry[1]
+        if self.cache_dir:
+            path = self._path(key)
+            if os.path.exists(path) and now - os.path.getmtime(path) < self.ttl:
+                with open(path, encoding='utf-8') as infile:
+                    data = json.load(infile)
+                self._memory[key] = (os.path.getmtime(path), data)
+                return data
+        return None
+
+    def _store(self, key, data, now):
+        self._memory[key] = (now, data)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(key), 'w', encoding='utf-8') as outfile:
+                json.dump(data, outfile)
+
+    def forecasts(self, locations, start_date, end_date):
+        """
+        {(latitude, longitude): minutely_15 data} for every location over
+        start_date..end_date (yyyy-mm-dd). Locations missing from the cache
+        are fetched together in one request.
+        """
+        now = time.time()
+        result, missing = {}, []
+        for latitude, longitude in dict.fromkeys(locations):
+            key = (latitude, longitude, start_date, end_date)
+            data = self._cached(key, now)
+            if data is None:
+                missing.append((latitude, longitude))
+            else:
+                result[(latitude, longitude)] = data
+
+        if missing:
+            responses = self.fetch({
+                "latitude": ",".join(f"{lat:.4f}" for lat, _ in missing),
+                "longitude": ",".join(f"{lon:.4f}" for _, lon in missing),
+                "minutely_15": ",".join(FORECAST_FIELDS),
+                "temperature_unit": "fahrenheit",
+                "wind_speed_unit": "mph",
+                "precipitation_unit": "inch",
+                "timezone": TIMEZONE,
+                "start_date": start_date,
+                "end_date": end_date,
+            })
+            for location, response in zip(missing, responses):
+                data = response.get("minutely_15", {})
+                self._store(location + (start_date, end_date), data, now)
+                result[location] = data
+        return result
+
+
+def forecast_frame(forecasts):
+    """
+    Long frame of (latitude, longitude, time) rows with FORECAST_FIELDS
+    renamed to feature names.
+    """
+    frames = []
+    for (latitude, longitude), data in forecasts.items():
+        if not data.get("time"):
+            continue
+        frame = pd.DataFrame({name: data.get(field) for field, name in FORECAST_FIELDS.items()})
+        frame["time"] = pd.to_datetime(data["time"], format="%Y-%m-%dT%H:%M")
+        frame["latitude"], frame["longitude"] = latitude, longitude
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["latitude", "longitude", "time"] + list(FORECAST_FIELDS.values()))
+    return pd.concat(frames, ignore_index=True)
+
+
+def game_weather(games, venues=None, cache=None, window_hours=GAME_WINDOW_HOURS):
+    """
+    Weather features for a slate, one row per game in games (GamePreviews:
+    id, date, time like "7:05PM", homeTeam). Games at the same park share
+    one forecast, and every game's window is reduced in one groupby:
+      temperature, humidity, wind_speed, wind_gusts: window means
+      wind_out: mph blowing out to center (negative is blowing in)
+      rain_probability: window max; rain: window total (inches)
+    Games whose park or first pitch is unknown get NaN features.
+    """
+    venues = load_venues() if venues is None else venues
+    cache = cache or ForecastCache()
+    games = pd.DataFrame(games)
+    features = ["temperature", "humidity", "wind_speed", "wind_gusts", "wind_out", "rain_probability", "rain"]
+    if games.empty:
+        return pd.DataFrame(columns=["id", "homeTeam", "first_pitch"] + features)
+
+    games = games[["id", "date", "time", "homeTeam"]].copy()
+    games["first_pitch"] = pd.to_datetime(games["date"].astype(str).str[:10] + " " + games["time"].astype(str).str.strip().str.upper(),
+                                          format="%Y-%m-%d %I:%M%p", errors="coerce")
+    games = games.join(venues[["latitude", "longitude", "out_bearing"]], on="homeTeam")
+    known = games.dropna(subset=["first_pitch", "latitude", "longitude"])
+
+    rows = pd.DataFrame(columns=["id"] + features)
+    if not known.empty:
+        start = known["first_pitch"].min().strftime('%Y-%m-%d')
+        end = (known["first_pitch"].max() + pd.Timedelta(hours=window_hours)).strftime('%Y-%m-%d')
+        forecast = forecast_frame(cache.forecasts(zip(known["latitude"], known["longitude"]), start, end))
+
+        window = known[["id", "first_pitch", "latitude", "longitude", "out_bearing"]].merge(forecast, on=["latitude", "longitude"])
+        in_window = (window["time"] >= window["first_pitch"]) & \
+                    (window["time"] <= window["first_pitch"] + pd.Timedelta(hours=window_hours))
+        window = window[in_window]
+        # wind_direction is where the wind comes from; it blows the opposite way
+        blowing_toward = (window["wind_direction"].to_numpy(dtype=float) + 180.0) % 360.0
+        angle = np.radians(blowing_toward - window["out_bearing"].to_numpy(dtype=float))
+        window = window.assign(wind_out=window["wind_speed"].to_numpy(dtype=float) * np.cos(angle))
+        rows = window.groupby("id", as_index=False).agg(
+            temperature=("temperature", "mean"),
+            humidity=("humidity", "mean"),
+            wind_speed=("wind_speed", "mean"),
+            wind_gusts=("wind_gusts", "mean"),
+            wind_out=("wind_out", "mean"),
+            rain_probability=("rain_probability", "max"),
+            rain=("rain", "sum"),
+        )
+
+    result = games[["id", "homeTeam", "first_pitch"]].merge(rows, on="id", how="left")
+    return result.round({name: 1 for name in features if name != "rain"}).round({"rain": 2})
+
+
+def fetch_game_previews(date, session=None):
+    response = (session or requests).get(f"{API_BASE_URL}/GamePreviews/{date}", verify=False)
+    if response.status_code != 200:
+        print(f"GamePreviews for {date} returned {response.status_code}")
+        return []
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Game-window weather features for a day's games, one forecast per park")
+    parser.add_argument("--date", default=datetime.now().strftime('%y-%m-%d'), help="yy-mm-dd, as GamePreviews expects")
+    parser.add_argument("--ttl", type=int, default=CACHE_TTL_SECONDS, help="Seconds a cached forecast stays fresh")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    games = fetch_game_previews(args.date, session)
+    if not games:
+        print(f"No game previews found for {args.date}")
+        return
+    cache = ForecastCache(lambda params: open_meteo_get(params, session), ttl=args.ttl)
+    with pd.option_context('display.max_rows', 100, 'display.width', 200):
+        print(game_weather(games, cache=cache).to_string(index=False))
+
+
+if __name__ == "__main__":
+    run(main)
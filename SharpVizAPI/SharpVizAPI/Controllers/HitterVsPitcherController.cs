@@ -116,6 +116,53 @@ namespace SharpVizAPI.Controllers
                 return CreatedAtAction("GetHitterVsPitcher", new { id = hitterVsPitcher.ID }, hitterVsPitcher);
             }
 
+            // POST: api/HitterVsPitcher/batch
+            // Upserts by (Pitcher, Hitter, GamePreviewID): existing matchups get the new stats, others are added
+            [HttpPost("batch")]
+            public async Task<IActionResult> UpsertHitterVsPitchers([FromBody] List<HitterVsPitcher> hitterVsPitchers)
+            {
+                if (hitterVsPitchers == null || !hitterVsPitchers.Any())
+                {
+                    return BadRequest("Invalid data.");
+                }
+
+                var gamePreviewIds = hitterVsPitchers.Select(hvp => hvp.GamePreviewID).Distinct().ToList();
+                var pitchers = hitterVsPitchers.Select(hvp => hvp.Pitcher).Distinct().ToList();
+
+                // One query for every stored row these matchups could match
+                var existing = (await _context.HitterVsPitchers
+                    .Where(hvp => gamePreviewIds.Contains(hvp.GamePreviewID) && pitchers.Contains(hvp.Pitcher))
+                    .ToListAsync())
+                    .GroupBy(hvp => (hvp.Pitcher, hvp.Hitter, hvp.GamePreviewID))
+                    .ToDictionary(group => group.Key, group => group.First());
+
+                int added = 0, updated = 0;
+                foreach (var incoming in hitterVsPitchers)
+                {
+                    if (existing.TryGetValue((incoming.Pitcher, incoming.Hitter, incoming.GamePreviewID), out var stored))
+                    {
+                        incoming.ID = stored.ID;
+                        _context.Entry(stored).CurrentValues.SetValues(incoming);
+                        updated++;
+                    }
+                    else
+                    {
+                        incoming.ID = 0;
+                        _context.HitterVsPitchers.Add(incoming);
+                        added++;
+                    }
+                }
+
+                await _context.SaveChangesAsync();
+
+                return Ok(new
+                {
+                    message = $"Processed {hitterVsPitchers.Count} matchups: {added} added, {updated} updated",
+                    added,
+                    updated
+                });
+            }
+
             // DELETE: api/HitterVsPitcher/5
             [HttpDelete("{id}")]
             public async Task<IActionResult> DeleteHitterVsPitcher(int id)
@@ -15,135 +15,156 @@ chrome_driver_path = "C:/buns/tw/SVREDO2/prodScripts/SeleniumVersions/chromedriv
 # chrome_driver_path = "C:/Users/travi/source/repos/SVREDO2/prodScripts/SeleniumVersions/chromedriver.exe"
 
 
-# Set Chrome options to run headless
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--no-sandbox")
-
-# Initialize the Selenium WebDriver (Chrome in this case)
-service = Service(chrome_driver_path)
-driver = webdriver.Chrome(service=service, options=chrome_options)
-
-# Load the webpage
-url = "https://stathead.com/baseball/versus-finder.cgi?request=1&match=versus_today"
-driver.get(url)
-
-# Wait for the page to fully load
-time.sleep(6)
-
-# Parse the page source with BeautifulSoup
-soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-# Close the WebDriver after the page is loaded
-driver.quit()
-
-# Try finding the table by id
-table = soup.find('table', {'id': 'stats'})
-if not table:
-    print("Table not found.")
-    exit()
-
-# Extract the rows from the table (skip the header row)
-rows = table.find_all('tr', {'data-row': True})
-
-# List to store the data
-hitter_vs_pitcher_data = []
-
-# Function to safely extract integer or float values
-def extract_stat(row, stat_name, data_type=int):
-    element = row.find('td', {'data-stat': stat_name})
-    if element:
-        text = element.text.strip()
-        if data_type == int:
-            return int(text or 0)
-        elif data_type == float:
-            return float(text or 0)
-    return 0
-
-# Iterate over the rows and extract each cell based on 'data-stat' attributes
-for row in rows:
-    pitcher_link_tag = row.find('td', {'data-stat': 'name_display_p'})
-    hitter_link_tag = row.find('td', {'data-stat': 'name_display_b'})
-    details_link_tag = row.find('td', {'data-stat': 'details_pa'})
-
-    if pitcher_link_tag and pitcher_link_tag.find('a'):
-        pitcher_link = pitcher_link_tag.find('a')['href']
-        pitcher = pitcher_link.split('/')[-1].split('.')[0]
-    else:
-        pitcher = "Unknown"
-
-    if hitter_link_tag and hitter_link_tag.find('a'):
-        hitter_link = hitter_link_tag.find('a')['href']
-        hitter = hitter_link.split('/')[-1].split('.')[0]
-    else:
-        hitter = "Unknown"
-
-    # Extract the correct matchup URL
-    if details_link_tag and details_link_tag.find('a'):
-        matchup_url = "https://stathead.com/baseball/" + details_link_tag.find('a')['href']
-    else:
-        matchup_url = url  # Fallback to the main URL if not found
-
-    # Create a dictionary for each row
-    data = {
-        "pitcher": pitcher,
-        "hitter": hitter,
-        "pa": extract_stat(row, 'b_pa', int),
-        "hits": extract_stat(row, 'b_h', int),
-        "hr": extract_stat(row, 'b_hr', int),
-        "rbi": extract_stat(row, 'b_rbi', int),
-        "bb": extract_stat(row, 'b_bb', int),
-        "so": extract_stat(row, 'b_so', int),
-        "ba": extract_stat(row, 'b_batting_avg', float),
-        "obp": extract_stat(row, 'b_onbase_perc', float),
-        "slg": extract_stat(row, 'b_slugging_perc', float),
-        "ops": extract_stat(row, 'b_onbase_plus_slugging', float),
-        "sh": extract_stat(row, 'b_sh', int),
-        "sf": extract_stat(row, 'b_sf', int),
-        "ibb": extract_stat(row, 'b_ibb', int),
-        "hbp": extract_stat(row, 'b_hbp', int),
-        "matchupURL": matchup_url  # Use the correct URL for the matchup
-    }
+STATHEAD_URL = "https://stathead.com/baseball/versus-finder.cgi?request=1&match=versus_today"
+API_BASE_URL = "https://localhost:44346/api"
+HEADERS = {
+    'accept': 'text/plain',
+    'Content-Type': 'application/json'
+}
+
+# Payload field -> (data-stat of its cell, type)
+MATCHUP_STATS = (
+    ("pa", "b_pa", int),
+    ("hits", "b_h", int),
+    ("hr", "b_hr", int),
+    ("rbi", "b_rbi", int),
+    ("bb", "b_bb", int),
+    ("so", "b_so", int),
+    ("ba", "b_batting_avg", float),
+    ("obp", "b_onbase_perc", float),
+    ("slg", "b_slugging_perc", float),
+    ("ops", "b_onbase_plus_slugging", float),
+    ("sh", "b_sh", int),
+    ("sf", "b_sf", int),
+    ("ibb", "b_ibb", int),
+    ("hbp", "b_hbp", int),
+)
+
+
+def fetch_versus_page():
+    # Set Chrome options to run headless
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+
+    # Initialize the Selenium WebDriver (Chrome in this case)
+    service = Service(chrome_driver_path)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    try:
+        # Load the webpage
+        driver.get(STATHEAD_URL)
 
-    hitter_vs_pitcher_data.append(data)
+        # Wait for the page to fully load
+        time.sleep(6)
 
-# Step 1: Fetch Game Previews for Today's Date (Corrected Date Format)
-today = datetime.now().strftime('%y-%m-%d')  # Changed to 'DD-MM-YY'
-game_previews_url = f"https://localhost:44346/api/GamePreviews/{today}"
+        # Parse the page source with BeautifulSoup
+        return BeautifulSoup(driver.page_source, 'html.parser')
+    finally:
+        # Close the WebDriver after the page is loaded
+        driver.quit()
 
-try:
-    game_previews_response = requests.get(game_previews_url, verify=False)  # Added verify=False here
-    game_previews_response.raise_for_status()
-    game_previews = game_previews_response.json()
-except requests.exceptions.RequestException as e:
-    print(f"Error fetching game previews: {e}")
-    exit()
 
-# Step 2: Match pitchers to game previews and send data to the API
-hitter_vs_pitcher_api_url = "https://localhost:44346/api/HitterVsPitcher"
+def player_id(cell):
+    # bbref id from the player link, e.g. /players/t/troutmi01.shtml -> troutmi01
+    link = cell.find('a') if cell is not None else None
+    if link is None:
+        return "Unknown"
+    return link['href'].split('/')[-1].split('.')[0]
 
-for hitter_vs_pitcher in hitter_vs_pitcher_data:
-    pitcher_id = hitter_vs_pitcher["pitcher"]
 
-    # Match the pitcher to a game preview
-    matched_game_preview = next(
-        (game for game in game_previews if game["homePitcher"] == pitcher_id or game["awayPitcher"] == pitcher_id), None
-    )
+def parse_matchup_row(row):
+    """
+    One pass over a row's cells, keyed by data-stat, then typed conversion
+    of the stat cells (blank -> 0).
+    """
+    cells = {cell.get('data-stat'): cell for cell in row.find_all(('td', 'th'), recursive=False)}
 
-    if matched_game_preview:
-        # Set the gamePreviewID in the payload
-        hitter_vs_pitcher["gamePreviewID"] = matched_game_preview["id"]
-    else:
-        hitter_vs_pitcher["gamePreviewID"] = 0  # Default to 0 if no match is found
+    details = cells.get('details_pa')
+    details_link = details.find('a') if details is not None else None
 
-    # Send POST request to HitterVsPitcher API
+    data = {
+        "pitcher": player_id(cells.get('name_display_p')),
+        "hitter": player_id(cells.get('name_display_b')),
+    }
+    for field, stat, data_type in MATCHUP_STATS:
+        cell = cells.get(stat)
+        text = cell.get_text(strip=True) if cell is not None else ""
+        data[field] = data_type(text or 0)
+    # Use the matchup's own URL, falling back to the main page
+    data["matchupURL"] = "https://stathead.com/baseball/" + details_link['href'] if details_link else STATHEAD_URL
+    return data
+
+
+def parse_matchups(soup):
+    # Try finding the table by id
+    table = soup.find('table', {'id': 'stats'})
+    if not table:
+        return None
+    # Extract the rows from the table (skip the header row)
+    return [parse_matchup_row(row) for row in table.find_all('tr', {'data-row': True})]
+
+
+def fetch_stored_pa(date):
+    """
+    PA of every matchup already stored for the date's games, keyed by
+    (pitcher, hitter, gamePreviewID).
+    """
+    response = requests.get(f"{API_BASE_URL}/HitterVsPitcher/allRecordsByDate/{date}", verify=False)
+    if response.status_code == 404:  # Nothing stored for the date yet
+        return {}
+    response.raise_for_status()
+    return {(r["pitcher"], r["hitter"], r["gamePreviewID"]): r["pa"] for r in response.json()}
+
+
+def main():
+    soup = fetch_versus_page()
+    hitter_vs_pitcher_data = parse_matchups(soup)
+    if hitter_vs_pitcher_data is None:
+        print("Table not found.")
+        return
+
+    # Step 1: Fetch Game Previews for Today's Date (Corrected Date Format)
+    today = datetime.now().strftime('%y-%m-%d')  # Changed to 'DD-MM-YY'
     try:
-        response = requests.post(hitter_vs_pitcher_api_url, json=hitter_vs_pitcher, verify=False, headers={
-            'accept': 'text/plain',
-            'Content-Type': 'application/json'
-        })
+        game_previews_response = requests.get(f"{API_BASE_URL}/GamePreviews/{today}", verify=False)  # Added verify=False here
+        game_previews_response.raise_for_status()
+        game_previews = game_previews_response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching game previews: {e}")
+        return
+
+    # Step 2: Match pitchers to game previews (0 if no match is found)
+    preview_by_pitcher = {}
+    for game in game_previews:
+        for pitcher in (game["homePitcher"], game["awayPitcher"]):
+            preview_by_pitcher.setdefault(pitcher, game["id"])
+    for hitter_vs_pitcher in hitter_vs_pitcher_data:
+        hitter_vs_pitcher["gamePreviewID"] = preview_by_pitcher.get(hitter_vs_pitcher["pitcher"], 0)
+
+    # Step 3: Only send matchups that are new or whose PA changed since the last run
+    try:
+        stored_pa = fetch_stored_pa(today)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching stored matchups, sending all: {e}")
+        stored_pa = {}
+    changed = [
+        hvp for hvp in hitter_vs_pitcher_data
+        if stored_pa.get((hvp["pitcher"], hvp["hitter"], hvp["gamePreviewID"])) != hvp["pa"]
+    ]
+    print(f"{len(hitter_vs_pitcher_data)} matchups, {len(changed)} new or changed")
+    if not changed:
+        return
+
+    # Step 4: Send the changed matchups to the API in one request
+    try:
+        response = requests.post(f"{API_BASE_URL}/HitterVsPitcher/batch", json=changed, verify=False, headers=HEADERS)
         response.raise_for_status()
-        print(f"Successfully added data for pitcher {pitcher_id}")
+        print(response.json().get("message", f"Successfully sent {len(changed)} matchups"))
     except requests.exceptions.RequestException as e:
-        print(f"Error sending data for pitcher {pitcher_id}: {e}")
+        print(f"Error sending matchups: {e}")
+
+
+if __name__ == "__main__":
+    main()